@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'agroproductores_risol.settings')
 
 application = get_asgi_application()
+
+# Workers de exportación: EXPORT_PRELOAD=1 carga openpyxl/reportlab al arrancar.
+from agroproductores_risol.utils.export_registry import preload_exporters_if_enabled  # noqa: E402
+
+preload_exporters_if_enabled()
@@ -122,7 +122,45 @@ def build_database_config() -> dict:
         }
 
     config.setdefault("CONN_MAX_AGE", 600)
+    _apply_mysql_options(config)
 
+    config["TEST"] = {"NAME": get_required_env("DB_TEST_NAME")}
+    return config
+
+
+def build_replica_database_config() -> dict | None:
+    """Réplica de solo lectura opcional (alias `replica`); None si no hay."""
+    replica_url = os.getenv("DATABASE_REPLICA_URL", "").strip()
+    if not replica_url:
+        return None
+    config = dj_database_url.parse(replica_url, conn_max_age=600)
+    _apply_mysql_options(config)
+    # En pruebas la réplica apunta a la misma base que `default`.
+    config["TEST"] = {"MIRROR": "default"}
+    return config
+
+
+def build_cache_config() -> dict:
+    """
+    Cache `default` a partir de CACHE_URL. Los locks single-flight, las
+    versiones de ETag/reportes y las marcas de réplica deben verse desde todos
+    los workers: en despliegue usar redis://, memcached:// o db://<tabla>
+    (`manage.py createcachetable`). Sin CACHE_URL se usa LocMem (un proceso).
+    """
+    cache_url = os.getenv("CACHE_URL", "").strip()
+    scheme, _, location = cache_url.partition("://")
+    if not cache_url or scheme == "locmem":
+        return {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    if scheme in {"redis", "rediss"}:
+        return {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": cache_url}
+    if scheme == "memcached":
+        return {"BACKEND": "django.core.cache.backends.memcached.PyMemcacheCache", "LOCATION": location}
+    if scheme == "db":
+        return {"BACKEND": "django.core.cache.backends.db.DatabaseCache", "LOCATION": location or "django_cache"}
+    raise ImproperlyConfigured(f"CACHE_URL no soportado: {scheme}://")
+
+
+def _apply_mysql_options(config: dict) -> None:
     if config.get("ENGINE") == "django.db.backends.mysql":
         options = config.setdefault("OPTIONS", {})
         options["charset"] = options.get("charset", "utf8mb4")
@@ -131,9 +169,6 @@ def build_database_config() -> dict:
             "SET sql_mode='STRICT_TRANS_TABLES,STRICT_ALL_TABLES,ERROR_FOR_DIVISION_BY_ZERO,NO_ZERO_DATE,NO_ZERO_IN_DATE'",
         )
 
-    config["TEST"] = {"NAME": get_required_env("DB_TEST_NAME")}
-    return config
-
 
 DEBUG = env_bool_required("DJANGO_DEBUG")
 ENABLE_API_DOCS = env_bool("DJANGO_ENABLE_API_DOCS", DEBUG)
@@ -184,6 +219,7 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "agroproductores_risol.utils.db_router.ReplicaRoutingMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -215,6 +251,18 @@ WSGI_APPLICATION = "agroproductores_risol.wsgi.application"
 DATABASES = {
     "default": build_database_config(),
 }
+CACHES = {
+    "default": build_cache_config(),
+}
+
+_replica_database = build_replica_database_config()
+if _replica_database:
+    DATABASES["replica"] = _replica_database
+
+# Lecturas de reportes/tablero/dashboard a la réplica (si existe); tras una
+# escritura el usuario lee de `default` durante DATABASE_REPLICA_STICKY_SECONDS.
+DATABASE_ROUTERS = ["agroproductores_risol.utils.db_router.ReplicaRouter"]
+DATABASE_REPLICA_STICKY_SECONDS = env_int("DATABASE_REPLICA_STICKY_SECONDS", 15)
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
@@ -223,6 +271,13 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
+    # orjson (mismos bytes que el JSONRenderer de DRF); el compacto omite
+    # `notification` y se pide con `Accept: application/json; compact=1`.
+    "DEFAULT_RENDERER_CLASSES": [
+        "agroproductores_risol.utils.renderers.CompactJSONRenderer",
+        "agroproductores_risol.utils.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
     "DEFAULT_PAGINATION_CLASS": "agroproductores_risol.utils.pagination.GenericPagination",
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "EXCEPTION_HANDLER": "agroproductores_risol.utils.exception_handler.canonical_exception_handler",
@@ -261,6 +316,54 @@ SIMPLE_JWT = {
     "SLIDING_TOKEN_REFRESH_LIFETIME": timedelta(days=7),
 }
 
+# Render de PDFs (WeasyPrint) en un pool de procesos precalentados
+# (agroproductores_risol.utils.pdf_renderer). 0 = render en el proceso web.
+PDF_RENDERER = {
+    "POOL_SIZE": env_int("PDF_RENDER_POOL_SIZE", 0 if DEBUG else 2),
+    "TIMEOUT": env_int("PDF_RENDER_TIMEOUT", 60),
+    "MAX_TASKS_PER_CHILD": env_int("PDF_RENDER_MAX_TASKS_PER_CHILD", 50),
+}
+
+# Exportadores PDF/Excel (agroproductores_risol.utils.export_registry): se
+# importan en el primer uso; PRELOAD los carga al arrancar workers de export.
+EXPORTS = {
+    "PRELOAD": env_bool("EXPORT_PRELOAD", False),
+}
+
+# Canal SSE del tablero de bodega (gestion_bodega.services.tablero_events).
+# Opt-in: cada pestaña abierta mantiene una respuesta en streaming hasta
+# MAX_STREAM_SECONDS, así que REQUIERE workers con hilos o asíncronos
+# (gunicorn -k gthread --threads N, o un servidor ASGI). Con workers síncronos
+# cada pestaña ocuparía un worker entero. Apagado, el cliente usa polling + ETag.
+# Backend: vacío = CacheEventBackend si CACHE_URL es compartido (varios
+# workers/nodos), InProcessEventBackend si no (un solo proceso).
+BODEGA_TABLERO_EVENTS = {
+    "ENABLED": env_bool("BODEGA_TABLERO_EVENTS_ENABLED", False),
+    "BACKEND": os.getenv("BODEGA_TABLERO_EVENTS_BACKEND", ""),
+    "HEARTBEAT_SECONDS": env_int("BODEGA_TABLERO_EVENTS_HEARTBEAT", 15),
+    "MAX_STREAM_SECONDS": env_int("BODEGA_TABLERO_EVENTS_MAX_SECONDS", 300),
+    "HISTORY": 200,
+    "CACHE_TTL": 600,
+    "POLL_SECONDS": 1.0,
+}
+
+# Máximo de renglones por POST /bodega/recepciones/bulk-create/
+BODEGA_RECEPCION_BULK_MAX_ITEMS = env_int("BODEGA_RECEPCION_BULK_MAX_ITEMS", 200)
+
+# Reporte semanal de bodega en cache (versión del tablero en la clave); lo
+# precalienta la tarea bodega.precalentar_reporte_semanal (solo con CACHE_URL
+# compartido: con LocMem se omite).
+BODEGA_REPORTE_SEMANAL_CACHE_TTL = env_int("BODEGA_REPORTE_SEMANAL_CACHE_TTL", 60 * 60)
+BODEGA_REPORTE_TEMPORADA_CACHE_TTL = env_int("BODEGA_REPORTE_TEMPORADA_CACHE_TTL", 60 * 60)
+
+# Scheduler de tareas periódicas (manage.py run_scheduler; tareas en <app>/tasks.py).
+# ENABLED=True indica que el daemon corre: las lecturas dejan de cerrar semanas.
+SCHEDULER = {
+    "ENABLED": env_bool("SCHEDULER_ENABLED", False),
+    "POLL_SECONDS": env_int("SCHEDULER_POLL_SECONDS", 30),
+    "HISTORY_DAYS": env_int("SCHEDULER_HISTORY_DAYS", 30),
+}
+
 AUTH_USER_MODEL = "gestion_usuarios.Users"
 MESSAGE_STORAGE = "django.contrib.messages.storage.session.SessionStorage"
 AUTH_PASSWORD_VALIDATORS = [
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""
+Versiones de cambio (change versions) + GET condicional
+-------------------------------------------------------
+Responsabilidad:
+- Mantener contadores monótonos en cache por "contexto" (p.ej. bodega+temporada)
+  que se incrementan cuando se confirma una escritura relevante.
+- Derivar ETags estables a partir de esas versiones para responder 304
+  ANTES de ejecutar cualquier agregación.
+
+Notas:
+- Si el backend de cache pierde la llave, la versión se re-siembra con el
+  reloj en milisegundos: nunca retrocede respecto a un ETag ya emitido.
+- Los ETags son "weak" (W/"...") porque describen equivalencia semántica
+  del payload, no igualdad byte a byte.
+- Con réplica de lectura, cada incremento se marca como reciente y cada
+  lectura lo consulta (ver agroproductores_risol.utils.db_router): un cuerpo
+  leído de una réplica atrasada nunca sale con el ETag de la versión nueva.
+"""
+from __future__ import annotations
+
+import hashlib
+import time
+from typing import Iterable, Optional
+
+from django.core.cache import cache
+
+from agroproductores_risol.utils.db_router import leer_versiones, marcar_versiones_recientes
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def _seed() -> int:
+    return int(time.time() * 1000)
+
+
+def get_change_version(key: str) -> int:
+    """
+    Devuelve la versión actual para `key`. Si no existe, la inicializa.
+    """
+    leer_versiones([key])
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _seed(), timeout=None)
+        version = cache.get(key) or _seed()
+    return int(version)
+
+
+def get_change_versions(keys: Iterable[str]) -> dict[str, int]:
+    """
+    Variante en lote (un solo round-trip al cache para las llaves existentes).
+    """
+    keys = list(keys)
+    leer_versiones(keys)
+    found = cache.get_many(keys) if keys else {}
+    out: dict[str, int] = {}
+    for key in keys:
+        out[key] = int(found[key]) if key in found else get_change_version(key)
+    return out
+
+
+def bump_change_version(key: str) -> int:
+    """
+    Incrementa de forma atómica la versión de `key`.
+    """
+    marcar_versiones_recientes([key])
+    try:
+        cache.add(key, _seed(), timeout=None)
+        return int(cache.incr(key))
+    except Exception:
+        version = _seed()
+        cache.set(key, version, timeout=None)
+        return version
+
+
+def build_etag(*parts: object) -> str:
+    """
+    ETag débil a partir de las partes discriminantes (versión, fecha, params...).
+    """
+    raw = "|".join(str(part) for part in parts)
+    digest = hashlib.md5(raw.encode()).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(request, etag: Optional[str]) -> bool:
+    """
+    True si el cliente ya tiene la representación identificada por `etag`.
+    Compara en modo débil (RFC 9110 §13.1.2) como hace Django.
+    """
+    if not etag:
+        return False
+    header = request.META.get("HTTP_IF_NONE_MATCH")
+    if not header:
+        return False
+    candidates = parse_etags(header)
+    if "*" in candidates:
+        return True
+    target = etag.removeprefix("W/")
+    return any(c.removeprefix("W/") == target for c in candidates)
+
+
+def not_modified_response(etag: str) -> Response:
+    response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    response["ETag"] = etag
+    return response
+
+
+__all__ = [
+    "build_etag",
+    "bump_change_version",
+    "etag_matches",
+    "get_change_version",
+    "get_change_versions",
+    "not_modified_response",
+]
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""
+Lecturas de reportes, tablero y dashboard en la réplica
+-------------------------------------------------------
+En temporada alta las agregaciones de reportes, el polling del tablero y el
+overview del dashboard compiten con las escrituras de recepciones y
+clasificaciones en `default`. Si existe el alias `replica` (y el cache es
+compartido entre workers, ver `agroproductores_risol.utils.shared_cache`):
+
+- Las vistas con `replica_reads = True` leen de la réplica; todo lo demás
+  (y cualquier escritura) sigue en `default`.
+- Read-your-writes: cuando una petición de un usuario escribe, se guarda en
+  el cache una marca por usuario durante DATABASE_REPLICA_STICKY_SECONDS y,
+  mientras exista, sus lecturas vuelven a `default`.
+- Versiones recientes: los ETags y las llaves de cache de reportes salen de
+  versiones que se incrementan al confirmar en `default`. Cada incremento
+  deja la marca `db:replica:reciente:<llave>` durante el mismo margen; si la
+  vista lee una versión marcada, el cuerpo se lee de `default`. Así ningún
+  cuerpo de la réplica se cachea ni se etiqueta con una versión que aún no
+  refleja, mientras el rezago sea menor que DATABASE_REPLICA_STICKY_SECONDS.
+- Si la propia petición escribe (p. ej. la bitácora de una exportación), el
+  resto de sus lecturas también van a `default`; lo mismo dentro de un
+  `transaction.atomic()` (y por eso en los TestCase, con la réplica como
+  `TEST["MIRROR"]`, todo se lee de `default`).
+
+Sin réplica configurada, o con cache local al proceso, el router no decide
+nada y todo va a `default`.
+"""
+from __future__ import annotations
+
+from contextvars import ContextVar
+from typing import Any, Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.functional import LazyObject
+
+from agroproductores_risol.utils.shared_cache import shared_cache_configured
+
+REPLICA_ALIAS = "replica"
+
+
+def _pin_key(user_id: Any) -> str:
+    return f"db:replica:pin:{user_id}"
+
+
+def _reciente_key(version_key: str) -> str:
+    return f"db:replica:reciente:{version_key}"
+
+
+def replica_configurada() -> bool:
+    # Sin cache compartido las marcas no cruzan workers: mejor no usar réplica.
+    return REPLICA_ALIAS in settings.DATABASES and shared_cache_configured()
+
+
+class _EstadoPeticion:
+    """Decisión de ruteo de la petición en curso (una por request)."""
+
+    def __init__(self, request):
+        self.request = request
+        self.replica = False      # la vista aceptó leer de la réplica
+        self.escribio = False     # hubo escrituras en esta petición
+        self.version_reciente = False  # leyó una versión que la réplica quizá no refleja
+        self._fijado: Optional[bool] = None  # marca read-your-writes del usuario
+
+    def permite_replica(self) -> bool:
+        if (
+            not self.replica
+            or self.escribio
+            or self.version_reciente
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return False
+        if self._fijado is None:
+            # DRF asigna el usuario real al HttpRequest tras autenticar; antes
+            # de eso (p. ej. la consulta del propio JWT) se lee de `default`.
+            user = self.request.__dict__.get("user")
+            if user is None or isinstance(user, LazyObject):
+                return False
+            self._fijado = bool(
+                getattr(user, "is_authenticated", False) and cache.get(_pin_key(user.pk))
+            )
+        return not self._fijado
+
+
+_estado: ContextVar[Optional[_EstadoPeticion]] = ContextVar("db_replica_estado", default=None)
+
+
+def marcar_versiones_recientes(keys: Iterable[str]) -> None:
+    """Al incrementar versiones: la réplica puede no reflejarlas todavía."""
+    if replica_configurada():
+        cache.set_many(
+            {_reciente_key(key): 1 for key in keys},
+            timeout=settings.DATABASE_REPLICA_STICKY_SECONDS,
+        )
+
+
+def leer_versiones(keys: Iterable[str]) -> None:
+    """
+    Al leer versiones para un ETag o una llave de cache: si alguna cambió hace
+    menos del margen de rezago, el resto de la petición lee de `default`.
+    """
+    estado = _estado.get()
+    if estado is None or not estado.replica or estado.version_reciente or not replica_configurada():
+        return
+    if cache.get_many([_reciente_key(key) for key in keys]):
+        estado.version_reciente = True
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        estado = _estado.get()
+        if estado is not None and replica_configurada() and estado.permite_replica():
+            return REPLICA_ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):
+        estado = _estado.get()
+        if estado is not None:
+            estado.escribio = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, REPLICA_ALIAS}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == REPLICA_ALIAS:
+            return False
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    """Abre el estado de ruteo por petición y fija al usuario tras escribir."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        estado = _EstadoPeticion(request)
+        token = _estado.set(estado)
+        try:
+            response = self.get_response(request)
+        finally:
+            _estado.reset(token)
+        if estado.escribio and not estado.replica and replica_configurada():
+            self._fijar_usuario(request)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        estado = _estado.get()
+        if estado is not None and estado.request is request:
+            view_class = getattr(view_func, "cls", None) or getattr(view_func, "view_class", None)
+            estado.replica = bool(getattr(view_class, "replica_reads", False))
+        return None
+
+    @staticmethod
+    def _fijar_usuario(request) -> None:
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            cache.set(_pin_key(user.pk), 1, settings.DATABASE_REPLICA_STICKY_SECONDS)
+
+
+__all__ = [
+    "REPLICA_ALIAS",
+    "ReplicaRouter",
+    "ReplicaRoutingMiddleware",
+    "leer_versiones",
+    "marcar_versiones_recientes",
+    "replica_configurada",
+]
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+Registro perezoso de backends de exportación (PDF/Excel)
+--------------------------------------------------------
+Los exportadores arrastran openpyxl/reportlab (y el registro de fuentes). Los
+servicios y vistas los piden por nombre con `get_exporter("huerta.pdf")`; el
+módulo se importa en el primer uso, así un worker web que nunca exporta no
+paga ese costo de arranque ni de memoria.
+
+Workers dedicados a exportar pueden precargarlos al arrancar con
+EXPORTS["PRELOAD"] (env EXPORT_PRELOAD=1): `preload_exporters_if_enabled()`
+se llama desde wsgi/asgi.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import dataclass
+from importlib import import_module
+from typing import Any, Dict, Iterable, List, Optional
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ExportBackend:
+    modulo: str
+    atributo: str
+    # Función del módulo que deja el backend listo (fuentes, estilos) al precargar.
+    warmup: Optional[str] = None
+
+
+_REGISTRY: Dict[str, ExportBackend] = {
+    "huerta.pdf": ExportBackend(
+        "gestion_huerta.services.exportacion.pdf_exporter", "PDFExporter", warmup="_register_brand_fonts"
+    ),
+    "huerta.excel": ExportBackend("gestion_huerta.services.exportacion.excel_exporter", "ExcelExporter"),
+    "bodega.excel": ExportBackend("gestion_bodega.services.exportacion.excel_exporter", "ExcelExporter"),
+}
+_loaded: Dict[str, Any] = {}
+_lock = threading.Lock()
+
+
+def register_exporter(nombre: str, modulo: str, atributo: str, *, warmup: Optional[str] = None) -> None:
+    with _lock:
+        _REGISTRY[nombre] = ExportBackend(modulo, atributo, warmup)
+        _loaded.pop(nombre, None)
+
+
+def registered_exporters() -> List[str]:
+    return sorted(_REGISTRY)
+
+
+def get_exporter(nombre: str) -> Any:
+    """Devuelve el backend `nombre`, importándolo en el primer uso."""
+    backend = _loaded.get(nombre)
+    if backend is not None:
+        return backend
+    try:
+        spec = _REGISTRY[nombre]
+    except KeyError:
+        raise LookupError(f"Exportador no registrado: {nombre}") from None
+    with _lock:
+        if nombre not in _loaded:
+            _loaded[nombre] = getattr(import_module(spec.modulo), spec.atributo)
+        return _loaded[nombre]
+
+
+def preload_exporters(nombres: Optional[Iterable[str]] = None) -> List[str]:
+    """Importa (y calienta) los backends indicados o todos; devuelve los cargados."""
+    cargados = []
+    for nombre in nombres or registered_exporters():
+        get_exporter(nombre)
+        spec = _REGISTRY[nombre]
+        if spec.warmup:
+            getattr(import_module(spec.modulo), spec.warmup)()
+        cargados.append(nombre)
+    return cargados
+
+
+def preload_exporters_if_enabled() -> None:
+    """Hook de arranque: precarga solo si EXPORTS['PRELOAD'] está activo."""
+    if not getattr(settings, "EXPORTS", {}).get("PRELOAD"):
+        return
+    try:
+        logger.info("Exportadores precargados: %s", ", ".join(preload_exporters()))
+    except Exception:
+        logger.exception("No se pudieron precargar los exportadores.")
+
+
+__all__ = [
+    "get_exporter",
+    "preload_exporters",
+    "preload_exporters_if_enabled",
+    "register_exporter",
+    "registered_exporters",
+]
@@ -0,0 +1,220 @@
+# agroproductores_risol/utils/pdf_renderer.py
+"""
+Render HTML → PDF con WeasyPrint fuera del worker web.
+
+- Un pool pequeño de procesos (spawn) que arrancan una vez: importan
+  WeasyPrint, crean la FontConfiguration, parsean las hojas de estilo
+  registradas y hacen un render de calentamiento (fontconfig/pango).
+- Cada export envía solo el HTML (+ la clave de su hoja de estilo) y recibe
+  los bytes del PDF con timeout. Los procesos se reciclan cada
+  MAX_TASKS_PER_CHILD renders para acotar el crecimiento de memoria de
+  WeasyPrint sin tocar a los workers web.
+- Con POOL_SIZE=0 (default en DEBUG) se renderiza en el proceso actual,
+  reutilizando igualmente la hoja de estilo ya parseada y las fuentes.
+
+Configuración: settings.PDF_RENDERER (POOL_SIZE, TIMEOUT, MAX_TASKS_PER_CHILD).
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional, Tuple
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class WeasyPrintUnavailable(ImportError):
+    """WeasyPrint (o sus librerías nativas) no está disponible."""
+
+
+class PdfRenderTimeout(RuntimeError):
+    """El render excedió PDF_RENDERER['TIMEOUT']; el pool se reinicia."""
+
+
+def _config() -> Dict[str, Any]:
+    defaults = {"POOL_SIZE": 0, "TIMEOUT": 60, "MAX_TASKS_PER_CHILD": 50}
+    return {**defaults, **getattr(settings, "PDF_RENDERER", {})}
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Estado por proceso (worker del pool o proceso web en modo in-process)
+# ──────────────────────────────────────────────────────────────────────────────
+
+_state: Dict[str, Any] = {"font_config": None, "css": {}}
+_state_lock = threading.Lock()
+
+
+def _digest(text: str) -> str:
+    return hashlib.md5(text.encode("utf-8")).hexdigest()
+
+
+def _weasy():
+    try:
+        from weasyprint import CSS, HTML
+        try:
+            from weasyprint.text.fonts import FontConfiguration
+        except ImportError:  # WeasyPrint < 53
+            from weasyprint.fonts import FontConfiguration
+    except Exception as exc:
+        raise WeasyPrintUnavailable(
+            "WeasyPrint no esta disponible completamente en este entorno."
+        ) from exc
+    return HTML, CSS, FontConfiguration
+
+
+def _font_config():
+    if _state["font_config"] is None:
+        _, _, FontConfiguration = _weasy()
+        _state["font_config"] = FontConfiguration()
+    return _state["font_config"]
+
+
+def _stylesheet(key: str, css_text: str):
+    """CSS parseado una vez por proceso (se re-parsea solo si cambia el texto)."""
+    digest = _digest(css_text)
+    cached = _state["css"].get(key)
+    if cached and cached[0] == digest:
+        return cached[1]
+    _, CSS, _ = _weasy()
+    parsed = CSS(string=css_text, font_config=_font_config())
+    _state["css"][key] = (digest, parsed)
+    return parsed
+
+
+def _render(html: str, stylesheet: Optional[Tuple[str, str]], base_url: str) -> bytes:
+    HTML, _, _ = _weasy()
+    with _state_lock:
+        stylesheets = [_stylesheet(*stylesheet)] if stylesheet else []
+        font_config = _font_config()
+    return HTML(string=html, base_url=base_url).write_pdf(stylesheets=stylesheets, font_config=font_config)
+
+
+def _worker_init(stylesheets: Dict[str, str]) -> None:
+    try:
+        for key, css_text in stylesheets.items():
+            _stylesheet(key, css_text)
+        # Primer layout: carga fontconfig/pango antes del primer export real.
+        _render("<p>ok</p>", None, ".")
+    except WeasyPrintUnavailable:
+        # Cada tarea devolverá el error; el caller usa su fallback.
+        pass
+
+
+def _noop() -> bool:
+    return True
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Pool
+# ──────────────────────────────────────────────────────────────────────────────
+
+# Hojas de estilo conocidas: clave → callable que devuelve el CSS.
+_STYLESHEETS: Dict[str, Any] = {}
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def register_stylesheet(key: str, provider) -> None:
+    """
+    Registra la hoja de estilo de un reporte para precalentarla en el pool.
+    `provider` es un callable sin argumentos que devuelve el CSS.
+    """
+    _STYLESHEETS[key] = provider
+
+
+def _create_pool(size: int, max_tasks: int) -> ProcessPoolExecutor:
+    initargs = ({key: provider() for key, provider in _STYLESHEETS.items()},)
+    kwargs = dict(
+        max_workers=size,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_worker_init,
+        initargs=initargs,
+    )
+    try:
+        pool = ProcessPoolExecutor(max_tasks_per_child=max_tasks or None, **kwargs)
+    except TypeError:  # Python < 3.11
+        pool = ProcessPoolExecutor(**kwargs)
+    # Arranca los procesos ya, en lugar de en el primer export.
+    for _ in range(size):
+        pool.submit(_noop)
+    return pool
+
+
+def _get_pool() -> Optional[ProcessPoolExecutor]:
+    global _pool
+    cfg = _config()
+    size = int(cfg["POOL_SIZE"] or 0)
+    if size <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = _create_pool(size, int(cfg["MAX_TASKS_PER_CHILD"] or 0))
+        return _pool
+
+
+def shutdown_pool(terminate: bool = False) -> None:
+    """Cierra el pool (siguiente render lo recrea). `terminate` mata procesos colgados."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is None:
+        return
+    if terminate:
+        for proc in list(getattr(pool, "_processes", {}).values()):
+            proc.terminate()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def warm_pdf_renderer() -> None:
+    """Crea el pool por adelantado (p.ej. desde un hook de arranque del servidor)."""
+    _get_pool()
+
+
+def render_html_to_pdf(
+    html: str,
+    *,
+    stylesheet_key: Optional[str] = None,
+    base_url: str = ".",
+) -> bytes:
+    """
+    Renderiza `html` con la hoja de estilo registrada `stylesheet_key`.
+    Lanza WeasyPrintUnavailable si WeasyPrint no puede cargarse (el caller
+    decide su fallback) y PdfRenderTimeout si el render excede el timeout.
+    """
+    stylesheet = None
+    if stylesheet_key:
+        stylesheet = (stylesheet_key, _STYLESHEETS[stylesheet_key]())
+
+    pool = _get_pool()
+    if pool is None:
+        return _render(html, stylesheet, base_url)
+
+    timeout = float(_config()["TIMEOUT"])
+    try:
+        future = pool.submit(_render, html, stylesheet, base_url)
+        return future.result(timeout=timeout)
+    except FutureTimeout:
+        logger.error("Render PDF excedió %ss; reiniciando pool.", timeout)
+        shutdown_pool(terminate=True)
+        raise PdfRenderTimeout(f"El PDF tardó más de {timeout:.0f}s en generarse.")
+    except BrokenProcessPool:
+        logger.exception("Pool de render PDF caído; se renderiza en proceso y se recrea.")
+        shutdown_pool(terminate=True)
+        return _render(html, stylesheet, base_url)
+
+
+__all__ = [
+    "PdfRenderTimeout",
+    "WeasyPrintUnavailable",
+    "register_stylesheet",
+    "render_html_to_pdf",
+    "shutdown_pool",
+    "warm_pdf_renderer",
+]
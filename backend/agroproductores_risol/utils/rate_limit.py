@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+Rate limiting de costo constante (ventana deslizante aproximada)
+----------------------------------------------------------------
+En lugar de guardar el historial de timestamps por identidad (lo que hace
+`SimpleRateThrottle` de DRF y crece con la tasa), se mantienen DOS contadores
+enteros por identidad: el de la ventana fija actual y el de la anterior.
+
+    estimado = previo * (1 - fracción transcurrida de la ventana actual) + actual
+
+Cada petición cuesta un `get_many` + `add`/`incr` atómicos en el cache
+compartido, sin importar cuántas peticiones haya hecho el usuario.
+"""
+from __future__ import annotations
+
+import math
+import time
+from typing import Optional, Tuple
+
+from django.core.cache import cache as default_cache
+from rest_framework.throttling import UserRateThrottle
+
+
+class SlidingWindowCounter:
+    """Contador por llave con límite `limit` en una ventana de `window` segundos."""
+
+    def __init__(self, limit: int, window: int, cache=None):
+        self.limit = int(limit)
+        self.window = int(window)
+        self.cache = cache or default_cache
+
+    def _buckets(self, key: str, now: float) -> Tuple[str, str, float]:
+        bucket = int(now // self.window)
+        elapsed = (now - bucket * self.window) / self.window
+        return f"{key}:{bucket}", f"{key}:{bucket - 1}", elapsed
+
+    def _estimate(self, actual: int, previo: int, elapsed: float) -> float:
+        return previo * (1.0 - elapsed) + actual
+
+    def _read(self, key: str, now: float) -> Tuple[int, int, float]:
+        cur, prev, elapsed = self._buckets(key, now)
+        found = self.cache.get_many([cur, prev])
+        return int(found.get(cur) or 0), int(found.get(prev) or 0), elapsed
+
+    def count(self, key: str, now: Optional[float] = None) -> float:
+        """Peticiones estimadas en la ventana que termina en `now`."""
+        actual, previo, elapsed = self._read(key, time.time() if now is None else now)
+        return self._estimate(actual, previo, elapsed)
+
+    def hit(self, key: str, now: Optional[float] = None) -> float:
+        """Registra una petición y devuelve el estimado resultante."""
+        now = time.time() if now is None else now
+        cur, prev, elapsed = self._buckets(key, now)
+        # La llave vive dos ventanas: la actual y la siguiente (como "previa").
+        self.cache.add(cur, 0, timeout=self.window * 2)
+        try:
+            actual = int(self.cache.incr(cur))
+        except ValueError:  # expiró entre add e incr
+            self.cache.set(cur, 1, timeout=self.window * 2)
+            actual = 1
+        previo = int(self.cache.get(prev) or 0)
+        return self._estimate(actual, previo, elapsed)
+
+    def retry_after(self, key: str, now: Optional[float] = None) -> Optional[float]:
+        """Segundos hasta que el estimado baje del límite (None si ya está debajo)."""
+        now = time.time() if now is None else now
+        actual, previo, elapsed = self._read(key, now)
+        if self._estimate(actual, previo, elapsed) < self.limit:
+            return None
+        if actual >= self.limit or previo == 0:
+            # Solo se libera al cambiar de ventana (y el actual pasa a ser "previo").
+            return (1.0 - elapsed) * self.window
+        needed = 1.0 - (self.limit - actual) / previo
+        return max(0.0, (needed - elapsed) * self.window)
+
+    def reset(self, key: str, now: Optional[float] = None) -> None:
+        cur, prev, _ = self._buckets(key, time.time() if now is None else now)
+        self.cache.delete_many([cur, prev])
+
+
+class SlidingWindowRateThrottle(UserRateThrottle):
+    """
+    `UserRateThrottle` con contador de ventana deslizante: mismos scopes,
+    tasas (DEFAULT_THROTTLE_RATES) e identidades que DRF, costo O(1).
+    """
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        counter = SlidingWindowCounter(self.num_requests, self.duration, cache=self.cache)
+        self._retry_after = counter.retry_after(self.key, self.now)
+        if self._retry_after is not None:
+            return self.throttle_failure()
+        counter.hit(self.key, self.now)
+        return True
+
+    def wait(self):
+        retry = getattr(self, "_retry_after", None)
+        return math.ceil(round(retry, 3)) if retry else None
+
+
+__all__ = ["SlidingWindowCounter", "SlidingWindowRateThrottle"]
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import json
+from decimal import Decimal
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+try:  # dependencia opcional: sin orjson se usa el JSONRenderer de DRF
+    import orjson
+except ImportError:  # pragma: no cover - depende del entorno
+    orjson = None
+
+
+class EventStreamRenderer(BaseRenderer):
+    """
+    Permite que DRF negocie `Accept: text/event-stream`.
+    El cuerpo real lo emite un StreamingHttpResponse; este renderer solo se usa
+    cuando la vista responde un error (400/403) a un cliente SSE.
+    """
+
+    media_type = "text/event-stream"
+    format = "sse"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return f"event: error\ndata: {json.dumps(data, default=str)}\n\n".encode(self.charset)
+
+
+# Fechas nativas en orjson: con OPT_UTC_Z coinciden con el encoder de DRF
+# (isoformat y '+00:00' -> 'Z').
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z if orjson is not None else 0
+_drf_default = JSONEncoder().default
+
+
+def _default(obj):
+    # Decimal es el caso más común en reportes: atajo antes de la cadena de DRF.
+    if type(obj) is Decimal:
+        return float(obj)
+    return _drf_default(obj)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer sobre orjson, con la misma salida byte a byte que el de DRF
+    para el envelope de NotificationHandler y los reportes:
+
+    - fechas/horas nativas de orjson con la misma representación que DRF
+      (isoformat, 'Z' para UTC); Decimal -> float y UUID, lazy strings,
+      QuerySets... por el `default` del encoder de DRF;
+    - llaves no-str como en json.dumps; U+2028/U+2029 escapados como DRF.
+
+    Diferencias conocidas: NaN/Infinity salen como null (DRF lanza ValueError)
+    y los floats en notación científica (>= 1e16 o < 1e-4) cambian de forma,
+    no de valor ('1e16' en vez de '1e+16'). Con indentación
+    (`Accept: application/json; indent=2`), settings no-default de
+    UNICODE_JSON/COMPACT_JSON, o sin orjson, delega en DRF.
+    """
+
+    def _use_orjson(self, accepted_media_type, renderer_context) -> bool:
+        if orjson is None or not (api_settings.UNICODE_JSON and api_settings.COMPACT_JSON):
+            return False
+        return self.get_indent(accepted_media_type or "", renderer_context or {}) is None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if not self._use_orjson(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=_default, option=_ORJSON_OPTIONS)
+        except TypeError:
+            # Enteros > 64 bits u otros tipos que orjson no acepta.
+            return super().render(data, accepted_media_type, renderer_context)
+        return ret.replace("\u2028".encode(), b"\\u2028").replace("\u2029".encode(), b"\\u2029")
+
+
+class CompactJSONRenderer(FastJSONRenderer):
+    """
+    Variante compacta del envelope: omite el bloque `notification` (deprecated;
+    duplica message_key/message). Se negocia con
+    `Accept: application/json; compact=1` o `?format=compact`.
+    """
+
+    media_type = "application/json; compact=1"
+    format = "compact"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, dict) and "message_key" in data and "notification" in data:
+            data = {key: value for key, value in data.items() if key != "notification"}
+        return super().render(data, accepted_media_type, renderer_context)
+
+
+__all__ = ["CompactJSONRenderer", "EventStreamRenderer", "FastJSONRenderer"]
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+¿El cache `default` se comparte entre procesos?
+-----------------------------------------------
+Varias piezas coordinan a los workers a través del cache (locks
+single-flight, versiones de ETag y de reportes, marcas read-your-writes de la
+réplica, epoch del catálogo de permisos, precalentado del scheduler). Con
+LocMem cada proceso tiene su propia copia y esa coordinación no existe; las
+funciones que dependen de ella consultan `shared_cache_configured()` y el
+check `agroproductores_risol.W001` lo avisa fuera de DEBUG (W002: la réplica
+queda desactivada sin cache compartido).
+"""
+from __future__ import annotations
+
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+PROCESS_LOCAL_BACKENDS = {
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+}
+
+
+def shared_cache_configured(alias: str = "default") -> bool:
+    backend = settings.CACHES.get(alias, {}).get("BACKEND", "")
+    return bool(backend) and backend not in PROCESS_LOCAL_BACKENDS
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs=None, **kwargs):
+    if shared_cache_configured():
+        return []
+    warnings = []
+    if not settings.DEBUG:
+        warnings.append(Warning(
+            "El cache 'default' es local al proceso: con varios workers no se "
+            "comparten locks single-flight, versiones de ETag ni marcas de réplica.",
+            hint="Define CACHE_URL (redis://, memcached:// o db://<tabla>).",
+            id="agroproductores_risol.W001",
+        ))
+    if "replica" in settings.DATABASES:
+        warnings.append(Warning(
+            "DATABASE_REPLICA_URL está definido pero el cache no es compartido: "
+            "las lecturas no se enrutan a la réplica.",
+            hint="Define CACHE_URL para activar la réplica.",
+            id="agroproductores_risol.W002",
+        ))
+    return warnings
+
+
+__all__ = ["shared_cache_configured"]
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+Cálculo single-flight de reportes (protección contra estampida)
+---------------------------------------------------------------
+Cuando una entrada de reporte expira o se invalida, todas las peticiones
+concurrentes la recalculaban en paralelo. `get_or_compute` coordina a los
+workers con un lock en el cache compartido:
+
+- Quien obtiene el lock (`cache.add`) calcula y publica el valor.
+- Los demás, si existe un valor anterior (`stale_key`), lo sirven de
+  inmediato mientras el primero revalida (stale-while-revalidate).
+- Sin valor anterior esperan, con tope `wait_timeout`, a que aparezca el
+  valor; si se agota el tiempo calculan ellos mismos (nunca se bloquea de
+  más a una petición por un worker caído).
+
+El lock y el valor viejo viven en el cache `default`: solo coordinan a
+workers distintos con un cache compartido (CACHE_URL; ver
+`agroproductores_risol.utils.shared_cache`). Con LocMem cada proceso es su
+propio single-flight.
+
+Métricas: contadores por `namespace` en el cache (`single_flight_metrics`)
+para medir cuántas peticiones se coalescieron y cuánto esperaron.
+"""
+from __future__ import annotations
+
+import logging
+import time
+import uuid
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+LOCK_TIMEOUT = 120  # segundos; cubre el cálculo más lento esperado
+WAIT_TIMEOUT = 15.0
+POLL_INTERVAL = 0.05
+METRICS_TIMEOUT = 7 * 24 * 3600
+
+# computed: cálculos hechos; coalesced: esperas que recibieron el valor de otro
+# worker; stale: respuestas servidas con el valor anterior; timeout: esperas
+# agotadas que terminaron calculando; wait_ms: milisegundos totales esperando.
+METRIC_EVENTS = ("computed", "coalesced", "stale", "timeout", "wait_ms")
+
+
+def _lock_key(key: str) -> str:
+    return f"singleflight:lock:{key}"
+
+
+def _metric_key(namespace: str, event: str) -> str:
+    return f"singleflight:metrics:{namespace}:{event}"
+
+
+def _record(namespace: str, event: str, amount: int = 1) -> None:
+    key = _metric_key(namespace, event)
+    try:
+        cache.add(key, 0, timeout=METRICS_TIMEOUT)
+        cache.incr(key, amount)
+    except Exception:  # las métricas nunca deben tumbar un reporte
+        logger.debug("No se pudo registrar la métrica %s", key, exc_info=True)
+
+
+def single_flight_metrics(namespaces: Iterable[str]) -> Dict[str, Dict[str, int]]:
+    """Contadores acumulados por namespace (ver METRIC_EVENTS)."""
+    namespaces = list(namespaces)
+    keys = {_metric_key(ns, ev): (ns, ev) for ns in namespaces for ev in METRIC_EVENTS}
+    found = cache.get_many(list(keys))
+    out: Dict[str, Dict[str, int]] = {ns: dict.fromkeys(METRIC_EVENTS, 0) for ns in namespaces}
+    for key, value in found.items():
+        ns, ev = keys[key]
+        out[ns][ev] = int(value)
+    return out
+
+
+def reset_single_flight_metrics(namespaces: Iterable[str]) -> None:
+    cache.delete_many([_metric_key(ns, ev) for ns in namespaces for ev in METRIC_EVENTS])
+
+
+def get_or_compute(
+    key: str,
+    builder: Callable[[], Any],
+    timeout: Optional[int],
+    *,
+    namespace: str,
+    stale_key: Optional[str] = None,
+    stale_timeout: Optional[int] = None,
+    force: bool = False,
+    lock_timeout: int = LOCK_TIMEOUT,
+    wait_timeout: float = WAIT_TIMEOUT,
+) -> Any:
+    """
+    Devuelve `cache[key]` o lo calcula con `builder()` una sola vez entre
+    workers concurrentes. `force` recalcula siempre (exportaciones), pero
+    sigue publicando el valor para los demás.
+    """
+    if not force:
+        value = cache.get(key)
+        if value is not None:
+            return value
+
+    token = uuid.uuid4().hex
+    lock_key = _lock_key(key)
+    if not cache.add(lock_key, token, timeout=lock_timeout):
+        if not force:
+            value = _wait_for(key, lock_key, namespace, stale_key, wait_timeout)
+            if value is not None:
+                return value
+        # Espera agotada (o `force`): se calcula sin lock.
+        return _compute(key, builder, timeout, namespace, stale_key, stale_timeout)
+
+    try:
+        return _compute(key, builder, timeout, namespace, stale_key, stale_timeout)
+    finally:
+        if cache.get(lock_key) == token:
+            cache.delete(lock_key)
+
+
+def _compute(key, builder, timeout, namespace, stale_key, stale_timeout):
+    value = builder()
+    cache.set(key, value, timeout)
+    if stale_key:
+        cache.set(stale_key, value, stale_timeout)
+    _record(namespace, "computed")
+    return value
+
+
+def _wait_for(key, lock_key, namespace, stale_key, wait_timeout):
+    if stale_key:
+        stale = cache.get(stale_key)
+        if stale is not None:
+            _record(namespace, "stale")
+            return stale
+
+    start = time.monotonic()
+    deadline = start + wait_timeout
+    while time.monotonic() < deadline:
+        time.sleep(POLL_INTERVAL)
+        # El lock se lee antes que el valor: si ya no existe y el valor
+        # tampoco, el dueño falló sin publicar y no tiene caso seguir esperando.
+        liberado = cache.get(lock_key) is None
+        value = cache.get(key)
+        if value is not None:
+            _record(namespace, "coalesced")
+            _record(namespace, "wait_ms", int((time.monotonic() - start) * 1000))
+            return value
+        if liberado:
+            break
+
+    _record(namespace, "timeout")
+    _record(namespace, "wait_ms", int((time.monotonic() - start) * 1000))
+    logger.warning("single-flight: espera agotada para %s (%s)", key, namespace)
+    return None
+
+
+__all__ = [
+    "get_or_compute",
+    "reset_single_flight_metrics",
+    "single_flight_metrics",
+]
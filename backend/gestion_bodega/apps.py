@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class GestionBodegaConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'gestion_bodega'
+
+    def ready(self):
+        try:
+            from . import signals  # noqa: F401
+        except Exception:
+            pass
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from gestion_bodega.models import TemporadaBodega
+from gestion_bodega.services.tablero_alertas import evaluar_alertas
+
+
+class Command(BaseCommand):
+    help = (
+        "Evalúa las reglas de alertas del tablero y sincroniza AlertaTablero "
+        "para las temporadas activas. El scheduler lo hace cada hora "
+        "(tarea bodega.evaluar_alertas); este comando permite correrlo a mano."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--bodega", type=int, help="Limita a una bodega.")
+        parser.add_argument("--temporada", type=int, help="Limita a una temporada.")
+
+    def handle(self, *args, **options):
+        qs = TemporadaBodega.objects.filter(is_active=True, finalizada=False, bodega__is_active=True)
+        if options["bodega"]:
+            qs = qs.filter(bodega_id=options["bodega"])
+        if options["temporada"]:
+            qs = qs.filter(id=options["temporada"])
+
+        contextos = abiertas = 0
+        for bodega_id, temporada_id in qs.order_by("id").values_list("bodega_id", "id"):
+            abiertas += len(evaluar_alertas(bodega_id, temporada_id))
+            contextos += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Alertas evaluadas en {contextos} contextos: {abiertas} abiertas."))
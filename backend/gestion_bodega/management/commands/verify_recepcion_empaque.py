@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from gestion_bodega.models import Recepcion
+
+
+class Command(BaseCommand):
+    help = (
+        "Verifica el estado de empaque materializado en Recepcion "
+        "(cajas_empaquetadas, cajas_merma, empaque_status) contra las "
+        "clasificaciones activas. Con --fix corrige las filas con deriva."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--fix", action="store_true", help="Corrige las filas con deriva.")
+        parser.add_argument("--bodega", type=int, help="Limita a una bodega.")
+        parser.add_argument("--temporada", type=int, help="Limita a una temporada.")
+        parser.add_argument("--chunk-size", type=int, default=500, help="Recepciones por lote (default 500).")
+
+    def handle(self, *args, **options):
+        qs = Recepcion.objects.order_by("id")
+        if options["bodega"]:
+            qs = qs.filter(bodega_id=options["bodega"])
+        if options["temporada"]:
+            qs = qs.filter(temporada_id=options["temporada"])
+
+        fix = options["fix"]
+        chunk_size = max(1, options["chunk_size"])
+        revisadas = 0
+        deriva = []
+        ids = list(qs.values_list("id", flat=True))
+        for start in range(0, len(ids), chunk_size):
+            chunk = ids[start:start + chunk_size]
+            revisadas += len(chunk)
+            deriva.extend(Recepcion.recalcular_empaque(chunk, dry_run=not fix))
+
+        for recepcion_id, guardado, calculado in deriva:
+            self.stdout.write(f"Recepción #{recepcion_id}: guardado={guardado} calculado={calculado}")
+
+        if not deriva:
+            self.stdout.write(self.style.SUCCESS(f"Sin deriva en {revisadas} recepciones."))
+        elif fix:
+            self.stdout.write(self.style.SUCCESS(f"Corregidas {len(deriva)} de {revisadas} recepciones."))
+        else:
+            self.stdout.write(self.style.WARNING(
+                f"{len(deriva)} de {revisadas} recepciones con deriva; ejecutar con --fix para corregir."
+            ))
@@ -0,0 +1,70 @@
+# Generated by Django 5.1.15 on 2026-10-19 16:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_recepcion_numero(apps, schema_editor):
+    """
+    Folio = posición por id dentro de (bodega, temporada), igual que el
+    conteo que antes calculaba el serializer en cada consulta.
+    """
+    Recepcion = apps.get_model("gestion_bodega", "Recepcion")
+    contexto = None
+    numero = 0
+    pendientes = []
+    for rec in Recepcion.objects.order_by("bodega_id", "temporada_id", "id").only("id", "bodega_id", "temporada_id"):
+        if (rec.bodega_id, rec.temporada_id) != contexto:
+            contexto = (rec.bodega_id, rec.temporada_id)
+            numero = 0
+        numero += 1
+        rec.numero = numero
+        pendientes.append(rec)
+        if len(pendientes) >= 1000:
+            Recepcion.objects.bulk_update(pendientes, ["numero"])
+            pendientes = []
+    if pendientes:
+        Recepcion.objects.bulk_update(pendientes, ["numero"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gestion_bodega', '0016_alter_abonomadera_fecha_alter_consumible_fecha_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SecuenciaBodega',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('clave', models.CharField(max_length=30)),
+                ('ultimo', models.PositiveIntegerField(default=0)),
+                ('actualizado_en', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='recepcion',
+            name='numero',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_recepcion_numero, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='recepcion',
+            constraint=models.UniqueConstraint(condition=models.Q(('numero__isnull', False)), fields=('bodega', 'temporada', 'numero'), name='uniq_recepcion_numero_por_bodega_temporada'),
+        ),
+        migrations.AddField(
+            model_name='secuenciabodega',
+            name='bodega',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='gestion_bodega.bodega'),
+        ),
+        migrations.AddField(
+            model_name='secuenciabodega',
+            name='temporada',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='gestion_bodega.temporadabodega'),
+        ),
+        migrations.AddConstraint(
+            model_name='secuenciabodega',
+            constraint=models.UniqueConstraint(fields=('bodega', 'temporada', 'clave'), name='uniq_secuencia_bodega_temporada_clave'),
+        ),
+    ]
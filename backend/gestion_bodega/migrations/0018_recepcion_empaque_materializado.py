@@ -0,0 +1,72 @@
+# Generated by Django 5.1.15 on 2026-10-19 17:00
+
+from django.db import migrations, models
+from django.db.models import Q, Sum
+
+
+def _status(cajas_campo, empacadas, merma):
+    if empacadas + merma <= 0:
+        return "SIN_EMPAQUE"
+    if empacadas <= 0:
+        return "MERMA_TOTAL"
+    if cajas_campo > 0 and empacadas >= cajas_campo:
+        return "EMPACADO"
+    return "PARCIAL"
+
+
+def backfill_recepcion_empaque(apps, schema_editor):
+    """Materializa el estado de empaque desde las clasificaciones activas."""
+    Recepcion = apps.get_model("gestion_bodega", "Recepcion")
+    ClasificacionEmpaque = apps.get_model("gestion_bodega", "ClasificacionEmpaque")
+
+    es_merma = Q(calidad__iexact="MERMA")
+    totales = (
+        ClasificacionEmpaque.objects.filter(is_active=True)
+        .values("recepcion_id")
+        .annotate(
+            empacadas=Sum("cantidad_cajas", filter=~es_merma),
+            merma=Sum("cantidad_cajas", filter=es_merma),
+        )
+        .order_by()
+    )
+    por_recepcion = {row["recepcion_id"]: row for row in totales}
+    cambiadas = []
+    for rec in Recepcion.objects.filter(pk__in=list(por_recepcion)).only("id", "cajas_campo").iterator():
+        row = por_recepcion[rec.id]
+        rec.cajas_empaquetadas = int(row["empacadas"] or 0)
+        rec.cajas_merma = int(row["merma"] or 0)
+        rec.empaque_status = _status(int(rec.cajas_campo or 0), rec.cajas_empaquetadas, rec.cajas_merma)
+        cambiadas.append(rec)
+    Recepcion.objects.bulk_update(
+        cambiadas, ["cajas_empaquetadas", "cajas_merma", "empaque_status"], batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gestion_bodega', '0017_secuenciabodega_recepcion_numero'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recepcion',
+            name='cajas_empaquetadas',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='recepcion',
+            name='cajas_merma',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='recepcion',
+            name='empaque_status',
+            field=models.CharField(choices=[('SIN_EMPAQUE', 'Sin empaque'), ('PARCIAL', 'Parcial'), ('EMPACADO', 'Empacado'), ('MERMA_TOTAL', 'Merma total')], default='SIN_EMPAQUE', editable=False, max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='recepcion',
+            index=models.Index(fields=['bodega', 'temporada', 'empaque_status'], name='idx_rec_ctx_empaque_status'),
+        ),
+        migrations.RunPython(backfill_recepcion_empaque, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.1.15 on 2026-10-19 17:08
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gestion_bodega', '0018_recepcion_empaque_materializado'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AlertaTablero',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('codigo', models.CharField(max_length=40)),
+                ('severidad', models.CharField(max_length=10)),
+                ('titulo', models.CharField(max_length=120)),
+                ('descripcion', models.TextField(blank=True, default='')),
+                ('link', models.JSONField(blank=True, default=dict)),
+                ('abierta_en', models.DateTimeField(default=django.utils.timezone.now)),
+                ('resuelta_en', models.DateTimeField(blank=True, null=True)),
+                ('evaluada_en', models.DateTimeField(default=django.utils.timezone.now)),
+                ('bodega', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='alertas_tablero', to='gestion_bodega.bodega')),
+                ('temporada', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='alertas_tablero', to='gestion_bodega.temporadabodega')),
+            ],
+            options={
+                'ordering': ['-abierta_en', '-id'],
+                'indexes': [models.Index(fields=['bodega', 'temporada', 'resuelta_en'], name='idx_alerta_ctx_resuelta')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('resuelta_en__isnull', True)), fields=('bodega', 'temporada', 'codigo'), name='uniq_alerta_abierta_por_codigo')],
+            },
+        ),
+    ]
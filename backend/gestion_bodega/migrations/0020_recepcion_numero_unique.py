@@ -0,0 +1,21 @@
+# Generated by Django 5.1.15 on 2026-10-19 18:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gestion_bodega', '0019_alertatablero'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='recepcion',
+            name='uniq_recepcion_numero_por_bodega_temporada',
+        ),
+        migrations.AddConstraint(
+            model_name='recepcion',
+            constraint=models.UniqueConstraint(fields=('bodega', 'temporada', 'numero'), name='uniq_recepcion_numero_por_bodega_temporada'),
+        ),
+    ]
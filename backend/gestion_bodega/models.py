@@ -2,10 +2,9 @@ from decimal import Decimal, InvalidOperation
 from typing import Dict, Optional
 
 from django.conf import settings
-from django.apps import apps
 from django.core.exceptions import ValidationError
-from django.db import connection, models, transaction
-from django.db.models import Sum, Q, UniqueConstraint, Index, Max
+from django.db import IntegrityError, connection, models, transaction
+from django.db.models import F, Sum, Q, UniqueConstraint, Index, Max
 from django.utils import timezone
 from datetime import date, timedelta
 
@@ -41,23 +40,18 @@ def _resolver_semana_por_fecha(bodega_id: int, temporada_id: int, fecha):
     if not (bodega_id and temporada_id and fecha):
         return None
 
-    CierreSemanal = apps.get_model("gestion_bodega", "CierreSemanal")
+    # Se asigna a un registro: calendario recién leído de la BD.
+    from gestion_bodega.utils.week_calendar import get_week_calendar
 
-    # P2 Robustez: Optimización DB-side (Order by desc + First)
-    candidate = CierreSemanal.objects.filter(
-        bodega_id=bodega_id,
-        temporada_id=temporada_id,
-        is_active=True,
-        fecha_desde__lte=fecha,
-    ).order_by("-fecha_desde").first()
+    return get_week_calendar(bodega_id, temporada_id, fresh=True).week_for(fecha)
 
-    if candidate:
-        # Verificamos si la fecha cae dentro del rango efectivo de esa semana
-        end = candidate.fecha_hasta or (candidate.fecha_desde + timedelta(days=6))
-        if fecha <= end:
-            return candidate
 
-    return None
+def _max_numero(model, bodega_id: int, temporada_id: int) -> int:
+    """Último `numero` asignado en el contexto (semilla de SecuenciaBodega)."""
+    return (
+        model.objects.filter(bodega_id=bodega_id, temporada_id=temporada_id, numero__isnull=False)
+        .aggregate(m=Max("numero"))["m"]
+    ) or 0
 
 
 def _week_effective_end(semana) -> date:
@@ -76,15 +70,10 @@ def ensure_week_state(bodega_id: int, temporada_id: int):
     Si hay una semana abierta que ya expiró (hoy > inicio + 6), la cierra automáticamente con clamp.
     Retorna la semana activa (si existe) tras el saneamiento.
     """
-    CierreSemanal = apps.get_model("gestion_bodega", "CierreSemanal")
-    
-    # Buscamos semana abierta
-    abierta = CierreSemanal.objects.filter(
-        bodega_id=bodega_id, 
-        temporada_id=temporada_id, 
-        is_active=True, 
-        fecha_hasta__isnull=True
-    ).first()
+    from gestion_bodega.utils.week_calendar import get_week_calendar
+
+    # Buscamos semana abierta (copia: se puede guardar sin tocar el calendario)
+    abierta = get_week_calendar(bodega_id, temporada_id, fresh=True).open_week()
 
     if not abierta:
         return None
@@ -138,6 +127,13 @@ class EstadoCamion(models.TextChoices):
     ANULADO    = "ANULADO", "Anulado"
 
 
+class EmpaqueStatus(models.TextChoices):
+    SIN_EMPAQUE = "SIN_EMPAQUE", "Sin empaque"
+    PARCIAL     = "PARCIAL", "Parcial"
+    EMPACADO    = "EMPACADO", "Empacado"
+    MERMA_TOTAL = "MERMA_TOTAL", "Merma total"
+
+
 # ───────────────────────────────────────────────────────────────────────────
 # Base (coincide con el estilo del repo)
 # ───────────────────────────────────────────────────────────────────────────
@@ -434,9 +430,17 @@ class Recepcion(TimeStampedModel):
     huertero_nombre = models.CharField(max_length=120, blank=True, default="")
     tipo_mango = models.CharField(max_length=80)
     cajas_campo = models.PositiveIntegerField()
+    # Folio correlativo por (bodega, temporada), asignado al crear (SecuenciaBodega)
+    numero = models.PositiveIntegerField(null=True, blank=True, editable=False)
     # Nuevo: Trazabilidad manual
     lote = models.ForeignKey(LoteBodega, on_delete=models.SET_NULL, null=True, blank=True, related_name="recepciones")
     observaciones = models.TextField(blank=True, default="")
+    # Estado de empaque materializado (lo mantiene ClasificacionEmpaque en la misma transacción)
+    cajas_empaquetadas = models.PositiveIntegerField(default=0, editable=False)  # sin MERMA
+    cajas_merma = models.PositiveIntegerField(default=0, editable=False)
+    empaque_status = models.CharField(
+        max_length=20, choices=EmpaqueStatus.choices, default=EmpaqueStatus.SIN_EMPAQUE, editable=False
+    )
 
 
     class Meta:
@@ -445,6 +449,15 @@ class Recepcion(TimeStampedModel):
             Index(fields=["bodega", "temporada", "fecha"], name="idx_rec_bod_temp_fecha"),
             Index(fields=["tipo_mango"], name="idx_rec_tipo_mango"),
             Index(fields=["bodega", "temporada", "semana", "fecha"], name="idx_rec_ctx_semana_fecha"),
+            Index(fields=["bodega", "temporada", "empaque_status"], name="idx_rec_ctx_empaque_status"),
+        ]
+        constraints = [
+            # Sin condición: los NULL (recepciones previas a la numeración) son
+            # distintos entre sí, y MySQL/MariaDB sí crean el índice.
+            UniqueConstraint(
+                fields=["bodega", "temporada", "numero"],
+                name="uniq_recepcion_numero_por_bodega_temporada",
+            )
         ]
 
     def __str__(self) -> str:
@@ -489,7 +502,101 @@ class Recepcion(TimeStampedModel):
         update_fields = kwargs.get("update_fields")
         if not _is_only_archival_fields(update_fields):
             self.full_clean()
-        return super().save(*args, **kwargs)
+        if self.pk is None and self.numero is None:
+            with transaction.atomic():
+                self.numero = Recepcion.reservar_numeros(self.bodega_id, self.temporada_id)
+                return super().save(*args, **kwargs)
+        if self._state.adding:
+            return super().save(*args, **kwargs)
+
+        # El estado de empaque lo escribe solo recalcular_empaque: una copia en
+        # memoria desactualizada no debe pisarlo. Si cambia cajas_campo, se recalcula.
+        if update_fields is None:
+            kwargs["update_fields"] = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name not in self.CAMPOS_EMPAQUE
+            ]
+        with transaction.atomic():
+            result = super().save(*args, **kwargs)
+            if update_fields is None or "cajas_campo" in update_fields:
+                for _, _, calculado in Recepcion.recalcular_empaque([self.pk]):
+                    self.cajas_empaquetadas, self.cajas_merma, self.empaque_status = calculado
+        return result
+
+    @classmethod
+    def reservar_numeros(cls, bodega_id: int, temporada_id: int, cantidad: int = 1) -> int:
+        """
+        Primer folio de un bloque de `cantidad` folios consecutivos del contexto.
+        Llamar dentro de transaction.atomic().
+        """
+        return SecuenciaBodega.reservar(
+            bodega_id,
+            temporada_id,
+            SecuenciaBodega.RECEPCION,
+            cantidad,
+            inicial=lambda: _max_numero(cls, bodega_id, temporada_id),
+        )
+
+    CAMPOS_EMPAQUE = ("cajas_empaquetadas", "cajas_merma", "empaque_status")
+
+    @staticmethod
+    def derivar_empaque_status(cajas_campo, empacadas, merma) -> str:
+        """
+        SIN_EMPAQUE: nada clasificado · MERMA_TOTAL: solo merma ·
+        EMPACADO: lo empacado (sin merma) cubre cajas_campo · PARCIAL: el resto.
+        """
+        cajas_campo, empacadas, merma = int(cajas_campo or 0), int(empacadas or 0), int(merma or 0)
+        if empacadas + merma <= 0:
+            return EmpaqueStatus.SIN_EMPAQUE
+        if empacadas <= 0:
+            return EmpaqueStatus.MERMA_TOTAL
+        if cajas_campo > 0 and empacadas >= cajas_campo:
+            return EmpaqueStatus.EMPACADO
+        return EmpaqueStatus.PARCIAL
+
+    @classmethod
+    def recalcular_empaque(cls, recepcion_ids, dry_run: bool = False) -> list:
+        """
+        Recalcula cajas_empaquetadas / cajas_merma / empaque_status desde las
+        clasificaciones activas (una consulta agrupada) y guarda solo las filas
+        que difieren. Bloquea las recepciones en orden de id.
+
+        Devuelve [(recepcion_id, guardado, calculado)] de las filas con deriva;
+        con dry_run=True solo reporta.
+        """
+        ids = sorted({int(i) for i in recepcion_ids if i})
+        if not ids:
+            return []
+        fields = cls.CAMPOS_EMPAQUE
+        with transaction.atomic():
+            recepciones = list(
+                cls.objects.select_for_update().filter(pk__in=ids).order_by("id").only("id", "cajas_campo", *fields)
+            )
+            es_merma = Q(calidad__iexact=CalidadMadera.MERMA)
+            totales = {
+                row["recepcion_id"]: row
+                for row in ClasificacionEmpaque.objects.filter(recepcion_id__in=ids, is_active=True)
+                .values("recepcion_id")
+                .annotate(
+                    empacadas=Sum("cantidad_cajas", filter=~es_merma),
+                    merma=Sum("cantidad_cajas", filter=es_merma),
+                )
+                .order_by()
+            }
+            deriva, cambiadas = [], []
+            for rec in recepciones:
+                row = totales.get(rec.id, {})
+                empacadas, merma = int(row.get("empacadas") or 0), int(row.get("merma") or 0)
+                calculado = (empacadas, merma, cls.derivar_empaque_status(rec.cajas_campo, empacadas, merma))
+                guardado = tuple(getattr(rec, f) for f in fields)
+                if guardado == calculado:
+                    continue
+                deriva.append((rec.id, guardado, calculado))
+                rec.cajas_empaquetadas, rec.cajas_merma, rec.empaque_status = calculado
+                cambiadas.append(rec)
+            if cambiadas and not dry_run:
+                cls.objects.bulk_update(cambiadas, fields)
+        return deriva
 
     @transaction.atomic
     def archivar(self, via_cascada: bool = False) -> dict:
@@ -630,7 +737,22 @@ class ClasificacionEmpaque(TimeStampedModel):
         update_fields = kwargs.get("update_fields")
         if not _is_only_archival_fields(update_fields):
             self.full_clean()
-        return super().save(*args, **kwargs)
+        previa = None
+        if self.pk is not None and not self._state.adding:
+            previa = (
+                ClasificacionEmpaque.objects.filter(pk=self.pk).values_list("recepcion_id", flat=True).first()
+            )
+        with transaction.atomic():
+            result = super().save(*args, **kwargs)
+            Recepcion.recalcular_empaque({self.recepcion_id, previa})
+        return result
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            recepcion_id = self.recepcion_id
+            result = super().delete(*args, **kwargs)
+            Recepcion.recalcular_empaque([recepcion_id])
+        return result
 
 
 # ───────────────────────────────────────────────────────────────────────────
@@ -825,6 +947,7 @@ class CamionSalida(TimeStampedModel):
             raise ValidationError(errors)
 
 
+    @transaction.atomic
     def confirmar(self):
         if self.estado == EstadoCamion.ANULADO:
             raise ValidationError("No se puede confirmar un camión anulado.")
@@ -837,17 +960,14 @@ class CamionSalida(TimeStampedModel):
 
         # Validación fuerte: para confirmar, semana debe existir
 
-        # Lock “padre” estable para evitar carreras
-        TemporadaBodega = apps.get_model("gestion_bodega", "TemporadaBodega")
-        TemporadaBodega.objects.select_for_update().get(pk=self.temporada_id)
-
-        ultimo = (
-            CamionSalida.objects
-            .filter(bodega_id=self.bodega_id, temporada_id=self.temporada_id, numero__isnull=False)
-            .aggregate(m=Max("numero"))["m"]
-        ) or 0
-
-        self.numero = ultimo + 1
+        # Correlativo desde la secuencia del contexto: el lock es solo de esa
+        # fila (no de la temporada) y no hay que recorrer MAX(numero).
+        self.numero = SecuenciaBodega.siguiente(
+            self.bodega_id,
+            self.temporada_id,
+            SecuenciaBodega.CAMION,
+            inicial=lambda: _max_numero(CamionSalida, self.bodega_id, self.temporada_id),
+        )
         self.estado = EstadoCamion.CONFIRMADO
         self.save(update_fields=["numero", "estado", "fecha_salida", "semana_id", "actualizado_en"])
 
@@ -1025,3 +1145,113 @@ class CierreSemanal(TimeStampedModel):
         if not _is_only_archival_fields(update_fields):
             self.full_clean()
         return super().save(*args, **kwargs)
+
+
+# ───────────────────────────────────────────────────────────────────────────
+# Secuencias (correlativos por bodega + temporada)
+# ───────────────────────────────────────────────────────────────────────────
+
+class SecuenciaBodega(models.Model):
+    """
+    Último número asignado de un correlativo (camiones, folios de recepción)
+    por (bodega, temporada). Cada asignación bloquea solo esta fila hasta el
+    commit, en lugar de la temporada completa.
+    """
+    CAMION = "camion"
+    RECEPCION = "recepcion"
+    # No numera nada: su fila es el lock de evaluar_alertas por contexto.
+    ALERTAS = "alertas"
+
+    bodega = models.ForeignKey(Bodega, on_delete=models.CASCADE, related_name="+")
+    temporada = models.ForeignKey(TemporadaBodega, on_delete=models.CASCADE, related_name="+")
+    clave = models.CharField(max_length=30)
+    ultimo = models.PositiveIntegerField(default=0)
+    actualizado_en = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            UniqueConstraint(
+                fields=["bodega", "temporada", "clave"],
+                name="uniq_secuencia_bodega_temporada_clave",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.clave} B{self.bodega_id}/T{self.temporada_id}: {self.ultimo}"
+
+    @classmethod
+    def siguiente(cls, bodega_id: int, temporada_id: int, clave: str, inicial=None) -> int:
+        """
+        Reserva y devuelve el siguiente número. Debe llamarse dentro de
+        transaction.atomic(): si la transacción hace rollback, el número se
+        libera junto con el lock de la fila.
+
+        `inicial` (callable) da el último número ya usado cuando la secuencia
+        aún no existe (p.ej. MAX(numero) de datos previos).
+        """
+        return cls.reservar(bodega_id, temporada_id, clave, 1, inicial=inicial)
+
+    @classmethod
+    def reservar(cls, bodega_id: int, temporada_id: int, clave: str, cantidad: int, inicial=None) -> int:
+        """
+        Reserva `cantidad` números consecutivos (altas masivas) y devuelve el
+        primero. Mismas reglas de transacción que `siguiente`.
+        """
+        lookup = {"bodega_id": bodega_id, "temporada_id": temporada_id, "clave": clave}
+        qs = cls.objects.filter(**lookup)
+
+        # UPDATE atómico: toma el lock de la fila y evita leer-modificar-escribir.
+        if not qs.update(ultimo=F("ultimo") + cantidad, actualizado_en=timezone.now()):
+            try:
+                with transaction.atomic():
+                    cls.objects.create(**lookup, ultimo=(inicial() if inicial else 0) + cantidad)
+            except IntegrityError:
+                # Otra transacción la creó primero: esperamos su lock e incrementamos.
+                qs.update(ultimo=F("ultimo") + cantidad, actualizado_en=timezone.now())
+        return qs.values_list("ultimo", flat=True).get() - cantidad + 1
+
+
+# ───────────────────────────────────────────────────────────────────────────
+# Alertas del tablero (estado persistido por el evaluador)
+# ───────────────────────────────────────────────────────────────────────────
+
+class AlertaTablero(models.Model):
+    """
+    Estado de una alerta del tablero por (bodega, temporada, código).
+    Abierta mientras resuelta_en es NULL; al dejar de cumplirse la regla se
+    cierra y queda como historial. La escribe services/tablero_alertas.py.
+    MySQL/MariaDB no crean la restricción parcial de abajo: ahí la unicidad
+    de las abiertas la garantiza el lock de evaluar_alertas (SecuenciaBodega
+    con clave "alertas").
+    """
+    bodega = models.ForeignKey(Bodega, on_delete=models.CASCADE, related_name="alertas_tablero")
+    temporada = models.ForeignKey(TemporadaBodega, on_delete=models.CASCADE, related_name="alertas_tablero")
+    codigo = models.CharField(max_length=40)
+    severidad = models.CharField(max_length=10)
+    titulo = models.CharField(max_length=120)
+    descripcion = models.TextField(blank=True, default="")
+    link = models.JSONField(default=dict, blank=True)
+    abierta_en = models.DateTimeField(default=timezone.now)
+    resuelta_en = models.DateTimeField(null=True, blank=True)
+    evaluada_en = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ["-abierta_en", "-id"]
+        indexes = [
+            Index(fields=["bodega", "temporada", "resuelta_en"], name="idx_alerta_ctx_resuelta"),
+        ]
+        constraints = [
+            UniqueConstraint(
+                fields=["bodega", "temporada", "codigo"],
+                condition=Q(resuelta_en__isnull=True),
+                name="uniq_alerta_abierta_por_codigo",
+            )
+        ]
+
+    def __str__(self) -> str:
+        estado = "abierta" if self.resuelta_en is None else "resuelta"
+        return f"{self.codigo} B{self.bodega_id}/T{self.temporada_id} ({estado})"
+
+    @property
+    def abierta(self) -> bool:
+        return self.resuelta_en is None
@@ -2,6 +2,7 @@
 from datetime import timedelta, datetime, time
 from decimal import Decimal
 
+from django.conf import settings
 from django.core.exceptions import ValidationError as DjangoValidationError
 from django.db import transaction
 from django.db.models import Sum, Q
@@ -20,6 +21,7 @@ from .models import (
     Consumible, CierreSemanal,
 )
 from gestion_bodega.utils.semana import semana_cerrada_ids
+from gestion_bodega.utils.week_calendar import get_week_calendar
 
 def normalize_calidad(material: str, calidad_raw: str) -> str:
     """
@@ -118,17 +120,7 @@ def _resolver_semana(bodega: Bodega, temporada: TemporadaBodega, f):
     """
     if not (bodega and temporada and f):
         return None
-
-    qs = CierreSemanal.objects.filter(bodega=bodega, temporada=temporada, is_active=True)
-
-    chosen = None
-    for s in qs:
-        start = s.fecha_desde
-        end = s.fecha_hasta or (s.fecha_desde + timedelta(days=6))
-        if start <= f <= end:
-            if chosen is None or s.fecha_desde > chosen.fecha_desde:
-                chosen = s
-    return chosen
+    return get_week_calendar(bodega.id, temporada.id, fresh=True).week_for(f)
 
 def _require_semana(bodega: Bodega, temporada: TemporadaBodega, fecha):
     """
@@ -306,6 +298,32 @@ class TemporadaBodegaSerializer(serializers.ModelSerializer):
 # Recepciones y Clasificaciones (empaque)
 # ───────────────────────────────────────────────────────────────────────────
 
+def build_codigo_lote(data: Dict[str, Any]) -> str:
+    """
+    Genera un código legible y determinístico usando el contexto:
+    B{bodega}-T{temporada}-S{semana}-H{huertero}-M{mango}-C{cajas}
+    """
+    def _slug(val: Any, length: int) -> str:
+        txt = str(val or "").strip().upper().replace(" ", "")
+        return (txt[:length] or "X" * min(length, 3))
+
+    bodega = getattr(data.get("bodega"), "id", data.get("bodega")) or "B"
+    temporada = getattr(data.get("temporada"), "id", data.get("temporada")) or "T"
+    semana_obj = data.get("semana")
+    semana = getattr(semana_obj, "id", semana_obj) or "S"
+
+    huertero = _slug(data.get("huertero_nombre"), 3)
+    mango = _slug(data.get("tipo_mango"), 4)
+    cajas_val = data.get("cajas_campo") or data.get("cantidad_cajas") or 0
+    try:
+        cajas = int(cajas_val)
+    except Exception:
+        cajas = 0
+
+    code = f"B{bodega}-T{temporada}-S{semana}-H{huertero}-M{mango}-C{cajas:03d}"
+    return code[:50]  # Límite del modelo
+
+
 class RecepcionSerializer(serializers.ModelSerializer):
     bodega_nombre = serializers.ReadOnlyField(source="bodega.nombre")
     temporada_nombre = serializers.ReadOnlyField(source="temporada.__str__")
@@ -319,7 +337,7 @@ class RecepcionSerializer(serializers.ModelSerializer):
     cantidad_cajas = serializers.IntegerField(source="cajas_campo", write_only=True)
     cajas_campo = serializers.IntegerField(read_only=True)
     
-    # Calculated fields (annotated in queryset via recepcion_aggregates.py)
+    # Estado de empaque: columnas materializadas + cajas_disponibles (recepcion_aggregates.py)
     cajas_empaquetadas = serializers.IntegerField(read_only=True)
     cajas_disponibles = serializers.IntegerField(read_only=True)
     cajas_merma = serializers.IntegerField(read_only=True)
@@ -386,29 +404,7 @@ class RecepcionSerializer(serializers.ModelSerializer):
         return data
 
     def _build_codigo_lote(self, data: Dict[str, Any]) -> str:
-        """
-        Genera un código legible y determinístico usando el contexto:
-        B{bodega}-T{temporada}-S{semana}-H{huertero}-M{mango}-C{cajas}
-        """
-        def _slug(val: Any, length: int) -> str:
-            txt = str(val or "").strip().upper().replace(" ", "")
-            return (txt[:length] or "X" * min(length, 3))
-
-        bodega = getattr(data.get("bodega"), "id", data.get("bodega")) or "B"
-        temporada = getattr(data.get("temporada"), "id", data.get("temporada")) or "T"
-        semana_obj = data.get("semana")
-        semana = getattr(semana_obj, "id", semana_obj) or "S"
-
-        huertero = _slug(data.get("huertero_nombre"), 3)
-        mango = _slug(data.get("tipo_mango"), 4)
-        cajas_val = data.get("cajas_campo") or data.get("cantidad_cajas") or 0
-        try:
-            cajas = int(cajas_val)
-        except Exception:
-            cajas = 0
-
-        code = f"B{bodega}-T{temporada}-S{semana}-H{huertero}-M{mango}-C{cajas:03d}"
-        return code[:50]  # Límite del modelo
+        return build_codigo_lote(data)
 
     def _resolve_lote(self, validated_data):
         """
@@ -493,6 +489,56 @@ class RecepcionSerializer(serializers.ModelSerializer):
 
 
 
+class RecepcionBulkItemSerializer(serializers.Serializer):
+    """Renglón de captura masiva (bodega/temporada/fecha vienen en el encabezado)."""
+    huertero_nombre = serializers.CharField(max_length=120, required=False, allow_blank=True, default="")
+    tipo_mango = serializers.CharField(max_length=80)
+    cantidad_cajas = serializers.IntegerField(min_value=1)
+    codigo_lote = serializers.CharField(max_length=50, required=False, allow_blank=True, default="")
+    observaciones = serializers.CharField(required=False, allow_blank=True, default="")
+
+    def to_internal_value(self, data):
+        if isinstance(data, dict) and "cajas_campo" in data and "cantidad_cajas" not in data:
+            data = {**data, "cantidad_cajas": data.get("cajas_campo")}
+        return super().to_internal_value(data)
+
+    def validate_codigo_lote(self, value):
+        return value.strip().upper() if value else ""
+
+
+class RecepcionBulkCreateSerializer(serializers.Serializer):
+    """
+    Encabezado de captura masiva: una (bodega, temporada, fecha) y N renglones.
+    Los renglones se validan uno a uno en la vista para reportar fallas parciales.
+    """
+    bodega = serializers.PrimaryKeyRelatedField(queryset=Bodega.objects.all())
+    temporada = serializers.PrimaryKeyRelatedField(queryset=TemporadaBodega.objects.all())
+    fecha = serializers.DateField()
+    items = serializers.ListField(child=serializers.JSONField(), allow_empty=False)
+
+    def validate_items(self, value):
+        limite = getattr(settings, "BODEGA_RECEPCION_BULK_MAX_ITEMS", 200)
+        if len(value) > limite:
+            raise serializers.ValidationError(f"Máximo {limite} recepciones por lote de captura.")
+        return value
+
+    def validate(self, data):
+        bodega = data["bodega"]
+        temporada = data["temporada"]
+        fecha = data["fecha"]
+
+        _assert_bodega_temporada_operables(bodega, temporada)
+
+        if fecha > timezone.localdate():
+            raise serializers.ValidationError({"fecha": "La fecha no puede ser futura."})
+        if _semana_bloqueada(bodega, temporada, fecha):
+            raise serializers.ValidationError(
+                "Esta semana esta cerrada; no se permiten mas cambios en ese rango."
+            )
+        data["semana"] = _require_semana(bodega, temporada, fecha)
+        return data
+
+
 class ClasificacionEmpaqueSerializer(serializers.ModelSerializer):
     recepcion_id  = serializers.PrimaryKeyRelatedField(queryset=Recepcion.objects.all(),        source="recepcion",  write_only=True)
     bodega_id     = serializers.PrimaryKeyRelatedField(queryset=Bodega.objects.all(),           source="bodega",     write_only=True)
@@ -890,6 +936,9 @@ class CamionConsumoEmpaqueSerializer(serializers.ModelSerializer):
     def get_recepcion_folio(self, obj):
         try:
             rec = obj.clasificacion_empaque.recepcion
+            if rec.numero is not None:
+                return rec.numero
+            # Recepciones sin folio asignado (creadas fuera de save(), p.ej. bulk_create)
             from gestion_bodega.models import Recepcion
             return Recepcion.objects.filter(
                 bodega_id=rec.bodega_id,
@@ -927,6 +976,21 @@ class CamionConsumoEmpaqueSerializer(serializers.ModelSerializer):
         return data
 
 
+class CamionCargaBulkItemSerializer(serializers.Serializer):
+    # Solo el id: las clasificaciones se cargan/bloquean juntas en InventoryService.
+    clasificacion_id = serializers.IntegerField(min_value=1)
+    cantidad = serializers.IntegerField(min_value=1)
+
+    def to_internal_value(self, data):
+        if isinstance(data, dict) and "clasificacion_empaque_id" in data and "clasificacion_id" not in data:
+            data = {**data, "clasificacion_id": data.get("clasificacion_empaque_id")}
+        return super().to_internal_value(data)
+
+
+class CamionCargaBulkSerializer(serializers.Serializer):
+    items = CamionCargaBulkItemSerializer(many=True, allow_empty=False)
+
+
 class CamionSalidaSerializer(serializers.ModelSerializer):
 
     bodega_id    = serializers.PrimaryKeyRelatedField(queryset=Bodega.objects.all(),           source="bodega",    write_only=True)
@@ -1217,6 +1281,9 @@ class AlertItemSerializer(serializers.Serializer):
     description = serializers.CharField()
     severity = serializers.ChoiceField(choices=["info", "warning", "critical"])
     link = serializers.DictField()  # { path, query }
+    # Estado persistido (AlertaTablero)
+    abierta_en = serializers.DateTimeField(required=False)
+    resuelta_en = serializers.DateTimeField(required=False, allow_null=True)
 
 
 class DashboardSummaryResponseSerializer(serializers.Serializer):
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from typing import Dict, Any, List, Optional
-from django.db.models import Sum, F, Q, QuerySet
+from django.db.models import Count, Sum, F, Q, QuerySet
 from django.db.models.functions import Coalesce
 from django.utils import timezone
 
@@ -10,6 +10,7 @@ from gestion_bodega.models import (
     CamionConsumoEmpaque,
     Recepcion
 )
+from gestion_bodega.utils.inventario_empaque import consumos_camion_por_clasificacion
 
 class InventoryService:
     """
@@ -124,33 +125,16 @@ class InventoryService:
         if fecha_desde: qs = qs.filter(fecha__gte=fecha_desde)
         if fecha_hasta: qs = qs.filter(fecha__lte=fecha_hasta)
         
-        # Anotamos lo empacado REAL (excluyendo MERMA — merma no es producto empacado)
-        # FIX: MERMA se contaba como "empacado", haciendo que recepciones con solo
-        # merma aparecieran como finalizadas cuando realmente no se empacó nada útil.
-        qs = qs.annotate(
-            total_packed=Coalesce(
-                Sum("clasificaciones__cantidad_cajas", filter=Q(
-                    clasificaciones__is_active=True
-                ) & ~Q(clasificaciones__calidad__iexact="MERMA")), 
-                0
-            ),
-            total_merma=Coalesce(
-                Sum("clasificaciones__cantidad_cajas", filter=Q(
-                    clasificaciones__is_active=True,
-                    clasificaciones__calidad__iexact="MERMA"
-                )), 
-                0
-            )
+        # cajas_empaquetadas (sin MERMA) y cajas_merma son columnas materializadas:
+        # empacado + merma = cajas ya clasificadas. Un solo agregado.
+        clasificadas = F("cajas_empaquetadas") + F("cajas_merma")
+        agg = qs.aggregate(
+            total=Count("id"),
+            pendientes=Count("id", filter=Q(cajas_campo__gt=clasificadas)),
+            finalizadas=Count("id", filter=Q(cajas_campo__lte=clasificadas, cajas_campo__gt=0)),
         )
-        
-        total = qs.count()
-        # Annotate total classified (packed + merma) — both are "accounted for"
-        qs = qs.annotate(total_classified=F("total_packed") + F("total_merma"))
-        # Pendientes: still have unclassified cajas
-        pendientes = qs.filter(total_classified__lt=F("cajas_campo")).count()
-        # Finalizadas: all cajas are accounted for (packed + merma ≥ cajas_campo)
-        empacadas = qs.filter(total_classified__gte=F("cajas_campo"), cajas_campo__gt=0).count()
-        
+        total, pendientes, empacadas = agg["total"], agg["pendientes"], agg["finalizadas"]
+
         return {
             "total_recepciones": total,
             "pendientes": pendientes,
@@ -310,14 +294,11 @@ class InventoryService:
                 .order_by("fecha", "id")
             )
 
+            consumidos = consumos_camion_por_clasificacion(
+                [emp.id for emp in locked_items], solo_camiones_activos=True
+            )
             for emp in locked_items:
-                consumed_trucks = (
-                    CamionConsumoEmpaque.objects.filter(
-                        clasificacion_empaque=emp,
-                        is_active=True,
-                        camion__is_active=True,
-                    ).aggregate(total=Coalesce(Sum("cantidad"), 0))["total"]
-                )
+                consumed_trucks = consumidos.get(emp.id, 0)
                 disponible = (emp.cantidad_cajas or 0) - consumed_trucks
                 if disponible <= 0:
                     continue
@@ -345,3 +326,86 @@ class InventoryService:
                 )
         
         return consumos
+
+    @staticmethod
+    def bulk_load_camion(camion, items: List[Dict[str, int]]):
+        """
+        Carga un manifiesto completo (renglones {clasificacion_id, cantidad}) en un camión.
+
+        - Bloquea todas las clasificaciones referidas en UNA sentencia, en orden
+          por id (mismo orden en todas las cargas → sin deadlocks entre camiones).
+        - Calcula el disponible de todas con UNA consulta agrupada y valida la
+          demanda total por clasificación (renglones repetidos se suman).
+        - Todo o nada: si algún renglón falla no se crea ninguna carga.
+
+        Returns:
+            (cargas_creadas, errores). `errores` es una lista de
+            {"index", "clasificacion_id", "detail", ...}; si no está vacía,
+            `cargas_creadas` es [].
+        """
+        from django.db import transaction
+        from django.db.models import prefetch_related_objects
+
+        ids = sorted({item["clasificacion_id"] for item in items})
+        errores: List[Dict[str, Any]] = []
+
+        with transaction.atomic():
+            clasificaciones = {
+                c.id: c
+                for c in ClasificacionEmpaque.objects.select_for_update().filter(pk__in=ids).order_by("id")
+            }
+            consumidos = consumos_camion_por_clasificacion(list(clasificaciones))
+
+            demanda: Dict[int, int] = {}
+            for item in items:
+                demanda[item["clasificacion_id"]] = demanda.get(item["clasificacion_id"], 0) + item["cantidad"]
+
+            for index, item in enumerate(items):
+                cid = item["clasificacion_id"]
+                clasif = clasificaciones.get(cid)
+                error = None
+                if clasif is None:
+                    error = {"detail": "La clasificación no existe."}
+                elif not clasif.is_active:
+                    error = {"detail": "La clasificación está archivada."}
+                elif clasif.bodega_id != camion.bodega_id or clasif.temporada_id != camion.temporada_id:
+                    error = {"detail": "La clasificación no pertenece a la bodega/temporada del camión."}
+                else:
+                    disponible = max(0, (clasif.cantidad_cajas or 0) - consumidos.get(cid, 0))
+                    if demanda[cid] > disponible:
+                        error = {
+                            "detail": f"Stock insuficiente. Disponible: {disponible}",
+                            "disponible": disponible,
+                            "solicitado": demanda[cid],
+                        }
+                if error:
+                    errores.append({"index": index, "clasificacion_id": cid, **error})
+
+            if errores:
+                return [], errores
+
+            cargas = CamionConsumoEmpaque.objects.bulk_create(
+                [
+                    CamionConsumoEmpaque(
+                        camion=camion,
+                        clasificacion_empaque=clasificaciones[item["clasificacion_id"]],
+                        cantidad=item["cantidad"],
+                    )
+                    for item in items
+                ]
+            )
+            if any(c.pk is None for c in cargas):
+                # Backends sin RETURNING (MySQL): las clasificaciones siguen
+                # bloqueadas, así que las últimas filas del camión son estas.
+                cargas = list(
+                    CamionConsumoEmpaque.objects.filter(camion=camion, clasificacion_empaque_id__in=ids)
+                    .select_related("clasificacion_empaque")
+                    .order_by("-id")[: len(cargas)]
+                )[::-1]
+
+            from gestion_bodega.signals import schedule_tablero_change
+
+            schedule_tablero_change(camion.bodega_id, camion.temporada_id, CamionConsumoEmpaque._meta.model_name)
+
+        prefetch_related_objects([c.clasificacion_empaque for c in cargas], "recepcion")
+        return cargas, []
@@ -0,0 +1,83 @@
+# backend/gestion_bodega/services/lote_summary.py
+"""
+Resumen de lotes (recibido vs empacado) calculado solo con agregados.
+
+- Una consulta agrupada sobre Recepcion (total y conteo por lote).
+- Una consulta agrupada sobre ClasificacionEmpaque por (lote, material, calidad);
+  los totales y conteos del lote salen de sumar ese desglose.
+
+`summarize_lotes` resume muchos lotes con esas mismas 2 consultas (listado
+de lotes, cola de inventarios); `summarize_lote` es la variante individual.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable
+
+from django.db.models import Count, Sum
+
+from gestion_bodega.models import ClasificacionEmpaque, Recepcion
+
+
+def _empty_summary(lote_id: int) -> Dict[str, Any]:
+    return {
+        "id": lote_id,
+        "total_recibido": 0,
+        "total_empacado": 0,
+        "recepciones_count": 0,
+        "empaques_count": 0,
+        "desglose": [],
+    }
+
+
+def summarize_lotes(lote_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+    """
+    {lote_id: resumen} para los lotes dados (registros activos únicamente).
+    Los lotes sin movimientos regresan el resumen en ceros.
+
+    desglose: [{"material", "calidad", "cantidad_cajas", "registros"}],
+    ordenado por material y calidad.
+    """
+    ids = sorted({int(i) for i in lote_ids if i})
+    resumenes = {lote_id: _empty_summary(lote_id) for lote_id in ids}
+    if not ids:
+        return resumenes
+
+    recepciones = (
+        Recepcion.objects.filter(lote_id__in=ids, is_active=True)
+        .values("lote_id")
+        .annotate(total=Sum("cajas_campo"), registros=Count("id"))
+        .order_by()
+    )
+    for row in recepciones:
+        resumen = resumenes[row["lote_id"]]
+        resumen["total_recibido"] = int(row["total"] or 0)
+        resumen["recepciones_count"] = row["registros"]
+
+    empaques = (
+        ClasificacionEmpaque.objects.filter(lote_id__in=ids, is_active=True)
+        .values("lote_id", "material", "calidad")
+        .annotate(total=Sum("cantidad_cajas"), registros=Count("id"))
+        .order_by("lote_id", "material", "calidad")
+    )
+    for row in empaques:
+        resumen = resumenes[row["lote_id"]]
+        cajas = int(row["total"] or 0)
+        resumen["total_empacado"] += cajas
+        resumen["empaques_count"] += row["registros"]
+        resumen["desglose"].append(
+            {
+                "material": row["material"],
+                "calidad": row["calidad"],
+                "cantidad_cajas": cajas,
+                "registros": row["registros"],
+            }
+        )
+
+    return resumenes
+
+
+def summarize_lote(lote_id: int) -> Dict[str, Any]:
+    return summarize_lotes([lote_id]).get(lote_id) or _empty_summary(lote_id)
+
+
+__all__ = ["summarize_lote", "summarize_lotes"]
@@ -0,0 +1,141 @@
+# backend/gestion_bodega/services/recepcion_bulk.py
+"""
+Captura masiva de recepciones para una (bodega, temporada, fecha).
+
+- La semana se resuelve una vez (encabezado); cada renglón se valida por
+  separado y los inválidos se reportan sin detener al resto.
+- Los lotes se resuelven con una consulta por código y los faltantes se
+  insertan juntos; los folios (numero) se reservan en bloque.
+- Las recepciones se insertan con bulk_create. Como bulk_create no dispara
+  post_save, el cambio del tablero se agenda explícitamente.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+
+from gestion_bodega.models import Bodega, CierreSemanal, LoteBodega, Recepcion, TemporadaBodega
+from gestion_bodega.serializers import RecepcionBulkItemSerializer, build_codigo_lote
+from gestion_bodega.signals import schedule_tablero_change
+
+
+def crear_recepciones(
+    *,
+    bodega: Bodega,
+    temporada: TemporadaBodega,
+    fecha,
+    semana: CierreSemanal,
+    items: List[Any],
+) -> List[Dict[str, Any]]:
+    """
+    Devuelve un resultado por renglón, en el orden recibido:
+      {"index", "ok": True, "recepcion": Recepcion}
+      {"index", "ok": False, "errors": {...}}
+    """
+    results: List[Dict[str, Any]] = [{} for _ in items]
+    pendientes: List[tuple[int, Recepcion, str]] = []
+
+    for index, raw in enumerate(items):
+        ser = RecepcionBulkItemSerializer(data=raw)
+        if not ser.is_valid():
+            results[index] = {"index": index, "ok": False, "errors": ser.errors}
+            continue
+        data = ser.validated_data
+        obj = Recepcion(
+            bodega=bodega,
+            temporada=temporada,
+            semana=semana,
+            fecha=fecha,
+            huertero_nombre=data["huertero_nombre"],
+            tipo_mango=data["tipo_mango"],
+            cajas_campo=data["cantidad_cajas"],
+            observaciones=data["observaciones"],
+        )
+        try:
+            # Reglas del modelo (temporada/semana/fecha) sin consultas: las FKs
+            # del encabezado ya están validadas y el folio aún no se asigna.
+            obj.full_clean(
+                exclude=["bodega", "temporada", "semana", "lote"],
+                validate_unique=False,
+                validate_constraints=False,
+            )
+        except DjangoValidationError as ex:
+            errors = getattr(ex, "message_dict", {"non_field_errors": ex.messages})
+            results[index] = {"index": index, "ok": False, "errors": errors}
+            continue
+        codigo = data["codigo_lote"] or build_codigo_lote(
+            {
+                "bodega": bodega,
+                "temporada": temporada,
+                "semana": semana,
+                "huertero_nombre": obj.huertero_nombre,
+                "tipo_mango": obj.tipo_mango,
+                "cajas_campo": obj.cajas_campo,
+            }
+        )
+        pendientes.append((index, obj, codigo))
+
+    if not pendientes:
+        return results
+
+    with transaction.atomic():
+        lotes = _resolver_lotes(bodega, temporada, semana, pendientes)
+        primero = Recepcion.reservar_numeros(bodega.id, temporada.id, len(pendientes))
+        objs = []
+        for offset, (_, obj, codigo) in enumerate(pendientes):
+            obj.lote = lotes[codigo]
+            obj.numero = primero + offset
+            objs.append(obj)
+
+        Recepcion.objects.bulk_create(objs)
+        if any(obj.pk is None for obj in objs):
+            # Backends sin RETURNING (MySQL): el folio identifica cada fila.
+            ids = dict(
+                Recepcion.objects.filter(
+                    bodega_id=bodega.id,
+                    temporada_id=temporada.id,
+                    numero__in=[obj.numero for obj in objs],
+                ).values_list("numero", "id")
+            )
+            for obj in objs:
+                obj.pk = ids[obj.numero]
+                obj._state.adding = False
+
+        schedule_tablero_change(bodega.id, temporada.id, Recepcion._meta.model_name)
+
+    for index, obj, _ in pendientes:
+        results[index] = {"index": index, "ok": True, "recepcion": obj}
+    return results
+
+
+def _resolver_lotes(bodega, temporada, semana, pendientes) -> Dict[str, LoteBodega]:
+    """Lotes por código: existentes + nuevos (una consulta y un insert)."""
+    origen_por_codigo: Dict[str, str] = {}
+    for _, obj, codigo in pendientes:
+        origen_por_codigo.setdefault(codigo, obj.huertero_nombre)
+
+    base = LoteBodega.objects.filter(bodega=bodega, temporada=temporada)
+    lotes = {lote.codigo_lote: lote for lote in base.filter(codigo_lote__in=list(origen_por_codigo))}
+    faltantes = [codigo for codigo in origen_por_codigo if codigo not in lotes]
+    if faltantes:
+        LoteBodega.objects.bulk_create(
+            [
+                LoteBodega(
+                    bodega=bodega,
+                    temporada=temporada,
+                    semana=semana,
+                    codigo_lote=codigo,
+                    origen_nombre=origen_por_codigo[codigo],
+                )
+                for codigo in faltantes
+            ],
+            # Si otra captura creó el mismo código, se reutiliza el suyo.
+            ignore_conflicts=True,
+        )
+        lotes.update({lote.codigo_lote: lote for lote in base.filter(codigo_lote__in=faltantes)})
+    return lotes
+
+
+__all__ = ["crear_recepciones"]
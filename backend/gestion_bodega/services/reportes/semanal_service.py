@@ -3,8 +3,14 @@ from __future__ import annotations
 
 from typing import Any, Tuple
 
+from django.conf import settings
+
+from agroproductores_risol.utils.export_registry import get_exporter
+from agroproductores_risol.utils.single_flight import get_or_compute
+
 from ...utils import reporting
-from ..exportacion.excel_exporter import ExcelExporter
+from ...utils.cache_keys import k_reporte_semanal, k_reporte_semanal_stale
+from ...utils.tablero_version import get_tablero_version
 
 
 def _ensure_ids(bodega_id: Any, temporada_id: Any) -> Tuple[int, int]:
@@ -18,12 +24,29 @@ def _ensure_ids(bodega_id: Any, temporada_id: Any) -> Tuple[int, int]:
     return bodega, temporada
 
 
+def _reporte_semanal_data(bodega: int, temporada: int, iso_semana: str) -> dict[str, Any]:
+    """
+    Agregados de la semana en cache. La clave lleva la versión del tablero:
+    cualquier escritura del contexto la invalida sin borrar nada. Tras una
+    invalidación un solo worker recalcula (single-flight).
+    """
+    ttl = getattr(settings, "BODEGA_REPORTE_SEMANAL_CACHE_TTL", 3600)
+    return get_or_compute(
+        k_reporte_semanal(bodega, temporada, iso_semana, get_tablero_version(bodega, temporada)),
+        lambda: reporting.aggregates_for_semana(bodega, temporada, iso_semana),
+        ttl,
+        namespace="bodega.reporte_semanal",
+        stale_key=k_reporte_semanal_stale(bodega, temporada, iso_semana),
+        stale_timeout=ttl,
+    )
+
+
 def build_reporte_semanal_json(bodega_id: Any, temporada_id: Any, iso_semana: str) -> dict[str, Any]:
     """Regresa la estructura JSON completa del reporte semanal."""
     if not iso_semana:
         raise ValueError("Debes indicar la semana en formato ISO (YYYY-Www).")
     bodega, temporada = _ensure_ids(bodega_id, temporada_id)
-    return reporting.aggregates_for_semana(bodega, temporada, iso_semana)
+    return _reporte_semanal_data(bodega, temporada, iso_semana)
 
 
 def build_reporte_semanal_pdf(bodega_id: Any, temporada_id: Any, iso_semana: str) -> tuple[bytes, str]:
@@ -31,7 +54,7 @@ def build_reporte_semanal_pdf(bodega_id: Any, temporada_id: Any, iso_semana: str
     if not iso_semana:
         raise ValueError("Debes indicar la semana en formato ISO (YYYY-Www).")
     bodega, temporada = _ensure_ids(bodega_id, temporada_id)
-    reporte_data = reporting.aggregates_for_semana(bodega, temporada, iso_semana)
+    reporte_data = _reporte_semanal_data(bodega, temporada, iso_semana)
     pdf_bytes = reporting.render_semana_pdf_from_data(reporte_data)
     filename = f"reporte_semanal_bodega_{bodega}_{iso_semana}.pdf"
     return pdf_bytes, filename
@@ -42,7 +65,7 @@ def build_reporte_semanal_excel(bodega_id: Any, temporada_id: Any, iso_semana: s
     if not iso_semana:
         raise ValueError("Debes indicar la semana en formato ISO (YYYY-Www).")
     bodega, temporada = _ensure_ids(bodega_id, temporada_id)
-    reporte_data = reporting.aggregates_for_semana(bodega, temporada, iso_semana)
-    xlsx_bytes = ExcelExporter.generar_excel_semanal(reporte_data)
+    reporte_data = _reporte_semanal_data(bodega, temporada, iso_semana)
+    xlsx_bytes = get_exporter("bodega.excel").generar_excel_semanal(reporte_data)
     filename = f"reporte_semanal_bodega_{bodega}_{iso_semana}.xlsx"
     return xlsx_bytes, filename
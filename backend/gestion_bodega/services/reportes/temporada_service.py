@@ -3,8 +3,14 @@ from __future__ import annotations
 
 from typing import Any
 
+from django.conf import settings
+
+from agroproductores_risol.utils.export_registry import get_exporter
+from agroproductores_risol.utils.single_flight import get_or_compute
+
 from ...utils import reporting
-from ..exportacion.excel_exporter import ExcelExporter
+from ...utils.cache_keys import k_reporte_temporada, k_reporte_temporada_stale
+from ...utils.tablero_version import get_tablero_version
 
 
 def _ensure_ids(bodega_id: Any, temporada_id: Any) -> tuple[int, int]:
@@ -18,16 +24,29 @@ def _ensure_ids(bodega_id: Any, temporada_id: Any) -> tuple[int, int]:
     return bodega, temporada
 
 
+def _reporte_temporada_data(bodega: int, temporada: int) -> dict[str, Any]:
+    """Agregados de la temporada en cache, versionados como el reporte semanal."""
+    ttl = getattr(settings, "BODEGA_REPORTE_TEMPORADA_CACHE_TTL", 3600)
+    return get_or_compute(
+        k_reporte_temporada(bodega, temporada, get_tablero_version(bodega, temporada)),
+        lambda: reporting.aggregates_for_temporada(bodega, temporada),
+        ttl,
+        namespace="bodega.reporte_temporada",
+        stale_key=k_reporte_temporada_stale(bodega, temporada),
+        stale_timeout=ttl,
+    )
+
+
 def build_reporte_temporada_json(bodega_id: Any, temporada_id: Any) -> dict[str, Any]:
     """Regresa la estructura JSON base utilizada en los reportes de temporada."""
     bodega, temporada = _ensure_ids(bodega_id, temporada_id)
-    return reporting.aggregates_for_temporada(bodega, temporada)
+    return _reporte_temporada_data(bodega, temporada)
 
 
 def build_reporte_temporada_pdf(bodega_id: Any, temporada_id: Any) -> tuple[bytes, str]:
     """Genera el PDF del reporte de temporada y devuelve (bytes, filename)."""
     bodega, temporada = _ensure_ids(bodega_id, temporada_id)
-    reporte_data = reporting.aggregates_for_temporada(bodega, temporada)
+    reporte_data = _reporte_temporada_data(bodega, temporada)
     pdf_bytes = reporting.render_temporada_pdf_from_data(reporte_data)
     filename = f"reporte_temporada_bodega_{bodega}_T{temporada}.pdf"
     return pdf_bytes, filename
@@ -36,7 +55,7 @@ def build_reporte_temporada_pdf(bodega_id: Any, temporada_id: Any) -> tuple[byte
 def build_reporte_temporada_excel(bodega_id: Any, temporada_id: Any) -> tuple[bytes, str]:
     """Genera el Excel del reporte de temporada y devuelve (bytes, filename)."""
     bodega, temporada = _ensure_ids(bodega_id, temporada_id)
-    reporte_data = reporting.aggregates_for_temporada(bodega, temporada)
-    xlsx_bytes = ExcelExporter.generar_excel_temporada(reporte_data)
+    reporte_data = _reporte_temporada_data(bodega, temporada)
+    xlsx_bytes = get_exporter("bodega.excel").generar_excel_temporada(reporte_data)
     filename = f"reporte_temporada_bodega_{bodega}_T{temporada}.xlsx"
     return xlsx_bytes, filename
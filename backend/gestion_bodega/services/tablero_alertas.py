@@ -0,0 +1,173 @@
+# backend/gestion_bodega/services/tablero_alertas.py
+"""
+Alertas del tablero como estado persistido (AlertaTablero).
+
+- `evaluar_alertas` corre las reglas (utils/kpis.build_alerts) y sincroniza
+  la tabla: abre las que empiezan a cumplirse, cierra (resuelta_en) las que
+  dejaron de cumplirse y refresca las que siguen abiertas.
+- Se evalúa al confirmar escrituras del tablero (signals, on_commit, una vez
+  por contexto y transacción) y cada hora desde la tarea
+  bodega.evaluar_alertas (o `evaluate_tablero_alerts` por cron): las reglas
+  dependen de "hoy".
+- La evaluación toma el lock de su propia fila de SecuenciaBodega
+  (clave "alertas") antes de leer e insertar: en MySQL/MariaDB la
+  restricción parcial `uniq_alerta_abierta_por_codigo` no existe y, sin
+  alertas abiertas, no habría ninguna fila que bloquear. Es una fila
+  dedicada: no compite con las escrituras de recepciones/empaques/camiones.
+- Si la evaluación abre, cambia o resuelve alguna alerta, al confirmar
+  incrementa la versión del tablero (ETags) y publica el tópico "alerts";
+  sin eso el cliente seguiría recibiendo 304 sobre las filas viejas.
+- `alertas_abiertas` sirve el tablero con una consulta a la tabla. Solo sin
+  scheduler evalúa en la primera lectura del día (ver la función).
+"""
+from __future__ import annotations
+
+from datetime import date
+from functools import partial
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from gestion_bodega.models import AlertaTablero, SecuenciaBodega
+from gestion_bodega.services.tablero_events import TOPIC_ALERTS, publish_tablero_topics
+from gestion_bodega.utils.cache_keys import k_tablero_alertas_evaluadas
+from gestion_bodega.utils.kpis import build_alerts
+from gestion_bodega.utils.tablero_version import bump_tablero_version
+
+# Marca "evaluado hoy" por contexto; expira sola al día siguiente.
+EVALUACION_TTL = 60 * 60 * 24
+ORDEN_SEVERIDAD = {"critical": 0, "warning": 1, "info": 2}
+
+
+def _hoy() -> date:
+    return timezone.localdate()
+
+
+def _notificar_cambio(bodega_id: int, temporada_id: int) -> None:
+    bump_tablero_version(bodega_id, temporada_id)
+    publish_tablero_topics(bodega_id, temporada_id, [TOPIC_ALERTS])
+
+
+def evaluar_alertas(bodega_id: int, temporada_id: int, *, today: Optional[date] = None) -> List[AlertaTablero]:
+    """
+    Sincroniza AlertaTablero con las reglas vigentes del contexto.
+    Devuelve las alertas abiertas tras la evaluación (críticas primero).
+    """
+    today = today or _hoy()
+    reglas = build_alerts(temporada_id=temporada_id, bodega_id=bodega_id, today=today)
+    vigentes = {raw["code"]: raw for raw in reglas}
+    ahora = timezone.now()
+
+    with transaction.atomic():
+        # Serializa las evaluaciones del contexto (ver docstring del módulo).
+        SecuenciaBodega.siguiente(bodega_id, temporada_id, SecuenciaBodega.ALERTAS)
+        abiertas = {
+            a.codigo: a
+            for a in AlertaTablero.objects.select_for_update()
+            .filter(bodega_id=bodega_id, temporada_id=temporada_id, resuelta_en__isnull=True)
+            .order_by("id")
+        }
+
+        resueltas = [codigo for codigo in abiertas if codigo not in vigentes]
+        if resueltas:
+            AlertaTablero.objects.filter(pk__in=[abiertas[c].pk for c in resueltas]).update(resuelta_en=ahora)
+
+        nuevas, refrescadas = [], []
+        cambio = bool(resueltas)
+        for codigo, raw in vigentes.items():
+            campos = {
+                "severidad": raw.get("severity") or "info",
+                "titulo": raw.get("title") or "",
+                "descripcion": raw.get("description") or "",
+                "link": raw.get("link") or {},
+            }
+            alerta = abiertas.get(codigo)
+            if alerta is None:
+                nuevas.append(
+                    AlertaTablero(
+                        bodega_id=bodega_id, temporada_id=temporada_id, codigo=codigo,
+                        abierta_en=ahora, evaluada_en=ahora, **campos,
+                    )
+                )
+                continue
+            for field, value in campos.items():
+                cambio = cambio or getattr(alerta, field) != value
+                setattr(alerta, field, value)
+            alerta.evaluada_en = ahora
+            refrescadas.append(alerta)
+
+        if refrescadas:
+            AlertaTablero.objects.bulk_update(
+                refrescadas, ["severidad", "titulo", "descripcion", "link", "evaluada_en"]
+            )
+        if nuevas:
+            AlertaTablero.objects.bulk_create(nuevas)
+            cambio = True
+        if cambio:
+            transaction.on_commit(partial(_notificar_cambio, bodega_id, temporada_id))
+
+    cache.set(k_tablero_alertas_evaluadas(bodega_id, temporada_id), today.isoformat(), EVALUACION_TTL)
+    return _abiertas(bodega_id, temporada_id)
+
+
+def _abiertas(bodega_id: int, temporada_id: int) -> List[AlertaTablero]:
+    """Abiertas del contexto: críticas primero, luego por antigüedad."""
+    alertas = AlertaTablero.objects.filter(
+        bodega_id=bodega_id, temporada_id=temporada_id, resuelta_en__isnull=True
+    ).order_by("abierta_en", "id")
+    return sorted(alertas, key=lambda a: ORDEN_SEVERIDAD.get(a.severidad, len(ORDEN_SEVERIDAD)))
+
+
+def alerta_payload(alerta: AlertaTablero) -> Dict[str, Any]:
+    """Contrato de AlertItemSerializer + marcas de tiempo del estado."""
+    return {
+        "code": alerta.codigo,
+        "title": alerta.titulo,
+        "description": alerta.descripcion,
+        "severity": alerta.severidad,
+        "link": alerta.link or {},
+        "abierta_en": alerta.abierta_en,
+        "resuelta_en": alerta.resuelta_en,
+    }
+
+
+def alertas_abiertas(bodega_id: int, temporada_id: int) -> List[Dict[str, Any]]:
+    """
+    Alertas abiertas del contexto (una consulta).
+
+    Con el scheduler activo la lectura nunca escribe. Sin scheduler no hay
+    quién abra las alertas que dependen solo de la fecha (p. ej.
+    NO_RECEPCIONES_72H en un contexto sin escrituras), así que, igual que
+    ensure_week_state en el tablero, la primera lectura del día (por proceso)
+    evalúa bajo el lock de la temporada.
+    """
+    today = _hoy()
+    if settings.SCHEDULER["ENABLED"]:
+        return [alerta_payload(a) for a in _abiertas(bodega_id, temporada_id)]
+    if cache.get(k_tablero_alertas_evaluadas(bodega_id, temporada_id)) != today.isoformat():
+        alertas = evaluar_alertas(bodega_id, temporada_id, today=today)
+    else:
+        alertas = _abiertas(bodega_id, temporada_id)
+    return [alerta_payload(a) for a in alertas]
+
+
+def historial_alertas(bodega_id: int, temporada_id: int, estado: Optional[str] = None) -> QuerySet:
+    """Alertas del contexto (más recientes primero); estado: abiertas | resueltas."""
+    qs = AlertaTablero.objects.filter(bodega_id=bodega_id, temporada_id=temporada_id)
+    if estado == "abiertas":
+        qs = qs.filter(resuelta_en__isnull=True)
+    elif estado == "resueltas":
+        qs = qs.filter(resuelta_en__isnull=False)
+    return qs.order_by("-abierta_en", "-id")
+
+
+__all__ = [
+    "alerta_payload",
+    "alertas_abiertas",
+    "evaluar_alertas",
+    "historial_alertas",
+]
@@ -0,0 +1,281 @@
+# gestion_bodega/services/tablero_events.py
+"""
+Canal de eventos del tablero (push en lugar de polling).
+
+Flujo:
+- gestion_bodega.signals publica, en `transaction.on_commit`, qué partes del
+  tablero cambiaron para un (bodega, temporada): "kpis", "alerts", "week",
+  "queue:recepciones", "queue:inventarios", "queue:despachos".
+- TableroBodegaEventsView (SSE) escucha el canal y reenvía notificaciones
+  pequeñas; el cliente vuelve a pedir SOLO lo que cambió.
+
+El canal es opt-in (BODEGA_TABLERO_EVENTS["ENABLED"]): cada stream ocupa un
+hilo del worker hasta MAX_STREAM_SECONDS, así que solo se habilita con
+workers con hilos o asíncronos. Apagado, no se publica nada y la vista
+responde 404.
+
+Backends (settings.BODEGA_TABLERO_EVENTS["BACKEND"]; vacío = automático):
+- CacheEventBackend: usa el cache compartido (Redis/Memcached/BD) como
+  bitácora secuencial por canal; sirve para varios workers/nodos. Los
+  suscriptores hacen un GET de cache por intervalo, nunca consultas a la BD.
+  Es el automático cuando el cache es compartido.
+- InProcessEventBackend: fan-out en memoria (un proceso, p.ej. runserver o un
+  único worker con hilos). Es el automático con cache local.
+
+Los ids de evento son secuenciales por canal; si el cliente reconecta con un
+Last-Event-ID que ya no se puede reconstruir (reinicio, huecos por TTL), se
+emite un evento de resincronización con todos los tópicos.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.module_loading import import_string
+
+from agroproductores_risol.utils.shared_cache import shared_cache_configured
+
+logger = logging.getLogger(__name__)
+
+TOPIC_KPIS = "kpis"
+TOPIC_ALERTS = "alerts"
+TOPIC_WEEK = "week"
+TOPIC_QUEUE_RECEPCIONES = "queue:recepciones"
+TOPIC_QUEUE_INVENTARIOS = "queue:inventarios"
+TOPIC_QUEUE_DESPACHOS = "queue:despachos"
+
+ALL_TOPICS: Tuple[str, ...] = (
+    TOPIC_KPIS,
+    TOPIC_ALERTS,
+    TOPIC_WEEK,
+    TOPIC_QUEUE_RECEPCIONES,
+    TOPIC_QUEUE_INVENTARIOS,
+    TOPIC_QUEUE_DESPACHOS,
+)
+
+# Qué secciones del tablero dependen de cada modelo (model_name → tópicos).
+TOPICS_BY_MODEL: Dict[str, Tuple[str, ...]] = {
+    "recepcion": (TOPIC_KPIS, TOPIC_ALERTS, TOPIC_QUEUE_RECEPCIONES),
+    "clasificacionempaque": (TOPIC_KPIS, TOPIC_ALERTS, TOPIC_QUEUE_RECEPCIONES, TOPIC_QUEUE_INVENTARIOS),
+    "lotebodega": (TOPIC_QUEUE_INVENTARIOS,),
+    "camionsalida": (TOPIC_ALERTS, TOPIC_QUEUE_DESPACHOS),
+    "camionconsumoempaque": (TOPIC_KPIS, TOPIC_QUEUE_INVENTARIOS, TOPIC_QUEUE_DESPACHOS),
+    "cierresemanal": ALL_TOPICS,
+    "temporadabodega": ALL_TOPICS,
+    "bodega": ALL_TOPICS,
+}
+
+Event = Tuple[int, Dict[str, Any]]
+
+
+def _config() -> Dict[str, Any]:
+    defaults = {
+        "ENABLED": False,
+        "BACKEND": "",
+        "HEARTBEAT_SECONDS": 15,
+        "MAX_STREAM_SECONDS": 300,
+        "HISTORY": 200,
+        "CACHE_TTL": 600,
+        "POLL_SECONDS": 1.0,
+    }
+    return {**defaults, **getattr(settings, "BODEGA_TABLERO_EVENTS", {})}
+
+
+def events_enabled() -> bool:
+    return bool(_config()["ENABLED"])
+
+
+def _backend_path(cfg: Dict[str, Any]) -> str:
+    if cfg["BACKEND"]:
+        return cfg["BACKEND"]
+    if shared_cache_configured():
+        return "gestion_bodega.services.tablero_events.CacheEventBackend"
+    return "gestion_bodega.services.tablero_events.InProcessEventBackend"
+
+
+def channel_name(bodega_id: int, temporada_id: int) -> str:
+    return f"{bodega_id}:{temporada_id}"
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Backends
+# ──────────────────────────────────────────────────────────────────────────────
+
+class InProcessEventBackend:
+    """
+    Bitácora acotada por canal + Condition para despertar a los lectores.
+    """
+
+    def __init__(self, history: int = 200, **_: Any):
+        self._cond = threading.Condition()
+        self._events: Dict[str, deque] = defaultdict(lambda: deque(maxlen=history))
+        self._seq: Dict[str, int] = defaultdict(int)
+
+    def publish(self, channel: str, data: Dict[str, Any]) -> int:
+        with self._cond:
+            self._seq[channel] += 1
+            event_id = self._seq[channel]
+            self._events[channel].append((event_id, data))
+            self._cond.notify_all()
+        return event_id
+
+    def last_id(self, channel: str) -> int:
+        with self._cond:
+            return self._seq.get(channel, 0)
+
+    def read(self, channel: str, after: int, timeout: float) -> Tuple[List[Event], int]:
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                last = self._seq.get(channel, 0)
+                if last != after:
+                    events = [e for e in self._events.get(channel, ()) if e[0] > after]
+                    return events, last
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return [], last
+                self._cond.wait(remaining)
+
+
+class CacheEventBackend:
+    """
+    Bitácora en el cache compartido: un contador por canal (incr atómico) y
+    una llave por evento con TTL. Apto para varios procesos/nodos.
+    """
+
+    prefix = "bodega:tablero:events"
+
+    def __init__(self, cache_ttl: int = 600, poll_seconds: float = 1.0, history: int = 200, **_: Any):
+        self.cache_ttl = cache_ttl
+        self.poll_seconds = poll_seconds
+        self.history = history
+
+    def _seq_key(self, channel: str) -> str:
+        return f"{self.prefix}:{channel}:seq"
+
+    def _event_key(self, channel: str, event_id: int) -> str:
+        return f"{self.prefix}:{channel}:{event_id}"
+
+    def publish(self, channel: str, data: Dict[str, Any]) -> int:
+        seq_key = self._seq_key(channel)
+        cache.add(seq_key, 0, timeout=None)
+        event_id = int(cache.incr(seq_key))
+        cache.set(self._event_key(channel, event_id), data, timeout=self.cache_ttl)
+        return event_id
+
+    def last_id(self, channel: str) -> int:
+        return int(cache.get(self._seq_key(channel)) or 0)
+
+    def read(self, channel: str, after: int, timeout: float) -> Tuple[List[Event], int]:
+        deadline = time.monotonic() + timeout
+        while True:
+            last = self.last_id(channel)
+            if last != after:
+                first = max(after + 1, last - self.history + 1)
+                ids = list(range(first, last + 1)) if last > after else []
+                found = cache.get_many([self._event_key(channel, i) for i in ids]) if ids else {}
+                events = [
+                    (i, found[self._event_key(channel, i)])
+                    for i in ids
+                    if self._event_key(channel, i) in found
+                ]
+                return events, last
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return [], last
+            time.sleep(min(self.poll_seconds, remaining))
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Broker
+# ──────────────────────────────────────────────────────────────────────────────
+
+class TableroEventBroker:
+    def __init__(self, backend):
+        self.backend = backend
+
+    def publish(self, bodega_id: int, temporada_id: int, topics: Iterable[str]) -> Optional[int]:
+        topics = sorted(set(topics))
+        if not (bodega_id and temporada_id and topics):
+            return None
+        return self.backend.publish(channel_name(bodega_id, temporada_id), {"topics": topics})
+
+    def last_id(self, bodega_id: int, temporada_id: int) -> int:
+        return self.backend.last_id(channel_name(bodega_id, temporada_id))
+
+    def wait(self, bodega_id: int, temporada_id: int, after: int, timeout: float) -> Tuple[Optional[int], List[str]]:
+        """
+        Espera cambios posteriores a `after` (hasta `timeout` segundos).
+        Devuelve (nuevo_last_id, tópicos) combinando todos los eventos leídos;
+        (None, []) si no hubo cambios.
+        Si el historial no permite reconstruir la secuencia (reinicio del
+        backend o eventos expirados) devuelve ALL_TOPICS como resincronización.
+        """
+        events, last = self.backend.read(channel_name(bodega_id, temporada_id), after, timeout)
+        if last == after:
+            return None, []
+        contiguous = last > after and len(events) == last - after
+        if not contiguous:
+            return last, list(ALL_TOPICS)
+        topics = sorted({t for _, data in events for t in data.get("topics", ())})
+        return last, topics
+
+
+_broker: Optional[TableroEventBroker] = None
+_broker_lock = threading.Lock()
+
+
+def get_broker() -> TableroEventBroker:
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                cfg = _config()
+                backend_cls = import_string(_backend_path(cfg))
+                backend = backend_cls(
+                    history=cfg["HISTORY"],
+                    cache_ttl=cfg["CACHE_TTL"],
+                    poll_seconds=cfg["POLL_SECONDS"],
+                )
+                _broker = TableroEventBroker(backend)
+    return _broker
+
+
+def reset_broker() -> None:
+    """Descarta el broker actual (tests / cambio de settings)."""
+    global _broker
+    with _broker_lock:
+        _broker = None
+
+
+def publish_tablero_change(bodega_id: Optional[int], temporada_id: Optional[int], model_name: str) -> None:
+    """
+    Publica el cambio de `model_name` en el canal del contexto.
+    Se invoca después del commit; nunca debe romper la escritura.
+    """
+    publish_tablero_topics(bodega_id, temporada_id, TOPICS_BY_MODEL.get(model_name) or ())
+
+
+def publish_tablero_topics(bodega_id: Optional[int], temporada_id: Optional[int], topics: Iterable[str]) -> None:
+    """Publica `topics` en el canal del contexto (después del commit)."""
+    topics = tuple(topics)
+    if not topics or not (bodega_id and temporada_id) or not events_enabled():
+        return
+    try:
+        get_broker().publish(bodega_id, temporada_id, topics)
+    except Exception:
+        # Best-effort: el cliente igual puede revalidar con ETag.
+        logger.exception("No se pudo publicar el cambio del tablero B%s/T%s", bodega_id, temporada_id)
+
+
+def stream_settings() -> Dict[str, Any]:
+    cfg = _config()
+    return {
+        "heartbeat": float(cfg["HEARTBEAT_SECONDS"]),
+        "max_duration": float(cfg["MAX_STREAM_SECONDS"]),
+    }
@@ -0,0 +1,188 @@
+# backend/gestion_bodega/services/tablero_kpis.py
+"""
+Motor de KPIs del tablero: todos los números del resumen para un
+(temporada, bodega, rango/semana) con UNA consulta por tabla de hechos.
+
+- Recepcion: cajas del periodo + conteos pendientes/finalizadas con
+  agregación condicional sobre las columnas de empaque materializadas.
+- ClasificacionEmpaque: producción (sin MERMA) y merma del periodo.
+- Contexto (temporada, bodega, semana activa): una consulta para las
+  etiquetas; la semana sale del calendario en memoria (utils/week_calendar).
+
+Lo consumen el resumen del tablero y el overview del dashboard general.
+"""
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any, Dict, Optional
+
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Coalesce
+
+from gestion_bodega.models import Bodega, ClasificacionEmpaque, Recepcion, TemporadaBodega
+from gestion_bodega.utils.week_calendar import get_week_calendar
+
+
+def _periodo(qs, temporada_id, bodega_id, fecha_desde, fecha_hasta, semana_id):
+    qs = qs.filter(temporada_id=temporada_id, is_active=True)
+    if bodega_id:
+        qs = qs.filter(bodega_id=bodega_id)
+    if semana_id:
+        qs = qs.filter(semana_id=semana_id)
+    if fecha_desde:
+        qs = qs.filter(fecha__gte=fecha_desde)
+    if fecha_hasta:
+        qs = qs.filter(fecha__lte=fecha_hasta)
+    return qs
+
+
+def compute_tablero_kpis(
+    temporada_id: int,
+    bodega_id: Optional[int],
+    fecha_desde: Optional[str],
+    fecha_hasta: Optional[str],
+    semana_id: Optional[int] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    {"recepcion": {...}, "empaque": {...}} con el contrato de KpiSummarySerializer.
+    Pendientes/finalizadas se filtran por fecha de RECEPCIÓN; producción y merma
+    por fecha de EMPAQUE (mismas reglas que InventoryService).
+    """
+    clasificadas = F("cajas_empaquetadas") + F("cajas_merma")
+    rec = _periodo(
+        Recepcion.objects, temporada_id, bodega_id, fecha_desde, fecha_hasta, semana_id
+    ).aggregate(
+        cajas_total=Coalesce(Sum("cajas_campo"), 0),
+        recepciones=Count("id"),
+        pendientes=Count("id", filter=Q(cajas_campo__gt=clasificadas)),
+        finalizadas=Count("id", filter=Q(cajas_campo__lte=clasificadas, cajas_campo__gt=0)),
+    )
+
+    es_merma = Q(calidad__iexact="MERMA")
+    emp = _periodo(
+        ClasificacionEmpaque.objects, temporada_id, bodega_id, fecha_desde, fecha_hasta, semana_id
+    ).aggregate(
+        producidas=Coalesce(Sum("cantidad_cajas", filter=~es_merma), 0),
+        merma=Coalesce(Sum("cantidad_cajas", filter=es_merma), 0),
+    )
+
+    return {
+        "recepcion": {
+            "cajas_total": int(rec["cajas_total"]),
+            "recepciones": int(rec["recepciones"]),
+            "apto_pct": None,
+            "merma_pct": None,
+        },
+        "empaque": {
+            "pendientes": int(rec["pendientes"]),
+            "empacadas": int(rec["finalizadas"]),
+            "cajas_empacadas": int(emp["producidas"]),
+            "merma": int(emp["merma"]),
+        },
+    }
+
+
+def active_week_context(bodega_id: Optional[int], temporada_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Semana ABIERTA del contexto o, si no hay, la última registrada (CERRADA).
+    Sin consultas cuando el calendario de la versión vigente ya está cargado.
+    """
+    if not bodega_id:
+        return None
+    calendar = get_week_calendar(bodega_id, temporada_id)
+    week = calendar.open_week()
+    if week is None:
+        weeks = calendar.weeks()
+        if not weeks:
+            return None
+        week = weeks[-1]
+
+    start = week.fecha_desde
+    end_real = week.fecha_hasta
+    end_theoretical = end_real or (start + timedelta(days=6))
+    return {
+        "id": week.id,
+        "fecha_inicio": start.isoformat(),
+        "fecha_fin": end_real.isoformat() if end_real else None,
+        "rango_inferido": {
+            "from": start.isoformat(),
+            "to": end_theoretical.isoformat(),
+        },
+        "estado": "ABIERTA" if end_real is None else "CERRADA",
+        "iso_semana": week.iso_semana or None,
+        "activa": end_real is None,
+    }
+
+
+_SIN_SEMANA = object()
+
+
+def tablero_context(
+    temporada_id: int,
+    bodega_id: Optional[int],
+    active_week: Any = _SIN_SEMANA,
+) -> Dict[str, Any]:
+    """
+    Bloque `context` del tablero. `active_week` permite reutilizar la semana
+    ya resuelta por el rango (None = sin semana).
+    """
+    temporada = (
+        TemporadaBodega.objects.select_related("bodega")
+        .only("id", "año", "bodega__id", "bodega__nombre")
+        .filter(id=temporada_id)
+        .first()
+    )
+    ctx: Dict[str, Any] = {
+        "temporada_id": temporada_id,
+        "temporada_label": str(temporada.año) if temporada else str(temporada_id),
+    }
+    if bodega_id:
+        if temporada and temporada.bodega_id == bodega_id:
+            ctx["bodega_label"] = temporada.bodega.nombre
+        else:
+            nombre = Bodega.objects.filter(id=bodega_id).values_list("nombre", flat=True).first()
+            ctx["bodega_label"] = nombre or str(bodega_id)
+    aw = active_week_context(bodega_id, temporada_id) if active_week is _SIN_SEMANA else active_week
+    if aw:
+        ctx["active_week"] = aw
+    return ctx
+
+
+def build_tablero_bundle(
+    temporada_id: int,
+    bodega_id: Optional[int],
+    fecha_desde: Optional[str],
+    fecha_hasta: Optional[str],
+    semana_id: Optional[int] = None,
+    active_week: Any = _SIN_SEMANA,
+) -> Dict[str, Any]:
+    """{"kpis": ..., "context": ...} listo para el resumen del tablero."""
+    return {
+        "kpis": compute_tablero_kpis(temporada_id, bodega_id, fecha_desde, fecha_hasta, semana_id=semana_id),
+        "context": tablero_context(temporada_id, bodega_id, active_week=active_week),
+    }
+
+
+def build_tablero_overview(temporada_id: int, bodega_id: int) -> Dict[str, Any]:
+    """
+    Bundle para el dashboard general: KPIs de la semana activa (o la última)
+    del contexto; sin semanas, KPIs de toda la temporada.
+    """
+    aw = active_week_context(bodega_id, temporada_id)
+    rango = (aw or {}).get("rango_inferido") or {}
+    return build_tablero_bundle(
+        temporada_id,
+        bodega_id,
+        rango.get("from"),
+        rango.get("to"),
+        active_week=aw,
+    )
+
+
+__all__ = [
+    "active_week_context",
+    "build_tablero_bundle",
+    "build_tablero_overview",
+    "compute_tablero_kpis",
+    "tablero_context",
+]
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import logging
+import threading
+import weakref
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from gestion_bodega.models import (
+    Bodega,
+    CamionConsumoEmpaque,
+    CamionSalida,
+    CierreSemanal,
+    ClasificacionEmpaque,
+    CompraMadera,
+    Consumible,
+    LoteBodega,
+    Recepcion,
+    TemporadaBodega,
+)
+from gestion_bodega.services.tablero_alertas import evaluar_alertas
+from gestion_bodega.services.tablero_events import publish_tablero_change
+from gestion_bodega.utils.tablero_version import bump_tablero_version
+from gestion_bodega.utils.week_calendar import invalidate_week_calendar
+
+logger = logging.getLogger(__name__)
+
+
+# Modelos cuyo cambio altera KPIs, colas, alertas o semanas del tablero.
+TABLERO_VERSION_MODELS = (
+    Bodega,
+    TemporadaBodega,
+    LoteBodega,
+    Recepcion,
+    ClasificacionEmpaque,
+    CamionSalida,
+    CamionConsumoEmpaque,
+    CompraMadera,
+    Consumible,
+    CierreSemanal,
+)
+
+
+def _tablero_contexts(instance) -> list[tuple[int, int]]:
+    """
+    (bodega_id, temporada_id) afectados por el cambio de `instance`.
+    """
+    if isinstance(instance, Bodega):
+        return [
+            (instance.id, temporada_id)
+            for temporada_id in TemporadaBodega.objects.filter(bodega_id=instance.id).values_list("id", flat=True)
+        ]
+    if isinstance(instance, TemporadaBodega):
+        return [(instance.bodega_id, instance.id)]
+    if isinstance(instance, CamionConsumoEmpaque):
+        camion = CamionSalida.objects.filter(pk=instance.camion_id).values("bodega_id", "temporada_id").first()
+        return [(camion["bodega_id"], camion["temporada_id"])] if camion else []
+    bodega_id = getattr(instance, "bodega_id", None)
+    temporada_id = getattr(instance, "temporada_id", None)
+    return [(bodega_id, temporada_id)] if bodega_id and temporada_id else []
+
+
+def _on_tablero_commit(bodega_id, temporada_id, model_name: str) -> None:
+    bump_tablero_version(bodega_id, temporada_id)
+    publish_tablero_change(bodega_id, temporada_id, model_name)
+
+
+def _evaluar_alertas_commit(bodega_id, temporada_id) -> None:
+    try:
+        evaluar_alertas(bodega_id, temporada_id)
+    except Exception:
+        # Las lecturas re-evalúan si hace falta; una falla aquí no afecta la escritura.
+        logger.exception("No se pudieron evaluar las alertas de B%s/T%s", bodega_id, temporada_id)
+
+
+# Evaluaciones agendadas por hilo: (alias, contexto) → weakref al callback.
+# Django suelta el callback al confirmar (tras ejecutarlo) o al hacer
+# rollback, y con él muere la referencia: no hay que limpiar a mano.
+_alertas_pendientes = threading.local()
+
+
+def _olvidar_pendiente(key, ref) -> None:
+    pendientes = getattr(_alertas_pendientes, "callbacks", {})
+    if pendientes.get(key) is ref:
+        del pendientes[key]
+
+
+def schedule_alert_evaluation(bodega_id, temporada_id) -> None:
+    """
+    Agenda (on_commit) la evaluación de alertas del contexto, una sola vez por
+    transacción aunque se guarden muchos registros.
+    """
+    if not (bodega_id and temporada_id):
+        return
+    connection = transaction.get_connection()
+    pendientes = getattr(_alertas_pendientes, "callbacks", None)
+    if pendientes is None:
+        pendientes = _alertas_pendientes.callbacks = {}
+    key = (connection.alias, bodega_id, temporada_id)
+    ref = pendientes.get(key)
+    if connection.in_atomic_block and ref is not None and ref() is not None:
+        return
+    callback = partial(_evaluar_alertas_commit, bodega_id, temporada_id)
+    callback.alertas_contexto = (bodega_id, temporada_id)
+    pendientes[key] = weakref.ref(callback, partial(_olvidar_pendiente, key))
+    transaction.on_commit(callback)
+
+
+def schedule_tablero_change(bodega_id, temporada_id, model_name: str) -> None:
+    """
+    Agenda (on_commit) el bump de versión + evento del tablero y la
+    evaluación de alertas.
+    Usar tras escrituras que no disparan post_save (bulk_create / update()).
+    """
+    transaction.on_commit(partial(_on_tablero_commit, bodega_id, temporada_id, model_name))
+    schedule_alert_evaluation(bodega_id, temporada_id)
+
+
+def _schedule_tablero_change(sender, instance, **kwargs) -> None:
+    if kwargs.get("raw"):
+        return
+    model_name = sender._meta.model_name
+    contexts = _tablero_contexts(instance) or [(None, None)]
+    for bodega_id, temporada_id in contexts:
+        schedule_tablero_change(bodega_id, temporada_id, model_name)
+
+
+for model in TABLERO_VERSION_MODELS:
+    post_save.connect(
+        _schedule_tablero_change,
+        sender=model,
+        weak=False,
+        dispatch_uid=f"gestion_bodega.tablero.version.save.{model._meta.label_lower}",
+    )
+    post_delete.connect(
+        _schedule_tablero_change,
+        sender=model,
+        weak=False,
+        dispatch_uid=f"gestion_bodega.tablero.version.delete.{model._meta.label_lower}",
+    )
+
+
+def _schedule_week_calendar_invalidation(sender, instance, **kwargs) -> None:
+    if kwargs.get("raw"):
+        return
+    if instance.bodega_id and instance.temporada_id:
+        transaction.on_commit(partial(invalidate_week_calendar, instance.bodega_id, instance.temporada_id))
+
+
+post_save.connect(
+    _schedule_week_calendar_invalidation,
+    sender=CierreSemanal,
+    weak=False,
+    dispatch_uid="gestion_bodega.week_calendar.save",
+)
+post_delete.connect(
+    _schedule_week_calendar_invalidation,
+    sender=CierreSemanal,
+    weak=False,
+    dispatch_uid="gestion_bodega.week_calendar.delete",
+)
@@ -0,0 +1,73 @@
+# gestion_bodega/tasks.py
+"""
+Tareas periódicas de bodega (las ejecuta `manage.py run_scheduler`).
+"""
+from __future__ import annotations
+
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from agroproductores_risol.utils.shared_cache import shared_cache_configured
+from gestion_bodega.models import CierreSemanal, TemporadaBodega
+from gestion_bodega.services.reportes.semanal_service import build_reporte_semanal_json
+from gestion_bodega.services.tablero_alertas import evaluar_alertas
+from gestion_bodega.services.week_service import WeekService
+from gestion_bodega.utils.semana import iso_week_code
+from gestion_bodega.utils.week_calendar import get_week_calendar
+from gestion_usuarios.services.scheduler import periodic_task
+
+
+def _contextos_activos():
+    return (
+        TemporadaBodega.objects.filter(is_active=True, finalizada=False, bodega__is_active=True)
+        .select_related("bodega")
+        .order_by("id")
+    )
+
+
+@periodic_task("bodega.cerrar_semanas_vencidas", cada=timedelta(minutes=5))
+def cerrar_semanas_vencidas():
+    """Cierra (clamp a 7 días) las semanas abiertas ya expiradas."""
+    limite = timezone.localdate() - timedelta(days=6)
+    vencidas = (
+        CierreSemanal.objects.filter(is_active=True, fecha_hasta__isnull=True, fecha_desde__lt=limite)
+        .select_related("bodega", "temporada")
+        .order_by("id")
+    )
+    cerradas = 0
+    for semana in vencidas:
+        with transaction.atomic():
+            if WeekService.auto_close_expired_week(semana.bodega, semana.temporada):
+                cerradas += 1
+    return {"cerradas": cerradas}
+
+
+@periodic_task("bodega.precalentar_reporte_semanal", cada=timedelta(minutes=10))
+def precalentar_reporte_semanal():
+    """Deja en cache el reporte semanal de la semana abierta de cada contexto."""
+    if not shared_cache_configured():
+        # Con LocMem solo se calentaría el cache del propio scheduler.
+        return {"reportes": 0, "omitida": "cache local al proceso"}
+    calentados = 0
+    for temporada in _contextos_activos():
+        semana = get_week_calendar(temporada.bodega_id, temporada.id).open_week()
+        if semana is None:
+            continue
+        build_reporte_semanal_json(
+            temporada.bodega_id, temporada.id, semana.iso_semana or iso_week_code(semana.fecha_desde)
+        )
+        calentados += 1
+    return {"reportes": calentados}
+
+
+@periodic_task("bodega.evaluar_alertas", cada=timedelta(hours=1))
+def evaluar_alertas_tablero():
+    """Re-evalúa las alertas del tablero (sus reglas dependen de la fecha)."""
+    abiertas = 0
+    contextos = 0
+    for temporada in _contextos_activos():
+        abiertas += len(evaluar_alertas(temporada.bodega_id, temporada.id))
+        contextos += 1
+    return {"contextos": contextos, "abiertas": abiertas}
@@ -0,0 +1,84 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from gestion_bodega.models import (
+    Bodega,
+    CamionConsumoEmpaque,
+    CamionSalida,
+    CierreSemanal,
+    ClasificacionEmpaque,
+    Material,
+    Recepcion,
+    TemporadaBodega,
+)
+
+
+class CamionBulkCargasTests(APITestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_superuser(
+            telefono="9990000361", password="secret123", nombre="Carga", apellido="Camion"
+        )
+        self.client.force_authenticate(self.user)
+        hoy = timezone.localdate()
+        self.bodega = Bodega.objects.create(nombre="Bodega Cargas")
+        self.temporada = TemporadaBodega.objects.create(bodega=self.bodega, año=2025, fecha_inicio=hoy)
+        semana = CierreSemanal.objects.create(
+            bodega=self.bodega, temporada=self.temporada, fecha_desde=hoy - timedelta(days=1)
+        )
+        recepcion = Recepcion.objects.create(
+            bodega=self.bodega, temporada=self.temporada, semana=semana, fecha=hoy,
+            huertero_nombre="Huerta", tipo_mango="KENT", cajas_campo=100,
+        )
+        self.primera, self.segunda = (
+            ClasificacionEmpaque.objects.create(
+                bodega=self.bodega, temporada=self.temporada, semana=semana, recepcion=recepcion,
+                fecha=hoy, material=Material.PLASTICO, calidad=calidad, tipo_mango="KENT",
+                cantidad_cajas=cajas,
+            )
+            for calidad, cajas in (("PRIMERA", 40), ("SEGUNDA", 20))
+        )
+        self.camion = CamionSalida.objects.create(
+            bodega=self.bodega, temporada=self.temporada, semana=semana, fecha_salida=hoy
+        )
+        self.url = f"/bodega/camiones/{self.camion.id}/cargas/bulk/"
+
+    def test_manifest_is_created_in_one_shot(self):
+        response = self.client.post(
+            self.url,
+            {"items": [
+                {"clasificacion_id": self.primera.id, "cantidad": 25},
+                {"clasificacion_empaque_id": self.segunda.id, "cantidad": 20},
+                {"clasificacion_id": self.primera.id, "cantidad": 15},
+            ]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        data = response.json()["data"]
+        self.assertEqual((data["count"], data["total_cantidad"]), (3, 60))
+        self.assertEqual([c["cantidad"] for c in data["cargas"]], [25, 20, 15])
+        self.assertTrue(all(c["id"] for c in data["cargas"]))
+        self.assertEqual(data["cargas"][0]["huertero_nombre"], "Huerta")
+        self.assertEqual(self.camion.cargas.count(), 3)
+
+    def test_manifest_is_all_or_nothing(self):
+        CamionConsumoEmpaque.objects.create(camion=self.camion, clasificacion_empaque=self.segunda, cantidad=15)
+
+        response = self.client.post(
+            self.url,
+            {"items": [
+                {"clasificacion_id": self.primera.id, "cantidad": 10},
+                {"clasificacion_id": self.segunda.id, "cantidad": 4},
+                {"clasificacion_id": self.segunda.id, "cantidad": 4},
+                {"clasificacion_id": 999999, "cantidad": 1},
+            ]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        errores = response.json()["data"]["errors"]["items"]
+        self.assertEqual([e["index"] for e in errores], [1, 2, 3])
+        self.assertEqual((errores[0]["disponible"], errores[0]["solicitado"]), (5, 8))
+        self.assertEqual(self.camion.cargas.count(), 1)
@@ -0,0 +1,90 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from gestion_bodega.models import (
+    Bodega,
+    CierreSemanal,
+    ClasificacionEmpaque,
+    LoteBodega,
+    Material,
+    Recepcion,
+    TemporadaBodega,
+)
+from gestion_bodega.services.lote_summary import summarize_lotes
+
+
+class LoteSummaryTests(APITestCase):
+    def setUp(self):
+        hoy = timezone.localdate()
+        self.hoy = hoy
+        self.bodega = Bodega.objects.create(nombre="Bodega Lotes")
+        self.temporada = TemporadaBodega.objects.create(bodega=self.bodega, año=2025, fecha_inicio=hoy)
+        self.semana = CierreSemanal.objects.create(
+            bodega=self.bodega, temporada=self.temporada, fecha_desde=hoy - timedelta(days=1)
+        )
+        self.lote = self._lote("L-001")
+        self.vacio = self._lote("L-002")
+
+        r1 = self._recepcion(60)
+        r2 = self._recepcion(40)
+        archivada = self._recepcion(500)
+        archivada.archivar()
+
+        self._clasificacion(r1, "PRIMERA", 30)
+        self._clasificacion(r2, "PRIMERA", 20)
+        self._clasificacion(r1, "SEGUNDA", 25)
+
+    def _lote(self, codigo):
+        return LoteBodega.objects.create(
+            bodega=self.bodega, temporada=self.temporada, semana=self.semana, codigo_lote=codigo
+        )
+
+    def _recepcion(self, cajas):
+        return Recepcion.objects.create(
+            bodega=self.bodega, temporada=self.temporada, semana=self.semana, lote=self.lote,
+            fecha=self.hoy, tipo_mango="KENT", cajas_campo=cajas,
+        )
+
+    def _clasificacion(self, recepcion, calidad, cajas):
+        return ClasificacionEmpaque.objects.create(
+            bodega=self.bodega, temporada=self.temporada, semana=self.semana, recepcion=recepcion,
+            lote=self.lote, fecha=self.hoy, material=Material.PLASTICO, calidad=calidad,
+            tipo_mango="KENT", cantidad_cajas=cajas,
+        )
+
+    def test_batch_summary_uses_two_grouped_queries(self):
+        with self.assertNumQueries(2):
+            resumenes = summarize_lotes([self.lote.id, self.vacio.id])
+
+        resumen = resumenes[self.lote.id]
+        self.assertEqual(resumen["total_recibido"], 100)
+        self.assertEqual(resumen["recepciones_count"], 2)
+        self.assertEqual(resumen["total_empacado"], 75)
+        self.assertEqual(resumen["empaques_count"], 3)
+        self.assertEqual(
+            [(d["calidad"], d["cantidad_cajas"], d["registros"]) for d in resumen["desglose"]],
+            [("PRIMERA", 50, 2), ("SEGUNDA", 25, 1)],
+        )
+        self.assertEqual(resumenes[self.vacio.id]["total_recibido"], 0)
+        self.assertEqual(resumenes[self.vacio.id]["desglose"], [])
+
+    def test_resumen_and_list_endpoints(self):
+        user = get_user_model().objects.create_superuser(
+            telefono="9990000341", password="secret123", nombre="Lotes", apellido="Resumen"
+        )
+        self.client.force_authenticate(user)
+
+        response = self.client.get(f"/bodega/lotes/{self.lote.id}/resumen/")
+        self.assertEqual(response.status_code, 200)
+        data = response.json()["data"]
+        self.assertEqual(data["codigo"], "L-001")
+        self.assertEqual((data["total_recibido"], data["total_empacado"]), (100, 75))
+
+        response = self.client.get("/bodega/lotes/", {"bodega": self.bodega.id})
+        self.assertEqual(response.status_code, 200)
+        results = {row["id"]: row for row in response.json()["data"]["results"]}
+        self.assertEqual(results[self.lote.id]["resumen"]["total_empacado"], 75)
+        self.assertEqual(results[self.vacio.id]["resumen"]["recepciones_count"], 0)
@@ -0,0 +1,53 @@
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from agroproductores_risol.utils import pdf_renderer
+from gestion_bodega.utils import reporting
+
+
+class _FakeCSS:
+    parsed = 0
+
+    def __init__(self, string, font_config=None):
+        type(self).parsed += 1
+        self.string = string
+
+
+class _FakeHTML:
+    def __init__(self, string, base_url=None):
+        self.string = string
+
+    def write_pdf(self, stylesheets=None, font_config=None):
+        return b"%PDF-fake " + str(len(stylesheets or [])).encode()
+
+
+class _FakeFontConfiguration:
+    pass
+
+
+@override_settings(PDF_RENDERER={"POOL_SIZE": 0})
+class PdfRendererTests(SimpleTestCase):
+    def setUp(self):
+        pdf_renderer._state["css"].clear()
+        pdf_renderer._state["font_config"] = None
+        self.addCleanup(pdf_renderer._state["css"].clear)
+        _FakeCSS.parsed = 0
+
+    def test_stylesheet_is_parsed_once_per_process(self):
+        fake = mock.patch.object(
+            pdf_renderer, "_weasy", return_value=(_FakeHTML, _FakeCSS, _FakeFontConfiguration)
+        )
+        with fake:
+            first = reporting.render_semana_pdf_from_data({"metadata": {}})
+            second = reporting.render_temporada_pdf_from_data({"metadata": {}})
+        self.assertEqual(first, b"%PDF-fake 1")
+        self.assertEqual(second, b"%PDF-fake 1")
+        self.assertEqual(_FakeCSS.parsed, 1)
+
+    def test_unavailable_weasyprint_uses_reportlab_fallback(self):
+        with mock.patch.object(
+            pdf_renderer, "_weasy", side_effect=pdf_renderer.WeasyPrintUnavailable("sin weasyprint")
+        ):
+            pdf = reporting.render_semana_pdf_from_data({"metadata": {"bodega": {"nombre": "B1"}}})
+        self.assertTrue(pdf.startswith(b"%PDF"))
@@ -1,4 +1,7 @@
+from io import StringIO
+
 from django.core.exceptions import ValidationError
+from django.core.management import call_command
 from django.test import TestCase
 from django.utils import timezone
 
@@ -10,6 +13,7 @@ from gestion_bodega.models import (
     Recepcion,
     TemporadaBodega,
 )
+from gestion_bodega.services.inventory_service import InventoryService
 from gestion_bodega.utils.recepcion_aggregates import annotate_recepcion_status
 
 
@@ -109,3 +113,59 @@ class RecepcionAggregatesTest(TestCase):
                 tipo_mango="KENT",
                 cantidad_cajas=110,
             )
+
+    def test_columns_follow_archive_and_delete(self):
+        linea = ClasificacionEmpaque.objects.create(
+            recepcion=self.recepcion,
+            bodega=self.bodega,
+            temporada=self.temporada,
+            semana=self.semana,
+            fecha=timezone.localdate(),
+            material=Material.PLASTICO,
+            calidad="PRIMERA",
+            tipo_mango="KENT",
+            cantidad_cajas=100,
+        )
+        self.recepcion.refresh_from_db()
+        self.assertEqual((self.recepcion.cajas_empaquetadas, self.recepcion.empaque_status), (100, "EMPACADO"))
+        self.assertEqual(Recepcion.objects.filter(empaque_status="EMPACADO").count(), 1)
+
+        linea.archivar()
+        self.recepcion.refresh_from_db()
+        self.assertEqual((self.recepcion.cajas_empaquetadas, self.recepcion.empaque_status), (0, "SIN_EMPAQUE"))
+
+        linea.desarchivar()
+        self.recepcion.cajas_campo = 150
+        self.recepcion.save(update_fields=["cajas_campo"])
+        self.recepcion.refresh_from_db()
+        self.assertEqual(self.recepcion.empaque_status, "PARCIAL")
+
+        linea.delete()
+        self.recepcion.refresh_from_db()
+        self.assertEqual(self.recepcion.empaque_status, "SIN_EMPAQUE")
+
+    def test_verify_command_repairs_drift(self):
+        ClasificacionEmpaque.objects.create(
+            recepcion=self.recepcion,
+            bodega=self.bodega,
+            temporada=self.temporada,
+            semana=self.semana,
+            fecha=timezone.localdate(),
+            material=Material.PLASTICO,
+            calidad="MERMA",
+            tipo_mango="KENT",
+            cantidad_cajas=30,
+        )
+        Recepcion.objects.filter(pk=self.recepcion.pk).update(cajas_merma=0, empaque_status="SIN_EMPAQUE")
+
+        out = StringIO()
+        call_command("verify_recepcion_empaque", stdout=out)
+        self.assertIn("1 de 1 recepciones con deriva", out.getvalue())
+        self.assertEqual(Recepcion.objects.get(pk=self.recepcion.pk).empaque_status, "SIN_EMPAQUE")
+
+        call_command("verify_recepcion_empaque", "--fix", f"--bodega={self.bodega.id}", stdout=StringIO())
+        self.recepcion.refresh_from_db()
+        self.assertEqual((self.recepcion.cajas_merma, self.recepcion.empaque_status), (30, "MERMA_TOTAL"))
+
+        kpi = InventoryService.get_recepciones_kpi(self.temporada.id, self.bodega.id, None, None, None)
+        self.assertEqual(kpi, {"total_recepciones": 1, "pendientes": 1, "finalizadas": 0})
@@ -0,0 +1,79 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from gestion_bodega.models import Bodega, CierreSemanal, LoteBodega, Recepcion, TemporadaBodega
+
+
+class RecepcionBulkCreateTests(APITestCase):
+    url = "/bodega/recepciones/bulk-create/"
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_superuser(
+            telefono="9990000351", password="secret123", nombre="Captura", apellido="Masiva"
+        )
+        self.client.force_authenticate(self.user)
+        self.hoy = timezone.localdate()
+        self.bodega = Bodega.objects.create(nombre="Bodega Bulk")
+        self.temporada = TemporadaBodega.objects.create(bodega=self.bodega, año=2025, fecha_inicio=self.hoy)
+        self.semana = CierreSemanal.objects.create(
+            bodega=self.bodega, temporada=self.temporada, fecha_desde=self.hoy - timedelta(days=1)
+        )
+        LoteBodega.objects.create(
+            bodega=self.bodega, temporada=self.temporada, semana=self.semana, codigo_lote="L-EXISTE"
+        )
+
+    def _payload(self, items, **extra):
+        return {
+            "bodega": self.bodega.id,
+            "temporada": self.temporada.id,
+            "fecha": str(self.hoy),
+            "items": items,
+            **extra,
+        }
+
+    def test_partial_failure_reports_per_item(self):
+        response = self.client.post(
+            self.url,
+            self._payload([
+                {"huertero_nombre": "Ana", "tipo_mango": "Kent", "cantidad_cajas": 10, "codigo_lote": "l-existe"},
+                {"huertero_nombre": "Beto", "tipo_mango": "Ataulfo", "cantidad_cajas": 0},
+                {"huertero_nombre": "Caro", "tipo_mango": "Kent", "cajas_campo": 7, "codigo_lote": "L-NUEVO"},
+                {"huertero_nombre": "Dani", "tipo_mango": "Kent", "cantidad_cajas": 3, "codigo_lote": "L-NUEVO"},
+            ]),
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        body = response.json()
+        self.assertEqual(body["message_key"], "recepcion_bulk_parcial")
+        self.assertEqual(body["data"]["summary"], {"total": 4, "creadas": 3, "fallidas": 1})
+
+        results = body["data"]["results"]
+        self.assertEqual([r["ok"] for r in results], [True, False, True, True])
+        self.assertIn("cantidad_cajas", results[1]["errors"])
+        self.assertEqual(results[0]["recepcion"]["lote_codigo"], "L-EXISTE")
+        self.assertEqual(results[2]["recepcion"]["cajas_disponibles"], 7)
+
+        creadas = Recepcion.objects.filter(bodega=self.bodega, temporada=self.temporada).order_by("numero")
+        self.assertEqual([r.numero for r in creadas], [1, 2, 3])
+        self.assertEqual({r.semana_id for r in creadas}, {self.semana.id})
+        self.assertEqual(LoteBodega.objects.filter(bodega=self.bodega, codigo_lote="L-NUEVO").count(), 1)
+        self.assertEqual(
+            [r["recepcion"]["id"] for r in results if r["ok"]],
+            list(creadas.values_list("id", flat=True)),
+        )
+
+    def test_closed_week_rejects_whole_batch(self):
+        self.semana.fecha_hasta = self.hoy
+        self.semana.save()
+        response = self.client.post(
+            self.url,
+            self._payload([{"tipo_mango": "Kent", "cantidad_cajas": 5}]),
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.json()["message_key"], "recepcion_semana_cerrada")
+        self.assertFalse(Recepcion.objects.exists())
@@ -0,0 +1,85 @@
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.test import TestCase
+from django.utils import timezone
+
+from gestion_bodega.models import (
+    Bodega,
+    CamionSalida,
+    CierreSemanal,
+    Recepcion,
+    SecuenciaBodega,
+    TemporadaBodega,
+)
+
+
+class SecuenciaBodegaTests(TestCase):
+    def setUp(self):
+        self.hoy = timezone.localdate()
+        self.bodega = Bodega.objects.create(nombre="Bodega Secuencias")
+        self.temporada = TemporadaBodega.objects.create(bodega=self.bodega, año=2025, fecha_inicio=self.hoy)
+        self.semana = CierreSemanal.objects.create(
+            bodega=self.bodega, temporada=self.temporada, fecha_desde=self.hoy - timedelta(days=1)
+        )
+
+    def _camion(self):
+        return CamionSalida.objects.create(
+            bodega=self.bodega, temporada=self.temporada, semana=self.semana, fecha_salida=self.hoy
+        )
+
+    def _recepcion(self, bodega=None, temporada=None, semana=None):
+        return Recepcion.objects.create(
+            bodega=bodega or self.bodega,
+            temporada=temporada or self.temporada,
+            semana=semana or self.semana,
+            fecha=self.hoy,
+            tipo_mango="KENT",
+            cajas_campo=10,
+        )
+
+    def test_confirmar_numera_desde_la_secuencia(self):
+        primero, segundo = self._camion(), self._camion()
+        segundo.confirmar()
+        primero.confirmar()
+        primero.confirmar()  # idempotente: no consume otro número
+
+        self.assertEqual((segundo.numero, primero.numero), (1, 2))
+        secuencia = SecuenciaBodega.objects.get(
+            bodega=self.bodega, temporada=self.temporada, clave=SecuenciaBodega.CAMION
+        )
+        self.assertEqual(secuencia.ultimo, 2)
+
+    def test_secuencia_nueva_continua_datos_previos(self):
+        previo = self._camion()
+        CamionSalida.objects.filter(pk=previo.pk).update(numero=7, estado="CONFIRMADO")
+
+        camion = self._camion()
+        camion.confirmar()
+        self.assertEqual(camion.numero, 8)
+
+    def test_folio_de_recepcion_por_contexto(self):
+        otra_bodega = Bodega.objects.create(nombre="Otra Secuencias")
+        otra_temporada = TemporadaBodega.objects.create(bodega=otra_bodega, año=2025, fecha_inicio=self.hoy)
+        otra_semana = CierreSemanal.objects.create(
+            bodega=otra_bodega, temporada=otra_temporada, fecha_desde=self.hoy - timedelta(days=1)
+        )
+
+        a1, a2 = self._recepcion(), self._recepcion()
+        b1 = self._recepcion(otra_bodega, otra_temporada, otra_semana)
+        a2.huertero_nombre = "Editada"
+        a2.save()
+
+        self.assertEqual((a1.numero, a2.numero, b1.numero), (1, 2, 1))
+        a2.refresh_from_db()
+        self.assertEqual(a2.numero, 2)
+
+    def test_numero_de_recepcion_unico_en_la_bd(self):
+        primera = self._recepcion()
+        sin_numero = self._recepcion()
+        otra_sin_numero = self._recepcion()
+        # Recepciones previas a la numeración: varios NULL en el mismo contexto.
+        Recepcion.objects.filter(pk__in=[sin_numero.pk, otra_sin_numero.pk]).update(numero=None)
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Recepcion.objects.filter(pk=sin_numero.pk).update(numero=primera.numero)
@@ -0,0 +1,135 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from gestion_bodega.models import (
+    AlertaTablero,
+    Bodega,
+    CierreSemanal,
+    Recepcion,
+    SecuenciaBodega,
+    TemporadaBodega,
+)
+from gestion_bodega.services.tablero_alertas import alertas_abiertas, evaluar_alertas
+
+
+class TableroAlertasTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.hoy = timezone.localdate()
+        self.bodega = Bodega.objects.create(nombre="Bodega Alertas")
+        self.temporada = TemporadaBodega.objects.create(bodega=self.bodega, año=2025, fecha_inicio=self.hoy)
+        self.semana = CierreSemanal.objects.create(
+            bodega=self.bodega, temporada=self.temporada, fecha_desde=self.hoy - timedelta(days=1)
+        )
+        # En TestCase nunca hay commit: se descartan los callbacks del setUp para que
+        # la evaluación agendada dentro de cada prueba no se tome como duplicada.
+        connection.run_on_commit.clear()
+
+    def _codigos(self, **filtros):
+        return set(
+            AlertaTablero.objects.filter(bodega=self.bodega, temporada=self.temporada, **filtros)
+            .values_list("codigo", flat=True)
+        )
+
+    def test_write_resolves_alert_and_keeps_history(self):
+        evaluar_alertas(self.bodega.id, self.temporada.id)
+        self.assertEqual(self._codigos(resuelta_en__isnull=True), {"NO_RECEPCIONES_72H", "SIN_INVENTARIO_7D"})
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            for cajas in (10, 20):
+                Recepcion.objects.create(
+                    bodega=self.bodega, temporada=self.temporada, semana=self.semana, fecha=self.hoy,
+                    huertero_nombre="Huerta", tipo_mango="KENT", cajas_campo=cajas,
+                )
+        # Una sola evaluación por contexto y transacción
+        self.assertEqual(sum(hasattr(cb, "alertas_contexto") for cb in callbacks), 1)
+
+        self.assertEqual(self._codigos(resuelta_en__isnull=True), {"SIN_INVENTARIO_7D"})
+        self.assertEqual(self._codigos(resuelta_en__isnull=False), {"NO_RECEPCIONES_72H"})
+
+    def test_reads_are_served_from_state_table(self):
+        call_command("evaluate_tablero_alerts", stdout=StringIO())
+        with self.assertNumQueries(1):
+            alerts = alertas_abiertas(self.bodega.id, self.temporada.id)
+        self.assertEqual([a["code"] for a in alerts], ["NO_RECEPCIONES_72H", "SIN_INVENTARIO_7D"])
+
+        user = get_user_model().objects.create_superuser(
+            telefono="9990000391", password="secret123", nombre="Alertas", apellido="Tablero"
+        )
+        self.client.force_authenticate(user)
+        params = {"bodega": self.bodega.id, "temporada": self.temporada.id}
+        response = self.client.get("/bodega/tablero/alerts/", params)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["data"]["alerts"]), 2)
+        self.assertTrue(response.json()["data"]["alerts"][0]["abierta_en"])
+
+        response = self.client.get("/bodega/tablero/alerts/history/", {**params, "estado": "resueltas"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["data"]["results"], [])
+
+    def test_evaluation_locks_its_own_row_not_the_temporada(self):
+        with mock.patch.object(
+            TemporadaBodega.objects, "select_for_update", wraps=TemporadaBodega.objects.select_for_update
+        ) as temporada_lock:
+            evaluar_alertas(self.bodega.id, self.temporada.id)
+            evaluar_alertas(self.bodega.id, self.temporada.id)
+        temporada_lock.assert_not_called()
+        lock = SecuenciaBodega.objects.get(
+            bodega=self.bodega, temporada=self.temporada, clave=SecuenciaBodega.ALERTAS
+        )
+        self.assertEqual(lock.ultimo, 2)
+        self.assertEqual(
+            AlertaTablero.objects.filter(bodega=self.bodega, temporada=self.temporada).count(), 2
+        )
+
+    def test_alerts_etag_changes_when_evaluation_opens_an_alert(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            evaluar_alertas(self.bodega.id, self.temporada.id)
+        user = get_user_model().objects.create_superuser(
+            telefono="9990000392", password="secret123", nombre="Alertas", apellido="ETag"
+        )
+        self.client.force_authenticate(user)
+        params = {"bodega": self.bodega.id, "temporada": self.temporada.id}
+        etag = self.client.get("/bodega/tablero/alerts/", params)["ETag"]
+
+        # Sin cambios en las alertas la versión no se mueve.
+        with self.captureOnCommitCallbacks(execute=True):
+            evaluar_alertas(self.bodega.id, self.temporada.id)
+        self.assertEqual(self.client.get("/bodega/tablero/alerts/", params, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        AlertaTablero.objects.filter(codigo="SIN_INVENTARIO_7D").delete()
+        with self.captureOnCommitCallbacks(execute=True):
+            evaluar_alertas(self.bodega.id, self.temporada.id)  # la vuelve a abrir
+        response = self.client.get("/bodega/tablero/alerts/", params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_one_evaluation_per_transaction_and_rollback_resets(self):
+        def recepcion():
+            Recepcion.objects.create(
+                bodega=self.bodega, temporada=self.temporada, semana=self.semana, fecha=self.hoy,
+                huertero_nombre="Huerta", tipo_mango="KENT", cajas_campo=5,
+            )
+
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            recepcion()
+            raise RuntimeError("rollback")
+        with self.captureOnCommitCallbacks() as callbacks:
+            recepcion()
+            recepcion()
+        self.assertEqual(sum(hasattr(cb, "alertas_contexto") for cb in callbacks), 1)
+
+    @override_settings(SCHEDULER={"ENABLED": True, "POLL_SECONDS": 30, "HISTORY_DAYS": 30})
+    def test_reads_do_not_evaluate_with_scheduler(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(alertas_abiertas(self.bodega.id, self.temporada.id), [])
+        self.assertFalse(AlertaTablero.objects.exists())
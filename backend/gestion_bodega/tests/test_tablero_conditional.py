@@ -0,0 +1,92 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from gestion_bodega.models import Bodega, CierreSemanal, Recepcion, TemporadaBodega
+
+
+class TableroConditionalGetTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_superuser(
+            telefono="9990000301",
+            password="secret123",
+            nombre="Tablero",
+            apellido="Admin",
+        )
+        self.client.force_authenticate(self.user)
+        today = timezone.localdate()
+        self.bodega = Bodega.objects.create(nombre="Bodega ETag", ubicacion="Zona")
+        self.temporada = TemporadaBodega.objects.create(
+            bodega=self.bodega,
+            año=today.year,
+            fecha_inicio=today,
+        )
+        self.semana = CierreSemanal.objects.create(
+            bodega=self.bodega,
+            temporada=self.temporada,
+            fecha_desde=today,
+        )
+        self.params = {"bodega": self.bodega.id, "temporada": self.temporada.id}
+
+    def _get(self, url, etag=None, **extra_params):
+        headers = {"HTTP_IF_NONE_MATCH": etag} if etag else {}
+        return self.client.get(url, {**self.params, **extra_params}, **headers)
+
+    def test_summary_returns_304_until_context_changes(self):
+        url = "/bodega/tablero/summary/"
+        first = self._get(url)
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        etag = first["ETag"]
+        self.assertTrue(etag)
+        self.assertIn("no-cache", first["Cache-Control"])
+        self.assertNotIn("no-store", first["Cache-Control"])
+
+        cached = self._get(url, etag)
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(cached["ETag"], etag)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Recepcion.objects.create(
+                bodega=self.bodega,
+                temporada=self.temporada,
+                semana=self.semana,
+                fecha=timezone.localdate(),
+                huertero_nombre="Productor",
+                tipo_mango="Kent",
+                cajas_campo=10,
+            )
+
+        fresh = self._get(url, etag)
+        self.assertEqual(fresh.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(fresh["ETag"], etag)
+        self.assertEqual(fresh.json()["data"]["kpis"]["recepcion"]["cajas_total"], 10)
+
+    def test_etag_is_scoped_by_view_and_params(self):
+        summary = self._get("/bodega/tablero/summary/")
+        alerts = self._get("/bodega/tablero/alerts/")
+        nav = self._get("/bodega/tablero/semanas/")
+        queue = self._get("/bodega/tablero/queues/", type="recepciones")
+        other_queue = self._get("/bodega/tablero/queues/", type="despachos")
+        etags = {r["ETag"] for r in (summary, alerts, nav, queue, other_queue)}
+        self.assertEqual(len(etags), 5)
+
+        stale = self._get("/bodega/tablero/queues/", summary["ETag"], type="recepciones")
+        self.assertEqual(stale.status_code, status.HTTP_200_OK)
+
+    def test_changes_in_other_context_keep_etag(self):
+        url = "/bodega/tablero/semanas/"
+        etag = self._get(url)["ETag"]
+
+        otra = Bodega.objects.create(nombre="Otra bodega", ubicacion="Sur")
+        with self.captureOnCommitCallbacks(execute=True):
+            TemporadaBodega.objects.create(bodega=otra, año=self.temporada.año, fecha_inicio=timezone.localdate())
+
+        self.assertEqual(self._get(url, etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_bad_request_has_no_etag(self):
+        response = self.client.get("/bodega/tablero/summary/", {"temporada": self.temporada.id})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(response.has_header("ETag"))
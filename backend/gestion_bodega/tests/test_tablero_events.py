@@ -0,0 +1,155 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from gestion_bodega.models import Bodega, CierreSemanal, Recepcion, TemporadaBodega
+from gestion_bodega.services.tablero_events import (
+    ALL_TOPICS,
+    CacheEventBackend,
+    InProcessEventBackend,
+    TableroEventBroker,
+    get_broker,
+    publish_tablero_change,
+    reset_broker,
+)
+from gestion_bodega.services import tablero_events
+
+
+class TableroEventBrokerTests(SimpleTestCase):
+    def test_wait_merges_topics_since_last_id(self):
+        broker = TableroEventBroker(InProcessEventBackend(history=10))
+        broker.publish(1, 2, ["kpis"])
+        broker.publish(1, 2, ["queue:recepciones", "kpis"])
+        broker.publish(1, 3, ["alerts"])
+
+        last, topics = broker.wait(1, 2, 0, timeout=0)
+        self.assertEqual(last, 2)
+        self.assertEqual(topics, ["kpis", "queue:recepciones"])
+        self.assertEqual(broker.wait(1, 2, 2, timeout=0), (None, []))
+
+    def test_resync_when_history_is_incomplete(self):
+        broker = TableroEventBroker(InProcessEventBackend(history=1))
+        broker.publish(1, 2, ["kpis"])
+        broker.publish(1, 2, ["week"])
+        last, topics = broker.wait(1, 2, 0, timeout=0)
+        self.assertEqual(last, 2)
+        self.assertEqual(topics, list(ALL_TOPICS))
+
+        # Last-Event-ID mayor al actual (backend reiniciado) también resincroniza.
+        last, topics = broker.wait(1, 2, 50, timeout=0)
+        self.assertEqual((last, topics), (2, list(ALL_TOPICS)))
+
+    def test_cache_backend_shares_sequence(self):
+        cache.clear()
+        publisher = TableroEventBroker(CacheEventBackend(cache_ttl=60, poll_seconds=0.01))
+        reader = TableroEventBroker(CacheEventBackend(cache_ttl=60, poll_seconds=0.01))
+        publisher.publish(5, 6, ["alerts"])
+        publisher.publish(5, 6, ["queue:despachos"])
+        self.assertEqual(reader.last_id(5, 6), 2)
+        self.assertEqual(reader.wait(5, 6, 1, timeout=0), (2, ["queue:despachos"]))
+        self.assertEqual(reader.wait(5, 6, 2, timeout=0.02), (None, []))
+
+
+    def test_backend_follows_shared_cache_and_publish_logs_failures(self):
+        self.addCleanup(reset_broker)
+        with override_settings(BODEGA_TABLERO_EVENTS={"ENABLED": True}):
+            for compartido, backend in ((True, CacheEventBackend), (False, InProcessEventBackend)):
+                reset_broker()
+                with mock.patch.object(tablero_events, "shared_cache_configured", return_value=compartido):
+                    self.assertIsInstance(get_broker().backend, backend)
+
+            with mock.patch.object(get_broker().backend, "publish", side_effect=RuntimeError("caido")), \
+                    self.assertLogs(tablero_events.logger, "ERROR"):
+                publish_tablero_change(1, 2, "recepcion")
+
+    def test_disabled_channel_publishes_nothing(self):
+        reset_broker()
+        self.addCleanup(reset_broker)
+        with override_settings(BODEGA_TABLERO_EVENTS={"ENABLED": False}):
+            publish_tablero_change(1, 2, "recepcion")
+        with override_settings(BODEGA_TABLERO_EVENTS={"ENABLED": True}):
+            self.assertEqual(get_broker().last_id(1, 2), 0)
+
+
+@override_settings(BODEGA_TABLERO_EVENTS={"ENABLED": True, "HEARTBEAT_SECONDS": 0.05, "MAX_STREAM_SECONDS": 0.2})
+class TableroEventsViewTests(APITestCase):
+    def setUp(self):
+        reset_broker()
+        self.addCleanup(reset_broker)
+        self.user = get_user_model().objects.create_superuser(
+            telefono="9990000302",
+            password="secret123",
+            nombre="Tablero",
+            apellido="Eventos",
+        )
+        self.client.force_authenticate(self.user)
+        today = timezone.localdate()
+        self.bodega = Bodega.objects.create(nombre="Bodega SSE", ubicacion="Zona")
+        self.temporada = TemporadaBodega.objects.create(bodega=self.bodega, año=today.year, fecha_inicio=today)
+        self.semana = CierreSemanal.objects.create(bodega=self.bodega, temporada=self.temporada, fecha_desde=today)
+        self.params = {"bodega": self.bodega.id, "temporada": self.temporada.id}
+
+    def _events(self, response):
+        body = b"".join(response.streaming_content).decode()
+        events = []
+        for block in body.split("\n\n"):
+            fields = dict(line.split(": ", 1) for line in block.splitlines() if ": " in line and not line.startswith(":"))
+            if "event" in fields:
+                events.append(fields)
+        return body, events
+
+    def test_stream_replays_changes_after_last_event_id(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Recepcion.objects.create(
+                bodega=self.bodega,
+                temporada=self.temporada,
+                semana=self.semana,
+                fecha=timezone.localdate(),
+                huertero_nombre="Productor",
+                tipo_mango="Kent",
+                cajas_campo=5,
+            )
+        last = get_broker().last_id(self.bodega.id, self.temporada.id)
+        self.assertGreater(last, 0)
+
+        response = self.client.get(
+            "/bodega/tablero/events/",
+            self.params,
+            HTTP_ACCEPT="text/event-stream",
+            HTTP_LAST_EVENT_ID="0",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["Content-Type"].startswith("text/event-stream"))
+        body, events = self._events(response)
+
+        self.assertTrue(body.startswith("retry: "))
+        self.assertEqual(events[0]["event"], "ready")
+        changed = [e for e in events if e["event"] == "changed"]
+        self.assertEqual(len(changed), 1)
+        self.assertEqual(int(changed[0]["id"]), last)
+        topics = json.loads(changed[0]["data"])["topics"]
+        self.assertIn("queue:recepciones", topics)
+        self.assertIn("kpis", topics)
+        self.assertIn(": keepalive", body)
+
+    def test_stream_requires_matching_context(self):
+        otra = Bodega.objects.create(nombre="Otra SSE", ubicacion="Sur")
+        response = self.client.get(
+            "/bodega/tablero/events/",
+            {"bodega": otra.id, "temporada": self.temporada.id},
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json()["message_key"], "tablero_events_contexto_invalido")
+
+    def test_stream_is_opt_in(self):
+        with override_settings(BODEGA_TABLERO_EVENTS={"ENABLED": False}):
+            response = self.client.get("/bodega/tablero/events/", self.params)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.json()["message_key"], "tablero_events_deshabilitado")
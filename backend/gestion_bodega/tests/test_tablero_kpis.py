@@ -0,0 +1,86 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from gestion_bodega.models import (
+    Bodega,
+    CierreSemanal,
+    ClasificacionEmpaque,
+    Material,
+    Recepcion,
+    TemporadaBodega,
+)
+from gestion_bodega.services.tablero_kpis import compute_tablero_kpis, tablero_context
+from gestion_bodega.utils import week_calendar
+from gestion_bodega.utils.week_calendar import clear_week_calendars
+
+
+class TableroKpisTests(APITestCase):
+    def setUp(self):
+        clear_week_calendars()
+        self.hoy = timezone.localdate()
+        self.bodega = Bodega.objects.create(nombre="Bodega KPIs")
+        self.temporada = TemporadaBodega.objects.create(bodega=self.bodega, año=2025, fecha_inicio=self.hoy)
+        self.semana = CierreSemanal.objects.create(
+            bodega=self.bodega, temporada=self.temporada, fecha_desde=self.hoy - timedelta(days=1)
+        )
+        completa = self._recepcion(50)
+        parcial = self._recepcion(40)
+        self._recepcion(10)
+        self._clasificacion(completa, "PRIMERA", 45)
+        self._clasificacion(completa, "MERMA", 5)
+        self._clasificacion(parcial, "SEGUNDA", 15)
+
+    def _recepcion(self, cajas):
+        return Recepcion.objects.create(
+            bodega=self.bodega, temporada=self.temporada, semana=self.semana, fecha=self.hoy,
+            huertero_nombre="Huerta", tipo_mango="KENT", cajas_campo=cajas,
+        )
+
+    def _clasificacion(self, recepcion, calidad, cajas):
+        return ClasificacionEmpaque.objects.create(
+            bodega=self.bodega, temporada=self.temporada, semana=self.semana, recepcion=recepcion,
+            fecha=self.hoy, material=Material.PLASTICO, calidad=calidad, tipo_mango="KENT",
+            cantidad_cajas=cajas,
+        )
+
+    def test_one_query_per_fact_table(self):
+        with self.assertNumQueries(2):
+            kpis = compute_tablero_kpis(self.temporada.id, self.bodega.id, str(self.hoy), str(self.hoy))
+
+        self.assertEqual(kpis["recepcion"]["cajas_total"], 100)
+        self.assertEqual(kpis["recepcion"]["recepciones"], 3)
+        self.assertEqual(
+            kpis["empaque"],
+            {"pendientes": 2, "empacadas": 1, "cajas_empacadas": 60, "merma": 5},
+        )
+
+    def test_context_reads_week_from_calendar(self):
+        with mock.patch.object(connection, "in_atomic_block", False), \
+                mock.patch.object(week_calendar, "shared_cache_configured", return_value=True):
+            tablero_context(self.temporada.id, self.bodega.id)
+            with self.assertNumQueries(1):  # solo etiquetas; la semana sale del calendario
+                ctx = tablero_context(self.temporada.id, self.bodega.id)
+
+        self.assertEqual(ctx["bodega_label"], "Bodega KPIs")
+        self.assertEqual(ctx["temporada_label"], "2025")
+        self.assertEqual(ctx["active_week"]["id"], self.semana.id)
+        self.assertEqual(ctx["active_week"]["estado"], "ABIERTA")
+
+    def test_summary_endpoint_uses_bundle(self):
+        user = get_user_model().objects.create_superuser(
+            telefono="9990000381", password="secret123", nombre="Tablero", apellido="KPIs"
+        )
+        self.client.force_authenticate(user)
+        response = self.client.get(
+            "/bodega/tablero/summary/", {"bodega": self.bodega.id, "temporada": self.temporada.id}
+        )
+        self.assertEqual(response.status_code, 200)
+        data = response.json()["data"]
+        self.assertEqual(data["kpis"]["empaque"]["cajas_empacadas"], 60)
+        self.assertEqual(data["kpis"]["recepcion"]["cajas_total"], 100)
+        self.assertEqual(data["context"]["active_week"]["id"], self.semana.id)
@@ -0,0 +1,125 @@
+from datetime import date, timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from rest_framework.test import APITestCase
+
+from gestion_bodega.models import Bodega, CierreSemanal, TemporadaBodega
+from gestion_bodega.utils.semana import semana_abierta_actual, semana_cerrada_ids
+from gestion_bodega.utils import week_calendar
+from gestion_bodega.utils.week_calendar import (
+    WeekCalendar,
+    clear_week_calendars,
+    get_week_calendar,
+)
+
+
+class WeekCalendarTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        clear_week_calendars()
+        self.addCleanup(clear_week_calendars)
+        self.bodega = Bodega.objects.create(nombre="Bodega Calendario", ubicacion="Norte")
+        self.temporada = TemporadaBodega.objects.create(
+            bodega=self.bodega, año=2025, fecha_inicio=date(2025, 1, 6)
+        )
+        self.s1 = CierreSemanal.objects.create(
+            bodega=self.bodega, temporada=self.temporada,
+            fecha_desde=date(2025, 1, 6), fecha_hasta=date(2025, 1, 12),
+        )
+        self.s2 = CierreSemanal.objects.create(
+            bodega=self.bodega, temporada=self.temporada,
+            fecha_desde=date(2025, 1, 13), fecha_hasta=date(2025, 1, 15),
+        )
+        self.s3 = CierreSemanal.objects.create(
+            bodega=self.bodega, temporada=self.temporada, fecha_desde=date(2025, 1, 20),
+        )
+
+    def test_lookups_match_week_ranges(self):
+        calendar = WeekCalendar.load(self.bodega.id, self.temporada.id)
+
+        self.assertEqual(calendar.week_for(date(2025, 1, 8)).id, self.s1.id)
+        self.assertEqual(calendar.week_for(date(2025, 1, 15)).id, self.s2.id)
+        self.assertIsNone(calendar.week_for(date(2025, 1, 17)))
+        # Semana abierta: fin efectivo = inicio + 6 días.
+        self.assertEqual(calendar.week_for(date(2025, 1, 26)).id, self.s3.id)
+        self.assertIsNone(calendar.week_for(date(2025, 1, 27)))
+        self.assertIsNone(calendar.week_for(date(2025, 1, 1)))
+
+        self.assertTrue(calendar.is_closed(date(2025, 1, 12)))
+        self.assertTrue(calendar.is_closed(date(2025, 1, 13)))
+        self.assertFalse(calendar.is_closed(date(2025, 1, 16)))
+        self.assertFalse(calendar.is_closed(date(2025, 1, 21)))
+
+        self.assertEqual(calendar.open_week().id, self.s3.id)
+        hoy = date(2025, 1, 22)
+        self.assertEqual(calendar.range_for(self.s3.id, hoy)[:2], (date(2025, 1, 20), hoy))
+        self.assertEqual(calendar.range_for(self.s1.id, hoy)[:2], (date(2025, 1, 6), date(2025, 1, 12)))
+        with self.assertRaises(ValueError):
+            calendar.range_for(999999, hoy)
+
+    def _fuera_de_transaccion(self):
+        """Fuera del atomic del TestCase y con cache compartido."""
+        for patcher in (
+            mock.patch.object(connection, "in_atomic_block", False),
+            mock.patch.object(week_calendar, "shared_cache_configured", return_value=True),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_cached_calendar_reloads_after_week_change(self):
+        self._fuera_de_transaccion()
+        first = get_week_calendar(self.bodega.id, self.temporada.id)
+        with self.assertNumQueries(0):
+            self.assertIs(get_week_calendar(self.bodega.id, self.temporada.id), first)
+            self.assertIsNotNone(semana_abierta_actual(self.bodega.id, self.temporada.id))
+
+        with mock.patch.object(connection, "in_atomic_block", True):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.s3.fecha_hasta = date(2025, 1, 23)
+                self.s3.save()
+
+        second = get_week_calendar(self.bodega.id, self.temporada.id)
+        self.assertIsNot(second, first)
+        self.assertTrue(second.is_closed(date(2025, 1, 22)))
+        self.assertIsNone(semana_abierta_actual(self.bodega.id, self.temporada.id))
+
+    def test_write_guards_ignore_a_stale_calendar(self):
+        self._fuera_de_transaccion()
+        stale = get_week_calendar(self.bodega.id, self.temporada.id)
+        # Otro worker cierra la semana y su versión no llega a este proceso.
+        CierreSemanal.objects.filter(pk=self.s3.pk).update(fecha_hasta=date(2025, 1, 23))
+
+        self.assertIs(get_week_calendar(self.bodega.id, self.temporada.id), stale)
+        self.assertTrue(semana_cerrada_ids(self.bodega.id, self.temporada.id, date(2025, 1, 22)))
+        fresh = get_week_calendar(self.bodega.id, self.temporada.id, fresh=True)
+        self.assertTrue(fresh.is_closed(date(2025, 1, 22)))
+        self.assertIs(get_week_calendar(self.bodega.id, self.temporada.id), fresh)
+
+    def test_entries_expire_and_need_a_shared_cache(self):
+        self._fuera_de_transaccion()
+        first = get_week_calendar(self.bodega.id, self.temporada.id)
+        ahora = week_calendar.time.monotonic()
+        with mock.patch.object(week_calendar.time, "monotonic", return_value=ahora + week_calendar.WEEK_CALENDAR_TTL):
+            self.assertIsNot(get_week_calendar(self.bodega.id, self.temporada.id), first)
+
+        with mock.patch.object(week_calendar, "shared_cache_configured", return_value=False):
+            with self.assertNumQueries(1):
+                get_week_calendar(self.bodega.id, self.temporada.id)
+
+    def test_index_uses_active_weeks_only(self):
+        user = get_user_model().objects.create_superuser(
+            telefono="9990000321", password="secret123", nombre="Index", apellido="Semanas"
+        )
+        self.client.force_authenticate(user)
+        CierreSemanal.objects.filter(pk=self.s2.pk).update(is_active=False)
+
+        response = self.client.get("/bodega/cierres/index/", {"temporada": self.temporada.id})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()["data"]
+        self.assertEqual([w["semana_id"] for w in data["weeks"]], [self.s1.id, self.s3.id])
+        self.assertEqual(data["current_semana_ix"], 2)
+        self.assertEqual(data["weeks"][1]["desde"], str(date(2025, 1, 20)))
+        self.assertEqual(data["weeks"][0]["hasta"], str(date(2025, 1, 6) + timedelta(days=6)))
@@ -20,6 +20,8 @@ from .views.tablero_views import (
     TableroBodegaSummaryView,
     TableroBodegaQueuesView,
     TableroBodegaAlertsView,
+    TableroBodegaAlertsHistoryView,
+    TableroBodegaEventsView,
     TableroBodegaWeekCurrentView,
     TableroBodegaWeekStartView,
     TableroBodegaWeekFinishView,
@@ -50,6 +52,8 @@ urlpatterns = [
     path("tablero/summary/", TableroBodegaSummaryView.as_view(), name="bodega-tablero-summary"),
     path("tablero/queues/",  TableroBodegaQueuesView.as_view(),  name="bodega-tablero-queues"),
     path("tablero/alerts/",  TableroBodegaAlertsView.as_view(),  name="bodega-tablero-alerts"),
+    path("tablero/alerts/history/", TableroBodegaAlertsHistoryView.as_view(), name="bodega-tablero-alerts-history"),
+    path("tablero/events/",  TableroBodegaEventsView.as_view(),  name="bodega-tablero-events"),
 
     # Tablero: gestión/navegación de semanas (manual)
     path("tablero/week/current/", TableroBodegaWeekCurrentView.as_view(), name="bodega-tablero-week-current"),
@@ -19,3 +19,27 @@ def k_cierres_semana(bodega_id: int, temporada_id: int) -> str:
 
 def k_camiones_list(bodega_id: int, temporada_id: int) -> str:
     return f"bodega:camiones:{bodega_id}:{temporada_id}"
+
+def k_tablero_version(bodega_id: int, temporada_id: int) -> str:
+    return f"bodega:tablero:version:{bodega_id}:{temporada_id}"
+
+def k_bodega_global_version() -> str:
+    return "bodega:tablero:version:global"
+
+def k_week_calendar_version(bodega_id: int, temporada_id: int) -> str:
+    return f"bodega:semanas:version:{bodega_id}:{temporada_id}"
+
+def k_tablero_alertas_evaluadas(bodega_id: int, temporada_id: int) -> str:
+    return f"bodega:tablero:alertas:evaluadas:{bodega_id}:{temporada_id}"
+
+def k_reporte_semanal(bodega_id: int, temporada_id: int, iso_semana: str, version: int) -> str:
+    return f"bodega:reporte:semanal:{bodega_id}:{temporada_id}:{iso_semana}:v{version}"
+
+def k_reporte_semanal_stale(bodega_id: int, temporada_id: int, iso_semana: str) -> str:
+    return f"bodega:reporte:semanal:{bodega_id}:{temporada_id}:{iso_semana}:stale"
+
+def k_reporte_temporada(bodega_id: int, temporada_id: int, version: int) -> str:
+    return f"bodega:reporte:temporada:{bodega_id}:{temporada_id}:v{version}"
+
+def k_reporte_temporada_stale(bodega_id: int, temporada_id: int) -> str:
+    return f"bodega:reporte:temporada:{bodega_id}:{temporada_id}:stale"
@@ -168,6 +168,21 @@ NOTIFICATION_MESSAGES = {
         "type": "success",
         "code": 201,
     },
+    "recepcion_bulk_create_success": {
+        "message": "Recepciones registradas.",
+        "type": "success",
+        "code": 201,
+    },
+    "recepcion_bulk_parcial": {
+        "message": "Se registraron algunas recepciones; revisa los renglones con error.",
+        "type": "warning",
+        "code": 207,
+    },
+    "recepcion_bulk_sin_registros": {
+        "message": "No se registró ninguna recepción; revisa los renglones con error.",
+        "type": "error",
+        "code": 400,
+    },
     "recepcion_update_success": {
         "message": "Recepción actualizada.",
         "type": "success",
@@ -812,6 +827,21 @@ NOTIFICATION_MESSAGES = {
         "type": "error",
         "code": 500,
     },
+    "tablero_alerts_historial_consultado": {
+        "message": "Historial de alertas del tablero consultado correctamente.",
+        "type": "success",
+        "code": 200,
+    },
+    "tablero_events_deshabilitado": {
+        "message": "Los eventos en vivo del tablero no están habilitados; se actualiza por consulta.",
+        "type": "info",
+        "code": 404,
+    },
+    "tablero_events_contexto_invalido": {
+        "message": "Debes indicar una bodega y temporada válidas para recibir eventos del tablero.",
+        "type": "error",
+        "code": 400,
+    },
     "tablero_week_contexto_invalido": {
         "message": "Los parametros de semana no corresponden a la bodega y temporada.",
         "type": "error",
@@ -1,3 +1,5 @@
+from typing import Dict
+
 from django.db.models import Sum
 
 from ..models import ClasificacionEmpaque, CamionConsumoEmpaque
@@ -26,6 +28,24 @@ def get_disponible_for_clasificacion(clasificacion_id: int, lock: bool = False)
     
     return max(0, total - camiones)
 
+def consumos_camion_por_clasificacion(clasificacion_ids, solo_camiones_activos: bool = False) -> Dict[int, int]:
+    """
+    {clasificacion_id: cajas cargadas en camiones} en una sola consulta agrupada.
+    """
+    ids = list(clasificacion_ids)
+    if not ids:
+        return {}
+    qs = CamionConsumoEmpaque.objects.filter(clasificacion_empaque_id__in=ids, is_active=True)
+    if solo_camiones_activos:
+        qs = qs.filter(camion__is_active=True)
+    return dict(
+        qs.values("clasificacion_empaque_id")
+        .annotate(t=Sum("cantidad"))
+        .order_by()
+        .values_list("clasificacion_empaque_id", "t")
+    )
+
+
 def validate_consumo_camion(clasificacion_id: int, cantidad: int, exclude_id: int = None, lock: bool = False):
     """
     Valida si hay stock suficiente para un consumo.
@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 import logging
-from datetime import timedelta
+from datetime import date, timedelta
 from typing import Any, Dict, List, Optional
 
 from django.db.models import Sum, F, QuerySet, Q, Max
@@ -51,83 +51,13 @@ def _path_with_bodega(base_tail: str, bodega_id: Optional[int]) -> str:
 # KPIs — alineados 100% al rango resuelto (sin cálculos ISO implícitos)
 # ──────────────────────────────────────────────────────────────────────────────
 
-def kpi_recepcion(
-    temporada_id: int,
-    bodega_id: Optional[int],
-    fecha_desde: Optional[str],
-    fecha_hasta: Optional[str],
-    huerta_id: Optional[int],
-    semana_id: Optional[int] = None,
-) -> Dict[str, Any]:
-    """
-    Suma de cajas de Recepcion.cajas_campo restringida EXCLUSIVAMENTE al rango recibido.
-    NOTA: El campo fue renombrado de 'kg_total' a 'cajas_total' (se reportan cajas, no kg).
-    """
-    qs = Recepcion.objects.filter(temporada_id=temporada_id, is_active=True)
-    if bodega_id:
-        qs = qs.filter(bodega_id=bodega_id)
-
-    # huerta_id no aplica hoy (no hay FK a huerta en el modelo actual)
-    if semana_id:
-        qs = qs.filter(semana_id=semana_id)
-
-    qs = _apply_date_range(qs, "fecha", fecha_desde, fecha_hasta)
-
-    total_cajas = qs.aggregate(v=Sum(F("cajas_campo")))["v"] or 0
-
-    return {
-        "cajas_total": int(total_cajas or 0),  # F-07 FIX: nombre semántico correcto
-        "apto_pct": None,
-        "merma_pct": None,
-    }
-
-
 # F-12 FIX: Placeholder KPIs eliminados (stock, ocupacion, rotacion, fefo,
 # rechazos_qc, lead_times). Se retornaban ceros/nulos que confundían a los
 # usuarios. Se reincorporarán cuando tengan modelos reales.
 
 from gestion_bodega.services.inventory_service import InventoryService
-
-def kpi_empaque(
-    temporada_id: int,
-    bodega_id: Optional[int],
-    fecha_desde: Optional[str],
-    fecha_hasta: Optional[str],
-    huerta_id: Optional[int],
-    semana_id: Optional[int] = None,
-) -> Dict[str, Any]:
-    """
-    KPIs de proceso de empaque para el periodo.
-    Delegado a InventoryService para consistencia estricta.
-    """
-    # 1. Métricas de produccion (Volumen Cajas)
-    snapshot = InventoryService.get_stock_snapshot(
-        temporada_id=temporada_id,
-        bodega_id=bodega_id,
-        semana_id=semana_id,
-        fecha_desde=fecha_desde,
-        fecha_hasta=fecha_hasta
-    )
-    kpis = snapshot["kpis"]
-
-    # 2. Métricas de estado (Recepciones)
-    # Nota: filter por recepciones aplica fecha_desde a la RECEPCIÓN, no al empaque.
-    # InventoryService.get_recepciones_kpi maneja esto.
-    rec_metrics = InventoryService.get_recepciones_kpi(
-        temporada_id=temporada_id,
-        bodega_id=bodega_id,
-        semana_id=semana_id,
-        fecha_desde=fecha_desde,
-        fecha_hasta=fecha_hasta
-    )
-
-    return {
-        "pendientes": rec_metrics["pendientes"],
-        "empacadas": rec_metrics["finalizadas"],
-        "cajas_empacadas": int(kpis["produced_period"]),
-        "merma": int(kpis["merma_period"]),
-    }
-
+from gestion_bodega.services.lote_summary import summarize_lotes
+from gestion_bodega.services.tablero_kpis import compute_tablero_kpis
 
 def build_summary(
     temporada_id: int,
@@ -139,15 +69,11 @@ def build_summary(
 ) -> Dict[str, Any]:
     """
     Ensambla el objeto de KPIs esperado por el serializer del tablero usando SOLO el rango resuelto.
+    Una consulta por tabla de hechos (services/tablero_kpis.py).
     """
-    # Notar que kpi_empaque ahora usa InventoryService internamente
+    # huerta_id no aplica hoy (no hay FK a huerta en el modelo actual)
     # F-12 FIX: Solo KPIs con datos reales (sin placeholders)
-    return {
-        "kpis": {
-            "recepcion": kpi_recepcion(temporada_id, bodega_id, fecha_desde, fecha_hasta, huerta_id, semana_id=semana_id),
-            "empaque": kpi_empaque(temporada_id, bodega_id, fecha_desde, fecha_hasta, huerta_id, semana_id=semana_id),
-        }
-    }
+    return {"kpis": compute_tablero_kpis(temporada_id, bodega_id, fecha_desde, fecha_hasta, semana_id=semana_id)}
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -337,9 +263,9 @@ def build_queue_items(tipo: str, raw_rows) -> List[Dict[str, Any]]:
         # 1. Bulk prefetch de desgloses (clasificaciones por lote y por recepcion sin lote)
         desglose_cache: Dict[str, List[Dict]] = {}  # "lote:{id}" o "rec:{id}" → details
         if lotes_ids:
-            for d in ClasificacionEmpaque.objects.filter(is_active=True, lote_id__in=lotes_ids).values('lote_id', 'calidad', 'material', 'cantidad_cajas'):
-                key = f"lote:{d['lote_id']}"
-                desglose_cache.setdefault(key, []).append(d)
+            # Desglose agregado por (material, calidad) del lote completo
+            for lote_id, resumen in summarize_lotes(lotes_ids).items():
+                desglose_cache[f"lote:{lote_id}"] = [{"lote_id": lote_id, **d} for d in resumen["desglose"]]
         if recepciones_ids:
             for d in ClasificacionEmpaque.objects.filter(is_active=True, lote__isnull=True, recepcion_id__in=recepciones_ids).values('recepcion_id', 'calidad', 'material', 'cantidad_cajas'):
                 key = f"rec:{d['recepcion_id']}"
@@ -459,9 +385,12 @@ def build_alerts(
     temporada_id: int,
     bodega_id: Optional[int] = None,
     filters: Optional[Dict[str, Any]] = None,
+    today: Optional[date] = None,
 ) -> List[Dict[str, Any]]:
     """
-    Genera la lista de alertas del tablero.
+    Evalúa en vivo las reglas de alertas del tablero. Las lecturas se sirven
+    desde AlertaTablero (services/tablero_alertas.py), que usa esta función
+    como evaluador.
     Estructura esperada por el frontend:
     {
       "code": "ALERTA_X",
@@ -477,7 +406,7 @@ def build_alerts(
     """
     alerts: List[Dict[str, Any]] = []
 
-    today = timezone.localdate()
+    today = today or timezone.localdate()
     d72 = today - timedelta(days=3)
     d24 = today - timedelta(days=1)
     d7 = today - timedelta(days=7)
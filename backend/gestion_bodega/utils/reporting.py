@@ -34,6 +34,11 @@ from gestion_bodega.models import (
     CamionSalida,
     CamionConsumoEmpaque,
 )
+from agroproductores_risol.utils.pdf_renderer import (
+    WeasyPrintUnavailable,
+    register_stylesheet,
+    render_html_to_pdf,
+)
 from .semana import iso_week_code, rango_por_semana_id
 
 
@@ -644,6 +649,10 @@ def _base_css() -> str:
     """
 
 
+PDF_STYLESHEET_KEY = "bodega.reporte"
+register_stylesheet(PDF_STYLESHEET_KEY, _base_css)
+
+
 def _kpi_cards_html(kpis: List[Dict[str, str]]) -> str:
     items = []
     for k in kpis:
@@ -721,27 +730,6 @@ def render_semana_pdf_from_data(reporte_data: Dict[str, Any]) -> bytes:
     desde = rango.get("desde", "")
     hasta = rango.get("hasta", "")
     fecha_gen = meta.get("fecha_generacion", _local_now_str())
-    
-    try:
-        from weasyprint import HTML
-    except Exception as e:
-        # Fallback a ReportLab si WeasyPrint no funca en Windows
-        from reportlab.lib.pagesizes import A4
-        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-        from reportlab.lib.styles import getSampleStyleSheet
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4)
-        styles = getSampleStyleSheet()
-        story = []
-        story.append(Paragraph("Reporte Semanal de Bodega (Fallback)", styles['Title']))
-        story.append(Spacer(1, 12))
-        story.append(Paragraph(f"Bodega: {bodega_nombre} | Temporada: {temporada_anio}", styles['Normal']))
-        story.append(Paragraph(f"Período: {desde} a {hasta}", styles['Normal']))
-        story.append(Spacer(1, 24))
-        story.append(Paragraph("WeasyPrint no esta disponible completamente en este entorno. Se uso un render alterno. Para el PDF completo, instala las dependencias nativas de WeasyPrint o usa Linux/WSL/Docker.", styles['Italic']))
-        doc.build(story)
-        buffer.seek(0)
-        return buffer.getvalue()
 
     # Buscar serie tipo 'pie' para distribución
     dist_data = []
@@ -752,7 +740,7 @@ def render_semana_pdf_from_data(reporte_data: Dict[str, Any]) -> bytes:
 
     html_content = f"""<!DOCTYPE html>
 <html lang="es">
-<head><meta charset="utf-8"><style>{_base_css()}</style></head>
+<head><meta charset="utf-8"></head>
 <body>
 <div class="wrapper">
   <div class="header">
@@ -789,23 +777,10 @@ def render_semana_pdf_from_data(reporte_data: Dict[str, Any]) -> bytes:
 </body>
 </html>"""
 
-    pdf_bytes = HTML(string=html_content).write_pdf()
-    return pdf_bytes
-
-
-def render_temporada_pdf_from_data(reporte_data: Dict[str, Any]) -> bytes:
-    """Genera un PDF profesional para el reporte de temporada usando WeasyPrint (o ReportLab fallback)."""
-    meta = reporte_data.get("metadata", {})
-    kpis = reporte_data.get("kpis", [])
-    tablas = reporte_data.get("tablas", {})
-    series = reporte_data.get("series", [])
-    bodega_nombre = meta.get("bodega", {}).get("nombre", "Bodega")
-    temporada_anio = meta.get("temporada", {}).get("anio", "")
-    fecha_gen = meta.get("fecha_generacion", _local_now_str())
-
     try:
-        from weasyprint import HTML
-    except Exception as e:
+        return render_html_to_pdf(html_content, stylesheet_key=PDF_STYLESHEET_KEY)
+    except WeasyPrintUnavailable:
+        # Fallback a ReportLab si WeasyPrint no funca en Windows
         from reportlab.lib.pagesizes import A4
         from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
         from reportlab.lib.styles import getSampleStyleSheet
@@ -813,15 +788,27 @@ def render_temporada_pdf_from_data(reporte_data: Dict[str, Any]) -> bytes:
         doc = SimpleDocTemplate(buffer, pagesize=A4)
         styles = getSampleStyleSheet()
         story = []
-        story.append(Paragraph("Reporte de Temporada de Bodega (Fallback)", styles['Title']))
+        story.append(Paragraph("Reporte Semanal de Bodega (Fallback)", styles['Title']))
         story.append(Spacer(1, 12))
         story.append(Paragraph(f"Bodega: {bodega_nombre} | Temporada: {temporada_anio}", styles['Normal']))
+        story.append(Paragraph(f"Período: {desde} a {hasta}", styles['Normal']))
         story.append(Spacer(1, 24))
         story.append(Paragraph("WeasyPrint no esta disponible completamente en este entorno. Se uso un render alterno. Para el PDF completo, instala las dependencias nativas de WeasyPrint o usa Linux/WSL/Docker.", styles['Italic']))
         doc.build(story)
         buffer.seek(0)
         return buffer.getvalue()
 
+
+def render_temporada_pdf_from_data(reporte_data: Dict[str, Any]) -> bytes:
+    """Genera un PDF profesional para el reporte de temporada usando WeasyPrint (o ReportLab fallback)."""
+    meta = reporte_data.get("metadata", {})
+    kpis = reporte_data.get("kpis", [])
+    tablas = reporte_data.get("tablas", {})
+    series = reporte_data.get("series", [])
+    bodega_nombre = meta.get("bodega", {}).get("nombre", "Bodega")
+    temporada_anio = meta.get("temporada", {}).get("anio", "")
+    fecha_gen = meta.get("fecha_generacion", _local_now_str())
+
     dist_data = []
     for s in series:
         if s.get("type") == "pie":
@@ -830,7 +817,7 @@ def render_temporada_pdf_from_data(reporte_data: Dict[str, Any]) -> bytes:
 
     html_content = f"""<!DOCTYPE html>
 <html lang="es">
-<head><meta charset="utf-8"><style>{_base_css()}</style></head>
+<head><meta charset="utf-8"></head>
 <body>
 <div class="wrapper">
   <div class="header">
@@ -859,7 +846,23 @@ def render_temporada_pdf_from_data(reporte_data: Dict[str, Any]) -> bytes:
 </body>
 </html>"""
 
-    pdf_bytes = HTML(string=html_content).write_pdf()
-    return pdf_bytes
+    try:
+        return render_html_to_pdf(html_content, stylesheet_key=PDF_STYLESHEET_KEY)
+    except WeasyPrintUnavailable:
+        from reportlab.lib.pagesizes import A4
+        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+        from reportlab.lib.styles import getSampleStyleSheet
+        buffer = BytesIO()
+        doc = SimpleDocTemplate(buffer, pagesize=A4)
+        styles = getSampleStyleSheet()
+        story = []
+        story.append(Paragraph("Reporte de Temporada de Bodega (Fallback)", styles['Title']))
+        story.append(Spacer(1, 12))
+        story.append(Paragraph(f"Bodega: {bodega_nombre} | Temporada: {temporada_anio}", styles['Normal']))
+        story.append(Spacer(1, 24))
+        story.append(Paragraph("WeasyPrint no esta disponible completamente en este entorno. Se uso un render alterno. Para el PDF completo, instala las dependencias nativas de WeasyPrint o usa Linux/WSL/Docker.", styles['Italic']))
+        doc.build(story)
+        buffer.seek(0)
+        return buffer.getvalue()
 
 
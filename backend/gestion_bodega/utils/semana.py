@@ -7,6 +7,7 @@ from typing import Tuple, Optional
 from django.utils import timezone
 
 from gestion_bodega.models import CierreSemanal, TemporadaBodega
+from gestion_bodega.utils.week_calendar import get_week_calendar, week_range
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -89,6 +90,8 @@ def semana_cerrada_ids(bodega_id: int, temporada_id: int, f: date) -> bool:
     True si existe un CierreSemanal ACTIVO para (bodega, temporada) con
     fecha_hasta definida cuyo rango [fecha_desde, fecha_hasta] cubre la fecha f.
     (Las semanas abiertas –fecha_hasta = NULL– NO se consideran cerradas aquí).
+    Es el guard de las escrituras: consulta la BD, nunca el calendario en
+    memoria (podría no reflejar un cierre hecho en otro worker).
     """
     if not (bodega_id and temporada_id and f):
         return False
@@ -126,16 +129,7 @@ def semana_abierta_actual(bodega_id: int, temporada_id: int) -> Optional[CierreS
     """
     if not (bodega_id and temporada_id):
         return None
-    return (
-        CierreSemanal.objects.filter(
-            bodega_id=bodega_id,
-            temporada_id=temporada_id,
-            is_active=True,
-            fecha_hasta__isnull=True,
-        )
-        .order_by("-fecha_desde")
-        .first()
-    )
+    return get_week_calendar(bodega_id, temporada_id).open_week()
 
 
 def rango_por_semana_id(semana_id: int) -> Tuple[date, date, Optional[str]]:
@@ -152,13 +146,4 @@ def rango_por_semana_id(semana_id: int) -> Tuple[date, date, Optional[str]]:
     if not cierre:
         raise ValueError("CierreSemanal no encontrado o inactivo.")
 
-    desde: date = cierre.fecha_desde
-    if cierre.fecha_hasta:
-        hasta: date = cierre.fecha_hasta
-    else:
-        # Semana abierta: acotamos a desde+6 o hoy, lo que ocurra primero (máx. 7 días visibles).
-        hoy = tz_today_mx()
-        hasta = min(desde + timedelta(days=6), hoy)
-
-    label = getattr(cierre, "iso_semana", None) or iso_week_code(desde)
-    return desde, hasta, label
+    return week_range(cierre, tz_today_mx())
@@ -0,0 +1,64 @@
+# gestion_bodega/utils/tablero_version.py
+"""
+Versión de cambios del tablero por (bodega, temporada).
+
+- Se incrementa en `transaction.on_commit` desde gestion_bodega.signals cuando
+  cambia cualquier modelo operativo del contexto.
+- Las vistas del tablero la usan para emitir ETags y contestar 304 sin
+  recalcular KPIs ni colas.
+- Además existe una versión global (cualquier bodega) para vistas transversales
+  como el dashboard general.
+"""
+from __future__ import annotations
+
+from typing import Optional
+
+from django.utils import timezone
+
+from agroproductores_risol.utils.change_versions import (
+    build_etag,
+    bump_change_version,
+    get_change_version,
+)
+from gestion_bodega.utils.cache_keys import k_bodega_global_version, k_tablero_version
+
+
+def get_tablero_version(bodega_id: int, temporada_id: int) -> int:
+    return get_change_version(k_tablero_version(bodega_id, temporada_id))
+
+
+def get_bodega_global_version() -> int:
+    return get_change_version(k_bodega_global_version())
+
+
+def bump_tablero_version(bodega_id: Optional[int], temporada_id: Optional[int]) -> None:
+    """
+    Incrementa la versión del contexto y la global.
+    Llamar SOLO después de commit (las lecturas deben ver el dato nuevo).
+    """
+    if bodega_id and temporada_id:
+        bump_change_version(k_tablero_version(bodega_id, temporada_id))
+    bump_change_version(k_bodega_global_version())
+
+
+def tablero_etag(scope: str, bodega_id: int, temporada_id: int, request) -> str:
+    """
+    ETag para una vista del tablero:
+      scope + versión del contexto + día local + query params ordenados.
+    El día local entra porque alertas, auto-cierre de semanas y rangos
+    por defecto dependen de "hoy".
+    """
+    params = sorted(
+        (k, v)
+        for k in request.query_params.keys()
+        for v in request.query_params.getlist(k)
+    )
+    return build_etag(
+        "tablero",
+        scope,
+        bodega_id,
+        temporada_id,
+        get_tablero_version(bodega_id, temporada_id),
+        timezone.localdate().isoformat(),
+        params,
+    )
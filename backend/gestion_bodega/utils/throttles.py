@@ -1,21 +1,21 @@
 # Scopes de rate-limit alineados al proyecto.
-from rest_framework.throttling import UserRateThrottle
+from agroproductores_risol.utils.rate_limit import SlidingWindowRateThrottle
 
 
-class BaseUserThrottle(UserRateThrottle):
+class BaseUserThrottle(SlidingWindowRateThrottle):
     scope = "default_user"
 
 
-class BodegaWriteThrottle(UserRateThrottle):
+class BodegaWriteThrottle(SlidingWindowRateThrottle):
     """Para recepciones/clasificaciones/pedidos frecuentes."""
     scope = "bodega_write"
 
 
-class BodegaSensitiveThrottle(UserRateThrottle):
+class BodegaSensitiveThrottle(SlidingWindowRateThrottle):
     """Para cierres, ajustes de inventario, cancelaciones."""
     scope = "bodega_sensitive"
 
 
-class BodegaExportThrottle(UserRateThrottle):
+class BodegaExportThrottle(SlidingWindowRateThrottle):
     """Para descargas de reportes PDF/Excel."""
     scope = "bodega_export"
@@ -0,0 +1,184 @@
+# backend/gestion_bodega/utils/week_calendar.py
+"""
+Calendario de semanas (CierreSemanal activos) por (bodega, temporada).
+
+- Carga TODAS las semanas activas del contexto en una consulta y resuelve
+  fecha → semana, "¿está cerrada?" y rangos por búsqueda binaria.
+- Se guarda en memoria del proceso (LRU acotado) junto con la versión del
+  contexto (cache compartido); gestion_bodega.signals incrementa la versión
+  cuando una semana se inicia, cierra o archiva, y el siguiente acceso
+  recarga. Además cada entrada vence a los WEEK_CALENDAR_TTL segundos, y
+  sin cache compartido (LocMem) no se guarda: la versión no cruzaría
+  workers.
+- Es solo para lecturas: los guards de escritura (semana cerrada) consultan
+  la BD (utils.semana.semana_cerrada_ids) y quien asigna la semana a un
+  registro pide `fresh=True`.
+- Dentro de un bloque atómico se arma sin cache: puede haber semanas aún
+  sin confirmar que no deben quedar guardadas si hay rollback.
+- Las semanas devueltas son copias: el llamador puede modificarlas/guardarlas
+  sin tocar el calendario compartido.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_right
+from collections import OrderedDict
+from copy import copy
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from django.db import connection
+
+from agroproductores_risol.utils.change_versions import bump_change_version, get_change_version
+from agroproductores_risol.utils.shared_cache import shared_cache_configured
+from gestion_bodega.models import CierreSemanal
+from gestion_bodega.utils.cache_keys import k_week_calendar_version
+
+MAX_CALENDARS = 256
+WEEK_CALENDAR_TTL = 60  # segundos
+
+
+def _effective_end(semana: CierreSemanal) -> date:
+    return semana.fecha_hasta or (semana.fecha_desde + timedelta(days=6))
+
+
+class WeekCalendar:
+    def __init__(self, bodega_id: int, temporada_id: int, semanas: List[CierreSemanal]):
+        self.bodega_id = bodega_id
+        self.temporada_id = temporada_id
+        self._semanas = sorted(semanas, key=lambda s: (s.fecha_desde, s.id))
+        self._starts = [s.fecha_desde for s in self._semanas]
+        self._by_id: Dict[int, CierreSemanal] = {s.id: s for s in self._semanas}
+
+    @classmethod
+    def load(cls, bodega_id: int, temporada_id: int) -> "WeekCalendar":
+        semanas = list(
+            CierreSemanal.objects.filter(bodega_id=bodega_id, temporada_id=temporada_id, is_active=True)
+        )
+        return cls(bodega_id, temporada_id, semanas)
+
+    def __len__(self) -> int:
+        return len(self._semanas)
+
+    def weeks(self) -> List[CierreSemanal]:
+        """Semanas activas en orden cronológico (copias)."""
+        return [copy(s) for s in self._semanas]
+
+    def _candidate_ix(self, fecha: date) -> int:
+        return bisect_right(self._starts, fecha) - 1
+
+    def week_for(self, fecha: date) -> Optional[CierreSemanal]:
+        """
+        Semana (la de inicio más reciente) cuyo rango efectivo cubre `fecha`.
+        Abiertas: fin efectivo = fecha_desde + 6 días.
+        """
+        if not fecha:
+            return None
+        i = self._candidate_ix(fecha)
+        if i < 0:
+            return None
+        semana = self._semanas[i]
+        return copy(semana) if fecha <= _effective_end(semana) else None
+
+    def is_closed(self, fecha: date) -> bool:
+        """
+        True si una semana CERRADA cubre `fecha` ([fecha_desde, fecha_hasta]).
+        Las abiertas no cuentan como cerradas.
+        """
+        if not fecha:
+            return False
+        i = self._candidate_ix(fecha)
+        # Las semanas duran ≤ 7 días: basta revisar las que inician en ese tramo.
+        while i >= 0 and self._semanas[i].fecha_desde >= fecha - timedelta(days=6):
+            semana = self._semanas[i]
+            if semana.fecha_hasta is not None and fecha <= semana.fecha_hasta:
+                return True
+            i -= 1
+        return False
+
+    def open_week(self) -> Optional[CierreSemanal]:
+        abiertas = [s for s in self._semanas if s.fecha_hasta is None]
+        return copy(abiertas[-1]) if abiertas else None
+
+    def get(self, semana_id: int) -> Optional[CierreSemanal]:
+        semana = self._by_id.get(semana_id)
+        return copy(semana) if semana else None
+
+    def range_for(self, semana_id: int, hoy: date) -> Tuple[date, date, str]:
+        """Mismo contrato que utils.semana.rango_por_semana_id, sin consultar."""
+        semana = self._by_id.get(semana_id)
+        if semana is None:
+            raise ValueError("CierreSemanal no encontrado o inactivo.")
+        return week_range(semana, hoy)
+
+
+def week_range(semana: CierreSemanal, hoy: date) -> Tuple[date, date, str]:
+    """
+    Rango [desde, hasta] visible de una semana:
+    cerrada → tal cual; abierta → min(desde + 6, hoy).
+    """
+    from gestion_bodega.utils.semana import iso_week_code
+
+    desde = semana.fecha_desde
+    hasta = semana.fecha_hasta or min(desde + timedelta(days=6), hoy)
+    label = getattr(semana, "iso_semana", None) or iso_week_code(desde)
+    return desde, hasta, label
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Cache en proceso con invalidación por versión
+# ──────────────────────────────────────────────────────────────────────────────
+
+_calendars: "OrderedDict[Tuple[int, int], Tuple[int, float, WeekCalendar]]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def get_week_calendar(bodega_id: int, temporada_id: int, *, fresh: bool = False) -> WeekCalendar:
+    """
+    Calendario del contexto. `fresh=True` lo recarga de la BD (escrituras que
+    asignan semana); el resultado reemplaza la entrada en memoria.
+    """
+    if connection.in_atomic_block or not shared_cache_configured():
+        return WeekCalendar.load(bodega_id, temporada_id)
+
+    # La versión se lee ANTES de cargar: si cambia durante la carga, el
+    # siguiente acceso verá una versión distinta y recargará.
+    version = get_change_version(k_week_calendar_version(bodega_id, temporada_id))
+    key = (bodega_id, temporada_id)
+    if not fresh:
+        with _lock:
+            hit = _calendars.get(key)
+            if hit and hit[0] == version and time.monotonic() - hit[1] < WEEK_CALENDAR_TTL:
+                _calendars.move_to_end(key)
+                return hit[2]
+
+    loaded_at = time.monotonic()
+    calendar = WeekCalendar.load(bodega_id, temporada_id)
+    with _lock:
+        _calendars[key] = (version, loaded_at, calendar)
+        _calendars.move_to_end(key)
+        while len(_calendars) > MAX_CALENDARS:
+            _calendars.popitem(last=False)
+    return calendar
+
+
+def invalidate_week_calendar(bodega_id: int, temporada_id: int) -> None:
+    """Llamar después de commit cuando cambian las semanas del contexto."""
+    bump_change_version(k_week_calendar_version(bodega_id, temporada_id))
+
+
+def clear_week_calendars() -> None:
+    """Vacía la cache local del proceso (tests)."""
+    with _lock:
+        _calendars.clear()
+
+
+__all__ = [
+    "WEEK_CALENDAR_TTL",
+    "WeekCalendar",
+    "clear_week_calendars",
+    "get_week_calendar",
+    "invalidate_week_calendar",
+    "week_range",
+]
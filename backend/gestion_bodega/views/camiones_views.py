@@ -5,12 +5,13 @@ from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 from django.db import transaction
 from django.core.exceptions import ValidationError as DjangoValidationError
-from datetime import timedelta
 
-from gestion_bodega.models import CamionSalida, CierreSemanal, CamionConsumoEmpaque
-from gestion_bodega.serializers import CamionSalidaSerializer, CamionConsumoEmpaqueSerializer
+from gestion_bodega.models import CamionSalida, CamionConsumoEmpaque
+from gestion_bodega.serializers import CamionSalidaSerializer, CamionConsumoEmpaqueSerializer, CamionCargaBulkSerializer
 from gestion_bodega.permissions import HasModulePermission
 from gestion_bodega.utils.audit import ViewSetAuditMixin
+from gestion_bodega.utils.semana import semana_cerrada_ids
+from gestion_bodega.utils.week_calendar import get_week_calendar
 from agroproductores_risol.utils.pagination import GenericPagination
 from agroproductores_risol.utils.notification_handler import NotificationHandler
 class NotificationMixin:
@@ -45,27 +46,10 @@ class NotificationMixin:
         }
 
 def _semana_cerrada(bodega_id: int, temporada_id: int, fecha):
-    return CierreSemanal.objects.filter(
-        bodega_id=bodega_id, temporada_id=temporada_id,
-        fecha_desde__lte=fecha, fecha_hasta__gte=fecha, is_active=True
-    ).exists()
+    return semana_cerrada_ids(bodega_id, temporada_id, fecha)
 
 def _resolve_semana_for_fecha(bodega, temporada, fecha):
-    qs = (
-        CierreSemanal.objects.filter(
-            bodega=bodega,
-            temporada=temporada,
-            is_active=True,
-        )
-        .order_by("-fecha_desde")
-    )
-
-    for cierre in qs:
-        start = cierre.fecha_desde
-        end = cierre.fecha_hasta or (cierre.fecha_desde + timedelta(days=6))
-        if start <= fecha <= end:
-            return cierre
-    return None
+    return get_week_calendar(bodega.id, temporada.id, fresh=True).week_for(fecha)
 
 
 class CamionSalidaViewSet(ViewSetAuditMixin, NotificationMixin, viewsets.ModelViewSet):
@@ -88,6 +72,7 @@ class CamionSalidaViewSet(ViewSetAuditMixin, NotificationMixin, viewsets.ModelVi
         "destroy":  ["archive_camionsalida"],
         "confirmar": ["change_camionsalida"],
         "add_carga": ["change_camionsalida"],
+        "bulk_cargas": ["change_camionsalida"],
         "remove_carga": ["change_camionsalida"],
     }
 
@@ -366,6 +351,46 @@ class CamionSalidaViewSet(ViewSetAuditMixin, NotificationMixin, viewsets.ModelVi
             status_code=status.HTTP_201_CREATED
         )
 
+    @action(detail=True, methods=["post"], url_path="cargas/bulk")
+    def bulk_cargas(self, request, pk=None):
+        """
+        Carga un manifiesto completo en una sola transacción.
+        Body: {"items": [{"clasificacion_id": <int>, "cantidad": <int>}, ...]}
+        Todo o nada: si un renglón no tiene stock, no se crea ninguna carga.
+        """
+        from gestion_bodega.services.inventory_service import InventoryService
+
+        obj = self.get_object()
+        if obj.estado == "CONFIRMADO":
+            return self.notify(key="camion_inmutable", status_code=status.HTTP_409_CONFLICT)
+
+        ser = CamionCargaBulkSerializer(data=request.data)
+        try:
+            ser.is_valid(raise_exception=True)
+        except serializers.ValidationError:
+            return self.notify(key="camion_carga_validacion_error", data={"errors": ser.errors}, status_code=status.HTTP_400_BAD_REQUEST)
+
+        if obj.fecha_salida and _semana_cerrada(obj.bodega_id, obj.temporada_id, obj.fecha_salida):
+            return self.notify(key="camion_semana_cerrada", status_code=status.HTTP_409_CONFLICT)
+
+        cargas, errores = InventoryService.bulk_load_camion(obj, ser.validated_data["items"])
+        if errores:
+            return self.notify(
+                key="camion_carga_validacion_error",
+                data={"errors": {"items": errores}},
+                status_code=status.HTTP_400_BAD_REQUEST,
+            )
+
+        return self.notify(
+            key="camion_cargas_creadas",
+            data={
+                "cargas": CamionConsumoEmpaqueSerializer(cargas, many=True).data,
+                "count": len(cargas),
+                "total_cantidad": sum(c.cantidad for c in cargas),
+            },
+            status_code=status.HTTP_201_CREATED,
+        )
+
     @action(detail=True, methods=["post"], url_path="cargas/remove")
     def remove_carga(self, request, pk=None):
         obj = self.get_object()
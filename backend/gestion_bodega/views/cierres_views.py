@@ -20,7 +20,8 @@ from gestion_bodega.services.week_service import WeekService
 from gestion_bodega.utils.activity import registrar_actividad
 from gestion_bodega.utils.audit import ViewSetAuditMixin
 from agroproductores_risol.utils.notification_handler import NotificationHandler
-from gestion_bodega.utils.semana import rango_por_semana_id, tz_today_mx
+from gestion_bodega.utils.semana import tz_today_mx
+from gestion_bodega.utils.week_calendar import get_week_calendar
 
 
 class NotificationMixin:
@@ -116,11 +117,9 @@ class CierresViewSet(ViewSetAuditMixin, NotificationMixin, viewsets.GenericViewS
             )
 
         temporada = get_object_or_404(TemporadaBodega, pk=temporada_id)
-        cierres = list(
-            CierreSemanal.objects.filter(temporada_id=temporada.id)
-            .order_by("fecha_desde")
-            .values("id", "fecha_desde", "fecha_hasta")
-        )
+        # Una sola carga (cacheada por versión) para todas las semanas del índice.
+        calendar = get_week_calendar(temporada.bodega_id, temporada.id)
+        cierres = calendar.weeks()
 
         if not cierres:
             return self.notify(
@@ -135,24 +134,25 @@ class CierresViewSet(ViewSetAuditMixin, NotificationMixin, viewsets.GenericViewS
 
         idx_actual = None
         for i, s in enumerate(cierres):
-            if s["fecha_hasta"] is None:
+            if s.fecha_hasta is None:
                 idx_actual = i
                 break
         if idx_actual is None:
             idx_actual = len(cierres) - 1
 
+        hoy = tz_today_mx()
         weeks: List[Dict] = []
         for i, s in enumerate(cierres, start=1):
-            desde, hasta, label = rango_por_semana_id(s["id"])
+            desde, hasta, label = calendar.range_for(s.id, hoy)
             weeks.append(
                 {
                     "semana_ix": i,
                     "desde": str(desde),
                     "hasta": str(hasta),
                     "iso_semana": label,
-                    "is_closed": s["fecha_hasta"] is not None,
-                    "is_expired": s["fecha_hasta"] is None and (tz_today_mx() - s["fecha_desde"]).days > 6,
-                    "semana_id": s["id"],
+                    "is_closed": s.fecha_hasta is not None,
+                    "is_expired": s.fecha_hasta is None and (hoy - s.fecha_desde).days > 6,
+                    "semana_id": s.id,
                 }
             )
 
@@ -5,10 +5,11 @@ from rest_framework.decorators import action
 from django_filters.rest_framework import DjangoFilterBackend
 from django.db import transaction
 
-from gestion_bodega.models import CompraMadera, AbonoMadera, CierreSemanal
+from gestion_bodega.models import CompraMadera, AbonoMadera
 from gestion_bodega.serializers import CompraMaderaSerializer, AbonoMaderaSerializer, RegistrarAbonoSerializer
 from gestion_bodega.permissions import HasModulePermission
 from gestion_bodega.utils.audit import ViewSetAuditMixin
+from gestion_bodega.utils.semana import semana_cerrada_ids
 from agroproductores_risol.utils.pagination import GenericPagination
 from agroproductores_risol.utils.notification_handler import NotificationHandler
 class NotificationMixin:
@@ -33,10 +34,7 @@ class NotificationMixin:
         }
 
 def _semana_cerrada(bodega_id: int, temporada_id: int, f):
-    return CierreSemanal.objects.filter(
-        bodega_id=bodega_id, temporada_id=temporada_id,
-        fecha_desde__lte=f, fecha_hasta__gte=f, is_active=True
-    ).exists()
+    return semana_cerrada_ids(bodega_id, temporada_id, f)
 
 
 class CompraMaderaViewSet(ViewSetAuditMixin, NotificationMixin, viewsets.ModelViewSet):
@@ -3,10 +3,11 @@ from rest_framework import viewsets, status, filters, serializers
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 
-from gestion_bodega.models import Consumible, CierreSemanal
+from gestion_bodega.models import Consumible
 from gestion_bodega.serializers import ConsumibleSerializer
 from gestion_bodega.permissions import HasModulePermission
 from gestion_bodega.utils.audit import ViewSetAuditMixin
+from gestion_bodega.utils.semana import semana_cerrada_ids
 from agroproductores_risol.utils.pagination import GenericPagination
 from agroproductores_risol.utils.notification_handler import NotificationHandler
 class NotificationMixin:
@@ -31,10 +32,7 @@ class NotificationMixin:
         }
 
 def _semana_cerrada(bodega_id: int, temporada_id: int, f):
-    return CierreSemanal.objects.filter(
-        bodega_id=bodega_id, temporada_id=temporada_id,
-        fecha_desde__lte=f, fecha_hasta__gte=f, is_active=True
-    ).exists()
+    return semana_cerrada_ids(bodega_id, temporada_id, f)
 
 
 class ConsumibleViewSet(ViewSetAuditMixin, NotificationMixin, viewsets.ModelViewSet):
@@ -1,5 +1,4 @@
 ﻿# backend/gestion_bodega/views/empaques_views.py
-from datetime import timedelta
 from typing import Any, Optional, Dict, List, Tuple, Set
 
 from django.db import transaction
@@ -15,7 +14,6 @@ from agroproductores_risol.utils.pagination import GenericPagination
 from gestion_bodega.models import (
     ClasificacionEmpaque,
     Recepcion,
-    CierreSemanal,
     CompraMadera,
 )
 from gestion_bodega.permissions import HasModulePermission
@@ -26,6 +24,7 @@ from gestion_bodega.serializers import (
 from gestion_bodega.utils.audit import ViewSetAuditMixin
 from agroproductores_risol.utils.notification_handler import NotificationHandler
 from gestion_bodega.utils.semana import semana_cerrada_ids
+from gestion_bodega.utils.week_calendar import get_week_calendar
 from gestion_bodega.utils.inventario_empaque import get_disponible_for_clasificacion
 from gestion_bodega.services.inventory_service import InventoryService
 
@@ -99,18 +98,7 @@ def _resolve_semana_for_fecha(bodega, temporada, fecha):
     Devuelve el CierreSemanal cuyo rango cubre la fecha.
     Para semana abierta (fecha_hasta=None) usa fin teórico = fecha_desde + 6 días.
     """
-    qs = CierreSemanal.objects.filter(
-        bodega=bodega,
-        temporada=temporada,
-        is_active=True,
-    ).order_by("-fecha_desde")
-
-    for c in qs:
-        start = c.fecha_desde
-        end = c.fecha_hasta or (c.fecha_desde + timedelta(days=6))
-        if start <= fecha <= end:
-            return c
-    return None
+    return get_week_calendar(bodega.id, temporada.id, fresh=True).week_for(fecha)
 
 
 def _derive_empaque_status(captured: int, packed: int) -> str:
@@ -7,6 +7,7 @@ from django_filters.rest_framework import DjangoFilterBackend
 
 from gestion_bodega.models import LoteBodega
 from gestion_bodega.permissions import HasModulePermission
+from gestion_bodega.services.lote_summary import summarize_lote, summarize_lotes
 from gestion_bodega.utils.audit import ViewSetAuditMixin
 from agroproductores_risol.utils.pagination import GenericPagination
 from agroproductores_risol.utils.notification_handler import NotificationHandler
@@ -14,11 +15,17 @@ from agroproductores_risol.utils.notification_handler import NotificationHandler
 from rest_framework import serializers
 
 class LoteBodegaSerializer(serializers.ModelSerializer):
+    resumen = serializers.SerializerMethodField()
+
     class Meta:
         model = LoteBodega
-        fields = ["id", "bodega", "temporada", "semana", "codigo_lote", "origen_nombre", "notas", "creado_en"]
+        fields = ["id", "bodega", "temporada", "semana", "codigo_lote", "origen_nombre", "notas", "creado_en", "resumen"]
         read_only_fields = ["bodega", "temporada", "semana", "creado_en"]
 
+    def get_resumen(self, obj):
+        # Calculado en lote por la vista (summarize_lotes) para la página actual.
+        return (self.context.get("resumenes") or {}).get(obj.id)
+
 class LoteBodegaViewSet(ViewSetAuditMixin, viewsets.ReadOnlyModelViewSet):
     """
     Vista de solo lectura para Lotes (se crean vía Recepción).
@@ -48,28 +55,24 @@ class LoteBodegaViewSet(ViewSetAuditMixin, viewsets.ReadOnlyModelViewSet):
         self.required_permissions = self._perm_map.get(self.action, ["view_recepcion"])
         return super().get_permissions()
 
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if page is not None:
+            self._resumenes = summarize_lotes(lote.id for lote in page)
+        return page
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["resumenes"] = getattr(self, "_resumenes", None)
+        return context
+
     @action(detail=True, methods=["get"])
     def resumen(self, request, pk=None):
         """
         Retorna resumen de lo recibido y empacado para este lote.
         """
         lote = self.get_object()
-        
-        # Calcular agregados simples
-        recepciones = lote.recepciones.filter(is_active=True)
-        cajas_recibidas = sum(r.cajas_campo for r in recepciones)
-        
-        empaques = lote.clasificaciones.filter(is_active=True)
-        cajas_empacadas = sum(e.cantidad_cajas for e in empaques)
-        
-        data = {
-            "id": lote.id,
-            "codigo": lote.codigo_lote,
-            "total_recibido": cajas_recibidas,
-            "total_empacado": cajas_empacadas,
-            "recepciones_count": recepciones.count(),
-            "empaques_count": empaques.count(),
-        }
+        data = {**summarize_lote(lote.id), "codigo": lote.codigo_lote}
         return NotificationHandler.generate_response(
             message_key="lote_resumen_consultado", 
             data=data,
@@ -1,5 +1,5 @@
 ﻿# backend/gestion_bodega/views/recepciones_views.py
-from datetime import date, timedelta
+from datetime import date
 
 from django.core.exceptions import ValidationError as DjangoValidationError
 from django.db import transaction
@@ -15,16 +15,17 @@ from gestion_bodega.models import (
     Bodega,
     Recepcion,
     TemporadaBodega,
-    CierreSemanal,
     ClasificacionEmpaque,  # ✅ fuente real del "empaque"
 )
 from gestion_bodega.permissions import HasModulePermission
-from gestion_bodega.serializers import RecepcionSerializer
+from gestion_bodega.serializers import RecepcionBulkCreateSerializer, RecepcionSerializer
 from gestion_bodega.utils.activity import registrar_actividad
 from gestion_bodega.utils.audit import ViewSetAuditMixin
 from agroproductores_risol.utils.notification_handler import NotificationHandler
 from gestion_bodega.utils.semana import semana_cerrada_ids as _semana_cerrada
+from gestion_bodega.utils.week_calendar import get_week_calendar
 from gestion_bodega.services.inventory_service import InventoryService
+from gestion_bodega.services.recepcion_bulk import crear_recepciones
 
 
 # ───────────────────────────────────────────────────────────────────────────
@@ -141,21 +142,7 @@ def _inject_empaque_fields(row: dict, *, captured: int, packed: int, merma: int)
 
 
 def _resolve_semana_for_fecha(bodega: Bodega, temporada: TemporadaBodega, fecha: date):
-    qs = (
-        CierreSemanal.objects.filter(
-            bodega=bodega,
-            temporada=temporada,
-            is_active=True,
-        )
-        .order_by("-fecha_desde")
-    )
-
-    for c in qs:
-        start = c.fecha_desde
-        end = c.fecha_hasta or (c.fecha_desde + timedelta(days=6))
-        if start <= fecha <= end:
-            return c
-    return None
+    return get_week_calendar(bodega.id, temporada.id, fresh=True).week_for(fecha)
 
 
 from gestion_bodega.utils.recepcion_aggregates import annotate_recepcion_status
@@ -189,6 +176,7 @@ class RecepcionViewSet(ViewSetAuditMixin, NotificationMixin, viewsets.ModelViewS
         "list": ["view_recepcion"],
         "retrieve": ["view_recepcion"],
         "create": ["add_recepcion"],
+        "bulk_create": ["add_recepcion"],
         "update": ["change_recepcion"],
         "partial_update": ["change_recepcion"],
         "destroy": ["delete_recepcion"],
@@ -307,6 +295,66 @@ class RecepcionViewSet(ViewSetAuditMixin, NotificationMixin, viewsets.ModelViewS
             status_code=status.HTTP_201_CREATED,
         )
 
+    # ---------- CREATE (captura masiva) ----------
+    @action(detail=False, methods=["post"], url_path="bulk-create")
+    def bulk_create(self, request):
+        """
+        Body: {"bodega", "temporada", "fecha", "items": [{huertero_nombre, tipo_mango,
+        cantidad_cajas, codigo_lote?, observaciones?}, ...]}
+        Crea los renglones válidos y reporta el resultado de cada uno (por índice).
+        """
+        ser = RecepcionBulkCreateSerializer(data=request.data)
+        try:
+            ser.is_valid(raise_exception=True)
+        except serializers.ValidationError as ex:
+            key, payload, sc = _map_recepcion_validation_errors(getattr(ex, "detail", ser.errors))
+            return self.notify(key=key, data=payload, status_code=sc)
+
+        bodega: Bodega = ser.validated_data["bodega"]
+        temporada: TemporadaBodega = ser.validated_data["temporada"]
+        results = crear_recepciones(
+            bodega=bodega,
+            temporada=temporada,
+            fecha=ser.validated_data["fecha"],
+            semana=ser.validated_data["semana"],
+            items=ser.validated_data["items"],
+        )
+
+        creadas = [r["recepcion"] for r in results if r["ok"]]
+        rows = {}
+        if creadas:
+            registrar_actividad(
+                request.user,
+                f"Creó {len(creadas)} recepciones en captura masiva (bodega {bodega.id}, temporada {temporada.id})",
+                detalles=", ".join(f"#{obj.id}" for obj in creadas),
+            )
+            for obj, row in zip(creadas, self.get_serializer(creadas, many=True).data):
+                rows[obj.id] = _inject_empaque_fields(row, captured=int(obj.cajas_campo or 0), packed=0, merma=0)
+
+        items = []
+        for r in results:
+            if r["ok"]:
+                items.append({"index": r["index"], "ok": True, "recepcion": rows[r["recepcion"].id]})
+            else:
+                key, _, _ = _map_recepcion_validation_errors(r["errors"])
+                items.append({"index": r["index"], "ok": False, "message_key": key, "errors": r["errors"]})
+
+        fallidas = len(results) - len(creadas)
+        if not creadas:
+            key, sc = "recepcion_bulk_sin_registros", status.HTTP_400_BAD_REQUEST
+        elif fallidas:
+            key, sc = "recepcion_bulk_parcial", status.HTTP_207_MULTI_STATUS
+        else:
+            key, sc = "recepcion_bulk_create_success", status.HTTP_201_CREATED
+        return self.notify(
+            key=key,
+            data={
+                "results": items,
+                "summary": {"total": len(results), "creadas": len(creadas), "fallidas": fallidas},
+            },
+            status_code=sc,
+        )
+
     # ---------- UPDATE ----------
     def update(self, request, *args, **kwargs):
         partial = kwargs.pop("partial", False)
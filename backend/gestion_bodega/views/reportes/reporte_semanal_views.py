@@ -26,6 +26,7 @@ class ReporteSemanalView(views.APIView):
 
     permission_classes = [permissions.IsAuthenticated, HasModulePermission]
     required_permissions = ["view_dashboard"]
+    replica_reads = True
 
     def get_permissions(self):
         formato = (getattr(self.request, "data", {}) or {}).get("formato", "json")
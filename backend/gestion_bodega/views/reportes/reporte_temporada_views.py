@@ -25,6 +25,7 @@ class ReporteTemporadaView(views.APIView):
 
     permission_classes = [permissions.IsAuthenticated, HasModulePermission]
     required_permissions = ["view_dashboard"]
+    replica_reads = True
 
     def get_permissions(self):
         formato = (getattr(self.request, "data", {}) or {}).get("formato", "json")
@@ -1,13 +1,17 @@
 # backend/gestion_bodega/views/tablero_views.py
 from __future__ import annotations
 
+import json
 import logging
 import re
+import time
 from datetime import date, timedelta
 from typing import Any, Dict, List, Optional, Tuple
 
+from django.conf import settings
+from django.http import StreamingHttpResponse
 from django.utils.decorators import method_decorator
-from django.views.decorators.cache import never_cache
+from django.views.decorators.cache import cache_control, never_cache
 from django.utils.translation import gettext_lazy as _
 from rest_framework import status
 from django.core.exceptions import ValidationError as DjangoValidationError, ObjectDoesNotExist, FieldError
@@ -16,26 +20,31 @@ from rest_framework.views import APIView
 from django.db.models import Q
 from django.db import transaction, IntegrityError
 
+from agroproductores_risol.utils.change_versions import etag_matches, not_modified_response
 from agroproductores_risol.utils.pagination import GenericPagination
+from agroproductores_risol.utils.renderers import EventStreamRenderer, FastJSONRenderer
 from gestion_bodega.models import Bodega, TemporadaBodega, CierreSemanal
 from gestion_bodega.serializers import (
+    AlertItemSerializer,
     DashboardAlertResponseSerializer,
     DashboardQueueResponseSerializer,
     DashboardSummaryResponseSerializer,
     QueueItemSerializer,
 )
+from gestion_bodega.services.tablero_alertas import alertas_abiertas, alerta_payload, historial_alertas
+from gestion_bodega.services.tablero_events import events_enabled, get_broker, stream_settings
+from gestion_bodega.services.tablero_kpis import active_week_context, build_tablero_bundle, tablero_context
 from gestion_bodega.services.week_service import WeekService
 from gestion_bodega.utils.constants import NOTIFICATION_MESSAGES
 from gestion_bodega.utils.kpis import (
-    build_alerts,
     build_queue_items,
-    build_summary,
     queue_despachos_qs,
     queue_inventarios_qs,
     queue_recepciones_qs,
 )
 from agroproductores_risol.utils.notification_handler import NotificationHandler
 from gestion_bodega.utils.activity import registrar_actividad
+from gestion_bodega.utils.tablero_version import tablero_etag
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +54,10 @@ logger = logging.getLogger(__name__)
 
 ISO_WEEK_RE = re.compile(r"^\d{4}-W\d{2}$")
 
+# Lecturas del tablero: el navegador puede guardar la respuesta pero SIEMPRE
+# revalida (If-None-Match) → 304 si la versión del contexto no cambió.
+revalidate_always = cache_control(private=True, no_cache=True, must_revalidate=True)
+
 
 def msg_text(key: str) -> str:
     return NOTIFICATION_MESSAGES.get(key, {}).get("message", "")
@@ -92,6 +105,7 @@ class WeekManagePermission(BasePermission):
 
 class BaseDashboardAPIView(APIView):
     permission_classes = [IsAuthenticated, BodegaDashboardPermission]
+    replica_reads = True
 
 
 def _to_int(v: Optional[str]) -> Optional[int]:
@@ -137,16 +151,6 @@ def _require_temporada(request) -> int | None:
         return None
 
 
-def _temporada_label(temporada_id: int) -> str:
-    try:
-        t = TemporadaBodega.objects.only("id", "año").get(id=temporada_id)
-        return str(t.año)
-    except TemporadaBodega.DoesNotExist:
-        return str(temporada_id)
-    except Exception:
-        return str(temporada_id)
-
-
 def _current_or_last_week_ctx(
     bodega_id: Optional[int],
     temporada_id: int,
@@ -155,57 +159,13 @@ def _current_or_last_week_ctx(
     Regla unificada para TODO el tablero:
 
     - Semana ACTIVA = CierreSemanal con fecha_hasta is null (bodega+temporada, is_active=True).
-    - Si hay varias abiertas (no debería por constraint), tomamos la última por fecha_desde.
     - Si NO hay abiertas, tomamos la ÚLTIMA semana registrada como contexto, marcada como CERRADA.
 
-    Siempre devolvemos:
-      {
-        "id": <id>,
-        "fecha_inicio": "YYYY-MM-DD",
-        "fecha_fin": "YYYY-MM-DD" | None,  # real persistida
-        "rango_inferido": { "from": ..., "to": ... },  # to = fecha_fin o fecha_desde+6 si está abierta
-        "estado": "ABIERTA" | "CERRADA",
-        "iso_semana": "YYYY-Www" | None,
-        "activa": True si fecha_hasta is null, False en caso contrario
-      }
+    Payload: {id, fecha_inicio, fecha_fin, rango_inferido{from,to}, estado, iso_semana, activa}
+    (ver services/tablero_kpis.active_week_context; sale del calendario en memoria).
     """
-    if not bodega_id:
-        return None
     try:
-        qs = (
-            CierreSemanal.objects.filter(
-                bodega_id=bodega_id,
-                temporada_id=temporada_id,
-                is_active=True,
-            )
-            .order_by("fecha_desde", "id")
-        )
-
-        # 1) Priorizar semana ABIERTA (fecha_hasta is null)
-        week = qs.filter(fecha_hasta__isnull=True).last()
-
-        # 2) Si no hay abiertas, usar la última semana registrada (cerrada)
-        if not week:
-            week = qs.last()
-            if not week:
-                return None
-
-        start = week.fecha_desde
-        end_real = week.fecha_hasta
-        end_theoretical = end_real or (start + timedelta(days=6))
-
-        return {
-            "id": week.id,
-            "fecha_inicio": start.isoformat(),
-            "fecha_fin": end_real.isoformat() if end_real else None,
-            "rango_inferido": {
-                "from": start.isoformat(),
-                "to": end_theoretical.isoformat(),
-            },
-            "estado": "ABIERTA" if end_real is None else "CERRADA",
-            "iso_semana": week.iso_semana or None,
-            "activa": end_real is None,
-        }
+        return active_week_context(bodega_id, temporada_id)
     except Exception:
         return None
 
@@ -364,29 +324,32 @@ def _ordering_from_alias(tipo: str, order_by: Optional[str]) -> List[str]:
     return orm_fields
 
 
+def _conditional_get(request, scope: str, bodega_id: int, temporada_id: int):
+    """
+    Calcula el ETag del contexto y, si el cliente ya lo tiene, devuelve el 304
+    listo (sin tocar KPIs/colas). Retorna (etag, response_304 | None).
+    """
+    etag = tablero_etag(scope, bodega_id, temporada_id, request)
+    if etag_matches(request, etag):
+        return etag, not_modified_response(etag)
+    return etag, None
+
+
+def _with_etag(response, etag: str):
+    if response.status_code == status.HTTP_200_OK:
+        response["ETag"] = etag
+    return response
+
+
 def _context_payload(temporada_id: int, bodega_id: Optional[int]) -> Dict[str, Any]:
-    ctx: Dict[str, Any] = {
-        "temporada_id": temporada_id,
-        "temporada_label": _temporada_label(temporada_id),
-    }
-    # Etiqueta de bodega (opcional)
-    if bodega_id:
-        try:
-            b = Bodega.objects.only("id", "nombre").get(id=bodega_id)
-            ctx["bodega_label"] = b.nombre
-        except Exception:
-            ctx["bodega_label"] = str(bodega_id)
-    aw = _current_or_last_week_ctx(bodega_id, temporada_id)
-    if aw:
-        ctx["active_week"] = aw
-    return ctx
+    return tablero_context(temporada_id, bodega_id)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Vistas: Summary / Queues / Alerts
 # ─────────────────────────────────────────────────────────────────────────────
 
-@method_decorator(never_cache, name="dispatch")
+@method_decorator(revalidate_always, name="dispatch")
 class TableroBodegaSummaryView(BaseDashboardAPIView):
     """
     GET /bodega/tablero/summary/?temporada=:id&bodega=:id&huerta_id=&fecha_desde=&fecha_hasta=&iso_semana=&semana_id=
@@ -409,37 +372,28 @@ class TableroBodegaSummaryView(BaseDashboardAPIView):
                     data={"detail": "Parámetro requerido: bodega"},
                     status_code=status.HTTP_400_BAD_REQUEST,
                 )
-            huerta_id = _to_int(request.query_params.get("huerta_id"))
-
-            # P1 Robustez: Auto-cierre si corresponde antes de calcular KPIs
-            from gestion_bodega.models import ensure_week_state
-            if bodega_id:
+            etag, not_modified = _conditional_get(request, "summary", bodega_id, temporada_id)
+            if not_modified is not None:
+                return not_modified
+
+            # P1 Robustez: Auto-cierre si corresponde antes de calcular KPIs.
+            # Con el scheduler activo lo hace la tarea bodega.cerrar_semanas_vencidas.
+            if not settings.SCHEDULER["ENABLED"]:
+                from gestion_bodega.models import ensure_week_state
                 ensure_week_state(bodega_id, temporada_id)
 
-            fdesde, fhasta, _ = _resolve_range(request, temporada_id, bodega_id)
+            fdesde, fhasta, aw = _resolve_range(request, temporada_id, bodega_id)
 
-            kpis_or_payload = build_summary(
-                temporada_id,
-                bodega_id,
-                fdesde,
-                fhasta,
-                huerta_id,
-            )
-            payload = (
-                kpis_or_payload
-                if isinstance(kpis_or_payload, dict) and "kpis" in kpis_or_payload
-                else {"kpis": kpis_or_payload}
-            )
-
-            ser = DashboardSummaryResponseSerializer(payload)
-            data = dict(ser.data)
-            data["context"] = _context_payload(temporada_id, bodega_id)
+            # KPIs (una consulta por tabla de hechos) + contexto con la semana ya resuelta
+            bundle = build_tablero_bundle(temporada_id, bodega_id, fdesde, fhasta, active_week=aw)
+            data = dict(DashboardSummaryResponseSerializer({"kpis": bundle["kpis"]}).data)
+            data["context"] = bundle["context"]
 
-            return NotificationHandler.generate_response(
+            return _with_etag(NotificationHandler.generate_response(
                 "tablero_resumen_consultado",
                 data=data,
                 status_code=status.HTTP_200_OK,
-            )
+            ), etag)
         except Exception as e:
             logger.exception("Error en TableroBodegaSummaryView: %s", e)
             return NotificationHandler.generate_response(
@@ -449,7 +403,7 @@ class TableroBodegaSummaryView(BaseDashboardAPIView):
             )
 
 
-@method_decorator(never_cache, name="dispatch")
+@method_decorator(revalidate_always, name="dispatch")
 class TableroBodegaQueuesView(BaseDashboardAPIView):
     """
     GET /bodega/tablero/queues/?temporada=:id&bodega=:id&type=recepciones|inventarios|despachos&page=&page_size=&order_by=&fecha_desde=&fecha_hasta=&iso_semana=&semana_id=&huerta_id=...
@@ -481,6 +435,10 @@ class TableroBodegaQueuesView(BaseDashboardAPIView):
                     data={"detail": "Parámetro requerido: bodega"},
                     status_code=status.HTTP_400_BAD_REQUEST,
                 )
+            etag, not_modified = _conditional_get(request, f"queue:{tipo}", bodega_id, temporada_id)
+            if not_modified is not None:
+                return not_modified
+
             fdesde, fhasta, _ = _resolve_range(request, temporada_id, bodega_id)
 
             huerta_id = _to_int(request.query_params.get("huerta_id"))
@@ -566,11 +524,11 @@ class TableroBodegaQueuesView(BaseDashboardAPIView):
             data = dict(ser.data)
             data["context"] = _context_payload(temporada_id, bodega_id)
 
-            return NotificationHandler.generate_response(
+            return _with_etag(NotificationHandler.generate_response(
                 "tablero_cola_consultada",
                 data=data,
                 status_code=status.HTTP_200_OK,
-            )
+            ), etag)
 
         except Exception as e:
             logger.exception("Error en TableroBodegaQueuesView: %s", e)
@@ -581,7 +539,7 @@ class TableroBodegaQueuesView(BaseDashboardAPIView):
             )
 
 
-@method_decorator(never_cache, name="dispatch")
+@method_decorator(revalidate_always, name="dispatch")
 class TableroBodegaAlertsView(BaseDashboardAPIView):
     """
     GET /bodega/tablero/alerts/?temporada=:id&bodega=:id
@@ -600,6 +558,10 @@ class TableroBodegaAlertsView(BaseDashboardAPIView):
             if temporada_id <= 0 or bodega_id <= 0:
                 raise DjangoValidationError("IDs inválidos para temporada/bodega")
 
+            etag, not_modified = _conditional_get(request, "alerts", bodega_id, temporada_id)
+            if not_modified is not None:
+                return not_modified
+
             try:
                 TemporadaBodega.objects.get(
                     id=temporada_id,
@@ -614,20 +576,18 @@ class TableroBodegaAlertsView(BaseDashboardAPIView):
                     status_code=status.HTTP_400_BAD_REQUEST,
                 )
 
-            alerts = build_alerts(
-                temporada_id=temporada_id,
-                bodega_id=bodega_id,
-            )
+            # Estado persistido por el evaluador (services/tablero_alertas.py)
+            alerts = alertas_abiertas(bodega_id, temporada_id)
             payload = {"alerts": alerts}
             ser = DashboardAlertResponseSerializer(payload)
             data = dict(ser.data)
             data["context"] = _context_payload(temporada_id, bodega_id)
 
-            return NotificationHandler.generate_response(
+            return _with_etag(NotificationHandler.generate_response(
                 "tablero_alerts_consultados",
                 data=data,
                 status_code=status.HTTP_200_OK,
-            )
+            ), etag)
         except (ValueError, DjangoValidationError) as ve:
             return NotificationHandler.generate_response(
                 "tablero_alerts_parametros_invalidos",
@@ -643,6 +603,132 @@ class TableroBodegaAlertsView(BaseDashboardAPIView):
             )
 
 
+@method_decorator(revalidate_always, name="dispatch")
+class TableroBodegaAlertsHistoryView(BaseDashboardAPIView):
+    """
+    GET /bodega/tablero/alerts/history/?temporada=:id&bodega=:id&estado=abiertas|resueltas&page=&page_size=
+    Historial de alertas (abiertas y resueltas) del contexto.
+    """
+    throttle_scope = "bodega_dashboard"
+
+    def get(self, request, *args, **kwargs):
+        temporada_id = _require_temporada(request)
+        bodega_id = _to_int(request.query_params.get("bodega"))
+        estado = request.query_params.get("estado") or None
+        if not temporada_id or not bodega_id or estado not in (None, "abiertas", "resueltas"):
+            return NotificationHandler.generate_response(
+                "tablero_alerts_parametros_invalidos",
+                data={"detail": "Parámetros requeridos: temporada y bodega; estado=abiertas|resueltas"},
+                status_code=status.HTTP_400_BAD_REQUEST,
+            )
+
+        etag, not_modified = _conditional_get(request, "alerts:history", bodega_id, temporada_id)
+        if not_modified is not None:
+            return not_modified
+
+        paginator = GenericPagination()
+        page = paginator.paginate_queryset(historial_alertas(bodega_id, temporada_id, estado), request, view=self)
+        items = AlertItemSerializer([alerta_payload(a) for a in page], many=True).data
+        envelope = paginator.get_paginated_response(items).data.get("data", {}) or {}
+        results_key = getattr(paginator, "resource_name", "results")
+
+        return _with_etag(NotificationHandler.generate_response(
+            "tablero_alerts_historial_consultado",
+            data={
+                "meta": envelope.get("meta", {}) or {},
+                "results": envelope.get("results", envelope.get(results_key, [])),
+            },
+            status_code=status.HTTP_200_OK,
+        ), etag)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Eventos en vivo (SSE)
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _sse(event: str, data: Dict[str, Any], event_id: Optional[int] = None) -> str:
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data)}")
+    return "\n".join(lines) + "\n\n"
+
+
+def _tablero_event_stream(bodega_id: int, temporada_id: int, last_event_id: Optional[int]):
+    """
+    Generador SSE: heartbeat periódico y cierre tras MAX_STREAM_SECONDS
+    (el cliente reconecta con Last-Event-ID y no pierde cambios).
+    """
+    broker = get_broker()
+    cfg = stream_settings()
+    after = broker.last_id(bodega_id, temporada_id) if last_event_id is None else last_event_id
+    deadline = time.monotonic() + cfg["max_duration"]
+
+    yield "retry: 3000\n\n"
+    yield _sse("ready", {"bodega": bodega_id, "temporada": temporada_id}, event_id=after)
+
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        new_last, topics = broker.wait(bodega_id, temporada_id, after, min(cfg["heartbeat"], remaining))
+        if new_last is None:
+            yield ": keepalive\n\n"
+            continue
+        after = new_last
+        yield _sse("changed", {"topics": topics}, event_id=after)
+
+
+@method_decorator(never_cache, name="dispatch")
+class TableroBodegaEventsView(BaseDashboardAPIView):
+    """
+    GET /bodega/tablero/events/?bodega=:id&temporada=:id   (text/event-stream)
+
+    Emite, cuando se confirma una escritura del contexto:
+      id: <secuencia>
+      event: changed
+      data: {"topics": ["kpis", "alerts", "week", "queue:recepciones", ...]}
+
+    El cliente vuelve a pedir solo esas secciones (con If-None-Match).
+    La autenticación es la misma JWT del resto del API, por lo que el cliente
+    debe consumirlo con fetch + ReadableStream (EventSource no envía headers).
+    Opt-in (BODEGA_TABLERO_EVENTS_ENABLED): requiere workers con hilos o
+    asíncronos; apagado responde 404 y el cliente sigue con polling + ETag.
+    """
+    throttle_scope = "bodega_dashboard"
+    renderer_classes = [FastJSONRenderer, EventStreamRenderer]
+
+    def get(self, request, *args, **kwargs):
+        if not events_enabled():
+            return NotificationHandler.generate_response(
+                "tablero_events_deshabilitado",
+                data={"detail": "El canal de eventos del tablero no está habilitado."},
+                status_code=status.HTTP_404_NOT_FOUND,
+            )
+        temporada_id = _require_temporada(request)
+        bodega_id = _to_int(request.query_params.get("bodega"))
+        if not temporada_id or not bodega_id or not TemporadaBodega.objects.filter(
+            id=temporada_id, bodega_id=bodega_id
+        ).exists():
+            return NotificationHandler.generate_response(
+                "tablero_events_contexto_invalido",
+                data={"detail": "bodega y temporada son obligatorios y deben corresponder."},
+                status_code=status.HTTP_400_BAD_REQUEST,
+            )
+
+        raw_last = request.META.get("HTTP_LAST_EVENT_ID") or request.query_params.get("last_event_id")
+        last_event_id = _to_int(raw_last)
+
+        response = StreamingHttpResponse(
+            _tablero_event_stream(bodega_id, temporada_id, last_event_id),
+            content_type="text/event-stream",
+        )
+        # Evita buffering de proxies (nginx) para que cada evento salga al instante.
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Semanas manuales — start / finish / current / nav
 # ─────────────────────────────────────────────────────────────────────────────
@@ -668,7 +754,7 @@ class BaseWeekAPIView(APIView):
             return bodega_id, temporada_id, None
 
 
-@method_decorator(never_cache, name="dispatch")
+@method_decorator(revalidate_always, name="dispatch")
 class TableroBodegaWeekCurrentView(BaseDashboardAPIView):
     """
     GET /bodega/tablero/week/current/?bodega=:id&temporada=:id
@@ -689,6 +775,10 @@ class TableroBodegaWeekCurrentView(BaseDashboardAPIView):
                 status_code=status.HTTP_400_BAD_REQUEST,
             )
 
+        etag, not_modified = _conditional_get(request, "week:current", bodega_id, temporada_id)
+        if not_modified is not None:
+            return not_modified
+
         aw = _current_or_last_week_ctx(bodega_id, temporada_id)
         week_simple = None
         if aw:
@@ -699,7 +789,7 @@ class TableroBodegaWeekCurrentView(BaseDashboardAPIView):
                 "activa": bool(aw.get("activa")),
             }
 
-        return NotificationHandler.generate_response(
+        return _with_etag(NotificationHandler.generate_response(
             "tablero_week_actual_consultada",
             data={
                 "active_week": aw,
@@ -707,7 +797,7 @@ class TableroBodegaWeekCurrentView(BaseDashboardAPIView):
                 "context": _context_payload(temporada_id, bodega_id),
             },
             status_code=status.HTTP_200_OK,
-        )
+        ), etag)
 
 
 @method_decorator(never_cache, name="dispatch")
@@ -897,7 +987,7 @@ class TableroBodegaWeekFinishView(BaseWeekAPIView):
             )
 
 
-@method_decorator(never_cache, name="dispatch")
+@method_decorator(revalidate_always, name="dispatch")
 class TableroBodegaWeeksNavView(BaseDashboardAPIView):
     """
     GET /bodega/tablero/semanas/?bodega=:id&temporada=:id&iso_semana=YYYY-Www
@@ -919,6 +1009,10 @@ class TableroBodegaWeeksNavView(BaseDashboardAPIView):
                 status_code=status.HTTP_400_BAD_REQUEST,
             )
 
+        etag, not_modified = _conditional_get(request, "week:nav", bodega_id, temporada_id)
+        if not_modified is not None:
+            return not_modified
+
         # Lista de semanas (cerradas y abierta si existe), ordenadas por fecha_desde
         semanas = list(
             CierreSemanal.objects.filter(
@@ -932,7 +1026,7 @@ class TableroBodegaWeeksNavView(BaseDashboardAPIView):
 
         total = len(semanas)
         if total == 0:
-            return NotificationHandler.generate_response(
+            return _with_etag(NotificationHandler.generate_response(
                 "tablero_week_nav_consultada",
                 data={
                     "actual": None,
@@ -943,7 +1037,7 @@ class TableroBodegaWeeksNavView(BaseDashboardAPIView):
                     "items": [],
                 },
                 status_code=status.HTTP_200_OK,
-            )
+            ), etag)
 
         # Elegir referencia:
         iso_key = request.query_params.get("iso_semana")
@@ -1016,8 +1110,8 @@ class TableroBodegaWeeksNavView(BaseDashboardAPIView):
         if idx < (total - 1):
             data["next"] = semanas[idx + 1].get("iso_semana") or None
 
-        return NotificationHandler.generate_response(
+        return _with_etag(NotificationHandler.generate_response(
             "tablero_week_nav_consultada",
             data=data,
             status_code=status.HTTP_200_OK,
-        )
+        ), etag)
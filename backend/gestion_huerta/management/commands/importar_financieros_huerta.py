@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import csv
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from gestion_huerta.services.importacion_financiera import (
+    BATCH_SIZE,
+    TIPOS_IMPORTACION,
+    importar_financieros,
+    leer_filas,
+)
+from gestion_huerta.utils.activity import registrar_actividad
+
+
+class Command(BaseCommand):
+    help = (
+        "Importa históricos de inversiones, ventas o precosechas desde CSV/XLSX "
+        "(streaming, validación por lotes y bulk_create). Reporta los errores "
+        "por número de fila; usa --dry-run para validar sin guardar."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("tipo", choices=TIPOS_IMPORTACION)
+        parser.add_argument("archivo", help="Ruta del CSV (UTF-8) o XLSX.")
+        parser.add_argument("--formato", choices=("csv", "xlsx"), help="Default: por extensión del archivo.")
+        parser.add_argument("--hoja", help="Hoja del XLSX (default: la activa).")
+        parser.add_argument("--lote", type=int, default=BATCH_SIZE, help="Filas por lote.")
+        parser.add_argument("--dry-run", action="store_true", help="Solo valida; no inserta nada.")
+        parser.add_argument("--errores", help="Escribe los errores por fila en este CSV.")
+        parser.add_argument("--usuario", help="Teléfono del usuario al que se registra la actividad.")
+
+    def handle(self, *args, **options):
+        if options["lote"] <= 0:
+            raise CommandError("--lote debe ser mayor que 0.")
+        usuario = None
+        if options["usuario"]:
+            usuario = get_user_model().objects.filter(telefono=options["usuario"]).first()
+            if usuario is None:
+                raise CommandError(f"No existe el usuario {options['usuario']}.")
+
+        try:
+            filas = leer_filas(options["archivo"], formato=options["formato"], hoja=options["hoja"])
+            resultado = importar_financieros(
+                options["tipo"], filas, batch_size=options["lote"], dry_run=options["dry_run"]
+            )
+        except (OSError, KeyError, ValueError) as exc:
+            raise CommandError(f"No se pudo leer el archivo: {exc}") from exc
+
+        if options["errores"] and resultado.errores:
+            with open(options["errores"], "w", encoding="utf-8", newline="") as fh:
+                writer = csv.writer(fh)
+                writer.writerow(["fila", "campo", "error"])
+                for error in resultado.errores:
+                    for campo, mensajes in error["errors"].items():
+                        for mensaje in mensajes:
+                            writer.writerow([error["fila"], campo, mensaje])
+
+        for error in resultado.errores[:20]:
+            self.stdout.write(self.style.WARNING(f"Fila {error['fila']}: {json.dumps(error['errors'], ensure_ascii=False)}"))
+        if resultado.fallidas > 20:
+            self.stdout.write(self.style.WARNING(f"... y {resultado.fallidas - 20} filas más con errores."))
+
+        if resultado.dry_run:
+            self.stdout.write(
+                self.style.SUCCESS(f"Validación: {resultado.validas} de {resultado.total} filas válidas; nada se guardó.")
+            )
+            return
+
+        if usuario is not None and resultado.creadas:
+            registrar_actividad(
+                usuario,
+                f"Importó {resultado.creadas} {resultado.tipo} históricas",
+                detalles=f"archivo={options['archivo']}, fallidas={resultado.fallidas}",
+            )
+        self.stdout.write(
+            self.style.SUCCESS(f"{resultado.creadas} de {resultado.total} filas importadas ({resultado.fallidas} con errores).")
+        )
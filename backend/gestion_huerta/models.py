@@ -3,7 +3,7 @@ from django.db import models, transaction
 from django.core.validators import MinValueValidator
 from django.utils import timezone
 from django.core.exceptions import ValidationError
-from django.db.models import F, Sum, Value, DecimalField, ExpressionWrapper
+from django.db.models import F, Sum, Value, DecimalField, ExpressionWrapper, OuterRef, Subquery
 from django.db.models.functions import Coalesce, Cast
 from decimal import Decimal
 from django.db.models import Q
@@ -549,6 +549,44 @@ class CategoriaPreCosecha(models.Model):
 
 
 # ────────────── COSECHA ───────────────────────────────────────────────────
+def _ventas_total_expr():
+    qty   = Cast(F("num_cajas"), DecimalField(max_digits=14, decimal_places=2))
+    price = Cast(F("precio_por_caja"), DecimalField(max_digits=14, decimal_places=2))
+    return ExpressionWrapper(qty * price, output_field=DecimalField(max_digits=18, decimal_places=2))
+
+
+def _gastos_total_expr():
+    gi = Coalesce(Cast(F("gastos_insumos"), DecimalField(max_digits=18, decimal_places=2)), Value(Decimal("0.00")))
+    gm = Coalesce(Cast(F("gastos_mano_obra"),  DecimalField(max_digits=18, decimal_places=2)), Value(Decimal("0.00")))
+    return ExpressionWrapper(gi + gm, output_field=DecimalField(max_digits=18, decimal_places=2))
+
+
+class CosechaQuerySet(models.QuerySet):
+    def with_financials(self):
+        """
+        Anota fin_total_ventas, fin_total_gastos y fin_ganancia_neta con dos
+        subconsultas agregadas por cosecha (sin multiplicar filas por JOIN).
+        Mismos criterios que las properties total_ventas/total_gastos.
+        """
+        money = DecimalField(max_digits=18, decimal_places=2)
+        ventas = (
+            Venta.objects.filter(cosecha=OuterRef("pk"))
+            .order_by().values("cosecha")
+            .annotate(total=Sum(_ventas_total_expr())).values("total")
+        )
+        gastos = (
+            InversionesHuerta.objects.filter(cosecha=OuterRef("pk"))
+            .order_by().values("cosecha")
+            .annotate(total=Sum(_gastos_total_expr())).values("total")
+        )
+        return self.annotate(
+            fin_total_ventas=Coalesce(Subquery(ventas, output_field=money), Value(Decimal("0.00")), output_field=money),
+            fin_total_gastos=Coalesce(Subquery(gastos, output_field=money), Value(Decimal("0.00")), output_field=money),
+        ).annotate(
+            fin_ganancia_neta=ExpressionWrapper(F("fin_total_ventas") - F("fin_total_gastos"), output_field=money),
+        )
+
+
 class Cosecha(models.Model):
     """
     Cosecha de una Temporada (obligatoria).
@@ -568,6 +606,8 @@ class Cosecha(models.Model):
     archivado_en   = models.DateTimeField(null=True, blank=True)
     archivado_por_cascada = models.BooleanField(default=False)
 
+    objects = CosechaQuerySet.as_manager()
+
     class Meta:
         ordering = ["-id"]
         unique_together = (("temporada", "nombre"),)
@@ -588,17 +628,11 @@ class Cosecha(models.Model):
 
     @property
     def total_ventas(self):
-        qty   = Cast(F("num_cajas"), DecimalField(max_digits=14, decimal_places=2))
-        price = Cast(F("precio_por_caja"), DecimalField(max_digits=14, decimal_places=2))
-        expr  = ExpressionWrapper(qty * price, output_field=DecimalField(max_digits=18, decimal_places=2))
-        return self.ventas.aggregate(total=Coalesce(Sum(expr), Value(Decimal("0.00"))))["total"]
+        return self.ventas.aggregate(total=Coalesce(Sum(_ventas_total_expr()), Value(Decimal("0.00"))))["total"]
 
     @property
     def total_gastos(self):
-        gi   = Coalesce(Cast(F("gastos_insumos"), DecimalField(max_digits=18, decimal_places=2)), Value(Decimal("0.00")))
-        gm   = Coalesce(Cast(F("gastos_mano_obra"),  DecimalField(max_digits=18, decimal_places=2)), Value(Decimal("0.00")))
-        expr = ExpressionWrapper(gi + gm, output_field=DecimalField(max_digits=18, decimal_places=2))
-        return self.inversiones.aggregate(total=Coalesce(Sum(expr), Value(Decimal("0.00"))))["total"]
+        return self.inversiones.aggregate(total=Coalesce(Sum(_gastos_total_expr()), Value(Decimal("0.00"))))["total"]
 
     @property
     def ganancia_neta(self):
@@ -364,9 +364,11 @@ class TemporadaSerializer(serializers.ModelSerializer):
 
 class CosechaSerializer(serializers.ModelSerializer):
     temporada        = serializers.PrimaryKeyRelatedField(queryset=Temporada.objects.all(), required=True)
-    ventas_totales   = serializers.FloatField(source='total_ventas',   read_only=True)
-    gastos_totales   = serializers.FloatField(source='total_gastos',   read_only=True)
-    margen_ganancia  = serializers.FloatField(source='ganancia_neta',  read_only=True)
+    # Preferir los valores de Cosecha.objects.with_financials(); las properties
+    # (una consulta cada una) quedan solo para instancias sueltas.
+    ventas_totales   = serializers.SerializerMethodField()
+    gastos_totales   = serializers.SerializerMethodField()
+    margen_ganancia  = serializers.SerializerMethodField()
     is_rentada       = serializers.SerializerMethodField()
     # Permitimos nombre vacío, pero lo normalizamos a uno único en validate()
     nombre           = serializers.CharField(required=False, allow_blank=True, allow_null=True)
@@ -398,6 +400,22 @@ class CosechaSerializer(serializers.ModelSerializer):
     def get_is_rentada(self, obj):
         return obj.huerta_rentada_id is not None
 
+    @staticmethod
+    def _financial(obj, annotated: str, prop: str) -> float:
+        value = getattr(obj, annotated, None)
+        if value is None:
+            value = getattr(obj, prop)
+        return float(value or 0)
+
+    def get_ventas_totales(self, obj) -> float:
+        return self._financial(obj, "fin_total_ventas", "total_ventas")
+
+    def get_gastos_totales(self, obj) -> float:
+        return self._financial(obj, "fin_total_gastos", "total_gastos")
+
+    def get_margen_ganancia(self, obj) -> float:
+        return self._financial(obj, "fin_ganancia_neta", "ganancia_neta")
+
     def validate_nombre(self, value):
         if value is None:
             return value
@@ -3,13 +3,22 @@
 ExportacionService
 ------------------
 Fachada del módulo de exportación que preserva la API estable y delega
-en los exportadores concretos (PDF/Excel) por entidad.
+en los exportadores concretos (PDF/Excel) por entidad. Los exportadores se
+resuelven en el primer uso (agroproductores_risol.utils.export_registry).
 """
 from __future__ import annotations
 from typing import Dict, Any
 
-from gestion_huerta.services.exportacion.pdf_exporter import PDFExporter
-from gestion_huerta.services.exportacion.excel_exporter import ExcelExporter
+from agroproductores_risol.utils.export_registry import get_exporter
+
+
+def _pdf():
+    return get_exporter("huerta.pdf")
+
+
+def _excel():
+    return get_exporter("huerta.excel")
+
 
 class ExportacionService:
     """Fachada que conserva la interfaz original y delega en exportadores específicos."""
@@ -17,26 +26,26 @@ class ExportacionService:
     # ---- COSECHA ----
     @staticmethod
     def generar_pdf_cosecha(reporte_data: Dict[str, Any]) -> bytes:
-        return PDFExporter.generar_pdf_cosecha(reporte_data)
+        return _pdf().generar_pdf_cosecha(reporte_data)
 
     @staticmethod
     def generar_excel_cosecha(reporte_data: Dict[str, Any]) -> bytes:
-        return ExcelExporter.generar_excel_cosecha(reporte_data)
+        return _excel().generar_excel_cosecha(reporte_data)
 
     # ---- TEMPORADA ----
     @staticmethod
     def generar_pdf_temporada(reporte_data: Dict[str, Any]) -> bytes:
-        return PDFExporter.generar_pdf_temporada(reporte_data)
+        return _pdf().generar_pdf_temporada(reporte_data)
 
     @staticmethod
     def generar_excel_temporada(reporte_data: Dict[str, Any]) -> bytes:
-        return ExcelExporter.generar_excel_temporada(reporte_data)
+        return _excel().generar_excel_temporada(reporte_data)
 
     # ---- PERFIL HUERTA ----
     @staticmethod
     def generar_pdf_perfil_huerta(reporte_data: Dict[str, Any]) -> bytes:
-        return PDFExporter.generar_pdf_perfil_huerta(reporte_data)
+        return _pdf().generar_pdf_perfil_huerta(reporte_data)
 
     @staticmethod
     def generar_excel_perfil_huerta(reporte_data: Dict[str, Any]) -> bytes:
-        return ExcelExporter.generar_excel_perfil_huerta(reporte_data)
+        return _excel().generar_excel_perfil_huerta(reporte_data)
@@ -0,0 +1,505 @@
+# -*- coding: utf-8 -*-
+"""
+Importación masiva de históricos financieros de huerta
+------------------------------------------------------
+Carga inversiones, ventas y precosechas de temporadas previas desde CSV o
+XLSX sin pasar renglón por renglón por los viewsets:
+
+- El archivo se lee en streaming (módulo csv / openpyxl en modo
+  read-only): la memoria no crece con el número de filas.
+- Las filas se validan por lotes. Cosechas y temporadas se precargan con una
+  consulta por lote (solo los ids aún no vistos) y las categorías una vez.
+- Los renglones válidos se insertan con bulk_create (sin full_clean por fila
+  ni señales) y los tags de reporte del lote se rotan una sola vez al hacer
+  commit.
+- Cada renglón inválido se reporta con su número de fila y errores por campo;
+  no detiene al resto.
+
+Reglas: al ser históricos se aceptan temporadas y cosechas finalizadas y
+fechas pasadas (no aplica la ventana HOY/AYER de la captura); se exige que
+los registros estén activos, que el origen coincida con la cosecha/temporada,
+montos válidos y fechas no futuras ni anteriores al inicio de la cosecha
+(para precosecha: anteriores al inicio de la temporada).
+
+Columnas (encabezado en la primera fila, sin importar mayúsculas):
+- inversiones: cosecha_id, fecha, categoria_id | categoria, gastos_insumos,
+  gastos_mano_obra, [descripcion], [temporada_id]
+- ventas: cosecha_id, fecha_venta, tipo_mango, num_cajas, precio_por_caja,
+  gasto, [descripcion], [temporada_id]
+- precosechas: temporada_id, fecha, categoria_id | categoria, gastos_insumos,
+  gastos_mano_obra, [descripcion]
+"""
+from __future__ import annotations
+
+import csv
+import io
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from functools import partial
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+
+from gestion_huerta.models import (
+    CategoriaInversion,
+    CategoriaPreCosecha,
+    Cosecha,
+    InversionesHuerta,
+    PreCosecha,
+    Temporada,
+    Venta,
+)
+from gestion_huerta.utils.cache_keys import bump_report_tags, report_tag
+
+TIPOS_IMPORTACION = ("inversiones", "ventas", "precosechas")
+BATCH_SIZE = 500
+
+Fila = Tuple[int, Dict[str, Any]]
+
+
+@dataclass
+class ResultadoImportacion:
+    tipo: str
+    total: int = 0
+    validas: int = 0
+    creadas: int = 0
+    dry_run: bool = False
+    errores: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def fallidas(self) -> int:
+        return len(self.errores)
+
+
+class _ErroresFila(Exception):
+    def __init__(self, errors: Dict[str, List[str]]):
+        super().__init__(errors)
+        self.errors = errors
+
+
+# ───────────────────────────── Lectura ─────────────────────────────
+
+def _normalizar_encabezado(valor: Any) -> str:
+    return str(valor or "").strip().lower()
+
+
+def _vacio(valor: Any) -> bool:
+    return valor is None or (isinstance(valor, str) and not valor.strip())
+
+
+def leer_filas(archivo, formato: Optional[str] = None, hoja: Optional[str] = None) -> Iterator[Fila]:
+    """
+    Itera (numero_de_fila, {columna: valor}) de un CSV o XLSX. `archivo` puede
+    ser una ruta o un archivo binario; el número de fila es el de la hoja
+    (el encabezado es la fila 1). Las filas vacías se omiten.
+    """
+    if formato is None:
+        nombre = str(archivo if isinstance(archivo, (str, Path)) else getattr(archivo, "name", ""))
+        formato = "xlsx" if nombre.lower().endswith((".xlsx", ".xlsm")) else "csv"
+    if formato == "xlsx":
+        yield from _leer_xlsx(archivo, hoja)
+    elif formato == "csv":
+        yield from _leer_csv(archivo)
+    else:
+        raise ValueError(f"Formato no soportado: {formato}")
+
+
+def _leer_csv(archivo) -> Iterator[Fila]:
+    if isinstance(archivo, (str, Path)):
+        with open(archivo, encoding="utf-8-sig", newline="") as fh:
+            yield from _filas_csv(fh)
+    else:
+        yield from _filas_csv(io.TextIOWrapper(archivo, encoding="utf-8-sig", newline=""))
+
+
+def _filas_csv(fh) -> Iterator[Fila]:
+    reader = csv.reader(fh)
+    encabezado = [_normalizar_encabezado(col) for col in next(reader, [])]
+    for numero, valores in enumerate(reader, start=2):
+        fila = {col: valor for col, valor in zip(encabezado, valores) if col}
+        if not all(_vacio(v) for v in fila.values()):
+            yield numero, fila
+
+
+def _leer_xlsx(archivo, hoja: Optional[str]) -> Iterator[Fila]:
+    # openpyxl solo se carga si se importa un XLSX (ver utils/export_registry).
+    from openpyxl import load_workbook
+
+    libro = load_workbook(archivo, read_only=True, data_only=True)
+    try:
+        ws = libro[hoja] if hoja else libro.active
+        filas = ws.iter_rows(values_only=True)
+        encabezado = [_normalizar_encabezado(col) for col in next(filas, ())]
+        for numero, valores in enumerate(filas, start=2):
+            fila = {col: valor for col, valor in zip(encabezado, valores) if col}
+            if not all(_vacio(v) for v in fila.values()):
+                yield numero, fila
+    finally:
+        libro.close()
+
+
+# ───────────────────────────── Conversión de celdas ─────────────────────────────
+
+def _fecha(valor: Any) -> date:
+    if isinstance(valor, datetime):
+        return valor.date()
+    if isinstance(valor, date):
+        return valor
+    texto = str(valor).strip()
+    for formato in ("%Y-%m-%d", "%d/%m/%Y"):
+        try:
+            return datetime.strptime(texto, formato).date()
+        except ValueError:
+            continue
+    raise ValueError("Fecha inválida; usa AAAA-MM-DD o DD/MM/AAAA.")
+
+
+def _decimal(valor: Any) -> Decimal:
+    try:
+        numero = Decimal(str(valor).strip().replace(",", ""))
+    except InvalidOperation:
+        raise ValueError("Número inválido.") from None
+    if not numero.is_finite():
+        raise ValueError("Número inválido.")
+    return numero
+
+
+def _entero(valor: Any) -> int:
+    numero = _decimal(valor)
+    if numero != numero.to_integral_value():
+        raise ValueError("Debe ser un número entero.")
+    return int(numero)
+
+
+class _Lector:
+    """Extrae columnas de una fila acumulando errores por campo."""
+
+    def __init__(self, fila: Dict[str, Any]):
+        self.fila = fila
+        self.errors: Dict[str, List[str]] = {}
+
+    def error(self, campo: str, mensaje: str) -> None:
+        self.errors.setdefault(campo, []).append(mensaje)
+
+    def get(self, campo: str, conversor: Callable[[Any], Any] = str, requerido: bool = True):
+        valor = self.fila.get(campo)
+        if _vacio(valor):
+            if requerido:
+                self.error(campo, "Este campo es obligatorio.")
+            return None
+        try:
+            return conversor(valor.strip() if isinstance(valor, str) else valor)
+        except (TypeError, ValueError) as exc:
+            self.error(campo, str(exc) or "Valor inválido.")
+            return None
+
+    def verificar(self) -> None:
+        if self.errors:
+            raise _ErroresFila(self.errors)
+
+
+# ───────────────────────────── Importador ─────────────────────────────
+
+class _Importador(ABC):
+    modelo = None
+    modelo_categoria = None
+    excluir_clean = ("categoria", "cosecha", "temporada", "huerta", "huerta_rentada")
+
+    def __init__(self):
+        self.cosechas: Dict[int, Optional[Cosecha]] = {}
+        self.temporadas: Dict[int, Optional[Temporada]] = {}
+        self.categorias: Dict[int, Any] = {}
+        self.categorias_por_nombre: Dict[str, List[Any]] = {}
+        if self.modelo_categoria is not None:
+            for categoria in self.modelo_categoria.objects.all():
+                self.categorias[categoria.id] = categoria
+                self.categorias_por_nombre.setdefault(categoria.nombre.strip().lower(), []).append(categoria)
+
+    # Precarga por lote: una consulta por tabla con los ids aún no vistos.
+    def precargar(self, filas: List[Fila]) -> None:
+        cosecha_ids = self._ids(filas, "cosecha_id") - self.cosechas.keys()
+        if cosecha_ids:
+            qs = Cosecha.objects.select_related(
+                "temporada", "huerta", "huerta_rentada", "temporada__huerta", "temporada__huerta_rentada"
+            ).filter(id__in=cosecha_ids)
+            encontrados = {c.id: c for c in qs}
+            self.cosechas.update({pk: encontrados.get(pk) for pk in cosecha_ids})
+        temporada_ids = self._ids(filas, "temporada_id") - self.temporadas.keys()
+        if temporada_ids:
+            qs = Temporada.objects.select_related("huerta", "huerta_rentada").filter(id__in=temporada_ids)
+            encontrados = {t.id: t for t in qs}
+            self.temporadas.update({pk: encontrados.get(pk) for pk in temporada_ids})
+
+    @staticmethod
+    def _ids(filas: List[Fila], columna: str) -> set:
+        ids = set()
+        for _, fila in filas:
+            try:
+                ids.add(_entero(fila[columna]))
+            except (KeyError, TypeError, ValueError):
+                continue
+        return ids
+
+    @abstractmethod
+    def construir(self, fila: Dict[str, Any]):
+        """Devuelve (instancia sin guardar, tag de reporte) o lanza _ErroresFila."""
+
+    # ——— Reglas compartidas ———
+    def _categoria(self, lector: _Lector):
+        categoria_id = lector.get("categoria_id", _entero, requerido=False)
+        if categoria_id is not None:
+            categoria = self.categorias.get(categoria_id)
+            if categoria is None:
+                lector.error("categoria_id", "La categoría no existe.")
+        else:
+            nombre = lector.get("categoria", requerido=False)
+            if nombre is None:
+                lector.error("categoria_id", "Indica categoria_id o el nombre de la categoría.")
+                return None
+            candidatas = self.categorias_por_nombre.get(nombre.strip().lower(), [])
+            if len(candidatas) != 1:
+                lector.error("categoria", "La categoría no existe." if not candidatas else "Nombre de categoría ambiguo; usa categoria_id.")
+                return None
+            categoria = candidatas[0]
+        if categoria is not None and not categoria.is_active:
+            lector.error("categoria_id", "No puedes usar una categoría archivada.")
+        return categoria
+
+    def _gastos(self, lector: _Lector) -> Tuple[Optional[Decimal], Optional[Decimal]]:
+        insumos = lector.get("gastos_insumos", _decimal)
+        mano = lector.get("gastos_mano_obra", _decimal)
+        for campo, valor in (("gastos_insumos", insumos), ("gastos_mano_obra", mano)):
+            if valor is not None and valor < 0:
+                lector.error(campo, "No puede ser negativo.")
+        if insumos is not None and mano is not None and insumos + mano <= 0:
+            lector.error("gastos_insumos", "Los gastos totales deben ser mayores a 0.")
+        return insumos, mano
+
+    def _cosecha(self, lector: _Lector):
+        """Cosecha activa con su temporada y origen; None si hay errores."""
+        cosecha_id = lector.get("cosecha_id", _entero)
+        if cosecha_id is None:
+            return None
+        cosecha = self.cosechas.get(cosecha_id)
+        if cosecha is None:
+            lector.error("cosecha_id", "La cosecha no existe.")
+            return None
+        temporada = cosecha.temporada
+        temporada_id = lector.get("temporada_id", _entero, requerido=False)
+        if temporada_id is not None and temporada_id != temporada.id:
+            lector.error("temporada_id", "La temporada no coincide con la temporada de la cosecha.")
+        if not cosecha.is_active:
+            lector.error("cosecha_id", "La cosecha está archivada.")
+        if not temporada.is_active:
+            lector.error("temporada_id", "La temporada está archivada.")
+        huerta = cosecha.huerta or temporada.huerta
+        huerta_rentada = cosecha.huerta_rentada or temporada.huerta_rentada
+        self._origen(lector, huerta, huerta_rentada, "cosecha_id")
+        return cosecha
+
+    def _origen(self, lector: _Lector, huerta, huerta_rentada, campo: str) -> None:
+        if bool(huerta) == bool(huerta_rentada):
+            lector.error(campo, "No tiene un origen (huerta/huerta_rentada) definido.")
+        elif huerta and not huerta.is_active:
+            lector.error("huerta_id", "La huerta está archivada.")
+        elif huerta_rentada and not huerta_rentada.is_active:
+            lector.error("huerta_rentada_id", "La huerta rentada está archivada.")
+
+    def _fecha_en_cosecha(self, lector: _Lector, campo: str, cosecha) -> Optional[date]:
+        fecha = lector.get(campo, _fecha)
+        if fecha is None:
+            return None
+        if fecha > timezone.localdate():
+            lector.error(campo, "La fecha no puede ser futura.")
+        if cosecha is not None and cosecha.fecha_inicio:
+            inicio = timezone.localtime(cosecha.fecha_inicio).date()
+            if fecha < inicio:
+                lector.error(campo, f"La fecha debe ser igual o posterior al inicio de la cosecha ({inicio.isoformat()}).")
+        return fecha
+
+    def validar_campos(self, obj) -> None:
+        # Validadores de campo del modelo (mínimos, dígitos); clean() no aplica
+        # porque prohíbe temporadas/cosechas finalizadas.
+        try:
+            obj.clean_fields(exclude=list(self.excluir_clean))
+        except DjangoValidationError as exc:
+            raise _ErroresFila(exc.message_dict) from None
+
+
+class _ImportadorInversiones(_Importador):
+    modelo = InversionesHuerta
+    modelo_categoria = CategoriaInversion
+
+    def construir(self, fila):
+        lector = _Lector(fila)
+        cosecha = self._cosecha(lector)
+        fecha = self._fecha_en_cosecha(lector, "fecha", cosecha)
+        categoria = self._categoria(lector)
+        insumos, mano = self._gastos(lector)
+        lector.verificar()
+        temporada = cosecha.temporada
+        obj = InversionesHuerta(
+            categoria=categoria,
+            fecha=fecha,
+            descripcion=lector.get("descripcion", requerido=False),
+            gastos_insumos=insumos,
+            gastos_mano_obra=mano,
+            cosecha=cosecha,
+            temporada=temporada,
+            huerta=cosecha.huerta or temporada.huerta,
+            huerta_rentada=cosecha.huerta_rentada or temporada.huerta_rentada,
+        )
+        self.validar_campos(obj)
+        return obj, report_tag("cosecha", cosecha.id)
+
+
+class _ImportadorVentas(_Importador):
+    modelo = Venta
+
+    def construir(self, fila):
+        lector = _Lector(fila)
+        cosecha = self._cosecha(lector)
+        fecha = self._fecha_en_cosecha(lector, "fecha_venta", cosecha)
+        tipo_mango = lector.get("tipo_mango")
+        num_cajas = lector.get("num_cajas", _entero)
+        precio = lector.get("precio_por_caja", _entero)
+        gasto = lector.get("gasto", _entero)
+        if num_cajas is not None and num_cajas <= 0:
+            lector.error("num_cajas", "Debe ser mayor que 0.")
+        if precio is not None and precio <= 0:
+            lector.error("precio_por_caja", "Debe ser > 0.")
+        if gasto is not None and gasto < 0:
+            lector.error("gasto", "Debe ser ≥ 0.")
+        lector.verificar()
+        temporada = cosecha.temporada
+        obj = Venta(
+            fecha_venta=fecha,
+            num_cajas=num_cajas,
+            precio_por_caja=precio,
+            tipo_mango=tipo_mango,
+            descripcion=lector.get("descripcion", requerido=False),
+            gasto=gasto,
+            cosecha=cosecha,
+            temporada=temporada,
+            huerta=cosecha.huerta or temporada.huerta,
+            huerta_rentada=cosecha.huerta_rentada or temporada.huerta_rentada,
+        )
+        self.validar_campos(obj)
+        return obj, report_tag("cosecha", cosecha.id)
+
+
+class _ImportadorPreCosechas(_Importador):
+    modelo = PreCosecha
+    modelo_categoria = CategoriaPreCosecha
+
+    def construir(self, fila):
+        lector = _Lector(fila)
+        temporada = None
+        temporada_id = lector.get("temporada_id", _entero)
+        if temporada_id is not None:
+            temporada = self.temporadas.get(temporada_id)
+            if temporada is None:
+                lector.error("temporada_id", "La temporada no existe.")
+            else:
+                if not temporada.is_active:
+                    lector.error("temporada_id", "La temporada está archivada.")
+                self._origen(lector, temporada.huerta, temporada.huerta_rentada, "temporada_id")
+        fecha = lector.get("fecha", _fecha)
+        if fecha is not None:
+            if fecha > timezone.localdate():
+                lector.error("fecha", "La fecha no puede ser futura.")
+            if temporada is not None and temporada.fecha_inicio and fecha >= temporada.fecha_inicio:
+                lector.error("fecha", "La fecha de precosecha debe ser anterior al inicio operativo de la temporada.")
+        categoria = self._categoria(lector)
+        insumos, mano = self._gastos(lector)
+        lector.verificar()
+        obj = PreCosecha(
+            categoria=categoria,
+            fecha=fecha,
+            descripcion=lector.get("descripcion", requerido=False),
+            gastos_insumos=insumos,
+            gastos_mano_obra=mano,
+            temporada=temporada,
+            huerta=temporada.huerta,
+            huerta_rentada=temporada.huerta_rentada,
+        )
+        self.validar_campos(obj)
+        return obj, report_tag("temporada", temporada.id)
+
+
+_IMPORTADORES = {
+    "inversiones": _ImportadorInversiones,
+    "ventas": _ImportadorVentas,
+    "precosechas": _ImportadorPreCosechas,
+}
+
+
+def importar_financieros(
+    tipo: str,
+    filas: Iterable[Fila],
+    *,
+    batch_size: int = BATCH_SIZE,
+    dry_run: bool = False,
+) -> ResultadoImportacion:
+    """
+    Valida e inserta `filas` (ver `leer_filas`) por lotes de `batch_size`.
+    Cada lote se inserta en su propia transacción; con `dry_run` solo valida.
+    """
+    if tipo not in _IMPORTADORES:
+        raise ValueError(f"Tipo de importación no soportado: {tipo}")
+    importador = _IMPORTADORES[tipo]()
+    resultado = ResultadoImportacion(tipo=tipo, dry_run=dry_run)
+
+    filas = iter(filas)
+    while True:
+        lote = list(islice(filas, batch_size))
+        if not lote:
+            break
+        resultado.total += len(lote)
+        importador.precargar(lote)
+
+        validas: List[Tuple[int, Any]] = []
+        tags = set()
+        for numero, fila in lote:
+            try:
+                obj, tag = importador.construir(fila)
+            except _ErroresFila as exc:
+                resultado.errores.append({"fila": numero, "errors": exc.errors})
+                continue
+            validas.append((numero, obj))
+            tags.add(tag)
+
+        resultado.validas += len(validas)
+        if dry_run or not validas:
+            continue
+        try:
+            with transaction.atomic():
+                importador.modelo.objects.bulk_create([obj for _, obj in validas])
+                # bulk_create no dispara post_save: una invalidación por lote.
+                transaction.on_commit(partial(bump_report_tags, tags))
+        except DatabaseError as exc:
+            resultado.validas -= len(validas)
+            resultado.errores.extend(
+                {"fila": numero, "errors": {"non_field_errors": [f"Error al guardar el lote: {exc}"]}}
+                for numero, _ in validas
+            )
+            continue
+        resultado.creadas += len(validas)
+
+    resultado.errores.sort(key=lambda e: e["fila"])
+    return resultado
+
+
+__all__ = [
+    "BATCH_SIZE",
+    "ResultadoImportacion",
+    "TIPOS_IMPORTACION",
+    "importar_financieros",
+    "leer_filas",
+]
@@ -10,7 +10,7 @@ Incluye
 - Detalle de inversiones y ventas, análisis por categorías/variedades.
 - Métricas de rendimiento (cajas totales, precio/caja, costo/margen por caja).
 - Validación de integridad (consistencia entre resumen y detalle).
-- Cache multiusuario con aislamiento por UID.
+- Cache compartido entre usuarios (permisos antes del cache; `generado_por` por usuario).
 - Estructura `ui` (kpis/series/tablas) para frontend.
 
 Reglas de negocio
@@ -28,17 +28,21 @@ from decimal import Decimal, ROUND_HALF_UP
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 
-from django.core.cache import cache
 from django.core.exceptions import ValidationError, PermissionDenied
 from django.db.models import Prefetch, Sum, F
 from django.utils import timezone
 
+from agroproductores_risol.utils.single_flight import get_or_compute
 from gestion_huerta.models import Cosecha, InversionesHuerta, Venta
 from gestion_huerta.services.exportacion_service import ExportacionService
 from gestion_huerta.utils.cache_keys import (
     REPORTES_CACHE_TIMEOUT,
     REPORTES_CACHE_VERSION,  # noqa: F401 (mantenemos compatibilidad de import)
+    REPORTES_CACHE_STALE_TIMEOUT,
     generate_cache_key,
+    generate_stale_key,
+    overlay_usuario,
+    report_tag,
 )
 
 # ========= Utilidades numéricas/seguras =========
@@ -266,7 +270,7 @@ def generar_reporte_cosecha(
 ) -> Dict[str, Any]:
     """
     Genera el reporte completo de una cosecha (JSON).
-    Cachea por (cosecha_id, formato, uid) después de validar permisos.
+    Cachea por (cosecha_id, formato) después de validar permisos.
     """
     if cosecha_inst is not None:
         cosecha = cosecha_inst
@@ -298,15 +302,33 @@ def generar_reporte_cosecha(
     if not skip_permission_check and not _validar_permisos_cosecha(usuario, cosecha):
         raise PermissionDenied("Sin permisos para generar este reporte")
 
+    origen_cache = cosecha.huerta or cosecha.huerta_rentada
+    cache_params = {"cosecha_id": cosecha_id, "formato": formato}
     cache_key = generate_cache_key(
         "cosecha",
-        {"cosecha_id": cosecha_id, "formato": formato, "uid": getattr(usuario, "id", None)},
+        cache_params,
+        tags=[
+            report_tag("cosecha", cosecha.id),
+            report_tag("temporada", cosecha.temporada_id),
+            report_tag("huerta", cosecha.huerta_id),
+            report_tag("huerta_rentada", cosecha.huerta_rentada_id),
+            report_tag("propietario", getattr(origen_cache, "propietario_id", None)),
+        ],
+    )
+    reporte = get_or_compute(
+        cache_key,
+        lambda: _construir_reporte_cosecha(cosecha),
+        REPORTES_CACHE_TIMEOUT,
+        namespace="huerta.reporte_cosecha",
+        stale_key=generate_stale_key("cosecha", cache_params),
+        stale_timeout=REPORTES_CACHE_STALE_TIMEOUT,
+        force=force_refresh,
     )
-    if not force_refresh:
-        cached = cache.get(cache_key)
-        if cached:
-            return cached
+    return overlay_usuario(reporte, usuario)
+
 
+def _construir_reporte_cosecha(cosecha: Cosecha) -> Dict[str, Any]:
+    """Calcula el reporte de la cosecha (sin cache)."""
     origen = cosecha.huerta or cosecha.huerta_rentada
     origen_nombre = safe_str(getattr(origen, "nombre", None) or safe_str(origen)) if origen else "N/A"
     ubicacion = safe_str(getattr(origen, "ubicacion", "")) if origen else ""
@@ -380,7 +402,7 @@ def generar_reporte_cosecha(
         "metadata": {
             "tipo": "cosecha",
             "fecha_generacion": timezone.localtime(timezone.now()).isoformat(timespec="seconds"),
-            "generado_por": getattr(usuario, "username", safe_str(usuario)),
+            "generado_por": None,  # por usuario: overlay_usuario al responder
             "generado_en": timezone.localtime(timezone.now()).isoformat(timespec="seconds"),  # alias amigable
             "cosecha_id": cosecha.id,
             "entidad": {"id": cosecha.id, "nombre": safe_str(cosecha.nombre), "tipo": "cosecha"},
@@ -447,7 +469,6 @@ def generar_reporte_cosecha(
     reporte["ui"] = _build_ui_from_cosecha(reporte)
     _validar_integridad_reporte(reporte)
 
-    cache.set(cache_key, reporte, REPORTES_CACHE_TIMEOUT)
     return reporte
 
 def exportar_cosecha(cosecha_id: int, usuario, formato: str) -> bytes:
@@ -12,7 +12,7 @@ Reglas de negocio
 - Proyecciones: promedio móvil de 3 años (si hay ≥2), alertas por ROI bajo y tendencia decreciente.
 
 Cache/Permisos
-- Cache por (huerta_id|huerta_rentada_id, años, formato, uid).
+- Cache compartido por (huerta_id|huerta_rentada_id, años, formato).
 - Permisos: superuser/staff o `gestion_huerta.view_huerta`.
   > Recomendación: complementar con pertenencia (owner) si aplica.
 
@@ -25,17 +25,21 @@ from decimal import Decimal, ROUND_HALF_UP
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 
-from django.core.cache import cache
 from django.core.exceptions import ValidationError, PermissionDenied
 from django.utils import timezone
 
-from gestion_huerta.models import Huerta, HuertaRentada
+from agroproductores_risol.utils.single_flight import get_or_compute
+from gestion_huerta.models import Cosecha, Huerta, HuertaRentada
 from gestion_huerta.services.exportacion_service import ExportacionService
 from gestion_huerta.services.reportes.temporada_service import generar_reporte_temporada
 from gestion_huerta.utils.cache_keys import (
     REPORTES_CACHE_TIMEOUT,
     REPORTES_CACHE_VERSION,
+    REPORTES_CACHE_STALE_TIMEOUT,
     generate_cache_key,
+    generate_stale_key,
+    overlay_usuario,
+    report_tag,
 )
 
 # ========= Utils locales =========
@@ -250,31 +254,53 @@ def generar_perfil_huerta(
     if not _validar_permisos_huerta(usuario, origen):
         raise PermissionDenied("Sin permisos para generar este reporte")
 
-    # Cache por usuario (uid) para evitar fugas de datos.
-    # La validación de permisos ocurre antes del cache hit para no servir
-    # reportes a usuarios que hayan perdido acceso desde la última generación.
-    cache_key = generate_cache_key(
-        "perfil_huerta",
-        {
-            "huerta_id": huerta_id,
-            "huerta_rentada_id": huerta_rentada_id,
-            "años": años,
-            "formato": formato,
-            "uid": getattr(usuario, "id", None),
-        },
+    temporadas = list(temporadas)
+    temporada_ids = [t.id for t in temporadas]
+    cosecha_ids = Cosecha.objects.filter(temporada_id__in=temporada_ids).values_list("id", flat=True)
+    # Tags: el origen (y qué temporadas tiene), cada temporada y sus cosechas.
+    tags = [
+        report_tag("huerta", huerta_id),
+        report_tag("huerta_rentada", huerta_rentada_id),
+        report_tag("temporadas_huerta", huerta_id),
+        report_tag("temporadas_huerta_rentada", huerta_rentada_id),
+        report_tag("propietario", origen.propietario_id),
+        *(report_tag("temporada", pk) for pk in temporada_ids),
+        *(report_tag("cosecha", pk) for pk in cosecha_ids),
+    ]
+
+    # Cache compartido entre usuarios: la validación de permisos ocurre antes
+    # del cache hit para no servir reportes a usuarios sin acceso, y lo propio
+    # de cada usuario se superpone al responder (overlay_usuario).
+    cache_params = {
+        "huerta_id": huerta_id,
+        "huerta_rentada_id": huerta_rentada_id,
+        "años": años,
+        "formato": formato,
+    }
+    cache_key = generate_cache_key("perfil_huerta", cache_params, tags=tags)
+    reporte = get_or_compute(
+        cache_key,
+        lambda: _construir_perfil_huerta(origen, temporadas, huerta_id, huerta_rentada_id, force_refresh),
+        REPORTES_CACHE_TIMEOUT,
+        namespace="huerta.perfil_huerta",
+        stale_key=generate_stale_key("perfil_huerta", cache_params),
+        stale_timeout=REPORTES_CACHE_STALE_TIMEOUT,
+        force=force_refresh,
     )
-    if not force_refresh:
-        cached = cache.get(cache_key)
-        if cached:
-            return cached
+    return overlay_usuario(reporte, usuario)
+
 
+def _construir_perfil_huerta(
+    origen, temporadas: List[Any], huerta_id: Optional[int], huerta_rentada_id: Optional[int], force_refresh: bool
+) -> Dict[str, Any]:
+    """Calcula el perfil histórico de la huerta (sin cache)."""
     datos_historicos: List[Dict[str, Any]] = []
     suma_roi = Decimal("0")
     total_años_validos = 0
     for temporada in temporadas:
         rep_t = generar_reporte_temporada(
             temporada.id,
-            usuario,
+            None,  # el reporte compartido no depende del usuario
             "json",
             force_refresh=force_refresh,
             temporada_inst=temporada,
@@ -306,7 +332,7 @@ def generar_perfil_huerta(
             "tipo": "perfil_huerta",
             # Fecha local a zona configurada, sin microsegundos
             "fecha_generacion": timezone.localtime(timezone.now()).isoformat(timespec="seconds"),
-            "generado_por": getattr(usuario, "username", safe_str(usuario)),
+            "generado_por": None,  # por usuario: overlay_usuario al responder
             "huerta_id": huerta_id,
             "huerta_rentada_id": huerta_rentada_id,
             "años_analizados": total_años_validos,
@@ -373,7 +399,6 @@ def generar_perfil_huerta(
         pass
 
     _validar_integridad_reporte(reporte)
-    cache.set(cache_key, reporte, REPORTES_CACHE_TIMEOUT)
     return reporte
 
 def exportar_perfil_huerta(
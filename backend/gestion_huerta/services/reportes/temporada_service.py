@@ -9,7 +9,7 @@ Incluye
 - Resumen ejecutivo (inversión, ventas, gastos, utilidad, ROI, productividad, cajas).
 - Comparativo por cosecha y análisis global por categorías/variedades.
 - Métricas de eficiencia por hectárea y por caja.
-- Cache por solicitante (aislado por UID) y validación de integridad temporal.
+- Cache compartido entre usuarios (permisos antes del cache) y validación de integridad temporal.
 
 Reglas de negocio
 - ROI temporada = ganancia_neta / inversión_total * 100; si inversión_total==0 → ROI=0.
@@ -24,18 +24,22 @@ from decimal import Decimal, ROUND_HALF_UP
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 
-from django.core.cache import cache
 from django.core.exceptions import ValidationError, PermissionDenied
 from django.db.models import Prefetch
 from django.utils import timezone
 
+from agroproductores_risol.utils.single_flight import get_or_compute
 from gestion_huerta.models import Temporada, Cosecha, InversionesHuerta, PreCosecha, Venta
 from gestion_huerta.services.exportacion_service import ExportacionService
 from gestion_huerta.services.reportes.cosecha_service import generar_reporte_cosecha
 from gestion_huerta.utils.cache_keys import (
     REPORTES_CACHE_TIMEOUT,
     REPORTES_CACHE_VERSION,
+    REPORTES_CACHE_STALE_TIMEOUT,
     generate_cache_key,
+    generate_stale_key,
+    overlay_usuario,
+    report_tag,
 )
 
 # ========= Utilidades locales (consistentes con otros servicios) =========
@@ -312,7 +316,7 @@ def generar_reporte_temporada(
 ) -> Dict[str, Any]:
     """
     Genera el reporte agregado de la temporada (JSON) sumando sus cosechas.
-    Cachea por (temporada_id, formato, uid) después de validar permisos.
+    Cachea por (temporada_id, formato) después de validar permisos.
     Reutiliza cosechas prefeteadas para evitar roundtrips.
     """
     if temporada_inst is not None:
@@ -345,15 +349,34 @@ def generar_reporte_temporada(
     if not skip_permission_check and not _validar_permisos_temporada(usuario, temporada):
         raise PermissionDenied("Sin permisos para generar este reporte")
 
+    cosechas = list(temporada.cosechas.all())
+    origen = temporada.huerta or temporada.huerta_rentada
+    cache_params = {"temporada_id": temporada_id, "formato": formato}
     cache_key = generate_cache_key(
-        "temporada", {"temporada_id": temporada_id, "formato": formato, "uid": getattr(usuario, "id", None)}
+        "temporada",
+        cache_params,
+        tags=[
+            report_tag("temporada", temporada.id),
+            report_tag("huerta", temporada.huerta_id),
+            report_tag("huerta_rentada", temporada.huerta_rentada_id),
+            report_tag("propietario", getattr(origen, "propietario_id", None)),
+            *(report_tag("cosecha", c.id) for c in cosechas),
+        ],
     )
-    if not force_refresh:
-        cached = cache.get(cache_key)
-        if cached:
-            return cached
+    reporte = get_or_compute(
+        cache_key,
+        lambda: _construir_reporte_temporada(temporada, cosechas, force_refresh),
+        REPORTES_CACHE_TIMEOUT,
+        namespace="huerta.reporte_temporada",
+        stale_key=generate_stale_key("temporada", cache_params),
+        stale_timeout=REPORTES_CACHE_STALE_TIMEOUT,
+        force=force_refresh,
+    )
+    return overlay_usuario(reporte, usuario)
 
-    cosechas = list(temporada.cosechas.all())
+
+def _construir_reporte_temporada(temporada: Temporada, cosechas: List[Cosecha], force_refresh: bool) -> Dict[str, Any]:
+    """Calcula el reporte de la temporada (sin cache)."""
     origen = temporada.huerta or temporada.huerta_rentada
     origen_nombre = safe_str(getattr(origen, "nombre", None) or safe_str(origen)) if origen else "N/A"
     ubicacion = safe_str(getattr(origen, "ubicacion", "")) if origen else ""
@@ -373,7 +396,7 @@ def generar_reporte_temporada(
     for c in cosechas:
         rep_c = generar_reporte_cosecha(
             c.id,
-            usuario,
+            None,  # el reporte compartido no depende del usuario
             "json",
             force_refresh=force_refresh,
             cosecha_inst=c,
@@ -451,7 +474,7 @@ def generar_reporte_temporada(
             "tipo": "temporada",
             # Fecha local (zona de settings) sin microsegundos
             "fecha_generacion": timezone.localtime(timezone.now()).isoformat(timespec="seconds"),
-            "generado_por": getattr(usuario, "username", safe_str(usuario)),
+            "generado_por": None,  # por usuario: overlay_usuario al responder
             # Se elimina temporada_id/version y se agrega bloque entidad para el frontend
             "entidad": {"id": temporada.id, "nombre": origen_nombre, "tipo": "temporada"},
             "infoHuerta": {
@@ -543,7 +566,6 @@ def generar_reporte_temporada(
     )
     _validar_integridad_reporte(reporte)
 
-    cache.set(cache_key, reporte, REPORTES_CACHE_TIMEOUT)
     return reporte
 
 def exportar_temporada(temporada_id: int, usuario, formato: str) -> bytes:
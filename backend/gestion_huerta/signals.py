@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+from functools import partial
+
 from django.db import transaction
-from django.db.models.signals import post_delete, post_save
+from django.db.models.signals import post_delete, post_init, post_save
 
 from gestion_huerta.models import (
     CategoriaPreCosecha,
@@ -14,26 +16,60 @@ from gestion_huerta.models import (
     Temporada,
     Venta,
 )
-from gestion_huerta.utils.cache_keys import bump_reportes_cache_generation
+from gestion_huerta.utils.cache_keys import (
+    bump_report_tags,
+    bump_reportes_cache_generation,
+    report_tag,
+)
 
 
-REPORTES_INVALIDATION_MODELS = (
-    Propietario,
-    Huerta,
-    HuertaRentada,
-    Temporada,
-    CategoriaPreCosecha,
-    Cosecha,
-    InversionesHuerta,
-    Venta,
-    PreCosecha,
-)
+# Tags de reporte que rota cada modelo: (tipo de tag, attname con el id).
+# Una venta solo afecta a su cosecha; los reportes de temporada y perfil
+# declaran las cosechas que agregan, así que también se invalidan.
+REPORTES_TAG_FIELDS = {
+    Propietario: (("propietario", "id"),),
+    Huerta: (("huerta", "id"),),
+    HuertaRentada: (("huerta_rentada", "id"),),
+    Temporada: (
+        ("temporada", "id"),
+        ("temporadas_huerta", "huerta_id"),
+        ("temporadas_huerta_rentada", "huerta_rentada_id"),
+    ),
+    Cosecha: (("cosecha", "id"), ("temporada", "temporada_id")),
+    InversionesHuerta: (("cosecha", "cosecha_id"),),
+    Venta: (("cosecha", "cosecha_id"),),
+    PreCosecha: (("temporada", "temporada_id"),),
+}
+
+# Catálogos compartidos por todos los reportes: invalidación global.
+REPORTES_INVALIDATION_MODELS = (*REPORTES_TAG_FIELDS, CategoriaPreCosecha)
+
+
+def _report_tags(instance) -> set:
+    # __dict__ evita cargar campos diferidos (only/defer) en señales.
+    data = instance.__dict__
+    return {
+        report_tag(tipo, data.get(attname))
+        for tipo, attname in REPORTES_TAG_FIELDS[type(instance)]
+    } - {None}
 
 
-def _schedule_report_cache_invalidation(**kwargs) -> None:
+def _stash_initial_report_tags(sender, instance, **kwargs) -> None:
+    # Si el registro cambia de cosecha/temporada/huerta, el origen anterior
+    # también debe invalidarse.
+    instance._reportes_tags_iniciales = _report_tags(instance)
+
+
+def _schedule_report_cache_invalidation(sender, instance, **kwargs) -> None:
     if kwargs.get("raw"):
         return
-    transaction.on_commit(bump_reportes_cache_generation)
+    if sender not in REPORTES_TAG_FIELDS:
+        transaction.on_commit(bump_reportes_cache_generation)
+        return
+    actuales = _report_tags(instance)
+    tags = actuales | getattr(instance, "_reportes_tags_iniciales", set())
+    instance._reportes_tags_iniciales = actuales
+    transaction.on_commit(partial(bump_report_tags, tags))
 
 
 for model in REPORTES_INVALIDATION_MODELS:
@@ -49,3 +85,12 @@ for model in REPORTES_INVALIDATION_MODELS:
         weak=False,
         dispatch_uid=f"gestion_huerta.reportes.invalidate.delete.{model._meta.label_lower}",
     )
+
+for model, fields in REPORTES_TAG_FIELDS.items():
+    if any(attname != "id" for _, attname in fields):
+        post_init.connect(
+            _stash_initial_report_tags,
+            sender=model,
+            weak=False,
+            dispatch_uid=f"gestion_huerta.reportes.tags.init.{model._meta.label_lower}",
+        )
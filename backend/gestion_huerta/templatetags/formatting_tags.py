@@ -1,23 +1,28 @@
+from functools import lru_cache
+
 from django import template
-import inflect
 
 register = template.Library()
-p = inflect.engine()
+
+
+@lru_cache(maxsize=1)
+def _engine():
+    # inflect tarda segundos en importarse; Django carga todas las templatetags
+    # al crear el motor de plantillas, así que se difiere al primer uso.
+    import inflect
+
+    return inflect.engine()
+
 
 @register.filter
 def intword(value):
     try:
         value = float(value)
-        return p.number_to_words(int(value))
+        return _engine().number_to_words(int(value))
     except (ValueError, TypeError):
         return value
 
-import inflect
-from django import template
-
-register = template.Library()
-p = inflect.engine()
 
 @register.filter
 def number_to_words(value):
-    return p.number_to_words(value)
\ No newline at end of file
+    return _engine().number_to_words(value)
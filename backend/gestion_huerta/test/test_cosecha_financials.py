@@ -0,0 +1,84 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from gestion_huerta.models import (
+    CategoriaInversion,
+    Cosecha,
+    Huerta,
+    InversionesHuerta,
+    Propietario,
+    Temporada,
+    Venta,
+)
+
+
+class CosechaFinancialsTests(APITestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            telefono='9990003131',
+            password='adminpass',
+            nombre='Admin',
+            apellido='Finanzas',
+            role='admin',
+        )
+        self.client.force_authenticate(user=self.user)
+        propietario = Propietario.objects.create(
+            nombre='Ana', apellidos='Lopez', telefono='1234567801', direccion='Calle 3',
+        )
+        self.huerta = Huerta.objects.create(
+            nombre='Huerta Finanzas', ubicacion='Norte', variedades='Kent',
+            hectareas=2.0, propietario=propietario,
+        )
+        today = timezone.localdate()
+        self.temporada = Temporada.objects.create(
+            año=today.year, huerta=self.huerta, fecha_inicio=today - timedelta(days=30),
+        )
+        self.categoria = CategoriaInversion.objects.create(nombre='Riego')
+        self.url = reverse('huerta:cosecha-list')
+
+    def _cosecha(self, nombre, cajas):
+        cosecha = Cosecha.objects.create(nombre=nombre, temporada=self.temporada)
+        Venta.objects.create(
+            fecha_venta=timezone.localdate(), num_cajas=cajas, precio_por_caja=100,
+            tipo_mango='Kent', gasto=0, cosecha=cosecha, temporada=self.temporada, huerta=self.huerta,
+        )
+        InversionesHuerta.objects.create(
+            categoria=self.categoria, fecha=timezone.localdate(),
+            gastos_insumos=Decimal('150.00'), gastos_mano_obra=Decimal('50.00'),
+            cosecha=cosecha, temporada=self.temporada, huerta=self.huerta,
+        )
+        cosecha.finalizar()
+        return cosecha
+
+    def test_with_financials_matches_properties(self):
+        cosecha = self._cosecha('Cosecha Uno', 10)
+        Cosecha.objects.create(nombre='Sin movimientos', temporada=self.temporada, finalizada=True)
+
+        rows = {c.nombre: c for c in Cosecha.objects.with_financials()}
+        anotada = rows['Cosecha Uno']
+        self.assertEqual(anotada.fin_total_ventas, cosecha.total_ventas)
+        self.assertEqual(anotada.fin_total_gastos, cosecha.total_gastos)
+        self.assertEqual(anotada.fin_ganancia_neta, Decimal('800.00'))
+        self.assertEqual(rows['Sin movimientos'].fin_total_ventas, Decimal('0.00'))
+
+    def test_list_query_count_does_not_grow_with_rows(self):
+        self._cosecha('Cosecha Uno', 10)
+        with CaptureQueriesContext(connection) as one:
+            response = self.client.get(self.url, {'temporada': self.temporada.id})
+        row = response.data['data']['results'][0]
+        self.assertEqual(row['ventas_totales'], 1000.0)
+        self.assertEqual(row['gastos_totales'], 200.0)
+        self.assertEqual(row['margen_ganancia'], 800.0)
+
+        for i in range(4):
+            self._cosecha(f'Cosecha Extra {i}', 5)
+        with CaptureQueriesContext(connection) as many:
+            self.client.get(self.url, {'temporada': self.temporada.id})
+        self.assertEqual(len(one), len(many))
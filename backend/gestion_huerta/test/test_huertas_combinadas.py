@@ -0,0 +1,75 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from gestion_huerta.models import Huerta, HuertaRentada, Propietario
+
+
+class HuertasCombinadasPaginationTests(APITestCase):
+    def setUp(self):
+        self.admin = get_user_model().objects.create_user(
+            telefono='9990001212',
+            password='adminpass',
+            nombre='Admin',
+            apellido='Combinadas',
+            role='admin',
+        )
+        self.client.force_authenticate(user=self.admin)
+        self.propietario = Propietario.objects.create(
+            nombre='Laura',
+            apellidos='Rios',
+            telefono='1234567800',
+            direccion='Calle 2',
+        )
+        self.url = reverse('huerta:huertas-combinadas-listar-combinadas')
+        for i in range(3):
+            Huerta.objects.create(
+                nombre=f'Loma {i}', ubicacion='Norte', variedades='Kent',
+                hectareas=1.0, propietario=self.propietario,
+            )
+            HuertaRentada.objects.create(
+                nombre=f'Loma R{i}', ubicacion='Sur', variedades='Kent',
+                hectareas=1.0, propietario=self.propietario, monto_renta=Decimal('100.00'),
+            )
+        self.exacta = HuertaRentada.objects.create(
+            nombre='Loma', ubicacion='Centro', variedades='Kent',
+            hectareas=1.0, propietario=self.propietario, monto_renta=Decimal('100.00'),
+        )
+
+    def test_orders_exact_first_then_propias_then_rentadas(self):
+        response = self.client.get(self.url, {'nombre': 'Loma', 'page_size': 4})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.data['data']
+        self.assertEqual(data['meta']['count'], 7)
+        self.assertEqual(data['meta']['total_pages'], 2)
+        rows = [(r['tipo'], r['nombre']) for r in data['results']]
+        self.assertEqual(rows, [
+            ('rentada', 'Loma'),
+            ('propia', 'Loma 2'),
+            ('propia', 'Loma 1'),
+            ('propia', 'Loma 0'),
+        ])
+
+        page2 = self.client.get(self.url, {'nombre': 'Loma', 'page_size': 4, 'page': 2}).data['data']
+        self.assertEqual([r['nombre'] for r in page2['results']], ['Loma R2', 'Loma R1', 'Loma R0'])
+
+    def test_tipo_filter_and_query_count_independent_of_catalog(self):
+        response = self.client.get(self.url, {'tipo': 'propia'})
+        self.assertEqual({r['tipo'] for r in response.data['data']['results']}, {'propia'})
+        self.assertEqual(response.data['data']['meta']['count'], 3)
+
+        with CaptureQueriesContext(connection) as small:
+            self.client.get(self.url, {'page_size': 2})
+        for i in range(10):
+            Huerta.objects.create(
+                nombre=f'Extra {i}', ubicacion='Este', variedades='Kent',
+                hectareas=1.0, propietario=self.propietario,
+            )
+        with CaptureQueriesContext(connection) as large:
+            self.client.get(self.url, {'page_size': 2})
+        self.assertEqual(len(small), len(large))
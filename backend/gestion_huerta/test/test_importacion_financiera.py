@@ -0,0 +1,120 @@
+import io
+import tempfile
+from datetime import date, datetime, timedelta
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+from pathlib import Path
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from openpyxl import Workbook
+
+from gestion_huerta.models import (
+    CategoriaInversion,
+    CategoriaPreCosecha,
+    Cosecha,
+    Huerta,
+    InversionesHuerta,
+    PreCosecha,
+    Propietario,
+    Temporada,
+    Venta,
+)
+from gestion_huerta.services import importacion_financiera
+from gestion_huerta.services.importacion_financiera import importar_financieros, leer_filas
+
+
+class ImportacionFinancieraTests(TestCase):
+    def setUp(self):
+        propietario = Propietario.objects.create(
+            nombre="Rosa", apellidos="Diaz", telefono="5550002222", direccion="Calle 12",
+        )
+        self.huerta = Huerta.objects.create(
+            nombre="Huerta Historica", ubicacion="Oeste", variedades="Kent", hectareas=5, propietario=propietario,
+        )
+        self.temporada = Temporada.objects.create(año=2024, huerta=self.huerta, fecha_inicio=date(2024, 3, 1))
+        self.cosecha = Cosecha.objects.create(nombre="2024-A", temporada=self.temporada, huerta=self.huerta)
+        Cosecha.objects.filter(pk=self.cosecha.pk).update(finalizada=True, fecha_inicio=datetime(2024, 4, 1, tzinfo=dt_timezone.utc))
+        Temporada.objects.filter(pk=self.temporada.pk).update(finalizada=True)
+        self.categoria = CategoriaInversion.objects.create(nombre="Fertilizante")
+        self.tmp = Path(tempfile.mkdtemp())
+
+    def _csv(self, texto):
+        path = self.tmp / "datos.csv"
+        path.write_text(texto, encoding="utf-8")
+        return path
+
+    def test_csv_ventas_importa_validas_y_reporta_errores_por_fila(self):
+        path = self._csv(
+            "Cosecha_ID,fecha_venta,tipo_mango,num_cajas,precio_por_caja,gasto\n"
+            f"{self.cosecha.id},2024-05-10,Kent,100,120,500\n"
+            f"{self.cosecha.id},11/05/2024,Ataulfo,80,\"1,150\",0\n"
+            "999999,2024-05-12,Kent,10,100,0\n"
+            f"{self.cosecha.id},2024-05-13,Kent,0,100,0\n"
+            ",,,,,\n"
+        )
+        with mock.patch.object(importacion_financiera, "bump_report_tags") as bump:
+            with self.captureOnCommitCallbacks(execute=True):
+                resultado = importar_financieros("ventas", leer_filas(path))
+
+        self.assertEqual((resultado.total, resultado.creadas, resultado.fallidas), (4, 2, 2))
+        self.assertEqual([e["fila"] for e in resultado.errores], [4, 5])
+        self.assertIn("cosecha_id", resultado.errores[0]["errors"])
+        self.assertIn("num_cajas", resultado.errores[1]["errors"])
+        ventas = Venta.objects.filter(cosecha=self.cosecha).order_by("fecha_venta")
+        self.assertEqual([v.precio_por_caja for v in ventas], [120, 1150])
+        self.assertEqual({(v.temporada_id, v.huerta_id) for v in ventas}, {(self.temporada.id, self.huerta.id)})
+        bump.assert_called_once_with({f"cosecha:{self.cosecha.id}"})
+
+    def test_lotes_con_consultas_constantes_y_una_invalidacion_por_lote(self):
+        filas = [
+            (n, {"cosecha_id": str(self.cosecha.id), "fecha": "2024-06-01", "categoria": "fertilizante",
+                 "gastos_insumos": "10.50", "gastos_mano_obra": "5"})
+            for n in range(2, 302)
+        ]
+        with mock.patch.object(importacion_financiera, "bump_report_tags") as bump:
+            with self.captureOnCommitCallbacks(execute=True):
+                with CaptureQueriesContext(connection) as queries:
+                    resultado = importar_financieros("inversiones", filas, batch_size=100)
+
+        # Búsquedas acotadas: categorías una vez y la cosecha solo en el primer lote.
+        selects = [q for q in queries.captured_queries if q["sql"].startswith("SELECT")]
+        self.assertEqual(len(selects), 2)
+
+        self.assertEqual(resultado.creadas, 300)
+        self.assertEqual(InversionesHuerta.objects.count(), 300)
+        self.assertEqual(bump.call_count, 3)
+
+    def test_xlsx_precosechas_y_dry_run(self):
+        temporada = Temporada.objects.create(
+            año=date.today().year + 1, huerta=self.huerta, fecha_inicio=date.today() + timedelta(days=30),
+            estado_operativo=Temporada.EstadoOperativo.PLANIFICADA,
+        )
+        CategoriaPreCosecha.objects.create(nombre="Poda")
+        wb = Workbook()
+        ws = wb.active
+        ws.append(["temporada_id", "fecha", "categoria", "gastos_insumos", "gastos_mano_obra", "descripcion"])
+        ws.append([temporada.id, date.today(), "Poda", 100, 50.25, "Poda general"])
+        ws.append([temporada.id, date.today() + timedelta(days=40), "Poda", 100, 0, None])
+        ws.append([temporada.id, date.today(), "Inexistente", 0, 0, None])
+        buffer = io.BytesIO()
+        wb.save(buffer)
+        path = self.tmp / "precosechas.xlsx"
+        path.write_bytes(buffer.getvalue())
+
+        resultado = importar_financieros("precosechas", leer_filas(path), dry_run=True)
+        self.assertEqual((resultado.validas, resultado.creadas, resultado.fallidas), (1, 0, 2))
+        self.assertEqual(set(resultado.errores[1]["errors"]), {"categoria", "gastos_insumos"})
+        self.assertFalse(PreCosecha.objects.exists())
+
+        out = io.StringIO()
+        errores = self.tmp / "errores.csv"
+        call_command("importar_financieros_huerta", "precosechas", str(path), errores=str(errores), stdout=out)
+        precosecha = PreCosecha.objects.get()
+        self.assertEqual(precosecha.gastos_mano_obra, Decimal("50.25"))
+        self.assertEqual(precosecha.huerta_id, self.huerta.id)
+        self.assertIn("1 de 3 filas importadas", out.getvalue())
+        self.assertIn("fila,campo,error", errores.read_text(encoding="utf-8"))
@@ -192,52 +192,54 @@ class PreCosechaReportingAndDashboardTests(TestCase):
         self.client = APIClient()
         self.client.force_authenticate(user=self.user)
 
-        propietario = Propietario.objects.create(
-            nombre="Prop",
-            apellidos="Tester",
-            telefono="3333333333",
-            direccion="Dir",
-        )
-        self.huerta_planificada = Huerta.objects.create(
-            nombre="Huerta Futura",
-            ubicacion="Ubic Fut",
-            variedades="Ataulfo",
-            historial="",
-            hectareas=2,
-            propietario=propietario,
-        )
-        self.huerta_operativa = Huerta.objects.create(
-            nombre="Huerta Operativa",
-            ubicacion="Ubic Op",
-            variedades="Tommy",
-            historial="",
-            hectareas=4,
-            propietario=propietario,
-        )
-        self.categoria = CategoriaPreCosecha.objects.create(nombre="Abonado")
+        # El índice de búsqueda del dashboard se mantiene en on_commit.
+        with self.captureOnCommitCallbacks(execute=True):
+            propietario = Propietario.objects.create(
+                nombre="Prop",
+                apellidos="Tester",
+                telefono="3333333333",
+                direccion="Dir",
+            )
+            self.huerta_planificada = Huerta.objects.create(
+                nombre="Huerta Futura",
+                ubicacion="Ubic Fut",
+                variedades="Ataulfo",
+                historial="",
+                hectareas=2,
+                propietario=propietario,
+            )
+            self.huerta_operativa = Huerta.objects.create(
+                nombre="Huerta Operativa",
+                ubicacion="Ubic Op",
+                variedades="Tommy",
+                historial="",
+                hectareas=4,
+                propietario=propietario,
+            )
+            self.categoria = CategoriaPreCosecha.objects.create(nombre="Abonado")
 
-        hoy = timezone.localdate()
-        self.temporada_planificada = Temporada.objects.create(
-            **{"a\u00f1o": hoy.year},
-            fecha_inicio=hoy + timedelta(days=20),
-            estado_operativo=Temporada.EstadoOperativo.PLANIFICADA,
-            huerta=self.huerta_planificada,
-        )
-        self.temporada_operativa = Temporada.objects.create(
-            **{"a\u00f1o": hoy.year},
-            fecha_inicio=hoy - timedelta(days=10),
-            estado_operativo=Temporada.EstadoOperativo.OPERATIVA,
-            huerta=self.huerta_operativa,
-        )
-        PreCosecha.objects.create(
-            temporada=self.temporada_planificada,
-            huerta=self.huerta_planificada,
-            categoria=self.categoria,
-            fecha=self.temporada_planificada.fecha_inicio - timedelta(days=5),
-            gastos_insumos=Decimal("90.00"),
-            gastos_mano_obra=Decimal("30.00"),
-            descripcion="Preparacion 2027",
-        )
+            hoy = timezone.localdate()
+            self.temporada_planificada = Temporada.objects.create(
+                **{"a\u00f1o": hoy.year},
+                fecha_inicio=hoy + timedelta(days=20),
+                estado_operativo=Temporada.EstadoOperativo.PLANIFICADA,
+                huerta=self.huerta_planificada,
+            )
+            self.temporada_operativa = Temporada.objects.create(
+                **{"a\u00f1o": hoy.year},
+                fecha_inicio=hoy - timedelta(days=10),
+                estado_operativo=Temporada.EstadoOperativo.OPERATIVA,
+                huerta=self.huerta_operativa,
+            )
+            PreCosecha.objects.create(
+                temporada=self.temporada_planificada,
+                huerta=self.huerta_planificada,
+                categoria=self.categoria,
+                fecha=self.temporada_planificada.fecha_inicio - timedelta(days=5),
+                gastos_insumos=Decimal("90.00"),
+                gastos_mano_obra=Decimal("30.00"),
+                descripcion="Preparacion 2027",
+            )
 
     def test_dashboard_excluye_temporadas_planificadas_del_contexto_operativo(self):
         overview = build_dashboard_overview(self.user)
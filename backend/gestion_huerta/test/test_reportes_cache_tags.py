@@ -0,0 +1,105 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+from agroproductores_risol.utils import single_flight
+from gestion_huerta.models import Cosecha, Huerta, Propietario, Temporada, Venta
+from gestion_huerta.services.reportes.cosecha_service import generar_reporte_cosecha
+from gestion_huerta.services.reportes.temporada_service import generar_reporte_temporada
+from gestion_huerta.utils.cache_keys import bump_reportes_cache_generation
+
+
+class ReportesCacheTagsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = get_user_model().objects.create_user(
+            telefono="6660000101", password="secret123", nombre="Admin", apellido="Tags", role="admin",
+        )
+        propietario = Propietario.objects.create(
+            nombre="Luis", apellidos="Mora", telefono="5550001111", direccion="Calle 9",
+        )
+        self.huerta_a = Huerta.objects.create(
+            nombre="Huerta A", ubicacion="Norte", variedades="Kent", hectareas=2, propietario=propietario,
+        )
+        self.huerta_b = Huerta.objects.create(
+            nombre="Huerta B", ubicacion="Sur", variedades="Kent", hectareas=3, propietario=propietario,
+        )
+        self.temporada_a = Temporada.objects.create(año=2026, huerta=self.huerta_a)
+        self.temporada_b = Temporada.objects.create(año=2026, huerta=self.huerta_b)
+        self.cosecha_a1 = Cosecha.objects.create(nombre="A1", temporada=self.temporada_a, huerta=self.huerta_a)
+        self.cosecha_a2 = Cosecha.objects.create(nombre="A2", temporada=self.temporada_a, huerta=self.huerta_a)
+        self.cosecha_b = Cosecha.objects.create(nombre="B1", temporada=self.temporada_b, huerta=self.huerta_b)
+        self.venta = self._venta(self.cosecha_a1, cajas=10)
+
+    def _venta(self, cosecha, cajas):
+        return Venta.objects.create(
+            fecha_venta=timezone.localdate(), num_cajas=cajas, precio_por_caja=100, tipo_mango="Kent",
+            gasto=0, cosecha=cosecha, temporada=cosecha.temporada, huerta=cosecha.huerta,
+        )
+
+    def _cached(self, generar, pk) -> bool:
+        """True si el reporte salió del cache (no se volvió a escribir)."""
+        with mock.patch.object(single_flight, "cache", wraps=cache) as spy:
+            generar(pk, self.admin)
+        return not spy.set.called
+
+    def _calentar(self):
+        for pk in (self.cosecha_a1.id, self.cosecha_a2.id, self.cosecha_b.id):
+            generar_reporte_cosecha(pk, self.admin)
+        for pk in (self.temporada_a.id, self.temporada_b.id):
+            generar_reporte_temporada(pk, self.admin)
+
+    def test_venta_solo_invalida_su_cosecha_y_temporada(self):
+        self._calentar()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.venta.num_cajas = 20
+            self.venta.save()
+
+        self.assertFalse(self._cached(generar_reporte_cosecha, self.cosecha_a1.id))
+        self.assertFalse(self._cached(generar_reporte_temporada, self.temporada_a.id))
+        self.assertTrue(self._cached(generar_reporte_cosecha, self.cosecha_a2.id))
+        self.assertTrue(self._cached(generar_reporte_cosecha, self.cosecha_b.id))
+        self.assertTrue(self._cached(generar_reporte_temporada, self.temporada_b.id))
+
+        reporte = generar_reporte_cosecha(self.cosecha_a1.id, self.admin)
+        self.assertEqual(reporte["resumen_financiero"]["total_ventas"], 2000.0)
+
+    def test_venta_movida_invalida_origen_y_destino(self):
+        self._calentar()
+        venta = Venta.objects.get(pk=self.venta.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            venta.cosecha = self.cosecha_a2
+            venta.save()
+
+        self.assertFalse(self._cached(generar_reporte_cosecha, self.cosecha_a1.id))
+        self.assertFalse(self._cached(generar_reporte_cosecha, self.cosecha_a2.id))
+        self.assertTrue(self._cached(generar_reporte_cosecha, self.cosecha_b.id))
+
+    def test_generacion_global_invalida_todo(self):
+        self._calentar()
+        bump_reportes_cache_generation()
+        self.assertFalse(self._cached(generar_reporte_cosecha, self.cosecha_b.id))
+        self.assertFalse(self._cached(generar_reporte_temporada, self.temporada_b.id))
+
+    def test_reporte_compartido_entre_usuarios_con_overlay(self):
+        otro = get_user_model().objects.create_user(
+            telefono="6660000102", password="secret123", nombre="Otra", apellido="Vista", role="usuario",
+        )
+        otro.user_permissions.add(Permission.objects.get(codename="view_temporada"))
+
+        reporte_admin = generar_reporte_temporada(self.temporada_a.id, self.admin)
+        with mock.patch.object(single_flight, "cache", wraps=cache) as spy:
+            reporte_otro = generar_reporte_temporada(self.temporada_a.id, otro)
+
+        self.assertFalse(spy.set.called)
+        self.assertEqual(reporte_otro["resumen_ejecutivo"], reporte_admin["resumen_ejecutivo"])
+        self.assertEqual(reporte_admin["metadata"]["generado_por"], str(self.admin))
+        self.assertEqual(reporte_otro["metadata"]["generado_por"], str(otro))
+        # El overlay no contamina el valor compartido.
+        self.assertEqual(generar_reporte_temporada(self.temporada_a.id, self.admin)["metadata"]["generado_por"], str(self.admin))
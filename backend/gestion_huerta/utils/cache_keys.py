@@ -12,8 +12,18 @@ Uso:
 
 generate_cache_key(tipo, parametros):
 - `tipo` agrupa la entidad/uso (p.ej. "cosecha", "temporada", "perfil_huerta").
-- `parametros` debe incluir los discriminantes relevantes (IDs, formato, uid, etc.).
+- `parametros` debe incluir los discriminantes relevantes (IDs, formato, etc.).
+  Los reportes se comparten entre usuarios: los permisos se validan antes de
+  consultar el cache y lo propio de cada usuario (`generado_por`) se
+  superpone al responder con `overlay_usuario`.
+- `tags` declara de qué entidades depende el reporte ("cosecha:12",
+  "temporada:3", "huerta:5"...). La versión actual de cada tag entra en la
+  llave: al cambiar una venta solo se rota su tag y los reportes que no
+  dependen de ella siguen calientes.
 - Se serializa con orden y `default=str` para soportar tipos no JSON (datetime/Decimal).
+
+La generación global (`bump_reportes_cache_generation`) sigue invalidando
+todo: se usa para catálogos compartidos (categorías) y cambios de reglas.
 """
 from __future__ import annotations
 
@@ -21,18 +31,53 @@ import hashlib
 import json
 import os
 import time
-from typing import Dict, Any
+from typing import Any, Dict, Iterable, Optional
 
 from django.core.cache import cache
 
+from agroproductores_risol.utils.change_versions import (
+    bump_change_version,
+    get_change_version,
+    get_change_versions,
+)
+from agroproductores_risol.utils.db_router import leer_versiones, marcar_versiones_recientes
+
 # Config centralizada de cache para reportes (parametrizable por variables de entorno)
 # Defaults más realistas para reportes (ajusta en producción vía envs).
 REPORTES_CACHE_TIMEOUT: int = int(os.getenv("REPORTES_CACHE_TIMEOUT", "300"))  # segundos
 REPORTES_CACHE_VERSION: str = os.getenv("REPORTES_CACHE_VERSION", "1.3.3")
+# Vida del último valor calculado, servido mientras otro worker revalida.
+REPORTES_CACHE_STALE_TIMEOUT: int = int(os.getenv("REPORTES_CACHE_STALE_TIMEOUT", "3600"))
 REPORTES_CACHE_GENERATION_KEY: str = os.getenv(
     "REPORTES_CACHE_GENERATION_KEY",
     "gestion_huerta:reportes:generation",
 )
+REPORTES_TAG_PREFIX: str = "gestion_huerta:reportes:tag:"
+# Se incrementa con cualquier cambio de datos de huerta (ETag del dashboard).
+HUERTA_DATA_VERSION_KEY: str = "gestion_huerta:data:version"
+
+
+def report_tag(tipo: str, pk: Optional[int]) -> Optional[str]:
+    """Tag de dependencia "<tipo>:<id>"; None si la entidad no existe."""
+    return f"{tipo}:{pk}" if pk else None
+
+
+def get_report_tag_versions(tags: Iterable[Optional[str]]) -> Dict[str, int]:
+    """Versiones actuales de los tags (un get_many)."""
+    unicos = sorted({tag for tag in tags if tag})
+    versions = get_change_versions(REPORTES_TAG_PREFIX + tag for tag in unicos)
+    return {tag: versions[REPORTES_TAG_PREFIX + tag] for tag in unicos}
+
+
+def bump_report_tags(tags: Iterable[Optional[str]]) -> None:
+    """Invalida solo los reportes que dependen de alguno de `tags`."""
+    for tag in sorted({tag for tag in tags if tag}):
+        bump_change_version(REPORTES_TAG_PREFIX + tag)
+    bump_change_version(HUERTA_DATA_VERSION_KEY)
+
+
+def get_huerta_data_version() -> int:
+    return get_change_version(HUERTA_DATA_VERSION_KEY)
 
 
 def get_reportes_cache_generation() -> str:
@@ -40,6 +85,7 @@ def get_reportes_cache_generation() -> str:
     Devuelve el token actual de invalidación para reportes.
     Si no existe aún en cache, inicializa con "1".
     """
+    leer_versiones([REPORTES_CACHE_GENERATION_KEY])
     generation = cache.get(REPORTES_CACHE_GENERATION_KEY)
     if generation is None:
         cache.add(REPORTES_CACHE_GENERATION_KEY, 1, timeout=None)
@@ -52,27 +98,56 @@ def bump_reportes_cache_generation() -> str:
     Invalida de forma global los reportes al rotar el token de generación.
     Evita depender de borrado por patrón del backend de cache.
     """
+    marcar_versiones_recientes([REPORTES_CACHE_GENERATION_KEY])
     try:
         cache.add(REPORTES_CACHE_GENERATION_KEY, 1, timeout=None)
         generation = cache.incr(REPORTES_CACHE_GENERATION_KEY)
     except Exception:
         generation = int(time.time() * 1000)
         cache.set(REPORTES_CACHE_GENERATION_KEY, generation, timeout=None)
+    bump_change_version(HUERTA_DATA_VERSION_KEY)
     return str(generation)
 
-def generate_cache_key(tipo: str, parametros: Dict[str, Any], version: str = REPORTES_CACHE_VERSION) -> str:
+
+def generate_cache_key(
+    tipo: str,
+    parametros: Dict[str, Any],
+    version: str = REPORTES_CACHE_VERSION,
+    tags: Iterable[Optional[str]] = (),
+) -> str:
     """
     Genera una clave de caché estable y corta (md5) a partir de:
       - tipo: nombre lógico del reporte
       - parametros: discriminantes (IDs/uid/formato/etc.)
       - version: string de versión de esquema/reglas para invalidación global
+      - tags: entidades de las que depende el reporte (ver `report_tag`)
     """
     data = {
         "tipo": tipo,
         "params": parametros,
         "version": version,
         "generation": get_reportes_cache_generation(),
+        "tags": get_report_tag_versions(tags),
     }
     s = json.dumps(data, sort_keys=True, default=str)  # tolera datetime/Decimal
     digest = hashlib.md5(s.encode()).hexdigest()
     return f"reporte_{digest}"
+
+
+def generate_stale_key(tipo: str, parametros: Dict[str, Any]) -> str:
+    """
+    Llave estable (sin versiones ni tags) del último valor calculado de un
+    reporte: se sirve solo mientras otro worker recalcula la llave vigente.
+    """
+    s = json.dumps({"tipo": tipo, "params": parametros}, sort_keys=True, default=str)
+    return f"reporte_stale_{hashlib.md5(s.encode()).hexdigest()}"
+
+
+def overlay_usuario(reporte: Dict[str, Any], usuario) -> Dict[str, Any]:
+    """
+    Aplica la parte por usuario sobre un reporte compartido (sin mutar el
+    valor cacheado): hoy solo `metadata.generado_por`.
+    """
+    metadata = dict(reporte.get("metadata") or {})
+    metadata["generado_por"] = getattr(usuario, "username", "" if usuario is None else str(usuario))
+    return {**reporte, "metadata": metadata}
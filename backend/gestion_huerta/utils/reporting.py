@@ -26,7 +26,6 @@ from __future__ import annotations
 
 from decimal import Decimal
 from typing import Any, Dict, List, Optional
-from io import BytesIO
 from datetime import datetime
 import base64
 
@@ -35,6 +34,11 @@ from django.db.models.functions import TruncMonth
 from django.utils.html import escape as html_escape
 from django.utils import timezone
 
+from agroproductores_risol.utils.pdf_renderer import (
+    WeasyPrintUnavailable,
+    register_stylesheet,
+    render_html_to_pdf,
+)
 from gestion_huerta.models import (
     Cosecha,
     Temporada,
@@ -556,15 +560,6 @@ def series_for_huerta(huerta_id: int) -> List[Dict[str, Any]]:
 # ===================  RENDER PDF CON ESTILO (WeasyPrint)  =============
 # =====================================================================
 
-def _ensure_weasyprint():
-    try:
-        from weasyprint import HTML, CSS  # noqa: F401
-    except Exception as exc:
-        raise ImportError(
-            "WeasyPrint no esta disponible completamente en este entorno. Instala WeasyPrint junto con sus dependencias nativas, o usa Linux/WSL/Docker para el renderizado completo."
-        ) from exc
-
-
 def _badge(text: str) -> str:
     return f'<span class="badge">{html_escape(text)}</span>'
 
@@ -813,6 +808,10 @@ def _base_css() -> str:
     """
 
 
+PDF_STYLESHEET_KEY = "huerta.reporte"
+register_stylesheet(PDF_STYLESHEET_KEY, _base_css)
+
+
 def _render_html_document(title: str, subtitle: str, meta_badges: List[str], body_html: str) -> str:
     return f"""
     <!DOCTYPE html>
@@ -821,9 +820,6 @@ def _render_html_document(title: str, subtitle: str, meta_badges: List[str], bod
       <meta charset="utf-8"/>
       <meta name="viewport" content="width=device-width, initial-scale=1"/>
       <title>{html_escape(title)}</title>
-      <style>
-        {_base_css()}
-      </style>
     </head>
     <body>
       <div class="wrapper">
@@ -1073,11 +1069,13 @@ def _html_huerta(h: Huerta | HuertaRentada) -> str:
 
 
 def _html_to_pdf_bytes(html: str) -> bytes:
-    _ensure_weasyprint()
-    from weasyprint import HTML, CSS  # type: ignore
-    pdf_io = BytesIO()
-    HTML(string=html, base_url=".").write_pdf(pdf_io, stylesheets=[CSS(string="")])
-    return pdf_io.getvalue()
+    # Pool de render precalentado (hoja de estilo ya parseada); ver pdf_renderer.
+    try:
+        return render_html_to_pdf(html, stylesheet_key=PDF_STYLESHEET_KEY)
+    except WeasyPrintUnavailable as exc:
+        raise ImportError(
+            "WeasyPrint no esta disponible completamente en este entorno. Instala WeasyPrint junto con sus dependencias nativas, o usa Linux/WSL/Docker para el renderizado completo."
+        ) from exc
 
 
 # =========================
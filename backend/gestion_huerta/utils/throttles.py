@@ -1,19 +1,19 @@
 # gestion_usuarios/utils/throttles.py
 
-from rest_framework.throttling import UserRateThrottle
+from agroproductores_risol.utils.rate_limit import SlidingWindowRateThrottle
 
-class BaseUserThrottle(UserRateThrottle):
+class BaseUserThrottle(SlidingWindowRateThrottle):
     scope = 'default_user'
     
-class LoginThrottle(UserRateThrottle):
+class LoginThrottle(SlidingWindowRateThrottle):
     scope = 'login'
 
-class SensitiveActionThrottle(UserRateThrottle):
+class SensitiveActionThrottle(SlidingWindowRateThrottle):
     scope = 'sensitive_action'
 
-class AdminOnlyThrottle(UserRateThrottle):
+class AdminOnlyThrottle(SlidingWindowRateThrottle):
     scope = 'admin_only'
 
-class RefreshTokenThrottle(UserRateThrottle):
+class RefreshTokenThrottle(SlidingWindowRateThrottle):
     scope = 'refresh_token'
 
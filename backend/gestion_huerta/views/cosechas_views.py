@@ -125,7 +125,10 @@ class CosechaViewSet(ViewSetAuditMixin, NotificationMixin, viewsets.ModelViewSet
             'retrieve', 'update', 'partial_update', 'destroy',
             'archivar', 'restaurar', 'finalizar', 'toggle_finalizada', 'reactivar'
         ]:
-            return qs
+            return qs.with_financials() if self.action == 'retrieve' else qs
+
+        # Totales financieros en la misma consulta del listado (evita N+1).
+        qs = qs.with_financials()
 
         # Filtro por temporada (acepta 'temporada' y alias 'temporada_id')
         temp_id = params.get("temporada") or params.get("temporada_id")
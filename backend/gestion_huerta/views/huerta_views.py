@@ -15,7 +15,7 @@
 
 import logging
 from django.db import transaction, IntegrityError
-from django.db.models import Q, Value, IntegerField, Case, When
+from django.db.models import Q, Value, IntegerField, CharField, Case, When
 from django.db.models.functions import Concat
 from rest_framework import status, viewsets, serializers
 from rest_framework.decorators import action
@@ -753,8 +753,8 @@ class HuertasCombinadasViewSet(ViewSetAuditMixin, NotificationMixin, viewsets.Ge
         nombre      = params.get("nombre")
         propietario = params.get("propietario")
 
-        qs_p = Huerta.objects.select_related('propietario').all().order_by('-id')
-        qs_r = HuertaRentada.objects.select_related('propietario').all().order_by('-id')
+        qs_p = Huerta.objects.all()
+        qs_r = HuertaRentada.objects.all()
 
         if estado in ("activos", "false"):
             qs_p = qs_p.filter(archivado_en__isnull=True)
@@ -768,51 +768,62 @@ class HuertasCombinadasViewSet(ViewSetAuditMixin, NotificationMixin, viewsets.Ge
             qs_r = qs_r.filter(propietario_id=propietario)
 
         # -----------------------------------------------------------
-        # Lógica "Exact Match First" manual (dos querysets)
+        # "Exact Match First" en BD: rango 0 = nombre exacto, 1 = contiene
         # -----------------------------------------------------------
-        exact = []
         if nombre:
-            # 1. Buscar coincidencias exactas
-            ex_p = qs_p.filter(nombre=nombre).values_list('id', flat=True).first()
-            ex_r = qs_r.filter(nombre=nombre).values_list('id', flat=True).first()
-            
-            if ex_p: exact.append(('propia', ex_p))
-            if ex_r: exact.append(('rentada', ex_r))
-            
-            # 2. Excluir exactas de la búsqueda general
-            if ex_p: qs_p = qs_p.exclude(id=ex_p)
-            if ex_r: qs_r = qs_r.exclude(id=ex_r)
-            
-            # 3. Aplicar filtro contains normal
             qs_p = qs_p.filter(nombre__icontains=nombre)
             qs_r = qs_r.filter(nombre__icontains=nombre)
+            rank = Case(When(nombre=nombre, then=Value(0)), default=Value(1), output_field=IntegerField())
+        else:
+            rank = Value(1, output_field=IntegerField())
 
-        combined = []
+        # UNION ALL de filas angostas (id, tipo, orden); el paginador hace un
+        # solo COUNT(*) y un LIMIT/OFFSET sobre la unión ordenada en BD.
+        partes = []
         if tipo in ("", "propia"):
-            combined.extend([('propia', pk) for pk in qs_p.values_list('id', flat=True)])
+            partes.append(qs_p.order_by().annotate(
+                tipo=Value("propia", output_field=CharField()),
+                tipo_orden=Value(0, output_field=IntegerField()),
+                exact_rank=rank,
+            ).values("id", "tipo", "tipo_orden", "exact_rank"))
         if tipo in ("", "rentada"):
-            combined.extend([('rentada', pk) for pk in qs_r.values_list('id', flat=True)])
-        ordered = exact + combined
+            partes.append(qs_r.order_by().annotate(
+                tipo=Value("rentada", output_field=CharField()),
+                tipo_orden=Value(1, output_field=IntegerField()),
+                exact_rank=rank,
+            ).values("id", "tipo", "tipo_orden", "exact_rank"))
+
+        if not partes:
+            combined = Huerta.objects.none().values("id")
+        elif len(partes) == 1:
+            combined = partes[0].order_by("exact_rank", "-id")
+        else:
+            combined = partes[0].union(partes[1], all=True).order_by("exact_rank", "tipo_orden", "-id")
+
         paginator = self.pagination_class()
-        page_ids = paginator.paginate_queryset(ordered, request)
-        ids_p = [pk for t, pk in page_ids if t == 'propia']
-        ids_r = [pk for t, pk in page_ids if t == 'rentada']
-        map_p = {o.id: o for o in Huerta.objects.select_related('propietario').filter(id__in=ids_p)}
-        map_r = {o.id: o for o in HuertaRentada.objects.select_related('propietario').filter(id__in=ids_r)}
+        page_rows = paginator.paginate_queryset(combined, request)
+
+        # Solo se materializa la página visible: una consulta y una
+        # serialización (many=True) por tipo, reensambladas en orden.
+        ids_p = [r["id"] for r in page_rows if r["tipo"] == "propia"]
+        ids_r = [r["id"] for r in page_rows if r["tipo"] == "rentada"]
+        data_p = {
+            d["id"]: {**d, "tipo": "propia"}
+            for d in HuertaSerializer(
+                Huerta.objects.select_related("propietario").filter(id__in=ids_p), many=True
+            ).data
+        } if ids_p else {}
+        data_r = {
+            d["id"]: {**d, "tipo": "rentada"}
+            for d in HuertaRentadaSerializer(
+                HuertaRentada.objects.select_related("propietario").filter(id__in=ids_r), many=True
+            ).data
+        } if ids_r else {}
+
         page_data = []
-        for t, pk in page_ids:
-            if t == 'propia':
-                obj = map_p.get(pk)
-                if not obj:
-                    continue
-                d = HuertaSerializer(obj).data
-                d['tipo'] = 'propia'
-            else:
-                obj = map_r.get(pk)
-                if not obj:
-                    continue
-                d = HuertaRentadaSerializer(obj).data
-                d['tipo'] = 'rentada'
-            page_data.append(d)
-            
+        for r in page_rows:
+            d = (data_p if r["tipo"] == "propia" else data_r).get(r["id"])
+            if d is not None:
+                page_data.append(d)
+
         return self.notify_list(request=request, results=page_data, paginator=paginator)
@@ -42,6 +42,7 @@ def _safe_filename(prefix: str, base: str, ext: str) -> str:
 
 class TemporadaReportViewSet(viewsets.GenericViewSet):
     permission_classes = [IsAuthenticated, HasHuertaModulePermissionAnd]
+    replica_reads = True
 
     def get_permissions(self):
         # Exigir permisos por formato (export vs view)
@@ -14,6 +14,7 @@ class GestionUsuariosConfig(AppConfig):
         # Registra señales para crear permisos personalizados tras migraciones
         try:
             from . import signals  # noqa: F401
+            from agroproductores_risol.utils import shared_cache  # noqa: F401  (registra el check W001)
         except Exception:
             logger.exception("No se pudieron registrar las señales de gestion_usuarios.")
             raise
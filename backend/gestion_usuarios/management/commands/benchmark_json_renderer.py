@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from agroproductores_risol.utils.renderers import CompactJSONRenderer, FastJSONRenderer, orjson
+
+
+def _payload_sintetico(filas: int) -> dict:
+    """Envelope de NotificationHandler con un reporte tipo temporada (floats, Decimals, fechas)."""
+    hoy = timezone.now()
+    detalle = [
+        {
+            "id": i,
+            "fecha": date(2025, 1, 1) + timedelta(days=i % 365),
+            "creado": hoy - timedelta(minutes=i),
+            "categoria": f"Categoría {i % 12}",
+            "monto": Decimal(f"{i * 13.37:.2f}"),
+            "cajas": i % 250,
+            "precio_caja": (i % 97) * 1.25,
+            "ganancia": {"bruta": Decimal(i) * Decimal("10.5"), "neta": float(i) * 7.3, "margen_pct": (i % 100) / 3},
+        }
+        for i in range(filas)
+    ]
+    return {
+        "success": True,
+        "message_key": "data_processed_success",
+        "message": "Datos procesados",
+        "data": {
+            "reporte": {
+                "metadata": {"generado": datetime.now(), "temporada": 2025},
+                "resumen": {"total_inversiones": Decimal("123456.78"), "roi": 12.345},
+                "detalle": detalle,
+            }
+        },
+        "notification": {"key": "data_processed_success", "message": "Datos procesados", "type": "success", "action": None, "target": None},
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara el JSONRenderer de DRF contra FastJSONRenderer (orjson) y el "
+        "compacto sobre un envelope de reporte: tiempo por render, tamaño y "
+        "verificación de salida byte a byte."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--filas", type=int, default=5000, help="Filas del detalle del reporte sintético.")
+        parser.add_argument("--iteraciones", type=int, default=20)
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            raise CommandError("orjson no está instalado: FastJSONRenderer usa el renderer de DRF.")
+
+        data = _payload_sintetico(options["filas"])
+        iteraciones = options["iteraciones"]
+        base = JSONRenderer().render(data)
+        rapido = FastJSONRenderer().render(data)
+        if rapido != base:
+            raise CommandError("FastJSONRenderer no produce los mismos bytes que JSONRenderer.")
+
+        resultados = []
+        for nombre, renderer in (
+            ("drf", JSONRenderer()),
+            ("orjson", FastJSONRenderer()),
+            ("orjson compacto", CompactJSONRenderer()),
+        ):
+            t0 = time.perf_counter()
+            for _ in range(iteraciones):
+                salida = renderer.render(data)
+            ms = (time.perf_counter() - t0) * 1000 / iteraciones
+            resultados.append((nombre, ms, len(salida)))
+
+        ms_drf = resultados[0][1]
+        self.stdout.write(f"{'renderer':<18} {'ms/render':>10} {'bytes':>10} {'speedup':>8}")
+        for nombre, ms, size in resultados:
+            self.stdout.write(f"{nombre:<18} {ms:>10.2f} {size:>10} {ms_drf / ms:>7.1f}x")
+        self.stdout.write(self.style.SUCCESS("Salida orjson idéntica a DRF."))
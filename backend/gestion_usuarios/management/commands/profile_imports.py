@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from django.apps import apps as django_apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Librerías que un worker web no debería cargar al arrancar (ver utils/export_registry).
+PESADAS = ("openpyxl", "reportlab", "weasyprint", "pandas")
+
+# Corre en un intérprete limpio: mide tiempo e incremento de RSS de cada
+# módulo en el orden dado (cada uno paga solo lo que no cargaron los previos).
+_PROBE = r"""
+import importlib, json, os, sys, time
+
+def rss_kb():
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+modulos, pesadas = json.loads(sys.argv[1]), json.loads(sys.argv[2])
+filas = []
+r0, t0 = rss_kb(), time.perf_counter()
+import django
+django.setup()
+filas.append({"modulo": "django.setup()", "ms": (time.perf_counter() - t0) * 1000, "rss_kb": rss_kb() - r0})
+for nombre in modulos:
+    r, t = rss_kb(), time.perf_counter()
+    error = None
+    try:
+        importlib.import_module(nombre)
+    except Exception as exc:
+        error = f"{type(exc).__name__}: {exc}"
+    filas.append({"modulo": nombre, "ms": (time.perf_counter() - t) * 1000, "rss_kb": rss_kb() - r, "error": error})
+print(json.dumps({
+    "filas": filas,
+    "rss_total_kb": rss_kb(),
+    "pesadas_cargadas": sorted(p for p in pesadas if p in sys.modules),
+}))
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Perfil de arranque: tiempo de import y RSS incremental por módulo del "
+        "proyecto (en un proceso limpio), y qué librerías pesadas quedan cargadas "
+        "tras importar las URLs. Sirve para detectar regresiones de cold start."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("modulos", nargs="*", help="Módulos a medir (default: ROOT_URLCONF).")
+        parser.add_argument("--apps", action="store_true", help="Mide también cada módulo de las apps del proyecto.")
+        parser.add_argument("--top", type=int, default=25, help="Filas a mostrar, ordenadas por tiempo.")
+        parser.add_argument("--json", action="store_true", help="Salida JSON cruda.")
+
+    def handle(self, *args, **options):
+        modulos = list(options["modulos"]) or [settings.ROOT_URLCONF]
+        if options["apps"]:
+            modulos = self._project_modules() + modulos
+
+        env = {**os.environ, "DJANGO_SETTINGS_MODULE": os.environ.get("DJANGO_SETTINGS_MODULE", "agroproductores_risol.settings")}
+        proc = subprocess.run(
+            [sys.executable, "-c", _PROBE, json.dumps(modulos), json.dumps(PESADAS)],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            raise CommandError(f"El proceso de perfilado falló:\n{proc.stderr[-2000:]}")
+        reporte = json.loads(proc.stdout.strip().splitlines()[-1])
+
+        if options["json"]:
+            self.stdout.write(json.dumps(reporte))
+            return
+
+        filas = sorted(reporte["filas"], key=lambda f: f["ms"], reverse=True)[: options["top"]]
+        self.stdout.write(f"{'módulo':<60} {'ms':>9} {'RSS KB':>9}")
+        for fila in filas:
+            linea = f"{fila['modulo']:<60} {fila['ms']:>9.1f} {fila['rss_kb']:>9}"
+            self.stdout.write(self.style.ERROR(f"{linea}  {fila['error']}") if fila.get("error") else linea)
+        self.stdout.write(f"RSS total: {reporte['rss_total_kb'] // 1024} MB")
+
+        pesadas = reporte["pesadas_cargadas"]
+        if pesadas:
+            self.stdout.write(self.style.WARNING(f"Librerías pesadas cargadas por los módulos medidos: {', '.join(pesadas)}"))
+        else:
+            self.stdout.write(self.style.SUCCESS("Los módulos medidos no cargan librerías pesadas."))
+
+    def _project_modules(self) -> list[str]:
+        base = Path(settings.BASE_DIR).resolve()
+        modulos = []
+        for app in django_apps.get_app_configs():
+            raiz = Path(app.path).resolve()
+            if base not in raiz.parents:
+                continue
+            for path in sorted(raiz.rglob("*.py")):
+                partes = path.relative_to(base).with_suffix("").parts
+                if {"migrations", "management", "tests", "test"} & set(partes) or partes[-1].startswith("test"):
+                    continue
+                if partes[-1] == "__init__":
+                    partes = partes[:-1]
+                modulos.append(".".join(partes))
+        return modulos
@@ -2,7 +2,9 @@ from __future__ import annotations
 
 from django.core.management.base import BaseCommand
 from django.contrib.auth.models import Permission
+from agroproductores_risol.utils.change_versions import bump_change_version
 from gestion_usuarios.permissions_policy import MODEL_CAPABILITIES, is_codename_allowed
+from gestion_usuarios.utils.cache_keys import PERMISSION_CATALOG_VERSION_KEY
 
 
 class Command(BaseCommand):
@@ -35,5 +37,6 @@ class Command(BaseCommand):
             return
 
         deleted = Permission.objects.filter(id__in=to_delete).delete()
+        bump_change_version(PERMISSION_CATALOG_VERSION_KEY)
         self.stdout.write(self.style.WARNING(f"Permisos eliminados (count, breakdown): {deleted}"))
 
@@ -6,8 +6,10 @@ from django.core.management.base import BaseCommand
 from django.apps import apps as django_apps
 from django.contrib.auth.management import create_permissions
 
+from agroproductores_risol.utils.change_versions import bump_change_version
 from gestion_usuarios.signals import ALLOWED_APPS, _ensure_permissions_for_model
 from gestion_usuarios.permissions_policy import MODEL_CAPABILITIES
+from gestion_usuarios.utils.cache_keys import PERMISSION_CATALOG_VERSION_KEY
 
 
 class Command(BaseCommand):
@@ -34,4 +36,6 @@ class Command(BaseCommand):
                         f"OK {app_label}.{model.__name__}: {', '.join(codenames)}"
                     ))
 
+        # 3) Invalida el catálogo de permisos cacheado
+        bump_change_version(PERMISSION_CATALOG_VERSION_KEY)
         self.stdout.write(self.style.SUCCESS("Permisos regenerados correctamente."))
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from gestion_usuarios.services.search_index import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconstruye el índice de búsqueda global (SearchDocument) a partir de "
+        "huertas, temporadas, cosechas, bodegas y usuarios activos. "
+        "Ejecutar tras `migrate` inicial o si el índice quedó desfasado."
+    )
+
+    def handle(self, *args, **options):
+        counts = rebuild_search_index(stdout=self.stdout)
+        total = sum(counts.values())
+        self.stdout.write(self.style.SUCCESS(f"Índice de búsqueda reconstruido: {total} documentos."))
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from gestion_usuarios.models import TareaProgramada
+from gestion_usuarios.services import scheduler
+
+
+class Command(BaseCommand):
+    help = (
+        "Daemon del scheduler: ejecuta las tareas periódicas registradas en "
+        "<app>/tasks.py. Puede correr en varios nodos; el lock en BD garantiza "
+        "una sola ejecución por tarea."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Un solo ciclo y termina (cron).")
+        parser.add_argument("--task", help="Ejecuta solo esta tarea ahora (ignora su vencimiento).")
+        parser.add_argument("--status", action="store_true", help="Muestra tareas, estado y métricas.")
+        parser.add_argument("--poll", type=int, help="Segundos entre ciclos (default SCHEDULER['POLL_SECONDS']).")
+
+    def handle(self, *args, **options):
+        tareas = scheduler.load_tasks()
+
+        if options["status"]:
+            return self._status(tareas)
+
+        if options["task"]:
+            task = scheduler.get_task(options["task"])
+            if task is None:
+                raise CommandError(f"Tarea no registrada: {options['task']}")
+            ejecucion = scheduler.run_task(task, force=True)
+            if ejecucion is None:
+                self.stdout.write(self.style.WARNING(f"{task.nombre}: bloqueada por otro nodo."))
+            else:
+                self._report(ejecucion)
+            return
+
+        if options["once"]:
+            for ejecucion in scheduler.run_due_tasks():
+                self._report(ejecucion)
+            return
+
+        self._loop(options["poll"] or settings.SCHEDULER["POLL_SECONDS"])
+
+    def _loop(self, poll: int):
+        detener = {"flag": False}
+
+        def _stop(signum, frame):
+            detener["flag"] = True
+
+        signal.signal(signal.SIGTERM, _stop)
+        signal.signal(signal.SIGINT, _stop)
+        nodo = scheduler.node_name()
+        self.stdout.write(f"Scheduler {nodo}: {len(scheduler.registered_tasks())} tareas, ciclo de {poll}s.")
+
+        while not detener["flag"]:
+            close_old_connections()
+            try:
+                for ejecucion in scheduler.run_due_tasks(nodo=nodo):
+                    self._report(ejecucion)
+            except Exception as exc:  # BD caída, etc.: se reintenta el siguiente ciclo
+                self.stderr.write(f"Ciclo del scheduler falló: {exc}")
+            for _ in range(poll):
+                if detener["flag"]:
+                    break
+                time.sleep(1)
+        self.stdout.write("Scheduler detenido.")
+
+    def _report(self, ejecucion):
+        style = self.style.SUCCESS if ejecucion.estado == "OK" else self.style.ERROR
+        self.stdout.write(style(
+            f"{ejecucion.tarea.nombre}: {ejecucion.estado} en {ejecucion.duracion_ms} ms {ejecucion.resultado or ''}"
+        ))
+
+    def _status(self, tareas):
+        estados = {t.nombre: t for t in TareaProgramada.objects.all()}
+        for task in tareas:
+            estado = estados.get(task.nombre)
+            if estado is None:
+                self.stdout.write(f"{task.nombre} (cada {task.cada}): sin ejecuciones")
+                continue
+            self.stdout.write(
+                f"{task.nombre} (cada {task.cada}): último={estado.ultimo_estado or '-'} "
+                f"ejecuciones={estado.ejecuciones} fallos={estado.fallos} "
+                f"prom={estado.duracion_promedio_ms} ms próxima={estado.proxima_ejecucion:%Y-%m-%d %H:%M:%S}"
+                + (f" lock={estado.bloqueado_por}" if estado.bloqueado_hasta else "")
+            )
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from agroproductores_risol.utils.single_flight import (
+    METRIC_EVENTS,
+    reset_single_flight_metrics,
+    single_flight_metrics,
+)
+
+# Namespaces de los reportes que usan get_or_compute.
+REPORT_NAMESPACES = (
+    "huerta.reporte_cosecha",
+    "huerta.reporte_temporada",
+    "huerta.perfil_huerta",
+    "bodega.reporte_semanal",
+    "bodega.reporte_temporada",
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Métricas del cálculo single-flight de reportes: cálculos, esperas "
+        "coalescidas, respuestas stale y esperas agotadas por namespace."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("namespaces", nargs="*", help="Namespaces a mostrar (default: reportes conocidos).")
+        parser.add_argument("--reset", action="store_true", help="Reinicia los contadores tras mostrarlos.")
+
+    def handle(self, *args, **options):
+        namespaces = options["namespaces"] or list(REPORT_NAMESPACES)
+        metricas = single_flight_metrics(namespaces)
+
+        self.stdout.write(f"{'namespace':<28}" + "".join(f"{ev:>11}" for ev in METRIC_EVENTS) + f"{'ms/espera':>11}")
+        for ns in namespaces:
+            fila = metricas[ns]
+            esperas = fila["coalesced"] + fila["timeout"]
+            promedio = fila["wait_ms"] / esperas if esperas else 0
+            self.stdout.write(f"{ns:<28}" + "".join(f"{fila[ev]:>11}" for ev in METRIC_EVENTS) + f"{promedio:>11.0f}")
+
+        if options["reset"]:
+            reset_single_flight_metrics(namespaces)
+            self.stdout.write(self.style.SUCCESS("Contadores reiniciados."))
@@ -0,0 +1,64 @@
+from django.db import migrations, models
+
+
+FULLTEXT_INDEX = "ft_searchdoc_text"
+TABLE = "gestion_usuarios_searchdocument"
+
+
+def _usa_ngram(connection) -> bool:
+    return connection.vendor == "mysql" and not connection.mysql_is_mariadb
+
+
+def create_fulltext_index(apps, schema_editor):
+    """
+    Índice FULLTEXT con parser ngram (MySQL/InnoDB): permite buscar fragmentos
+    de palabra ("nor" → "norte") sin el LIKE '%...%' que no usa índices.
+    Se desactivan stopwords en la sesión: con ngram cualquier bigrama que
+    contenga una stopword ("a", "i") quedaría fuera del índice.
+    MariaDB no trae el parser ngram: ahí (y en otros motores) no se crea el
+    índice y search_index.search_documents usa el fallback por LIKE.
+    """
+    if not _usa_ngram(schema_editor.connection):
+        return
+    schema_editor.execute("SET SESSION innodb_ft_enable_stopword = OFF")
+    schema_editor.execute(
+        f"CREATE FULLTEXT INDEX {FULLTEXT_INDEX} ON {TABLE} (search_text) WITH PARSER ngram"
+    )
+
+
+def drop_fulltext_index(apps, schema_editor):
+    if not _usa_ngram(schema_editor.connection):
+        return
+    schema_editor.execute(f"DROP INDEX {FULLTEXT_INDEX} ON {TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gestion_usuarios', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entity_type', models.CharField(max_length=32)),
+                ('entity_id', models.PositiveBigIntegerField()),
+                ('scope', models.CharField(choices=[('huertas', 'Huertas'), ('temporadas', 'Temporadas'), ('cosechas', 'Cosechas'), ('bodegas', 'Bodegas'), ('usuarios', 'Usuarios')], max_length=20)),
+                ('group', models.CharField(max_length=60)),
+                ('title', models.CharField(max_length=255)),
+                ('subtitle', models.CharField(blank=True, default='', max_length=255)),
+                ('meta', models.CharField(blank=True, default='', max_length=60)),
+                ('link', models.CharField(max_length=500)),
+                ('link_alt', models.CharField(blank=True, default='', max_length=500)),
+                ('search_text', models.TextField()),
+                ('actualizado_en', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['scope', 'entity_type'], name='idx_searchdoc_scope_type')],
+                'constraints': [models.UniqueConstraint(fields=('entity_type', 'entity_id'), name='uniq_searchdoc_entity')],
+            },
+        ),
+        migrations.RunPython(create_fulltext_index, drop_fulltext_index),
+    ]
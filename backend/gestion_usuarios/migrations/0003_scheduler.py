@@ -0,0 +1,52 @@
+# Generated by Django 5.1.15 on 2026-10-19 17:13
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gestion_usuarios', '0002_searchdocument'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TareaProgramada',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nombre', models.CharField(max_length=100, unique=True)),
+                ('proxima_ejecucion', models.DateTimeField(default=django.utils.timezone.now)),
+                ('bloqueado_por', models.CharField(blank=True, default='', max_length=120)),
+                ('bloqueado_hasta', models.DateTimeField(blank=True, null=True)),
+                ('ultima_ejecucion', models.DateTimeField(blank=True, null=True)),
+                ('ultimo_estado', models.CharField(blank=True, default='', max_length=10)),
+                ('ultima_duracion_ms', models.PositiveIntegerField(default=0)),
+                ('ejecuciones', models.PositiveIntegerField(default=0)),
+                ('fallos', models.PositiveIntegerField(default=0)),
+                ('duracion_total_ms', models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['nombre'],
+            },
+        ),
+        migrations.CreateModel(
+            name='EjecucionTarea',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nodo', models.CharField(max_length=120)),
+                ('iniciada_en', models.DateTimeField(default=django.utils.timezone.now)),
+                ('terminada_en', models.DateTimeField(blank=True, null=True)),
+                ('estado', models.CharField(choices=[('EN_CURSO', 'En curso'), ('OK', 'Correcta'), ('ERROR', 'Con error')], default='EN_CURSO', max_length=10)),
+                ('duracion_ms', models.PositiveIntegerField(default=0)),
+                ('resultado', models.JSONField(blank=True, default=dict)),
+                ('error', models.TextField(blank=True, default='')),
+                ('tarea', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ejecuciones_registradas', to='gestion_usuarios.tareaprogramada')),
+            ],
+            options={
+                'ordering': ['-iniciada_en', '-id'],
+                'indexes': [models.Index(fields=['tarea', 'iniciada_en'], name='idx_ejecucion_tarea_inicio')],
+            },
+        ),
+    ]
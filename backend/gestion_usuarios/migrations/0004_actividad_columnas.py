@@ -0,0 +1,112 @@
+# Generated by Django 5.1.15 on 2026-10-19 17:17
+
+from django.db import migrations, models
+
+CAMPOS = ["categoria", "severidad", "ruta", "metodo", "es_denegado"]
+
+# Copia congelada de gestion_usuarios.models.clasificar_actividad al crear la
+# migración: cambios posteriores a las reglas no deben alterar el backfill.
+_TOKENS_HUERTA = ("huerta", "cosecha", "temporada", "venta", "inversion", "propietario")
+_TOKENS_BODEGA = ("bodega", "recepcion", "camion", "madera", "consumible", "empaque", "semana")
+_TOKENS_INFO = ("elim", "archiv", "restaur", "finaliz", "reactiv")
+
+
+def _detalle(detalles, clave):
+    for part in detalles.split(";"):
+        part = part.strip()
+        if part.startswith(f"{clave}="):
+            return part.split("=", 1)[1]
+    return ""
+
+
+def clasificar_actividad(accion, detalles):
+    crudo = detalles or ""
+    accion, detalles = (accion or "").lower(), crudo.lower()
+    es_denegado = "denegado" in accion or "bloqueado" in accion or "permiso_requerido=" in detalles
+
+    if es_denegado:
+        categoria = "seguridad"
+    elif "sesion" in accion or "login" in accion or "contrase" in accion:
+        categoria = "autenticacion"
+    elif any(t in accion or t in detalles for t in _TOKENS_HUERTA):
+        categoria = "gestion_huerta"
+    elif any(t in accion or t in detalles for t in _TOKENS_BODEGA):
+        categoria = "gestion_bodega"
+    elif "usuario" in accion or "permiso" in accion:
+        categoria = "gestion_usuarios"
+    else:
+        categoria = "sistema"
+
+    if "denegado" in accion or "fallido" in accion or "bloque" in accion:
+        severidad = "warning"
+    elif any(t in accion or t in detalles for t in _TOKENS_INFO):
+        severidad = "info"
+    else:
+        severidad = "success"
+
+    return {
+        "categoria": categoria,
+        "severidad": severidad,
+        "ruta": _detalle(crudo, "ruta")[:255],
+        "metodo": _detalle(crudo, "metodo")[:10],
+        "es_denegado": es_denegado,
+    }
+
+
+def backfill_actividad(apps, schema_editor):
+    """Deriva las columnas nuevas de los registros existentes."""
+    RegistroActividad = apps.get_model("gestion_usuarios", "RegistroActividad")
+    lote = []
+    for reg in RegistroActividad.objects.only("id", "accion", "detalles").iterator(chunk_size=1000):
+        for field, value in clasificar_actividad(reg.accion, reg.detalles).items():
+            setattr(reg, field, value)
+        lote.append(reg)
+        if len(lote) >= 1000:
+            RegistroActividad.objects.bulk_update(lote, CAMPOS)
+            lote = []
+    if lote:
+        RegistroActividad.objects.bulk_update(lote, CAMPOS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gestion_usuarios', '0003_scheduler'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='registroactividad',
+            name='categoria',
+            field=models.CharField(default='sistema', editable=False, max_length=20),
+        ),
+        migrations.AddField(
+            model_name='registroactividad',
+            name='es_denegado',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name='registroactividad',
+            name='metodo',
+            field=models.CharField(blank=True, default='', editable=False, max_length=10),
+        ),
+        migrations.AddField(
+            model_name='registroactividad',
+            name='ruta',
+            field=models.CharField(blank=True, default='', editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='registroactividad',
+            name='severidad',
+            field=models.CharField(default='success', editable=False, max_length=10),
+        ),
+        migrations.AddIndex(
+            model_name='registroactividad',
+            index=models.Index(fields=['categoria', 'fecha_hora'], name='idx_actividad_cat_fecha'),
+        ),
+        migrations.AddIndex(
+            model_name='registroactividad',
+            index=models.Index(fields=['fecha_hora'], name='idx_actividad_fecha'),
+        ),
+        migrations.RunPython(backfill_actividad, migrations.RunPython.noop),
+    ]
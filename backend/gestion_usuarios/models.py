@@ -87,9 +87,177 @@ class Users(AbstractBaseUser, PermissionsMixin):
             self.save(update_fields=["is_active", "archivado_en"])
 
 
+_TOKENS_HUERTA = ("huerta", "cosecha", "temporada", "venta", "inversion", "propietario")
+_TOKENS_BODEGA = ("bodega", "recepcion", "camion", "madera", "consumible", "empaque", "semana")
+_TOKENS_INFO = ("elim", "archiv", "restaur", "finaliz", "reactiv")
+
+
+def _detalle(detalles: str, clave: str) -> str:
+    for part in detalles.split(";"):
+        part = part.strip()
+        if part.startswith(f"{clave}="):
+            return part.split("=", 1)[1]
+    return ""
+
+
+def clasificar_actividad(accion, detalles) -> dict:
+    """
+    Columnas derivadas de un registro (se guardan al escribir para que el
+    listado no vuelva a parsear `detalles`): categoria, severidad, ruta,
+    metodo y es_denegado.
+    """
+    crudo = detalles or ""
+    accion, detalles = (accion or "").lower(), crudo.lower()
+    es_denegado = "denegado" in accion or "bloqueado" in accion or "permiso_requerido=" in detalles
+
+    if es_denegado:
+        categoria = "seguridad"
+    elif "sesion" in accion or "login" in accion or "contrase" in accion:
+        categoria = "autenticacion"
+    elif any(t in accion or t in detalles for t in _TOKENS_HUERTA):
+        categoria = "gestion_huerta"
+    elif any(t in accion or t in detalles for t in _TOKENS_BODEGA):
+        categoria = "gestion_bodega"
+    elif "usuario" in accion or "permiso" in accion:
+        categoria = "gestion_usuarios"
+    else:
+        categoria = "sistema"
+
+    if "denegado" in accion or "fallido" in accion or "bloque" in accion:
+        severidad = "warning"
+    elif any(t in accion or t in detalles for t in _TOKENS_INFO):
+        severidad = "info"
+    else:
+        severidad = "success"
+
+    return {
+        "categoria": categoria,
+        "severidad": severidad,
+        "ruta": _detalle(crudo, "ruta")[:255],
+        "metodo": _detalle(crudo, "metodo")[:10],
+        "es_denegado": es_denegado,
+    }
+
+
 class RegistroActividad(models.Model):
     usuario = models.ForeignKey(Users, on_delete=models.CASCADE)
     accion = models.CharField(max_length=255)
     fecha_hora = models.DateTimeField(auto_now_add=True)
     detalles = models.TextField(null=True, blank=True)
-    ip = models.GenericIPAddressField(null=True, blank=True)
\ No newline at end of file
+    ip = models.GenericIPAddressField(null=True, blank=True)
+    # Derivados de accion/detalles al guardar (ver clasificar_actividad)
+    categoria = models.CharField(max_length=20, default="sistema", editable=False)
+    severidad = models.CharField(max_length=10, default="success", editable=False)
+    ruta = models.CharField(max_length=255, blank=True, default="", editable=False)
+    metodo = models.CharField(max_length=10, blank=True, default="", editable=False)
+    es_denegado = models.BooleanField(default=False, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["categoria", "fecha_hora"], name="idx_actividad_cat_fecha"),
+            models.Index(fields=["fecha_hora"], name="idx_actividad_fecha"),
+        ]
+
+    def save(self, *args, **kwargs):
+        for field, value in clasificar_actividad(self.accion, self.detalles).items():
+            setattr(self, field, value)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"accion", "detalles"} & set(update_fields):
+            kwargs["update_fields"] = set(update_fields) | {"categoria", "severidad", "ruta", "metodo", "es_denegado"}
+        super().save(*args, **kwargs)
+
+
+class SearchDocument(models.Model):
+    """
+    Documento desnormalizado para la búsqueda global del dashboard.
+    Se mantiene desde señales (gestion_usuarios.services.search_index) y se
+    reconstruye con `manage.py rebuild_search_index`.
+    `search_text` va normalizado (minúsculas, sin acentos); en MySQL tiene un
+    índice FULLTEXT con parser ngram (migración 0002).
+    """
+
+    class Scope(models.TextChoices):
+        HUERTAS = "huertas", "Huertas"
+        TEMPORADAS = "temporadas", "Temporadas"
+        COSECHAS = "cosechas", "Cosechas"
+        BODEGAS = "bodegas", "Bodegas"
+        USUARIOS = "usuarios", "Usuarios"
+
+    entity_type = models.CharField(max_length=32)
+    entity_id = models.PositiveBigIntegerField()
+    scope = models.CharField(max_length=20, choices=Scope.choices)
+    group = models.CharField(max_length=60)
+    title = models.CharField(max_length=255)
+    subtitle = models.CharField(max_length=255, blank=True, default="")
+    meta = models.CharField(max_length=60, blank=True, default="")
+    link = models.CharField(max_length=500)
+    link_alt = models.CharField(max_length=500, blank=True, default="")
+    search_text = models.TextField()
+    actualizado_en = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["entity_type", "entity_id"], name="uniq_searchdoc_entity"),
+        ]
+        indexes = [
+            models.Index(fields=["scope", "entity_type"], name="idx_searchdoc_scope_type"),
+        ]
+
+    def __str__(self):
+        return f"{self.entity_type}-{self.entity_id}: {self.title}"
+
+
+class TareaProgramada(models.Model):
+    """
+    Estado y métricas de una tarea periódica del scheduler
+    (gestion_usuarios.services.scheduler). El lock es la propia fila:
+    `bloqueado_hasta` se toma con un UPDATE condicional, así solo un nodo
+    ejecuta la tarea aunque corran varios daemons.
+    """
+    nombre = models.CharField(max_length=100, unique=True)
+    proxima_ejecucion = models.DateTimeField(default=timezone.now)
+    bloqueado_por = models.CharField(max_length=120, blank=True, default="")
+    bloqueado_hasta = models.DateTimeField(null=True, blank=True)
+    ultima_ejecucion = models.DateTimeField(null=True, blank=True)
+    ultimo_estado = models.CharField(max_length=10, blank=True, default="")
+    ultima_duracion_ms = models.PositiveIntegerField(default=0)
+    ejecuciones = models.PositiveIntegerField(default=0)
+    fallos = models.PositiveIntegerField(default=0)
+    duracion_total_ms = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        ordering = ["nombre"]
+
+    def __str__(self):
+        return self.nombre
+
+    @property
+    def duracion_promedio_ms(self) -> int:
+        return int(self.duracion_total_ms / self.ejecuciones) if self.ejecuciones else 0
+
+
+class EjecucionTarea(models.Model):
+    """Historial de ejecuciones del scheduler (una fila por corrida)."""
+
+    class Estado(models.TextChoices):
+        EN_CURSO = "EN_CURSO", "En curso"
+        OK = "OK", "Correcta"
+        ERROR = "ERROR", "Con error"
+
+    tarea = models.ForeignKey(TareaProgramada, on_delete=models.CASCADE, related_name="ejecuciones_registradas")
+    nodo = models.CharField(max_length=120)
+    iniciada_en = models.DateTimeField(default=timezone.now)
+    terminada_en = models.DateTimeField(null=True, blank=True)
+    estado = models.CharField(max_length=10, choices=Estado.choices, default=Estado.EN_CURSO)
+    duracion_ms = models.PositiveIntegerField(default=0)
+    resultado = models.JSONField(default=dict, blank=True)
+    error = models.TextField(blank=True, default="")
+
+    class Meta:
+        ordering = ["-iniciada_en", "-id"]
+        indexes = [
+            models.Index(fields=["tarea", "iniciada_en"], name="idx_ejecucion_tarea_inicio"),
+        ]
+
+    def __str__(self):
+        return f"{self.tarea_id} {self.estado} ({self.iniciada_en:%Y-%m-%d %H:%M})"
@@ -8,6 +8,8 @@ from django.core.cache import cache
 from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework import serializers
 
+from agroproductores_risol.utils.rate_limit import SlidingWindowCounter
+
 from .models import RegistroActividad, Users
 from .utils.activity import registrar_actividad
 from .validators import validate_telefono
@@ -18,6 +20,9 @@ LOGIN_LOCK_WINDOW_SECONDS = 5 * 60
 INVALID_CREDENTIALS_MESSAGE = "Credenciales invalidas. Verifica tu telefono y contrasena."
 PASSWORD_POLICY_MESSAGE = "La contrasena debe tener al menos 8 caracteres e incluir letras y numeros."
 
+# Intentos fallidos por (telefono, IP) en ventana deslizante (dos contadores en cache).
+_login_failures = SlidingWindowCounter(LOGIN_LOCK_THRESHOLD, LOGIN_LOCK_WINDOW_SECONDS)
+
 
 def _login_fail_key(telefono: str, remote_addr: str) -> str:
     return f"auth:login:fail:{telefono}:{remote_addr}"
@@ -92,8 +97,7 @@ class LoginSerializer(serializers.Serializer):
         )
 
         if not user_auth:
-            failed_attempts = int(cache.get(fail_key, 0) or 0) + 1
-            cache.set(fail_key, failed_attempts, LOGIN_LOCK_WINDOW_SECONDS)
+            failed_attempts = max(1, round(_login_failures.hit(fail_key, now)))
 
             user.intentos_fallidos = failed_attempts
             user.save(update_fields=["intentos_fallidos"])
@@ -107,7 +111,7 @@ class LoginSerializer(serializers.Serializer):
             if failed_attempts >= LOGIN_LOCK_THRESHOLD:
                 lock_until = now + LOGIN_LOCK_WINDOW_SECONDS
                 cache.set(lock_key, lock_until, LOGIN_LOCK_WINDOW_SECONDS)
-                cache.delete(fail_key)
+                _login_failures.reset(fail_key, now)
                 registrar_actividad(
                     user,
                     "Bloqueo temporal de inicio de sesion",
@@ -127,7 +131,7 @@ class LoginSerializer(serializers.Serializer):
 
         user.intentos_fallidos = 0
         user.save(update_fields=["intentos_fallidos"])
-        cache.delete(fail_key)
+        _login_failures.reset(fail_key, now)
         cache.delete(lock_key)
         data["user"] = user
         data["must_change_password"] = user.must_change_password
@@ -209,61 +213,21 @@ class UsuarioSerializer(serializers.ModelSerializer):
         extra_kwargs = {"password": {"write_only": True}}
 
 
+class UsuarioActividadSerializer(serializers.ModelSerializer):
+    """Proyección compacta del usuario para el feed de actividad (sin permisos)."""
+
+    full_name = serializers.ReadOnlyField(source="get_full_name")
+
+    class Meta:
+        model = Users
+        fields = ["id", "telefono", "nombre", "apellido", "role", "full_name"]
+        read_only_fields = fields
+
+
 class RegistroActividadSerializer(serializers.ModelSerializer):
-    usuario = UsuarioSerializer()
-    categoria = serializers.SerializerMethodField()
-    severidad = serializers.SerializerMethodField()
-    ruta = serializers.SerializerMethodField()
-    metodo = serializers.SerializerMethodField()
-    es_denegado = serializers.SerializerMethodField()
-
-    @staticmethod
-    def _normalized(instance) -> tuple[str, str]:
-        accion = (instance.accion or "").lower()
-        detalles = (instance.detalles or "").lower()
-        return accion, detalles
-
-    def get_categoria(self, instance):
-        accion, detalles = self._normalized(instance)
-        if "denegado" in accion or "bloqueado" in accion or "permiso_requerido=" in detalles:
-            return "seguridad"
-        if "sesion" in accion or "login" in accion or "contrase" in accion:
-            return "autenticacion"
-        if any(token in accion or token in detalles for token in ("huerta", "cosecha", "temporada", "venta", "inversion", "propietario")):
-            return "gestion_huerta"
-        if any(token in accion or token in detalles for token in ("bodega", "recepcion", "camion", "madera", "consumible", "empaque", "semana")):
-            return "gestion_bodega"
-        if "usuario" in accion or "permiso" in accion:
-            return "gestion_usuarios"
-        return "sistema"
-
-    def get_severidad(self, instance):
-        accion, detalles = self._normalized(instance)
-        if "denegado" in accion or "fallido" in accion or "bloque" in accion:
-            return "warning"
-        if any(token in accion or token in detalles for token in ("elim", "archiv", "restaur", "finaliz", "reactiv")):
-            return "info"
-        return "success"
-
-    def get_ruta(self, instance):
-        detalles = instance.detalles or ""
-        for part in detalles.split(";"):
-            part = part.strip()
-            if part.startswith("ruta="):
-                return part.split("=", 1)[1]
-        return None
-
-    def get_metodo(self, instance):
-        detalles = instance.detalles or ""
-        for part in detalles.split(";"):
-            part = part.strip()
-            if part.startswith("metodo="):
-                return part.split("=", 1)[1]
-        return None
-
-    def get_es_denegado(self, instance):
-        accion, detalles = self._normalized(instance)
-        return "denegado" in accion or "permiso_requerido=" in detalles or "bloqueado" in accion
+    """categoria/severidad/ruta/metodo/es_denegado son columnas (se derivan al guardar)."""
+
+    usuario = UsuarioActividadSerializer(read_only=True)
 
     class Meta:
         model = RegistroActividad
@@ -280,6 +244,7 @@ class RegistroActividadSerializer(serializers.ModelSerializer):
             "metodo",
             "es_denegado",
         ]
+        read_only_fields = ["categoria", "severidad", "ruta", "metodo", "es_denegado"]
 
 
 class PermisoSerializer(serializers.ModelSerializer):
@@ -18,7 +18,8 @@ from gestion_bodega.models import (
     Recepcion,
     TemporadaBodega,
 )
-from gestion_bodega.utils.kpis import build_alerts
+from gestion_bodega.services.tablero_alertas import alertas_abiertas
+from gestion_bodega.services.tablero_kpis import build_tablero_overview
 from gestion_huerta.models import (
     Cosecha,
     Huerta,
@@ -27,7 +28,7 @@ from gestion_huerta.models import (
     Temporada,
     Venta,
 )
-from gestion_usuarios.models import RegistroActividad, Users
+from gestion_usuarios.models import RegistroActividad, SearchDocument, Users
 
 DECIMAL_ZERO = Decimal("0.00")
 MONEY_FIELD = DecimalField(max_digits=18, decimal_places=2)
@@ -204,32 +205,6 @@ def _bodega_tablero_link(temporada: TemporadaBodega) -> str:
     )
 
 
-def _activity_category(activity: RegistroActividad) -> str:
-    accion = (activity.accion or "").lower()
-    detalles = (activity.detalles or "").lower()
-    if "denegado" in accion or "bloqueado" in accion or "permiso_requerido=" in detalles:
-        return "seguridad"
-    if "sesion" in accion or "login" in accion or "contrase" in accion:
-        return "autenticacion"
-    if any(token in accion or token in detalles for token in ("huerta", "cosecha", "temporada", "venta", "inversion", "propietario")):
-        return "gestion_huerta"
-    if any(token in accion or token in detalles for token in ("bodega", "recepcion", "camion", "madera", "consumible", "empaque", "semana")):
-        return "gestion_bodega"
-    if "usuario" in accion or "permiso" in accion:
-        return "gestion_usuarios"
-    return "sistema"
-
-
-def _activity_severity(activity: RegistroActividad) -> str:
-    accion = (activity.accion or "").lower()
-    detalles = (activity.detalles or "").lower()
-    if "denegado" in accion or "fallido" in accion or "bloque" in accion:
-        return "warning"
-    if any(token in accion or token in detalles for token in ("elim", "archiv", "restaur", "finaliz", "reactiv")):
-        return "info"
-    return "success"
-
-
 def _link_from_bodega_alert(raw_alert: dict[str, Any]) -> str | None:
     link = raw_alert.get("link") or {}
     path = link.get("path")
@@ -283,10 +258,12 @@ def build_dashboard_overview(user: Users) -> dict[str, Any]:
     empaque_prev = ClasificacionEmpaque.objects.filter(is_active=True, temporada__is_active=True, temporada__finalizada=False, fecha__gte=p7, fecha__lte=p7_end).aggregate(total=Coalesce(Sum("cantidad_cajas"), 0))["total"] if access["bodega"] else 0
     despachos_now = CamionSalida.objects.filter(is_active=True, temporada__is_active=True, temporada__finalizada=False, fecha_salida__gte=d7, fecha_salida__lte=today).aggregate(total=Coalesce(Sum("cargas__cantidad", filter=Q(cargas__is_active=True)), 0))["total"] if access["bodega"] else 0
     despachos_prev = CamionSalida.objects.filter(is_active=True, temporada__is_active=True, temporada__finalizada=False, fecha_salida__gte=p7, fecha_salida__lte=p7_end).aggregate(total=Coalesce(Sum("cargas__cantidad", filter=Q(cargas__is_active=True)), 0))["total"] if access["bodega"] else 0
+    # Mismo motor de KPIs que el resumen del tablero (semana activa del contexto destacado)
+    featured_tablero = build_tablero_overview(featured_bodega.id, featured_bodega.bodega_id) if featured_bodega and access["tablero"] else None
     madera_stock = CompraMadera.objects.filter(is_active=True, temporada__is_active=True, temporada__finalizada=False).aggregate(total=Coalesce(Sum("stock_actual"), Value(DECIMAL_ZERO)))["total"] if access["bodega"] else DECIMAL_ZERO
 
     pending_passwords = Users.objects.filter(is_active=True, must_change_password=True).count() if access["admin"] else 0
-    security_events = RegistroActividad.objects.filter(fecha_hora__date__gte=d7).filter(Q(accion__iregex=r"(denegad|bloquead|fallid)") | Q(detalles__icontains="permiso_requerido=")).count() if access["admin"] else 0
+    security_events = RegistroActividad.objects.filter(fecha_hora__date__gte=d7).filter(Q(categoria="seguridad") | Q(severidad="warning")).count() if access["admin"] else 0
 
     alerts = []
     if temporadas_sin_cosecha:
@@ -302,7 +279,7 @@ def build_dashboard_overview(user: Users) -> dict[str, Any]:
     if access["admin"] and pending_passwords:
         alerts.append({"id": "admin-passwords", "source": "Administracion", "severity": "info", "title": "Usuarios con alta pendiente", "description": f"{pending_passwords} cuentas aun deben cambiar contrasena.", "to": "/users-admin", "cta": "Gestionar usuarios"})
     if featured_bodega and access["tablero"]:
-        for raw in build_alerts(temporada_id=featured_bodega.id, bodega_id=featured_bodega.bodega_id, filters=None):
+        for raw in alertas_abiertas(featured_bodega.bodega_id, featured_bodega.id):
             alerts.append({"id": f"bodega-{raw.get('code', 'alerta').lower()}", "source": "Bodega", "severity": raw.get("severity", "info"), "title": raw.get("title") or "Alerta operativa", "description": raw.get("description") or "", "to": _link_from_bodega_alert(raw), "cta": "Abrir contexto"})
     alerts = sorted(alerts, key=lambda item: {"critical": 0, "warning": 1, "info": 2}.get(item["severity"], 9))[:6]
 
@@ -325,7 +302,7 @@ def build_dashboard_overview(user: Users) -> dict[str, Any]:
     timeline_qs = RegistroActividad.objects.select_related("usuario").order_by("-fecha_hora")
     if not access["admin"]:
         timeline_qs = timeline_qs.filter(usuario=user)
-    timeline = [{"id": item.id, "title": item.accion, "description": item.detalles or "Movimiento registrado en el sistema.", "category": _activity_category(item), "severity": _activity_severity(item), "created_at": item.fecha_hora.isoformat(), "user_name": item.usuario.get_full_name(), "to": "/profile" if _activity_category(item) == "autenticacion" else "/activity-log" if access["admin"] else None} for item in timeline_qs[:8]]
+    timeline = [{"id": item.id, "title": item.accion, "description": item.detalles or "Movimiento registrado en el sistema.", "category": item.categoria, "severity": item.severidad, "created_at": item.fecha_hora.isoformat(), "user_name": item.usuario.get_full_name(), "to": "/profile" if item.categoria == "autenticacion" else "/activity-log" if access["admin"] else None} for item in timeline_qs[:8]]
 
     return {
         "generated_at": timezone.now().isoformat(),
@@ -417,7 +394,7 @@ def build_dashboard_overview(user: Users) -> dict[str, Any]:
         ],
         "contexts": {
             "featured_temporada": {"id": featured_temporada.id, "label": f"{_huerta_origin_name(featured_temporada)} / {featured_temporada.año}", "to": _temporada_report_link(featured_temporada.id)} if featured_temporada else None,
-            "featured_bodega": {"id": featured_bodega.id, "label": f"{featured_bodega.bodega.nombre} / {featured_bodega.año}", "to": _bodega_tablero_link(featured_bodega)} if featured_bodega else None,
+            "featured_bodega": {"id": featured_bodega.id, "label": f"{featured_bodega.bodega.nombre} / {featured_bodega.año}", "to": _bodega_tablero_link(featured_bodega), "tablero": featured_tablero} if featured_bodega else None,
         },
     }
 
@@ -435,50 +412,21 @@ def build_dashboard_search(user: Users, query: str) -> dict[str, Any]:
         "bodegas": _can(user, "view_bodega", "view_temporadabodega"),
         "tablero": _can(user, "view_dashboard"),
     }
-    results: list[dict[str, Any]] = []
-
+    scopes = []
     if access["huertas"]:
-        for item in Huerta.objects.select_related("propietario").filter(is_active=True).filter(
-            Q(nombre__icontains=term) | Q(ubicacion__icontains=term) | Q(propietario__nombre__icontains=term) | Q(propietario__apellidos__icontains=term)
-        )[:4]:
-            results.append({"id": f"huerta-{item.id}", "group": "Huertas", "kind": "entity", "title": item.nombre, "subtitle": f"{item.ubicacion} · {item.propietario}", "meta": "Huerta propia", "to": _huerta_profile_link(item.id)})
-
-        for item in HuertaRentada.objects.select_related("propietario").filter(is_active=True).filter(
-            Q(nombre__icontains=term) | Q(ubicacion__icontains=term) | Q(propietario__nombre__icontains=term) | Q(propietario__apellidos__icontains=term)
-        )[:4]:
-            results.append({"id": f"huerta-rentada-{item.id}", "group": "Huertas", "kind": "entity", "title": item.nombre, "subtitle": f"{item.ubicacion} · {item.propietario}", "meta": "Huerta rentada", "to": _huerta_profile_link(item.id)})
-
+        scopes.append(SearchDocument.Scope.HUERTAS)
     if access["temporadas"]:
-        temporadas_q = Q(huerta__nombre__icontains=term) | Q(huerta_rentada__nombre__icontains=term)
-        if term.isdigit():
-            temporadas_q |= Q(año=int(term))
-        for item in (
-            Temporada.objects
-            .select_related("huerta", "huerta_rentada")
-            .filter(is_active=True, estado_operativo=Temporada.EstadoOperativo.OPERATIVA)
-            .filter(temporadas_q)[:4]
-        ):
-            results.append({"id": f"temporada-{item.id}", "group": "Temporadas", "kind": "entity", "title": f"Temporada {item.año}", "subtitle": _huerta_origin_name(item) or "Temporada activa", "meta": "Huerta", "to": _temporada_report_link(item.id)})
-
+        scopes.append(SearchDocument.Scope.TEMPORADAS)
     if access["cosechas"]:
-        for item in Cosecha.objects.select_related("temporada", "huerta", "huerta_rentada").filter(is_active=True).filter(
-            Q(nombre__icontains=term) | Q(temporada__huerta__nombre__icontains=term) | Q(temporada__huerta_rentada__nombre__icontains=term)
-        )[:6]:
-            origin_name = item.huerta.nombre if item.huerta_id else item.huerta_rentada.nombre if item.huerta_rentada_id else "Cosecha"
-            results.append({"id": f"cosecha-{item.id}", "group": "Cosechas", "kind": "entity", "title": item.nombre, "subtitle": f"{origin_name} · Temp {item.temporada.año}", "meta": "Huerta", "to": _cosecha_report_link(item.id)})
-
+        scopes.append(SearchDocument.Scope.COSECHAS)
     if access["bodegas"] or access["tablero"]:
-        for item in Bodega.objects.filter(is_active=True).filter(Q(nombre__icontains=term) | Q(ubicacion__icontains=term))[:4]:
-            results.append({"id": f"bodega-{item.id}", "group": "Bodegas", "kind": "entity", "title": item.nombre, "subtitle": item.ubicacion or "Sin ubicacion registrada", "meta": "Bodega", "to": _bodega_temporadas_link(item)})
+        scopes.append(SearchDocument.Scope.BODEGAS)
+    if access["admin"]:
+        scopes.append(SearchDocument.Scope.USUARIOS)
 
-        temporadas_bodega_q = Q(bodega__nombre__icontains=term)
-        if term.isdigit():
-            temporadas_bodega_q |= Q(año=int(term))
-        for item in TemporadaBodega.objects.select_related("bodega").filter(is_active=True).filter(temporadas_bodega_q)[:6]:
-            results.append({"id": f"temporada-bodega-{item.id}", "group": "Operacion de bodega", "kind": "entity", "title": f"{item.bodega.nombre} · {item.año}", "subtitle": "Temporada de bodega", "meta": "Tablero", "to": _bodega_tablero_link(item) if access["tablero"] else _bodega_temporadas_link(item.bodega)})
+    # Índice desnormalizado (una consulta); ver services/search_index.py.
+    from gestion_usuarios.services.search_index import search_documents
 
-    if access["admin"]:
-        for item in Users.objects.filter(is_active=True).filter(Q(nombre__icontains=term) | Q(apellido__icontains=term) | Q(telefono__icontains=term))[:4]:
-            results.append({"id": f"user-{item.id}", "group": "Usuarios", "kind": "entity", "title": item.get_full_name(), "subtitle": item.telefono, "meta": item.role, "to": "/users-admin"})
+    results = search_documents(term, scopes, tablero_links=access["tablero"])
 
     return {"query": term, "results": results[:18], "meta": {"total": len(results)}}
@@ -0,0 +1,173 @@
+"""
+Scheduler de tareas periódicas del proyecto (daemon: `manage.py run_scheduler`).
+
+- Registro: cada app declara sus tareas en `<app>/tasks.py` con el decorador
+  `periodic_task`; `load_tasks()` descubre esos módulos.
+- Lock en BD: la fila TareaProgramada se toma con un UPDATE condicional
+  (vencida + sin lock vigente). Solo el nodo que afecta la fila ejecuta; si
+  un nodo muere, el lock expira solo (`lock_ttl`).
+- Historial y métricas: EjecucionTarea por corrida; contadores, última
+  duración y estado en TareaProgramada.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import time
+import traceback
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+from gestion_usuarios.models import EjecucionTarea, TareaProgramada
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PeriodicTask:
+    nombre: str
+    func: Callable[[], Optional[Dict[str, Any]]]
+    cada: timedelta
+    lock_ttl: timedelta
+    descripcion: str = ""
+
+
+_REGISTRY: Dict[str, PeriodicTask] = {}
+
+
+def periodic_task(nombre: str, *, cada: timedelta, lock_ttl: Optional[timedelta] = None, descripcion: str = ""):
+    """
+    Registra `func` como tarea periódica. `func()` puede devolver un dict
+    (resumen serializable) que queda en el historial.
+    """
+    def decorator(func):
+        register_task(
+            PeriodicTask(
+                nombre=nombre,
+                func=func,
+                cada=cada,
+                lock_ttl=lock_ttl or max(cada, timedelta(minutes=5)),
+                descripcion=descripcion or (func.__doc__ or "").strip().split("\n")[0],
+            )
+        )
+        return func
+    return decorator
+
+
+def register_task(task: PeriodicTask) -> None:
+    _REGISTRY[task.nombre] = task
+
+
+def unregister_task(nombre: str) -> None:
+    _REGISTRY.pop(nombre, None)
+
+
+def registered_tasks() -> List[PeriodicTask]:
+    return [_REGISTRY[nombre] for nombre in sorted(_REGISTRY)]
+
+
+def get_task(nombre: str) -> Optional[PeriodicTask]:
+    return _REGISTRY.get(nombre)
+
+
+def load_tasks() -> List[PeriodicTask]:
+    """Importa `<app>/tasks.py` de las apps instaladas (registra sus tareas)."""
+    autodiscover_modules("tasks")
+    return registered_tasks()
+
+
+def node_name() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _acquire(task: PeriodicTask, nodo: str, ahora: datetime, force: bool) -> bool:
+    TareaProgramada.objects.get_or_create(nombre=task.nombre, defaults={"proxima_ejecucion": ahora})
+    qs = TareaProgramada.objects.filter(nombre=task.nombre).filter(
+        Q(bloqueado_hasta__isnull=True) | Q(bloqueado_hasta__lt=ahora)
+    )
+    if not force:
+        qs = qs.filter(proxima_ejecucion__lte=ahora)
+    return qs.update(bloqueado_por=nodo, bloqueado_hasta=ahora + task.lock_ttl) == 1
+
+
+def run_task(task: PeriodicTask, *, nodo: Optional[str] = None, force: bool = False) -> Optional[EjecucionTarea]:
+    """
+    Ejecuta la tarea si está vencida y este nodo obtiene el lock
+    (force=True ignora el vencimiento, no el lock). None si no se ejecutó.
+    """
+    nodo = nodo or node_name()
+    inicio = timezone.now()
+    if not _acquire(task, nodo, inicio, force):
+        return None
+
+    tarea = TareaProgramada.objects.get(nombre=task.nombre)
+    ejecucion = EjecucionTarea.objects.create(tarea=tarea, nodo=nodo, iniciada_en=inicio)
+    t0 = time.monotonic()
+    estado, resultado, error = EjecucionTarea.Estado.OK, {}, ""
+    try:
+        resultado = task.func() or {}
+    except Exception:
+        estado, error = EjecucionTarea.Estado.ERROR, traceback.format_exc()
+        logger.exception("Tarea programada %s falló", task.nombre)
+    duracion_ms = int((time.monotonic() - t0) * 1000)
+    fin = timezone.now()
+
+    ejecucion.estado, ejecucion.resultado, ejecucion.error = estado, resultado, error
+    ejecucion.duracion_ms, ejecucion.terminada_en = duracion_ms, fin
+    ejecucion.save(update_fields=["estado", "resultado", "error", "duracion_ms", "terminada_en"])
+
+    # Libera el lock solo si sigue siendo nuestro (pudo expirar y tomarlo otro nodo).
+    TareaProgramada.objects.filter(pk=tarea.pk, bloqueado_por=nodo).update(
+        bloqueado_por="",
+        bloqueado_hasta=None,
+        proxima_ejecucion=inicio + task.cada,
+    )
+    TareaProgramada.objects.filter(pk=tarea.pk).update(
+        ultima_ejecucion=fin,
+        ultimo_estado=estado,
+        ultima_duracion_ms=duracion_ms,
+        ejecuciones=F("ejecuciones") + 1,
+        fallos=F("fallos") + (1 if estado == EjecucionTarea.Estado.ERROR else 0),
+        duracion_total_ms=F("duracion_total_ms") + duracion_ms,
+    )
+    logger.info("Tarea programada %s: %s en %s ms", task.nombre, estado, duracion_ms)
+    return ejecucion
+
+
+def run_due_tasks(*, nodo: Optional[str] = None) -> List[EjecucionTarea]:
+    """Un ciclo del daemon: ejecuta las tareas registradas que estén vencidas."""
+    nodo = nodo or node_name()
+    ejecutadas = []
+    for task in registered_tasks():
+        ejecucion = run_task(task, nodo=nodo)
+        if ejecucion is not None:
+            ejecutadas.append(ejecucion)
+    return ejecutadas
+
+
+def purge_history(dias: int) -> int:
+    """Borra el historial de ejecuciones más antiguo que `dias`."""
+    limite = timezone.now() - timedelta(days=dias)
+    borradas, _ = EjecucionTarea.objects.filter(iniciada_en__lt=limite).delete()
+    return borradas
+
+
+__all__ = [
+    "PeriodicTask",
+    "get_task",
+    "load_tasks",
+    "node_name",
+    "periodic_task",
+    "purge_history",
+    "register_task",
+    "registered_tasks",
+    "run_due_tasks",
+    "run_task",
+    "unregister_task",
+]
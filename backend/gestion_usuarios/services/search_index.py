@@ -0,0 +1,374 @@
+# gestion_usuarios/services/search_index.py
+"""
+Índice desnormalizado de la búsqueda global (SearchDocument).
+
+- Un documento por entidad buscable: huerta, huerta rentada, temporada,
+  cosecha, bodega, temporada de bodega y usuario. Guarda el texto ya
+  normalizado (sin acentos, minúsculas), el scope de permiso y el link.
+- Se mantiene desde señales (ver `connect_signals`): el documento de la
+  instancia y de sus dependientes (p.ej. renombrar una huerta cambia el
+  subtítulo de sus cosechas) se actualiza en on_commit, cuando ya se
+  aplicaron también las cascadas de archivado que usan `QuerySet.update()`
+  (no disparan señales).
+- `search_documents` resuelve la búsqueda con UNA consulta indexada
+  (MATCH ... AGAINST en MySQL; LIKE sobre la tabla angosta en MariaDB y
+  otros motores).
+- `rebuild_search_index` reconstruye todo (comando rebuild_search_index); el
+  post_migrate de gestion_usuarios lo corre si el índice está vacío.
+"""
+from __future__ import annotations
+
+import re
+import unicodedata
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, List, Sequence
+
+from django.db import connection, transaction
+from django.db.models import BooleanField, F, QuerySet, Window
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import RowNumber
+from django.db.models.signals import post_delete, post_save
+
+from gestion_bodega.models import Bodega, TemporadaBodega
+from gestion_huerta.models import Cosecha, Huerta, HuertaRentada, Propietario, Temporada
+from gestion_usuarios.models import SearchDocument, Users
+from gestion_usuarios.services.dashboard_service import (
+    _bodega_tablero_link,
+    _bodega_temporadas_link,
+    _cosecha_report_link,
+    _huerta_origin_name,
+    _huerta_profile_link,
+    _temporada_report_link,
+)
+
+Scope = SearchDocument.Scope
+
+# Tope de resultados por tipo (mismo reparto que la búsqueda original).
+RESULT_LIMITS: Dict[str, int] = {
+    "huerta": 4,
+    "huerta-rentada": 4,
+    "temporada": 4,
+    "cosecha": 6,
+    "bodega": 4,
+    "temporada-bodega": 6,
+    "user": 4,
+}
+TYPE_ORDER = list(RESULT_LIMITS)
+MAX_RESULTS = 18
+REBUILD_CHUNK = 500
+
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def normalize_search_text(*parts: Any) -> str:
+    """Minúsculas, sin acentos y solo [a-z0-9] separados por un espacio."""
+    raw = " ".join(str(p) for p in parts if p not in (None, ""))
+    folded = unicodedata.normalize("NFKD", raw)
+    folded = "".join(ch for ch in folded if not unicodedata.combining(ch)).lower()
+    return _NON_ALNUM.sub(" ", folded).strip()
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Definición de documentos por tipo
+# ──────────────────────────────────────────────────────────────────────────────
+
+@dataclass(frozen=True)
+class DocumentSpec:
+    entity_type: str
+    model: type
+    queryset: Callable[[], QuerySet]
+    build: Callable[[Any], Dict[str, Any]]
+
+
+def _owner_label(item) -> str:
+    return f"{item.ubicacion} · {item.propietario}"
+
+
+def _build_huerta(item: Huerta) -> Dict[str, Any]:
+    return {
+        "scope": Scope.HUERTAS, "group": "Huertas", "title": item.nombre,
+        "subtitle": _owner_label(item), "meta": "Huerta propia",
+        "link": _huerta_profile_link(item.id),
+        "search_text": normalize_search_text(
+            item.nombre, item.ubicacion, item.propietario.nombre, item.propietario.apellidos
+        ),
+    }
+
+
+def _build_huerta_rentada(item: HuertaRentada) -> Dict[str, Any]:
+    return {
+        "scope": Scope.HUERTAS, "group": "Huertas", "title": item.nombre,
+        "subtitle": _owner_label(item), "meta": "Huerta rentada",
+        "link": _huerta_profile_link(item.id),
+        "search_text": normalize_search_text(
+            item.nombre, item.ubicacion, item.propietario.nombre, item.propietario.apellidos
+        ),
+    }
+
+
+def _build_temporada(item: Temporada) -> Dict[str, Any]:
+    return {
+        "scope": Scope.TEMPORADAS, "group": "Temporadas", "title": f"Temporada {item.año}",
+        "subtitle": _huerta_origin_name(item) or "Temporada activa", "meta": "Huerta",
+        "link": _temporada_report_link(item.id),
+        "search_text": normalize_search_text(_huerta_origin_name(item), item.año),
+    }
+
+
+def _build_cosecha(item: Cosecha) -> Dict[str, Any]:
+    origin_name = item.huerta.nombre if item.huerta_id else item.huerta_rentada.nombre if item.huerta_rentada_id else "Cosecha"
+    return {
+        "scope": Scope.COSECHAS, "group": "Cosechas", "title": item.nombre,
+        "subtitle": f"{origin_name} · Temp {item.temporada.año}", "meta": "Huerta",
+        "link": _cosecha_report_link(item.id),
+        "search_text": normalize_search_text(item.nombre, origin_name, _huerta_origin_name(item.temporada)),
+    }
+
+
+def _build_bodega(item: Bodega) -> Dict[str, Any]:
+    return {
+        "scope": Scope.BODEGAS, "group": "Bodegas", "title": item.nombre,
+        "subtitle": item.ubicacion or "Sin ubicacion registrada", "meta": "Bodega",
+        "link": _bodega_temporadas_link(item),
+        "search_text": normalize_search_text(item.nombre, item.ubicacion),
+    }
+
+
+def _build_temporada_bodega(item: TemporadaBodega) -> Dict[str, Any]:
+    return {
+        "scope": Scope.BODEGAS, "group": "Operacion de bodega", "title": f"{item.bodega.nombre} · {item.año}",
+        "subtitle": "Temporada de bodega", "meta": "Tablero",
+        # Sin permiso de tablero se usa el listado de temporadas (link_alt).
+        "link": _bodega_tablero_link(item), "link_alt": _bodega_temporadas_link(item.bodega),
+        "search_text": normalize_search_text(item.bodega.nombre, item.año),
+    }
+
+
+def _build_user(item: Users) -> Dict[str, Any]:
+    return {
+        "scope": Scope.USUARIOS, "group": "Usuarios", "title": item.get_full_name(),
+        "subtitle": item.telefono, "meta": item.role, "link": "/users-admin",
+        "search_text": normalize_search_text(item.nombre, item.apellido, item.telefono),
+    }
+
+
+SPECS: Dict[str, DocumentSpec] = {
+    spec.entity_type: spec
+    for spec in (
+        DocumentSpec("huerta", Huerta, lambda: Huerta.objects.select_related("propietario").filter(is_active=True), _build_huerta),
+        DocumentSpec("huerta-rentada", HuertaRentada, lambda: HuertaRentada.objects.select_related("propietario").filter(is_active=True), _build_huerta_rentada),
+        DocumentSpec(
+            "temporada", Temporada,
+            lambda: Temporada.objects.select_related("huerta", "huerta_rentada").filter(
+                is_active=True, estado_operativo=Temporada.EstadoOperativo.OPERATIVA
+            ),
+            _build_temporada,
+        ),
+        DocumentSpec(
+            "cosecha", Cosecha,
+            lambda: Cosecha.objects.select_related(
+                "huerta", "huerta_rentada", "temporada__huerta", "temporada__huerta_rentada"
+            ).filter(is_active=True),
+            _build_cosecha,
+        ),
+        DocumentSpec("bodega", Bodega, lambda: Bodega.objects.filter(is_active=True), _build_bodega),
+        DocumentSpec("temporada-bodega", TemporadaBodega, lambda: TemporadaBodega.objects.select_related("bodega").filter(is_active=True), _build_temporada_bodega),
+        DocumentSpec("user", Users, lambda: Users.objects.filter(is_active=True), _build_user),
+    )
+}
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Mantenimiento
+# ──────────────────────────────────────────────────────────────────────────────
+
+def reindex(entity_type: str, ids: Iterable[int]) -> None:
+    """
+    Sincroniza los documentos de `ids`: upsert de los indexables y borrado
+    de los que ya no existen o dejaron de serlo (archivados, planificadas).
+    """
+    ids = {int(i) for i in ids if i}
+    if not ids:
+        return
+    spec = SPECS[entity_type]
+    found = {obj.pk: obj for obj in spec.queryset().filter(pk__in=ids)}
+    missing = ids - set(found)
+    if missing:
+        SearchDocument.objects.filter(entity_type=entity_type, entity_id__in=missing).delete()
+    for pk, obj in found.items():
+        SearchDocument.objects.update_or_create(
+            entity_type=entity_type,
+            entity_id=pk,
+            defaults={"subtitle": "", "meta": "", "link_alt": "", **spec.build(obj)},
+        )
+
+
+def _affected(model, pk: int) -> Dict[str, List[int]]:
+    """(tipo → ids) a reindexar cuando cambia `model(pk)`, incluyendo dependientes."""
+    if model is Propietario:
+        return {
+            "huerta": list(Huerta.objects.filter(propietario_id=pk).values_list("id", flat=True)),
+            "huerta-rentada": list(HuertaRentada.objects.filter(propietario_id=pk).values_list("id", flat=True)),
+        }
+    if model is Huerta:
+        return {
+            "huerta": [pk],
+            "temporada": list(Temporada.objects.filter(huerta_id=pk).values_list("id", flat=True)),
+            "cosecha": list(Cosecha.objects.filter(temporada__huerta_id=pk).values_list("id", flat=True)),
+        }
+    if model is HuertaRentada:
+        return {
+            "huerta-rentada": [pk],
+            "temporada": list(Temporada.objects.filter(huerta_rentada_id=pk).values_list("id", flat=True)),
+            "cosecha": list(Cosecha.objects.filter(temporada__huerta_rentada_id=pk).values_list("id", flat=True)),
+        }
+    if model is Temporada:
+        return {
+            "temporada": [pk],
+            "cosecha": list(Cosecha.objects.filter(temporada_id=pk).values_list("id", flat=True)),
+        }
+    if model is Bodega:
+        return {
+            "bodega": [pk],
+            "temporada-bodega": list(TemporadaBodega.objects.filter(bodega_id=pk).values_list("id", flat=True)),
+        }
+    if model is Cosecha:
+        return {"cosecha": [pk]}
+    if model is TemporadaBodega:
+        return {"temporada-bodega": [pk]}
+    if model is Users:
+        return {"user": [pk]}
+    return {}
+
+
+def reindex_related(model, pk: int) -> None:
+    for entity_type, ids in _affected(model, pk).items():
+        reindex(entity_type, ids)
+
+
+# Campos que alimentan algún documento; guardados que solo tocan otros campos
+# (p.ej. intentos_fallidos o last_login del usuario) no reindexan.
+INDEXED_FIELDS: Dict[type, set] = {
+    Propietario: {"nombre", "apellidos"},
+    Huerta: {"nombre", "ubicacion", "propietario", "is_active"},
+    HuertaRentada: {"nombre", "ubicacion", "propietario", "is_active"},
+    Temporada: {"año", "huerta", "huerta_rentada", "is_active", "estado_operativo"},
+    Cosecha: {"nombre", "temporada", "huerta", "huerta_rentada", "is_active"},
+    Bodega: {"nombre", "ubicacion", "is_active"},
+    TemporadaBodega: {"año", "bodega", "is_active"},
+    Users: {"nombre", "apellido", "telefono", "role", "is_active"},
+}
+
+
+def _on_indexed_change(sender, instance, **kwargs) -> None:
+    if kwargs.get("raw"):
+        return
+    update_fields = kwargs.get("update_fields")
+    if update_fields and not (set(update_fields) & INDEXED_FIELDS[sender]):
+        return
+    transaction.on_commit(partial(reindex_related, sender, instance.pk))
+
+
+def connect_signals() -> None:
+    for model in INDEXED_FIELDS:
+        label = model._meta.label_lower
+        post_save.connect(_on_indexed_change, sender=model, weak=False, dispatch_uid=f"gestion_usuarios.search.save.{label}")
+        post_delete.connect(_on_indexed_change, sender=model, weak=False, dispatch_uid=f"gestion_usuarios.search.delete.{label}")
+
+
+def rebuild_search_index(stdout=None) -> Dict[str, int]:
+    """Reconstruye el índice completo. Devuelve documentos por tipo."""
+    counts: Dict[str, int] = {}
+    with transaction.atomic():
+        SearchDocument.objects.all().delete()
+        for entity_type, spec in SPECS.items():
+            batch: List[SearchDocument] = []
+            total = 0
+            for obj in spec.queryset().order_by("pk").iterator(chunk_size=REBUILD_CHUNK):
+                batch.append(SearchDocument(entity_type=entity_type, entity_id=obj.pk, **spec.build(obj)))
+                if len(batch) >= REBUILD_CHUNK:
+                    SearchDocument.objects.bulk_create(batch)
+                    total += len(batch)
+                    batch = []
+            if batch:
+                SearchDocument.objects.bulk_create(batch)
+                total += len(batch)
+            counts[entity_type] = total
+            if stdout is not None:
+                stdout.write(f"{entity_type}: {total}")
+    return counts
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Consulta
+# ──────────────────────────────────────────────────────────────────────────────
+
+def fulltext_disponible() -> bool:
+    """El índice FULLTEXT ngram solo existe en MySQL (MariaDB no trae ngram)."""
+    return connection.vendor == "mysql" and not connection.mysql_is_mariadb
+
+
+def _match(qs: QuerySet, tokens: Sequence[str]) -> QuerySet:
+    if fulltext_disponible():
+        # Cada token como frase obligatoria: con el parser ngram equivale a
+        # "contiene el fragmento", igual que el icontains anterior.
+        against = " ".join(f'+"{t}"' for t in tokens)
+        table = SearchDocument._meta.db_table
+        return qs.filter(RawSQL(
+            f"MATCH({connection.ops.quote_name(table)}.`search_text`) AGAINST (%s IN BOOLEAN MODE)",
+            [against],
+            output_field=BooleanField(),
+        ))
+    for token in tokens:
+        qs = qs.filter(search_text__contains=token)
+    return qs
+
+
+def search_documents(term: str, scopes: Iterable[str], *, tablero_links: bool = True) -> List[Dict[str, Any]]:
+    """
+    Busca en el índice limitado a `scopes`; una sola consulta con tope por
+    tipo (ROW_NUMBER por entity_type). Devuelve el formato del dashboard.
+    """
+    scopes = list(scopes)
+    # Tokens de 1 carácter no están en el índice ngram (token_size=2).
+    tokens = [t for t in normalize_search_text(term).split() if len(t) >= 2]
+    if not scopes or not tokens:
+        return []
+
+    qs = _match(SearchDocument.objects.filter(scope__in=scopes), tokens)
+    rows = list(
+        qs.annotate(
+            rank=Window(RowNumber(), partition_by=[F("entity_type")], order_by=[F("title").asc(), F("entity_id").asc()])
+        )
+        .filter(rank__lte=max(RESULT_LIMITS.values()))
+        .values("entity_type", "entity_id", "group", "title", "subtitle", "meta", "link", "link_alt", "rank")
+    )
+    rows.sort(key=lambda r: (TYPE_ORDER.index(r["entity_type"]) if r["entity_type"] in TYPE_ORDER else len(TYPE_ORDER), r["rank"]))
+
+    results: List[Dict[str, Any]] = []
+    for row in rows:
+        if row["rank"] > RESULT_LIMITS.get(row["entity_type"], 0):
+            continue
+        link = row["link"] if tablero_links or not row["link_alt"] else row["link_alt"]
+        results.append({
+            "id": f"{row['entity_type']}-{row['entity_id']}",
+            "group": row["group"],
+            "kind": "entity",
+            "title": row["title"],
+            "subtitle": row["subtitle"],
+            "meta": row["meta"],
+            "to": link,
+        })
+    return results
+
+
+__all__ = [
+    "normalize_search_text",
+    "reindex",
+    "reindex_related",
+    "rebuild_search_index",
+    "search_documents",
+    "connect_signals",
+]
@@ -5,10 +5,14 @@ from typing import Iterable
 
 from django.contrib.auth.models import Permission
 from django.contrib.contenttypes.models import ContentType
-from django.db.models.signals import post_migrate
+from django.db import DEFAULT_DB_ALIAS, connection, transaction
+from django.db.models.signals import post_delete, post_migrate, post_save
 from django.dispatch import receiver
 from django.apps import apps as django_apps
+from agroproductores_risol.utils.change_versions import bump_change_version
+from .models import RegistroActividad, SearchDocument, Users
 from .permissions_policy import allowed_prefixes_for
+from .utils.cache_keys import DASHBOARD_USUARIOS_VERSION_KEY, PERMISSION_CATALOG_VERSION_KEY
 
 
 logger = logging.getLogger(__name__)
@@ -99,7 +103,56 @@ def ensure_custom_permissions(sender, app_config, **kwargs):
                 continue
             for model in cfg.get_models():
                 _ensure_permissions_for_model(model)
+        bump_change_version(PERMISSION_CATALOG_VERSION_KEY)
         _HAS_RUN = True
     except Exception:
         logger.exception("No se pudieron garantizar los permisos personalizados tras migrate.")
         raise
+
+
+def _schedule_dashboard_version_bump(sender, **kwargs) -> None:
+    """
+    Usuarios y bitácora alimentan el dashboard (timeline, altas pendientes,
+    eventos de seguridad): cualquier cambio invalida su ETag.
+    """
+    if kwargs.get("raw"):
+        return
+    transaction.on_commit(lambda: bump_change_version(DASHBOARD_USUARIOS_VERSION_KEY))
+
+
+for _model in (Users, RegistroActividad):
+    post_save.connect(
+        _schedule_dashboard_version_bump,
+        sender=_model,
+        weak=False,
+        dispatch_uid=f"gestion_usuarios.dashboard.version.save.{_model._meta.label_lower}",
+    )
+    post_delete.connect(
+        _schedule_dashboard_version_bump,
+        sender=_model,
+        weak=False,
+        dispatch_uid=f"gestion_usuarios.dashboard.version.delete.{_model._meta.label_lower}",
+    )
+
+
+# Índice de búsqueda global (SearchDocument): upsert/borrado por señales.
+from .services.search_index import connect_signals as _connect_search_signals  # noqa: E402
+from .services.search_index import rebuild_search_index  # noqa: E402
+
+_connect_search_signals()
+
+
+@receiver(post_migrate, dispatch_uid="gestion_usuarios.search.backfill")
+def backfill_search_index(sender, app_config=None, using=DEFAULT_DB_ALIAS, **kwargs):
+    """
+    Llena el índice si está vacío (p. ej. recién creada la tabla): sin esto la
+    búsqueda no devolvía nada hasta correr `rebuild_search_index` a mano.
+    """
+    if not app_config or app_config.label != "gestion_usuarios" or using != DEFAULT_DB_ALIAS:
+        return
+    if SearchDocument._meta.db_table not in connection.introspection.table_names():
+        return
+    if SearchDocument.objects.exists():
+        return
+    counts = rebuild_search_index()
+    logger.info("Índice de búsqueda poblado tras migrate: %s", counts)
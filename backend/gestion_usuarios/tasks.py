@@ -0,0 +1,16 @@
+"""
+Tareas periódicas propias del scheduler (las ejecuta `manage.py run_scheduler`).
+"""
+from __future__ import annotations
+
+from datetime import timedelta
+
+from django.conf import settings
+
+from gestion_usuarios.services.scheduler import periodic_task, purge_history
+
+
+@periodic_task("scheduler.purgar_historial", cada=timedelta(days=1))
+def purgar_historial():
+    """Borra el historial de ejecuciones más antiguo que SCHEDULER['HISTORY_DAYS']."""
+    return {"borradas": purge_history(settings.SCHEDULER["HISTORY_DAYS"])}
@@ -0,0 +1,37 @@
+from rest_framework.test import APITestCase
+
+from gestion_usuarios.models import RegistroActividad, Users
+
+
+class ActivityLogListTests(APITestCase):
+    def setUp(self):
+        self.admin = Users.objects.create_superuser(
+            telefono='0000000041', password='p', nombre='Admin', apellido='Log'
+        )
+        self.client.force_authenticate(self.admin)
+        usuarios = [
+            Users.objects.create_user(telefono=f'30000000{i:02d}', password='p', nombre='Usu', apellido=f'N{i}')
+            for i in range(5)
+        ]
+        for i in range(100):
+            RegistroActividad.objects.create(
+                usuario=usuarios[i % 5],
+                accion='Intento de inicio de sesion fallido' if i % 10 == 0 else 'Actualizó bodega',
+                detalles=f'ruta=/bodega/{i}/; metodo=PATCH',
+            )
+
+    def test_page_of_100_rows_in_two_queries(self):
+        with self.assertNumQueries(2):
+            response = self.client.get('/usuarios/actividad/', {'page_size': 100})
+        self.assertEqual(response.status_code, 200)
+        rows = response.json()['data']['results']
+        self.assertEqual(len(rows), 100)
+        row = rows[0]
+        self.assertEqual(set(row['usuario']), {'id', 'telefono', 'nombre', 'apellido', 'role', 'full_name'})
+        self.assertEqual((row['metodo'], row['ruta'][:8]), ('PATCH', '/bodega/'))
+
+    def test_tipo_filters_use_columns(self):
+        response = self.client.get('/usuarios/actividad/', {'tipo': 'seguridad', 'page_size': 100})
+        self.assertEqual(response.json()['data']['meta']['count'], 10)
+        response = self.client.get('/usuarios/actividad/', {'tipo': 'gestion_bodega', 'page_size': 100})
+        self.assertEqual(response.json()['data']['meta']['count'], 90)
@@ -1,6 +1,11 @@
+import importlib
 from datetime import timedelta
 from decimal import Decimal
+from io import StringIO
+from unittest import mock
 
+from django.apps import apps
+from django.core.management import call_command
 from django.urls import reverse
 from django.utils import timezone
 from rest_framework.test import APITestCase
@@ -24,7 +29,8 @@ from gestion_huerta.models import (
     Temporada,
     Venta,
 )
-from gestion_usuarios.models import RegistroActividad, Users
+from gestion_usuarios.models import RegistroActividad, SearchDocument, Users
+from gestion_usuarios.signals import backfill_search_index
 
 
 class DashboardApiTests(APITestCase):
@@ -159,6 +165,32 @@ class DashboardApiTests(APITestCase):
             payload['next_action']['to'],
             f'/bodega/tablero?bodega={self.bodega.id}&temporada={self.temporada_bodega.id}',
         )
+        tablero = payload['contexts']['featured_bodega']['tablero']
+        self.assertEqual(set(tablero['kpis']), {'recepcion', 'empaque'})
+        self.assertEqual(tablero['context']['temporada_id'], self.temporada_bodega.id)
+
+    def test_overview_revalidates_with_etag(self):
+        first = self.client.get(self.overview_url)
+        etag = first['ETag']
+        self.assertTrue(etag)
+
+        cached = self.client.get(self.overview_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(cached.status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Recepcion.objects.create(
+                bodega=self.bodega,
+                temporada=self.temporada_bodega,
+                semana=CierreSemanal.objects.get(temporada=self.temporada_bodega),
+                fecha=timezone.localdate(),
+                huertero_nombre='Pedro Campo',
+                tipo_mango='Kent',
+                cajas_campo=15,
+            )
+
+        fresh = self.client.get(self.overview_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(fresh.status_code, 200)
+        self.assertNotEqual(fresh['ETag'], etag)
 
     def test_search_returns_cross_module_results(self):
         response = self.client.get(self.search_url, {'q': 'Norte'})
@@ -169,3 +201,51 @@ class DashboardApiTests(APITestCase):
         groups = {item['group'] for item in results}
         self.assertIn('Huertas', groups)
         self.assertIn('Bodegas', groups)
+
+    def test_search_index_folds_accents_and_follows_renames(self):
+        # El índice se actualiza en on_commit; aquí se reconstruye lo de setUp.
+        call_command('rebuild_search_index', stdout=StringIO())
+        response = self.client.get(self.search_url, {'q': 'SOLÍS'})
+        ids = {item['id'] for item in response.data['data']['results']}
+        huerta = Huerta.objects.get(nombre='Huerta Norte')
+        self.assertIn(f'huerta-{huerta.id}', ids)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            huerta.nombre = 'Huerta Pacífico'
+            huerta.save()
+        results = self.client.get(self.search_url, {'q': 'pacifico'}).data['data']['results']
+        by_group = {item['group']: item for item in results}
+        self.assertEqual(by_group['Huertas']['title'], 'Huerta Pacífico')
+        self.assertEqual(by_group['Cosechas']['subtitle'], f'Huerta Pacífico · Temp {timezone.localdate().year}')
+
+    def test_search_index_drops_archived_and_rebuilds(self):
+        temporada = Temporada.objects.get(huerta__nombre='Huerta Norte')
+        with self.captureOnCommitCallbacks(execute=True):
+            temporada.archivar()
+        groups = {item['group'] for item in self.client.get(self.search_url, {'q': 'principal'}).data['data']['results']}
+        self.assertNotIn('Cosechas', groups)
+
+        SearchDocument.objects.all().delete()
+        call_command('rebuild_search_index', stdout=StringIO())
+        self.assertFalse(SearchDocument.objects.filter(entity_type='temporada', entity_id=temporada.id).exists())
+        results = self.client.get(self.search_url, {'q': 'norte'}).data['data']['results']
+        self.assertIn('Huertas', {item['group'] for item in results})
+
+    def test_post_migrate_puebla_el_indice_vacio(self):
+        SearchDocument.objects.all().delete()
+        backfill_search_index(sender=None, app_config=apps.get_app_config('gestion_usuarios'))
+        self.assertTrue(SearchDocument.objects.filter(entity_type='huerta').exists())
+        results = self.client.get(self.search_url, {'q': 'norte'}).data['data']['results']
+        self.assertIn('Huertas', {item['group'] for item in results})
+
+    def test_migracion_fulltext_omite_ngram_en_mariadb(self):
+        migracion = importlib.import_module('gestion_usuarios.migrations.0002_searchdocument')
+        schema_editor = mock.Mock()
+        schema_editor.connection.vendor = 'mysql'
+        schema_editor.connection.mysql_is_mariadb = True
+        migracion.create_fulltext_index(apps, schema_editor)
+        schema_editor.execute.assert_not_called()
+
+        schema_editor.connection.mysql_is_mariadb = False
+        migracion.create_fulltext_index(apps, schema_editor)
+        self.assertIn('WITH PARSER ngram', schema_editor.execute.call_args.args[0])
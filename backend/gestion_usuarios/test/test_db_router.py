@@ -0,0 +1,177 @@
+from types import SimpleNamespace
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.db import connections
+from django.test import RequestFactory, SimpleTestCase, TransactionTestCase, override_settings
+from django.utils.functional import SimpleLazyObject
+from rest_framework.test import APIClient
+
+from agroproductores_risol.utils import db_router
+from agroproductores_risol.utils.change_versions import bump_change_version, get_change_version
+from agroproductores_risol.utils.db_router import ReplicaRouter, ReplicaRoutingMiddleware
+from gestion_huerta.models import Venta
+from gestion_usuarios.models import Users
+
+REPLICA = {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}
+
+
+class _VistaReporte:
+    replica_reads = True
+
+
+class _VistaCaptura:
+    pass
+
+
+def _vista(cls):
+    def view(request):
+        return None
+    view.cls = cls
+    return view
+
+
+@override_settings(DATABASE_REPLICA_STICKY_SECONDS=30)
+class ReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.router = ReplicaRouter()
+        self.factory = RequestFactory()
+        for patcher in (
+            mock.patch.dict(settings.DATABASES, {"replica": REPLICA}),
+            mock.patch.object(db_router, "shared_cache_configured", return_value=True),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _peticion(self, vista, user, escribe=False, metodo="get", versiones=()):
+        """Simula middleware + vista DRF; devuelve los alias de lectura antes/después de autenticar."""
+        lecturas = {}
+        request = getattr(self.factory, metodo)("/")
+        request.user = SimpleLazyObject(AnonymousUser)
+
+        def get_response(req):
+            middleware.process_view(req, _vista(vista), (), {})
+            lecturas["sin_autenticar"] = self.router.db_for_read(Venta)
+            req.user = user  # DRF reemplaza el usuario perezoso tras autenticar
+            for key in versiones:
+                get_change_version(key)  # p. ej. el ETag del tablero
+            lecturas["autenticado"] = self.router.db_for_read(Venta)
+            if escribe:
+                self.assertEqual(self.router.db_for_write(Venta), "default")
+                lecturas["tras_escribir"] = self.router.db_for_read(Venta)
+            return SimpleNamespace(status_code=200)
+
+        middleware = ReplicaRoutingMiddleware(get_response)
+        middleware(request)
+        return lecturas
+
+    def test_vistas_de_lectura_usan_replica_tras_autenticar(self):
+        user = SimpleNamespace(pk=1, is_authenticated=True)
+        lecturas = self._peticion(_VistaReporte, user, escribe=True, metodo="post")
+        self.assertIsNone(lecturas["sin_autenticar"])
+        self.assertEqual(lecturas["autenticado"], "replica")
+        # La bitácora de la exportación escribe: el resto de la petición va a default.
+        self.assertIsNone(lecturas["tras_escribir"])
+        # ...pero no fija al usuario para las siguientes.
+        self.assertEqual(self._peticion(_VistaReporte, user)["autenticado"], "replica")
+
+    def test_read_your_writes_por_usuario(self):
+        autor = SimpleNamespace(pk=1, is_authenticated=True)
+        otro = SimpleNamespace(pk=2, is_authenticated=True)
+
+        lecturas = self._peticion(_VistaCaptura, autor, escribe=True, metodo="post")
+        self.assertIsNone(lecturas["autenticado"])
+
+        self.assertIsNone(self._peticion(_VistaReporte, autor)["autenticado"])
+        self.assertEqual(self._peticion(_VistaReporte, otro)["autenticado"], "replica")
+
+    def test_sin_replica_ni_peticion_todo_va_a_default(self):
+        self.assertIsNone(self.router.db_for_read(Venta))
+        del settings.DATABASES["replica"]
+        user = SimpleNamespace(pk=1, is_authenticated=True)
+        self.assertIsNone(self._peticion(_VistaReporte, user)["autenticado"])
+
+    def test_sin_cache_compartido_no_usa_replica(self):
+        user = SimpleNamespace(pk=1, is_authenticated=True)
+        with mock.patch.object(db_router, "shared_cache_configured", return_value=False):
+            self.assertIsNone(self._peticion(_VistaReporte, user)["autenticado"])
+
+    def test_version_recien_incrementada_lee_el_cuerpo_de_default(self):
+        user = SimpleNamespace(pk=1, is_authenticated=True)
+        bump_change_version("tablero:v:1:1")
+
+        lecturas = self._peticion(_VistaReporte, user, versiones=["tablero:v:1:1"])
+        self.assertIsNone(lecturas["autenticado"])
+        self.assertEqual(self._peticion(_VistaReporte, user, versiones=["tablero:v:2:2"])["autenticado"], "replica")
+
+        cache.delete("db:replica:reciente:tablero:v:1:1")  # venció el margen de rezago
+        self.assertEqual(self._peticion(_VistaReporte, user, versiones=["tablero:v:1:1"])["autenticado"], "replica")
+
+    def test_dentro_de_una_transaccion_lee_de_default(self):
+        user = SimpleNamespace(pk=1, is_authenticated=True)
+        with mock.patch.object(connections["default"], "in_atomic_block", True):
+            self.assertIsNone(self._peticion(_VistaReporte, user)["autenticado"])
+
+    def test_no_migra_en_replica(self):
+        self.assertFalse(self.router.allow_migrate("replica", "gestion_huerta"))
+        self.assertIsNone(self.router.allow_migrate("default", "gestion_huerta"))
+
+
+@override_settings(DATABASE_REPLICA_STICKY_SECONDS=30)
+class ReplicaRoutingDRFTests(TransactionTestCase):
+    """Pila real (middleware + autenticación DRF + vistas); el router solo se espía."""
+
+    def setUp(self):
+        cache.clear()
+        self.decisiones = []
+        original = ReplicaRouter.db_for_read
+
+        def espia(router, model, **hints):
+            self.decisiones.append(original(router, model, **hints))
+            return None  # la réplica no existe en pruebas: se lee de default
+
+        # La pila completa recorre los alias (ATOMIC_REQUESTS, etc.): réplica con la config de default.
+        replica = {**settings.DATABASES["default"], "TEST": {"MIRROR": "default"}}
+        for patcher in (
+            mock.patch.dict(settings.DATABASES, {"replica": replica}),
+            mock.patch.object(db_router, "shared_cache_configured", return_value=True),
+            mock.patch.object(ReplicaRouter, "db_for_read", autospec=True, side_effect=espia),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.autor = Users.objects.create_superuser(telefono="5550000201", password="Admin2026", nombre="A", apellido="Uno")
+        self.otro = Users.objects.create_superuser(telefono="5550000202", password="Admin2026", nombre="B", apellido="Dos")
+
+    def _overview(self, user):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        self.decisiones.clear()
+        self.assertEqual(client.get("/usuarios/dashboard/overview/").status_code, 200)
+        return set(self.decisiones)
+
+    def test_escritura_fija_al_autor_y_versiones_nuevas_leen_de_default(self):
+        cache.clear()  # ya pasó el margen de rezago de las altas del setUp
+        self.assertIn("replica", self._overview(self.otro))
+
+        client = APIClient()
+        client.force_authenticate(user=self.autor)
+        response = client.post("/huerta/propietarios/", {
+            "nombre": "Rosa", "apellidos": "Diaz", "telefono": "6670000301", "direccion": "Centro",
+        }, format="json")
+        self.assertEqual(response.status_code, 201)
+
+        # La versión del overview acaba de cambiar: nadie etiqueta datos de la réplica con ella.
+        self.assertNotIn("replica", self._overview(self.otro))
+        self.assertNotIn("replica", self._overview(self.autor))
+
+        # Vencidas las marcas de versión, solo el autor sigue fijado a default.
+        pin = db_router._pin_key(self.autor.pk)
+        self.assertEqual(cache.get(pin), 1)
+        cache.clear()
+        cache.set(pin, 1)
+        self.assertIn("replica", self._overview(self.otro))
+        self.assertNotIn("replica", self._overview(self.autor))
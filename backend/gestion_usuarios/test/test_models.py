@@ -48,3 +48,19 @@ class RegistroActividadTests(TestCase):
         )
         self.assertEqual(RegistroActividad.objects.count(), 1)
         self.assertEqual(ra.accion, 'Prueba')
+
+    def test_columnas_derivadas_al_guardar(self):
+        u = Users.objects.create_user(telefono='2223335555', password='p', nombre='Ana', apellido='Sol')
+        ra = RegistroActividad.objects.create(
+            usuario=u,
+            accion='Intento de acceso denegado',
+            detalles='motivo=x; ruta=/bodega/tablero/; metodo=GET; permiso_requerido=view_dashboard',
+        )
+        self.assertEqual(
+            (ra.categoria, ra.severidad, ra.ruta, ra.metodo, ra.es_denegado),
+            ('seguridad', 'warning', '/bodega/tablero/', 'GET', True),
+        )
+        ra.accion, ra.detalles = 'Eliminó la huerta', None
+        ra.save(update_fields=['accion', 'detalles'])
+        ra.refresh_from_db()
+        self.assertEqual((ra.categoria, ra.severidad, ra.ruta, ra.es_denegado), ('gestion_huerta', 'info', '', False))
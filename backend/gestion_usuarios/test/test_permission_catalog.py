@@ -0,0 +1,59 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.contrib.auth.models import Permission
+from rest_framework.test import APITestCase
+
+from gestion_usuarios.models import Users
+
+
+class PermissionCatalogTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = Users.objects.create_superuser(
+            telefono='0000000042', password='p', nombre='Admin', apellido='Perm'
+        )
+        self.client.force_authenticate(self.admin)
+
+    def test_user_list_prefetches_permissions(self):
+        perms = list(Permission.objects.filter(content_type__app_label='gestion_huerta')[:3])
+        for i in range(3):
+            u = Users.objects.create_user(telefono=f'40000000{i:02d}', password='p', nombre='Usu', apellido=f'N{i}')
+            u.user_permissions.set(perms)
+
+        # count + página + prefetch de permisos, sin importar el tamaño de página
+        with self.assertNumQueries(3):
+            response = self.client.get('/usuarios/users/', {'page_size': 50})
+        self.assertEqual(response.status_code, 200)
+        rows = response.json()['data']['results']
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(sorted(rows[0]['permisos']), sorted(p.codename for p in perms))
+
+    def test_catalog_is_cached_until_permissions_are_rebuilt(self):
+        first = self.client.get('/usuarios/permisos-filtrados/').json()['data']['permisos']
+        self.assertTrue(first)
+        self.assertEqual(set(first[0]), {'codename', 'nombre', 'descripcion', 'modulo', 'area'})
+
+        with self.assertNumQueries(0):
+            again = self.client.get('/usuarios/permisos-filtrados/').json()['data']['permisos']
+        self.assertEqual(again, first)
+
+        Permission.objects.filter(codename='view_huerta').delete()
+        self.assertIn('view_huerta', [p['codename'] for p in self.client.get('/usuarios/permisos-filtrados/').json()['data']['permisos']])
+
+        call_command('rebuild_permissions', stdout=StringIO())
+        self.assertIn('view_huerta', [p['codename'] for p in self.client.get('/usuarios/permisos-filtrados/').json()['data']['permisos']])
+        call_command('prune_permissions', stdout=StringIO())
+        with self.assertNumQueries(1):
+            self.client.get('/usuarios/permisos-filtrados/')
+
+    def test_catalog_ttl_is_short_without_shared_cache(self):
+        for compartido, ttl in ((False, 60), (True, 60 * 60 * 24)):
+            cache.clear()
+            with mock.patch('gestion_usuarios.views.user_views.shared_cache_configured', return_value=compartido), \
+                    mock.patch.object(cache, 'set', wraps=cache.set) as cache_set:
+                self.client.get('/usuarios/permisos-filtrados/')
+            catalog_sets = [c for c in cache_set.call_args_list if c.args[0].startswith('usuarios:permisos:catalogo')]
+            self.assertEqual([c.args[2] for c in catalog_sets], [ttl])
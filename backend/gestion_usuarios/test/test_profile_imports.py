@@ -0,0 +1,25 @@
+import json
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+from agroproductores_risol.utils.export_registry import get_exporter
+
+
+class ProfileImportsTests(SimpleTestCase):
+    def test_urlconf_boot_does_not_load_export_stacks(self):
+        out = StringIO()
+        call_command("profile_imports", "--json", stdout=out)
+        reporte = json.loads(out.getvalue())
+
+        self.assertEqual(reporte["pesadas_cargadas"], [])
+        self.assertEqual([f["modulo"] for f in reporte["filas"]], ["django.setup()", "agroproductores_risol.urls"])
+        self.assertTrue(all(f["ms"] >= 0 for f in reporte["filas"]))
+
+    def test_exporters_resolve_on_first_use(self):
+        exporter = get_exporter("huerta.excel")
+        self.assertIs(get_exporter("huerta.excel"), exporter)
+        self.assertTrue(hasattr(exporter, "generar_excel_temporada"))
+        with self.assertRaises(LookupError):
+            get_exporter("nope.pdf")
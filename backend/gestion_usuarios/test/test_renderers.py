@@ -0,0 +1,62 @@
+import uuid
+from datetime import date, datetime, time, timezone as dt_timezone
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from agroproductores_risol.utils.renderers import CompactJSONRenderer, FastJSONRenderer
+from gestion_usuarios.models import Users
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    def test_bytes_match_drf_renderer(self):
+        data = {
+            "success": True,
+            "message": "Operación completada\u2028\u2029ok",
+            "data": {
+                "monto": Decimal("1234.50"),
+                "fecha": date(2025, 3, 1),
+                "creado": datetime(2025, 3, 1, 12, 30, 0, 1500, tzinfo=dt_timezone.utc),
+                "local": datetime(2025, 3, 1, 12, 30),
+                "hora": time(7, 15),
+                "id": uuid.UUID(int=7),
+                "etiqueta": gettext_lazy("Ventas"),
+                "filas": [(1, 2.5), {3: "x"}],
+                "pct": 0.1 + 0.2,
+            },
+        }
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_indent_and_huge_ints_fall_back_to_drf(self):
+        data = {"n": 2**70, "a": [1]}
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(
+            FastJSONRenderer().render(data, "application/json; indent=2"),
+            JSONRenderer().render(data, "application/json; indent=2"),
+        )
+
+    def test_compact_drops_notification_block(self):
+        body = CompactJSONRenderer().render(
+            {"success": True, "message_key": "k", "message": "m", "data": {}, "notification": {"key": "k"}}
+        )
+        self.assertEqual(body, b'{"success":true,"message_key":"k","message":"m","data":{}}')
+
+
+class RendererNegotiationTests(APITestCase):
+    def setUp(self):
+        self.user = Users.objects.create_user(telefono='0000000045', password='p', nombre='Ren', apellido='Der')
+        self.client.force_authenticate(self.user)
+
+    def test_compact_mode_is_opt_in(self):
+        default = self.client.get('/usuarios/me/')
+        self.assertIn('notification', default.json())
+
+        compact = self.client.get('/usuarios/me/', HTTP_ACCEPT='application/json; compact=1')
+        self.assertEqual(compact.status_code, 200)
+        self.assertNotIn('notification', compact.json())
+        self.assertEqual(compact.json()['data'], default.json()['data'])
+
+        self.assertNotIn('notification', self.client.get('/usuarios/me/', {'format': 'compact'}).json())
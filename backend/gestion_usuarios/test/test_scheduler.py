@@ -0,0 +1,88 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase
+from django.utils import timezone
+
+from gestion_bodega.models import Bodega, CierreSemanal, TemporadaBodega
+from gestion_usuarios.models import EjecucionTarea, TareaProgramada
+from gestion_usuarios.services import scheduler
+
+
+class SchedulerTests(TestCase):
+    def setUp(self):
+        self.llamadas = []
+        self.task = scheduler.PeriodicTask(
+            nombre="test.tarea", func=self._tarea, cada=timedelta(minutes=5), lock_ttl=timedelta(minutes=5)
+        )
+        scheduler.register_task(self.task)
+        self.addCleanup(scheduler.unregister_task, "test.tarea")
+
+    def _tarea(self):
+        self.llamadas.append(1)
+        if len(self.llamadas) > 1:
+            raise RuntimeError("falla")
+        return {"n": len(self.llamadas)}
+
+    def test_run_records_history_and_schedules_next(self):
+        ejecucion = scheduler.run_task(self.task, nodo="n1")
+
+        self.assertEqual((ejecucion.estado, ejecucion.resultado), ("OK", {"n": 1}))
+        tarea = TareaProgramada.objects.get(nombre="test.tarea")
+        self.assertEqual((tarea.ejecuciones, tarea.fallos, tarea.bloqueado_por), (1, 0, ""))
+        self.assertGreater(tarea.proxima_ejecucion, timezone.now())
+        # No está vencida: otro ciclo no la vuelve a correr.
+        self.assertIsNone(scheduler.run_task(self.task, nodo="n2"))
+
+        with self.assertLogs("gestion_usuarios.services.scheduler", "ERROR"):
+            fallida = scheduler.run_task(self.task, nodo="n2", force=True)
+        self.assertEqual(fallida.estado, "ERROR")
+        self.assertIn("RuntimeError", fallida.error)
+        tarea.refresh_from_db()
+        self.assertEqual((tarea.ejecuciones, tarea.fallos, tarea.ultimo_estado), (2, 1, "ERROR"))
+
+    def test_lock_held_by_other_node_skips_run(self):
+        ahora = timezone.now()
+        TareaProgramada.objects.create(
+            nombre="test.tarea", proxima_ejecucion=ahora, bloqueado_por="n1",
+            bloqueado_hasta=ahora + timedelta(minutes=1),
+        )
+        self.assertIsNone(scheduler.run_task(self.task, nodo="n2", force=True))
+        self.assertEqual(self.llamadas, [])
+
+        # Lock expirado (nodo caído): se puede tomar.
+        TareaProgramada.objects.filter(nombre="test.tarea").update(bloqueado_hasta=ahora - timedelta(seconds=1))
+        self.assertIsNotNone(scheduler.run_task(self.task, nodo="n2"))
+        self.assertEqual(EjecucionTarea.objects.filter(tarea__nombre="test.tarea").count(), 1)
+
+    def test_cerrar_semanas_vencidas_task(self):
+        tareas = {t.nombre for t in scheduler.load_tasks()}
+        self.assertIn("bodega.cerrar_semanas_vencidas", tareas)
+
+        hoy = timezone.localdate()
+        bodega = Bodega.objects.create(nombre="Bodega Scheduler")
+        temporada = TemporadaBodega.objects.create(bodega=bodega, año=2025, fecha_inicio=hoy - timedelta(days=30))
+        semana = CierreSemanal.objects.create(bodega=bodega, temporada=temporada, fecha_desde=hoy - timedelta(days=10))
+
+        ejecucion = scheduler.run_task(scheduler.get_task("bodega.cerrar_semanas_vencidas"), nodo="n1")
+
+        self.assertEqual(ejecucion.resultado, {"cerradas": 1})
+        semana.refresh_from_db()
+        self.assertEqual(semana.fecha_hasta, semana.fecha_desde + timedelta(days=6))
+
+    def test_precalentar_reporte_semanal_requires_shared_cache(self):
+        hoy = timezone.localdate()
+        bodega = Bodega.objects.create(nombre="Bodega Precalentado")
+        temporada = TemporadaBodega.objects.create(bodega=bodega, año=2025, fecha_inicio=hoy)
+        CierreSemanal.objects.create(bodega=bodega, temporada=temporada, fecha_desde=hoy)
+        task = scheduler.get_task("bodega.precalentar_reporte_semanal")
+
+        with mock.patch("gestion_bodega.tasks.build_reporte_semanal_json") as build:
+            ejecucion = scheduler.run_task(task, nodo="n1")
+            self.assertEqual(ejecucion.resultado["reportes"], 0)
+            build.assert_not_called()
+
+            with mock.patch("gestion_bodega.tasks.shared_cache_configured", return_value=True):
+                ejecucion = scheduler.run_task(task, nodo="n1", force=True)
+            self.assertEqual(ejecucion.resultado, {"reportes": 1})
+            build.assert_called_once()
@@ -0,0 +1,34 @@
+import os
+from unittest import mock
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, override_settings
+
+from agroproductores_risol.settings import build_cache_config
+from agroproductores_risol.utils.shared_cache import check_shared_cache, shared_cache_configured
+
+
+class CacheConfigTests(SimpleTestCase):
+    def _config(self, url):
+        with mock.patch.dict(os.environ, {"CACHE_URL": url}):
+            return build_cache_config()
+
+    def test_cache_url_selecciona_backend(self):
+        self.assertEqual(self._config("")["BACKEND"], "django.core.cache.backends.locmem.LocMemCache")
+        self.assertEqual(self._config("redis://cache:6379/1"), {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": "redis://cache:6379/1",
+        })
+        self.assertEqual(self._config("memcached://cache:11211")["LOCATION"], "cache:11211")
+        self.assertEqual(self._config("db://")["LOCATION"], "django_cache")
+        with self.assertRaises(ImproperlyConfigured):
+            self._config("ftp://x")
+
+    @override_settings(DEBUG=False, CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+    def test_check_avisa_cache_local_fuera_de_debug(self):
+        self.assertFalse(shared_cache_configured())
+        self.assertEqual([w.id for w in check_shared_cache()], ["agroproductores_risol.W001"])
+
+    @override_settings(DEBUG=False, CACHES={"default": {"BACKEND": "django.core.cache.backends.db.DatabaseCache", "LOCATION": "t"}})
+    def test_cache_compartido_no_avisa(self):
+        self.assertTrue(shared_cache_configured())
+        self.assertEqual(check_shared_cache(), [])
@@ -0,0 +1,81 @@
+import threading
+import time
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from agroproductores_risol.utils.single_flight import (
+    _lock_key,
+    get_or_compute,
+    single_flight_metrics,
+)
+
+
+class SingleFlightTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.calls = 0
+
+    def _builder(self, delay=0.0, value="nuevo"):
+        def build():
+            self.calls += 1
+            time.sleep(delay)
+            return {"valor": value}
+        return build
+
+    def test_concurrent_misses_compute_once(self):
+        results = []
+        builder = self._builder(delay=0.3)
+
+        def worker():
+            results.append(get_or_compute("k", builder, 60, namespace="t"))
+
+        threads = [threading.Thread(target=worker) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(results, [{"valor": "nuevo"}] * 5)
+        metricas = single_flight_metrics(["t"])["t"]
+        self.assertEqual(metricas["computed"], 1)
+        self.assertEqual(metricas["coalesced"], 4)
+        self.assertGreater(metricas["wait_ms"], 0)
+        self.assertIsNone(cache.get(_lock_key("k")))
+
+    def test_serves_stale_while_another_worker_revalidates(self):
+        cache.set("k:stale", {"valor": "viejo"})
+        cache.add(_lock_key("k"), "otro-worker", 60)
+
+        value = get_or_compute("k", self._builder(), 60, namespace="t", stale_key="k:stale")
+
+        self.assertEqual(value, {"valor": "viejo"})
+        self.assertEqual(self.calls, 0)
+        self.assertEqual(single_flight_metrics(["t"])["t"]["stale"], 1)
+
+    def test_bounded_wait_falls_back_to_computing(self):
+        cache.add(_lock_key("k"), "worker-colgado", 60)
+
+        with self.assertLogs("agroproductores_risol.utils.single_flight", level="WARNING"):
+            value = get_or_compute("k", self._builder(), 60, namespace="t", wait_timeout=0.2)
+
+        self.assertEqual(value, {"valor": "nuevo"})
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(single_flight_metrics(["t"])["t"]["timeout"], 1)
+
+    def test_force_recomputes_and_publishes(self):
+        cache.set("k", {"valor": "viejo"})
+        value = get_or_compute("k", self._builder(), 60, namespace="t", stale_key="k:stale", force=True)
+        self.assertEqual(value, {"valor": "nuevo"})
+        self.assertEqual(cache.get("k"), {"valor": "nuevo"})
+        self.assertEqual(cache.get("k:stale"), {"valor": "nuevo"})
+
+    def test_builder_error_releases_lock(self):
+        def falla():
+            raise RuntimeError("boom")
+
+        with self.assertRaises(RuntimeError):
+            get_or_compute("k", falla, 60, namespace="t")
+        self.assertIsNone(cache.get(_lock_key("k")))
+        self.assertEqual(get_or_compute("k", self._builder(), 60, namespace="t"), {"valor": "nuevo"})
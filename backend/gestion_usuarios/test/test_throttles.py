@@ -0,0 +1,48 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from rest_framework.test import APIRequestFactory
+
+from agroproductores_risol.utils.rate_limit import SlidingWindowCounter
+from gestion_usuarios.utils.throttles import PermissionsThrottle
+
+
+class SlidingWindowCounterTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.counter = SlidingWindowCounter(limit=10, window=60)
+
+    def test_previous_window_decays_linearly(self):
+        for _ in range(10):
+            self.counter.hit("k", now=30.0)
+        self.assertEqual(self.counter.count("k", now=59.0), 10)
+        self.assertGreater(self.counter.retry_after("k", now=59.0), 0)
+        # A mitad de la ventana siguiente pesa la mitad del previo.
+        self.assertAlmostEqual(self.counter.count("k", now=90.0), 5.0)
+        self.assertIsNone(self.counter.retry_after("k", now=90.0))
+        self.assertEqual(self.counter.count("k", now=125.0), 0)
+
+    def test_state_is_two_integers(self):
+        for i in range(500):
+            self.counter.hit("k", now=float(i % 120))
+        self.assertEqual(
+            sorted(key for key in cache._cache if ":k:" in key), sorted(cache.make_key(k) for k in ("k:0", "k:1"))
+        )
+        self.counter.reset("k", now=119.0)
+        self.assertEqual(self.counter.count("k", now=119.0), 0)
+
+
+class SlidingWindowThrottleTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_scope_rate_is_enforced(self):
+        request = APIRequestFactory().get("/")
+        request.user = mock.Mock(is_authenticated=True, pk=7)
+        with mock.patch.object(PermissionsThrottle, "timer", return_value=1000.0):
+            results = [PermissionsThrottle().allow_request(request, None) for _ in range(31)]
+            throttle = PermissionsThrottle()
+            self.assertFalse(throttle.allow_request(request, None))
+        self.assertEqual(results, [True] * 30 + [False])
+        self.assertEqual(throttle.wait(), 20)
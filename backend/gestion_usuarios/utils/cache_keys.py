@@ -0,0 +1,17 @@
+"""
+Claves de caché compartidas del módulo de usuarios.
+"""
+
+# Versión de cambios de los datos de usuarios/actividad que alimentan el dashboard.
+DASHBOARD_USUARIOS_VERSION_KEY = "usuarios:dashboard:version"
+
+# Versión del catálogo de permisos (la suben rebuild/prune_permissions y migrate).
+PERMISSION_CATALOG_VERSION_KEY = "usuarios:permisos:catalogo:version"
+
+
+def k_perm_epoch(user_id: int) -> str:
+    return f"user:{user_id}:perm_epoch"
+
+
+def k_permission_catalog(version: int) -> str:
+    return f"usuarios:permisos:catalogo:v{version}"
@@ -1,13 +1,24 @@
 from django.core.cache import cache
 from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_control
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 
+from agroproductores_risol.utils.change_versions import (
+    build_etag,
+    etag_matches,
+    get_change_version,
+    not_modified_response,
+)
 from agroproductores_risol.utils.notification_handler import NotificationHandler
+from gestion_bodega.utils.tablero_version import get_bodega_global_version
+from gestion_huerta.utils.cache_keys import get_huerta_data_version
 from gestion_usuarios.services.dashboard_service import (
     build_dashboard_overview,
     build_dashboard_search,
 )
+from gestion_usuarios.utils.cache_keys import DASHBOARD_USUARIOS_VERSION_KEY, k_perm_epoch
 from gestion_usuarios.utils.throttles import PermissionsThrottle
 
 OVERVIEW_CACHE_TTL = 20
@@ -15,7 +26,7 @@ SEARCH_CACHE_TTL = 45
 
 
 def _cache_key(scope: str, user, *parts: object) -> str:
-    perm_epoch = cache.get(f"user:{user.id}:perm_epoch") or 1
+    perm_epoch = cache.get(k_perm_epoch(user.id)) or 1
     base = [
         "dashboard",
         scope,
@@ -29,25 +40,50 @@ def _cache_key(scope: str, user, *parts: object) -> str:
     return ":".join(base)
 
 
+def _overview_etag(cache_key: str) -> str:
+    """
+    El overview mezcla bodega, huerta y usuarios: el ETag combina las tres
+    versiones de cambio con la llave por usuario (rol, permisos, día).
+    """
+    return build_etag(
+        cache_key,
+        get_bodega_global_version(),
+        get_huerta_data_version(),
+        get_change_version(DASHBOARD_USUARIOS_VERSION_KEY),
+    )
+
+
+@method_decorator(cache_control(private=True, no_cache=True, must_revalidate=True), name="dispatch")
 class DashboardOverviewView(APIView):
     permission_classes = [IsAuthenticated]
     throttle_classes = [PermissionsThrottle]
+    replica_reads = True
 
     def get(self, request):
         cache_key = _cache_key("overview", request.user)
-        payload = cache.get(cache_key)
+        etag = _overview_etag(cache_key)
+        if etag_matches(request, etag):
+            return not_modified_response(etag)
+
+        # La versión forma parte de la llave: un payload cacheado nunca se
+        # entrega con un ETag más nuevo que los datos que contiene.
+        versioned_key = f"{cache_key}:{etag}"
+        payload = cache.get(versioned_key)
         if payload is None:
             payload = build_dashboard_overview(request.user)
-            cache.set(cache_key, payload, OVERVIEW_CACHE_TTL)
-        return NotificationHandler.generate_response(
+            cache.set(versioned_key, payload, OVERVIEW_CACHE_TTL)
+        response = NotificationHandler.generate_response(
             message_key="fetch_success",
             data=payload,
         )
+        response["ETag"] = etag
+        return response
 
 
 class DashboardSearchView(APIView):
     permission_classes = [IsAuthenticated]
     throttle_classes = [PermissionsThrottle]
+    replica_reads = True
 
     def get(self, request):
         query = (request.query_params.get("q", "") or "").strip().lower()
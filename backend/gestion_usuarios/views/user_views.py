@@ -11,10 +11,13 @@ from django.contrib.auth.models import Permission
 from django.core.cache import cache
 from django.db.models import Q
 
+from agroproductores_risol.utils.change_versions import get_change_version
 from agroproductores_risol.utils.pagination import GenericPagination
+from agroproductores_risol.utils.shared_cache import shared_cache_configured
 from gestion_usuarios.permissions import IsAdmin, IsSelfOrAdmin
 from gestion_usuarios.models import Users, RegistroActividad
 from gestion_usuarios.utils.activity import registrar_actividad
+from gestion_usuarios.utils.cache_keys import PERMISSION_CATALOG_VERSION_KEY, k_permission_catalog
 from agroproductores_risol.utils.notification_handler import NotificationHandler
 from gestion_usuarios.utils.throttles import (
     RefreshTokenThrottle,
@@ -589,7 +592,8 @@ class UsuarioViewSet(ModelViewSet):
 
     def get_queryset(self):
         estado = self.request.query_params.get('estado')  # activos | archivados | todos
-        queryset = super().get_queryset()
+        # `permisos` del serializer: una sola consulta para toda la página
+        queryset = super().get_queryset().prefetch_related('user_permissions')
 
         if estado == 'activos':
             queryset = queryset.filter(archivado_en__isnull=True)
@@ -912,27 +916,65 @@ try:
             return is_codename_allowed(app_label, model, codename)
         return codename.startswith(("add_", "change_", "delete_", "view_"))
 
-    def get_filtered_permissions_qs():  # type: ignore[no-redef]
-        base = (
-            Permission.objects.select_related("content_type")
-            .filter(content_type__app_label__in=ALLOWED_APP_LABELS)
-            .order_by("content_type__app_label", "content_type__model", "codename")
+    PERMISSION_CATALOG_TTL = 60 * 60 * 24
+    # Con cache local, rebuild/prune_permissions y post_migrate incrementan la
+    # versión solo en su propio proceso: los workers la ven al expirar esto.
+    PERMISSION_CATALOG_LOCAL_TTL = 60
+
+    def _build_permission_catalog() -> list[dict]:
+        """Catálogo visible ya filtrado, traducido y ordenado (una consulta)."""
+        base = Permission.objects.select_related("content_type").filter(
+            content_type__app_label__in=ALLOWED_APP_LABELS
         )
-        allowed_ids = []
+        catalog = []
         for perm in base:
-            app = perm.content_type.app_label
+            app_label = perm.content_type.app_label
             model = perm.content_type.model
-            code = perm.codename
-            if _is_visible_permission(app, model, code):
-                allowed_ids.append(perm.id)
+            if not _is_visible_permission(app_label, model, perm.codename):
+                continue
+            modulo = _MODEL_LABELS.get(model, model.capitalize())
+            catalog.append({
+                "id": perm.id,
+                "app_label": app_label,
+                "model": model,
+                "codename": perm.codename,
+                "nombre": _friendly_name_from_codename(perm.codename, modulo),
+                "descripcion": _permission_description(perm.codename, modulo),
+                "modulo": modulo,
+                "area": _AREA_LABELS.get(app_label, app_label.replace("_", " ").title()),
+            })
+        catalog.sort(key=lambda p: _module_sort_weight(p["app_label"], p["model"]) + (p["codename"],))
+        return catalog
+
+    def _permission_catalog() -> list[dict]:
+        """Catálogo cacheado bajo PERMISSION_CATALOG_VERSION_KEY."""
+        key = k_permission_catalog(get_change_version(PERMISSION_CATALOG_VERSION_KEY))
+        catalog = cache.get(key)
+        if catalog is None:
+            catalog = _build_permission_catalog()
+            ttl = PERMISSION_CATALOG_TTL if shared_cache_configured() else PERMISSION_CATALOG_LOCAL_TTL
+            cache.set(key, catalog, ttl)
+        return catalog
+
+    def get_filtered_permissions_qs():  # type: ignore[no-redef]
         return (
             Permission.objects.select_related("content_type")
-            .filter(id__in=allowed_ids)
+            .filter(id__in=[perm["id"] for perm in _permission_catalog()])
             .order_by("content_type__app_label", "content_type__model", "codename")
         )
 
     def _registro_get_queryset(self):  # noqa: ANN001
-        qs = RegistroActividad.objects.select_related("usuario").order_by("-fecha_hora")
+        # Proyección del feed: columnas del registro + usuario compacto (sin permisos).
+        qs = (
+            RegistroActividad.objects.select_related("usuario")
+            .only(
+                "id", "accion", "fecha_hora", "detalles", "ip",
+                "categoria", "severidad", "ruta", "metodo", "es_denegado",
+                "usuario__id", "usuario__telefono", "usuario__nombre",
+                "usuario__apellido", "usuario__role",
+            )
+            .order_by("-fecha_hora")
+        )
         tipo = (self.request.query_params.get("tipo") or "").strip().lower()
         rol = (self.request.query_params.get("rol") or "").strip().lower()
 
@@ -940,18 +982,10 @@ try:
             qs = qs.filter(usuario__role=rol)
 
         if tipo == "seguridad":
-            qs = qs.filter(
-                Q(accion__iregex=r"(denegad|bloquead|fallid)")
-                | Q(detalles__icontains="permiso_requerido=")
-            )
-        elif tipo == "autenticacion":
-            qs = qs.filter(accion__iregex=r"(sesion|login|contrase)")
-        elif tipo == "gestion_bodega":
-            qs = qs.filter(accion__iregex=r"(bodega|recepci|camion|madera|consumible|empaque|semana)")
-        elif tipo == "gestion_huerta":
-            qs = qs.filter(accion__iregex=r"(huerta|cosecha|temporada|venta|inversion|propietario)")
-        elif tipo == "gestion_usuarios":
-            qs = qs.filter(accion__iregex=r"(usuario|permiso)")
+            # Incluye intentos fallidos/bloqueos aunque su categoría sea autenticación.
+            qs = qs.filter(Q(categoria="seguridad") | Q(severidad="warning"))
+        elif tipo in {"autenticacion", "gestion_bodega", "gestion_huerta", "gestion_usuarios"}:
+            qs = qs.filter(categoria=tipo)
 
         return qs
 
@@ -974,20 +1008,8 @@ try:
         except Exception:
             cache_key = None
 
-        dotted = list(request.user.get_all_permissions())
-        plains = _to_plain(dotted)
-        filtered = []
-        perms_qs = Permission.objects.select_related("content_type").filter(
-            codename__in=plains,
-            content_type__app_label__in=ALLOWED_APP_LABELS,
-        )
-        for perm in perms_qs:
-            app = perm.content_type.app_label
-            model = perm.content_type.model
-            code = perm.codename
-            if _is_visible_permission(app, model, code):
-                filtered.append(code)
-
+        visibles = {f"{perm['app_label']}.{perm['codename']}" for perm in _permission_catalog()}
+        filtered = _to_plain(p for p in request.user.get_all_permissions() if p in visibles)
         filtered = sorted(set(filtered))
         if cache_key:
             try:
@@ -1002,23 +1024,8 @@ try:
     UserPermissionsView.get = _userperms_get_strict  # type: ignore[attr-defined]
 
     def _permisos_filtrados_get(self, request):  # noqa: ANN001
-        permisos = []
-        perms = list(get_filtered_permissions_qs())
-        perms.sort(key=lambda perm: _module_sort_weight(perm.content_type.app_label, perm.content_type.model) + (perm.codename,))
-
-        for perm in perms:
-            app_label = perm.content_type.app_label
-            model = perm.content_type.model
-            modulo = _MODEL_LABELS.get(model, model.capitalize())
-            nombre = _friendly_name_from_codename(perm.codename, modulo)
-            descripcion = _permission_description(perm.codename, modulo)
-            permisos.append({
-                "codename": perm.codename,
-                "nombre": nombre,
-                "descripcion": descripcion,
-                "modulo": modulo,
-                "area": _AREA_LABELS.get(app_label, app_label.replace("_", " ").title()),
-            })
+        campos = ("codename", "nombre", "descripcion", "modulo", "area")
+        permisos = [{campo: perm[campo] for campo in campos} for perm in _permission_catalog()]
         return NotificationHandler.generate_response(
             message_key="fetch_success",
             data={"permisos": permisos},